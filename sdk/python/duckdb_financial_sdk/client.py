@@ -118,6 +118,52 @@ class FinancialClient:
         except json.JSONDecodeError as e:
             raise APIError(f"Invalid JSON response: {e}")
 
+    def _stream_request(self,
+                        method: str,
+                        endpoint: str,
+                        accept: str,
+                        data: Optional[Dict] = None,
+                        params: Optional[Dict] = None) -> requests.Response:
+        """
+        Make HTTP request and return the open response for streamed reading.
+
+        The caller reads ``response.raw`` and must close the response.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint (without base URL)
+            accept: Media type requested via the Accept header
+            data: Request data for POST/PUT requests
+            params: Query parameters
+
+        Returns:
+            Streaming response
+
+        Raises:
+            APIError: For API-related errors
+            AuthenticationError: For authentication failures
+            ValidationError: For validation errors
+        """
+        url = f"{self.base_url}{endpoint}"
+
+        try:
+            response = self.session.request(
+                method, url,
+                params=params,
+                json=data,
+                headers={'Accept': accept},
+                timeout=self.timeout,
+                verify=self.verify_ssl,
+                stream=True
+            )
+            response.raise_for_status()
+            return response
+
+        except requests.exceptions.HTTPError as e:
+            self._handle_http_error(e, response)
+        except requests.exceptions.RequestException as e:
+            raise APIError(f"Request failed: {e}")
+
     def _handle_http_error(self, error: requests.exceptions.HTTPError,
                           response: requests.Response):
         """Handle HTTP errors with appropriate exceptions."""
@@ -3,11 +3,29 @@ Market Data Client
 ==================
 
 Client for market data operations.
+
+Bulk OHLCV data can be fetched as an Arrow IPC stream and decoded batch by
+batch into ``pyarrow`` / ``pandas`` (requires the ``arrow`` extra).
 """
 
-from typing import Dict, List, Optional, Any
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Any
 from datetime import datetime, date
 
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+
+def _import_pyarrow():
+    """Import pyarrow, which is only needed for Arrow responses."""
+    try:
+        import pyarrow
+        import pyarrow.ipc
+    except ImportError as e:
+        raise ImportError(
+            "Arrow responses require pyarrow: pip install 'duckdb-financial-sdk[arrow]'"
+        ) from e
+    return pyarrow
+
 
 class MarketDataClient:
     """
@@ -180,3 +198,98 @@ class MarketDataClient:
         """
         return self.client._make_request('GET', f'/market-data/{symbol}/intraday',
                                        params={'date': date})
+
+    def iter_batches(self,
+                     symbol: str,
+                     start_date: Optional[str] = None,
+                     end_date: Optional[str] = None,
+                     timeframe: str = "1T",
+                     limit: Optional[int] = None) -> Iterator[Any]:
+        """
+        Stream OHLCV data as Arrow record batches.
+
+        Minute data (``1T``) comes from ``/market-data``; other timeframes
+        from ``/resample``. Only one batch is held in memory at a time.
+
+        Args:
+            symbol: Trading symbol
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            timeframe: Data timeframe (1T, 5T, 15T, 30T, 1H, 4H, 1D, 1W, 1M)
+            limit: Maximum number of records (minute data only)
+
+        Yields:
+            pyarrow.RecordBatch
+        """
+        with self._open_arrow_stream(symbol, start_date, end_date, timeframe, limit) as reader:
+            for batch in reader:
+                yield batch
+
+    def get_arrow(self,
+                  symbol: str,
+                  start_date: Optional[str] = None,
+                  end_date: Optional[str] = None,
+                  timeframe: str = "1T",
+                  limit: Optional[int] = None) -> Any:
+        """
+        Get OHLCV data as a ``pyarrow.Table`` decoded from an Arrow stream.
+
+        Args:
+            symbol: Trading symbol
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            timeframe: Data timeframe
+            limit: Maximum number of records (minute data only)
+
+        Returns:
+            pyarrow.Table
+        """
+        with self._open_arrow_stream(symbol, start_date, end_date, timeframe, limit) as reader:
+            return reader.read_all()
+
+    def get_dataframe(self,
+                      symbol: str,
+                      start_date: Optional[str] = None,
+                      end_date: Optional[str] = None,
+                      timeframe: str = "1T",
+                      limit: Optional[int] = None) -> Any:
+        """
+        Get OHLCV data as a pandas DataFrame decoded from an Arrow stream.
+
+        Args:
+            symbol: Trading symbol
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            timeframe: Data timeframe
+            limit: Maximum number of records (minute data only)
+
+        Returns:
+            pandas.DataFrame
+        """
+        return self.get_arrow(symbol, start_date, end_date, timeframe, limit).to_pandas()
+
+    @contextmanager
+    def _open_arrow_stream(self,
+                           symbol: str,
+                           start_date: Optional[str],
+                           end_date: Optional[str],
+                           timeframe: str,
+                           limit: Optional[int]):
+        """Open an Arrow IPC stream reader over the HTTP response body."""
+        pyarrow = _import_pyarrow()
+
+        payload = {'symbol': symbol, 'start_date': start_date, 'end_date': end_date}
+        if timeframe == "1T":
+            endpoint = '/market-data'
+            if limit:
+                payload['limit'] = limit
+        else:
+            endpoint = '/resample'
+            payload['timeframe'] = timeframe
+
+        response = self.client._stream_request('POST', endpoint, accept=ARROW_STREAM, data=payload)
+        try:
+            response.raw.decode_content = True
+            yield pyarrow.ipc.open_stream(response.raw)
+        finally:
+            response.close()
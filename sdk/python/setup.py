@@ -63,6 +63,10 @@ setup(
             'mypy>=1.0.0',
             'sphinx>=5.0.0',    # For documentation
         ],
+        'arrow': [
+            'pyarrow>=10.0.0',
+            'pandas>=1.3.0',
+        ],
         'examples': [
             'pandas>=1.3.0',
             'matplotlib>=3.5.0',
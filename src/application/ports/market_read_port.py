@@ -2,7 +2,7 @@
 Market Read Port for simple read-model queries used by runners.
 """
 
-from typing import List
+from typing import List, Optional, Sequence
 from datetime import date, datetime, time
 from typing import Protocol
 import pandas as pd
@@ -21,3 +21,18 @@ class MarketReadPort(Protocol):
     ) -> pd.DataFrame:  # pragma: no cover - protocol
         ...
 
+    def get_minute_window(
+        self,
+        start_date: date,
+        end_date: date,
+        start_time: time,
+        end_time: time,
+        symbols: Optional[Sequence[str]] = None,
+    ) -> pd.DataFrame:  # pragma: no cover - protocol
+        """Minute bars for all (or the given) symbols within a time-of-day window.
+
+        Returns columns symbol, timestamp, open, high, low, close, volume for
+        every trading day in [start_date, end_date], ordered by symbol and
+        timestamp.
+        """
+        ...
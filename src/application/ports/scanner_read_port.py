@@ -35,3 +35,35 @@ class ScannerReadPort(Protocol):
         max_results: int,
     ) -> List[Dict[str, Any]]:  # pragma: no cover - protocol
         ...
+
+    def get_crp_candidates_range(
+        self,
+        start_date: date,
+        end_date: date,
+        cutoff_time: time,
+        end_time: time,
+        config: Dict[str, Any],
+        max_results: int,
+    ) -> List[Dict[str, Any]]:  # pragma: no cover - protocol
+        """Top ``max_results`` CRP candidates for every day in [start_date, end_date].
+
+        Rows carry the ``get_crp_candidates`` fields plus ``scan_date`` and the
+        ``get_end_of_day_prices`` fields, ordered by scan_date and rank.
+        """
+        ...
+
+    def get_breakout_candidates_range(
+        self,
+        start_date: date,
+        end_date: date,
+        cutoff_time: time,
+        end_time: time,
+        config: Dict[str, Any],
+        max_results: int,
+    ) -> List[Dict[str, Any]]:  # pragma: no cover - protocol
+        """Top ``max_results`` breakout candidates for every day in [start_date, end_date].
+
+        Rows carry the ``get_breakout_candidates`` fields plus ``scan_date`` and
+        the ``get_end_of_day_prices`` fields, ordered by scan_date and rank.
+        """
+        ...
@@ -23,6 +23,7 @@ import multiprocessing as mp
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from src.infrastructure.core.singleton_database import DuckDBConnectionManager, create_db_manager
+from src.application.scanners.strategies.vectorized_intraday_scan import VectorizedScanParams, shortlists_by_day
 
 class FastBacktester:
     """
@@ -52,6 +53,10 @@ class FastBacktester:
         self.min_score_threshold = 0.7
         self.rotation_score_threshold = 0.8
 
+        # Phase 1 scan mode: one batched query and vectorized scoring per chunk of days
+        self.use_vectorized_scan = True
+        self.scan_chunk_days = 20
+
         # Backtest tracking
         self.portfolio_value = self.initial_capital
         self.trades = []
@@ -75,7 +80,7 @@ class FastBacktester:
         print("🚀 FAST ADVANCED TWO-PHASE SCANNER BACKTESTER")
         print("="*60)
         print(f"📅 Backtest Period: {self.start_date} to {self.end_date}")
-        print(f"💰 Initial Capital: ₹{self.initial_capital:,0f}")
+        print(f"💰 Initial Capital: ₹{self.initial_capital:,.0f}")
         print(f"⚡ Leverage: {self.leverage}x")
         print(f"📊 Max Positions: {self.max_positions}")
         print("="*60)
@@ -133,6 +138,47 @@ class FastBacktester:
         except Exception as e:
             return pd.DataFrame()
 
+    def get_opening_window(self, start_date: date, end_date: date) -> pd.DataFrame:
+        """Get 09:15-09:50 minute data for all symbols across a date range in one query"""
+        try:
+            query = f"""
+            SELECT symbol, timestamp, open, high, low, close, volume
+            FROM market_data_unified
+            WHERE date_partition >= '{start_date}'
+            AND date_partition <= '{end_date}'
+            AND CAST(timestamp AS TIME) BETWEEN TIME '09:15:00' AND TIME '09:50:00'
+            ORDER BY symbol, timestamp
+            """
+
+            result = self.db_manager.execute_custom_query(query)
+            if result.empty:
+                return pd.DataFrame()
+
+            result['timestamp'] = pd.to_datetime(result['timestamp'])
+            return result
+
+        except Exception as e:
+            print(f"❌ Error getting opening window {start_date} to {end_date}: {e}")
+            return pd.DataFrame()
+
+    def scan_trading_days(self, trading_days: List[date]) -> Dict[date, List[Dict]]:
+        """Phase 1 shortlists for many days using the vectorized cross-symbol scan.
+
+        Equivalent to ``pre_market_filter`` + ``scan_symbol_advanced`` for every
+        symbol on every day, with one query per ``scan_chunk_days`` days.
+        """
+        params = VectorizedScanParams(target_shortlist_size=self.target_shortlist_size)
+        shortlists: Dict[date, List[Dict]] = {}
+
+        for i in range(0, len(trading_days), self.scan_chunk_days):
+            chunk = trading_days[i:i + self.scan_chunk_days]
+            bars = self.get_opening_window(chunk[0], chunk[-1])
+            day_shortlists = shortlists_by_day(bars, params) if not bars.empty else {}
+            for trade_date in chunk:
+                shortlists[trade_date] = day_shortlists.get(trade_date, [])
+
+        return shortlists
+
     def calculate_advanced_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         """Calculate advanced technical indicators"""
         if df.empty or len(df) < 30:
@@ -361,23 +407,29 @@ class FastBacktester:
         batch_trades = []
         batch_daily_pnl = []
 
+        shortlists = self.scan_trading_days(trading_days_batch) if self.use_vectorized_scan else {}
+
         for trade_date in trading_days_batch:
             try:
-                # Get symbols for the day
-                symbols = self.get_symbols_for_date(trade_date)
-                if not symbols:
-                    continue
-
-                # Phase 1: Pre-filter and scan
-                filtered_symbols = self.pre_market_filter(symbols, trade_date)
-                shortlist = []
-
-                for symbol in filtered_symbols:
-                    result = self.scan_symbol_advanced(symbol, trade_date)
-                    if result:
-                        shortlist.append(result)
-
-                shortlist.sort(key=lambda x: x['score'], reverse=True)
+                if self.use_vectorized_scan:
+                    # Phase 1: precomputed by the vectorized scan
+                    shortlist = shortlists.get(trade_date, [])
+                else:
+                    # Get symbols for the day
+                    symbols = self.get_symbols_for_date(trade_date)
+                    if not symbols:
+                        continue
+
+                    # Phase 1: Pre-filter and scan
+                    filtered_symbols = self.pre_market_filter(symbols, trade_date)
+                    shortlist = []
+
+                    for symbol in filtered_symbols:
+                        result = self.scan_symbol_advanced(symbol, trade_date)
+                        if result:
+                            shortlist.append(result)
+
+                    shortlist.sort(key=lambda x: x['score'], reverse=True)
 
                 # Phase 2: Trading simulation
                 if shortlist:
@@ -582,7 +634,7 @@ class FastBacktester:
         else:
             sharpe_ratio = 0
 
-        print(f"💰 Final Portfolio Value: ₹{self.portfolio_value:,0f}")
+        print(f"💰 Final Portfolio Value: ₹{self.portfolio_value:,.0f}")
         print(f"📈 Total Return: {total_return:.2f}%")
         print(f"🎯 Total Trades: {len(self.trades)}")
         print(f"📊 Win Rate: {win_rate:.1f}%")
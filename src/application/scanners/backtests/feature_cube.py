@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Feature Cube for Parameter Sweeps
+
+MiniBacktester re-queries minute data and recomputes the same warmup features
+for every parameter combination, although only the thresholds differ. The
+feature cube materializes those per-(symbol, date) features once per
+walk-forward window, stores them as a Parquet file, and evaluates whole
+parameter grids as array operations over the cube.
+
+Evaluation reproduces ``MiniBacktester.run_quick_backtest`` exactly: the same
+sampled days (every 5th trading day, first 20), the same symbols (first 10 by
+name per day), the same scoring rules and the same trade/P&L simulation.
+"""
+
+import math
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Sampling used by MiniBacktester.run_quick_backtest / process_trading_day
+DAY_STRIDE = 5
+MAX_DAYS = 20
+MAX_SYMBOLS = 10
+MIN_BARS = 20
+
+CUBE_COLUMNS = [
+    "date", "symbol", "n_bars", "mean_volume", "last_close", "last_volume",
+    "prev_close", "prev_volume", "vwap_deviation",
+]
+
+
+@dataclass
+class FeatureCube:
+    """Per-(symbol, date) warmup features for one backtest window."""
+    start_date: date
+    end_date: date
+    features: pd.DataFrame
+
+    @property
+    def days(self) -> List[date]:
+        """Sampled trading days, in order; each contributes a daily P&L entry."""
+        return sorted(self.features["date"].unique())
+
+    @staticmethod
+    def cube_path(cache_dir: str, start_date: date, end_date: date) -> Path:
+        return Path(cache_dir) / f"feature_cube_{start_date}_{end_date}.parquet"
+
+    @classmethod
+    def build(cls, db_manager, start_date: date, end_date: date) -> "FeatureCube":
+        """Compute the cube with one query for the trading-day list and one for features."""
+        days_df = db_manager.execute_custom_query(f"""
+        SELECT DISTINCT date_partition
+        FROM market_data_unified
+        WHERE date_partition >= '{start_date}'
+        AND date_partition <= '{end_date}'
+        ORDER BY date_partition
+        """)
+        trading_days = [pd.to_datetime(d).date() for d in days_df['date_partition'].tolist()]
+        sampled = trading_days[::DAY_STRIDE][:MAX_DAYS]
+        if not sampled:
+            return cls(start_date, end_date, pd.DataFrame(columns=CUBE_COLUMNS))
+
+        day_list = ", ".join(f"DATE '{d}'" for d in sampled)
+        features = db_manager.execute_custom_query(f"""
+        WITH day_symbols AS (
+            SELECT date_partition, symbol,
+                   ROW_NUMBER() OVER (PARTITION BY date_partition ORDER BY symbol) AS symbol_rank
+            FROM (
+                SELECT DISTINCT date_partition, symbol
+                FROM market_data_unified
+                WHERE date_partition IN ({day_list})
+            )
+        ),
+        opening AS (
+            SELECT m.date_partition, m.symbol, m.timestamp, m.close, m.volume,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY m.date_partition, m.symbol ORDER BY m.timestamp DESC
+                   ) AS rn_desc
+            FROM market_data_unified m
+            JOIN day_symbols s
+              ON s.date_partition = m.date_partition AND s.symbol = m.symbol
+            WHERE s.symbol_rank <= {MAX_SYMBOLS}
+              AND m.timestamp >= CAST(m.date_partition AS TIMESTAMP) + INTERVAL '9 hours 15 minutes'
+              AND m.timestamp <= CAST(m.date_partition AS TIMESTAMP) + INTERVAL '9 hours 50 minutes'
+        ),
+        agg AS (
+            SELECT date_partition, symbol,
+                   COUNT(*) AS n_bars,
+                   AVG(volume) AS mean_volume,
+                   MAX(CASE WHEN rn_desc = 1 THEN close END) AS last_close,
+                   MAX(CASE WHEN rn_desc = 1 THEN volume END) AS last_volume,
+                   MAX(CASE WHEN rn_desc = 2 THEN close END) AS prev_close,
+                   MAX(CASE WHEN rn_desc = 2 THEN volume END) AS prev_volume
+            FROM opening
+            GROUP BY date_partition, symbol
+        )
+        SELECT s.date_partition AS date, s.symbol,
+               COALESCE(a.n_bars, 0) AS n_bars,
+               a.mean_volume, a.last_close, a.last_volume, a.prev_close, a.prev_volume,
+               CAST(NULL AS DOUBLE) AS vwap_deviation
+        FROM day_symbols s
+        LEFT JOIN agg a ON a.date_partition = s.date_partition AND a.symbol = s.symbol
+        WHERE s.symbol_rank <= {MAX_SYMBOLS}
+        ORDER BY s.date_partition, s.symbol
+        """)
+        features['date'] = pd.to_datetime(features['date']).dt.date
+        return cls(start_date, end_date, features[CUBE_COLUMNS])
+
+    @classmethod
+    def load_or_build(cls, db_manager, start_date: date, end_date: date,
+                      cache_dir: Optional[str] = None) -> "FeatureCube":
+        """Load the window's cube from ``cache_dir`` or build and store it."""
+        if cache_dir:
+            path = cls.cube_path(cache_dir, start_date, end_date)
+            if path.exists():
+                features = pd.read_parquet(path)
+                features['date'] = pd.to_datetime(features['date']).dt.date
+                return cls(start_date, end_date, features)
+
+        cube = cls.build(db_manager, start_date, end_date)
+        if cache_dir:
+            cube.save(cache_dir)
+        return cube
+
+    def save(self, cache_dir: str) -> Path:
+        path = self.cube_path(cache_dir, self.start_date, self.end_date)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.features.to_parquet(path, index=False)
+        return path
+
+
+FEATURE_ARRAYS = [
+    "n_bars", "mean_volume", "last_close", "last_volume",
+    "prev_close", "prev_volume", "vwap_deviation", "day_index",
+]
+
+
+def _grid_array(parameter_grid: List[Dict], name: str, default: float) -> np.ndarray:
+    return np.array([params.get(name, default) for params in parameter_grid], dtype=float)
+
+
+def cube_arrays(cube: FeatureCube) -> Dict[str, np.ndarray]:
+    """Flatten the cube into the float64 column arrays the evaluator reads."""
+    features = cube.features
+    day_position = {d: i for i, d in enumerate(cube.days)}
+    arrays = {
+        name: features[name].to_numpy(dtype=float)
+        for name in FEATURE_ARRAYS if name != "day_index"
+    }
+    arrays["day_index"] = features['date'].map(day_position).to_numpy(dtype=float)
+    return arrays
+
+
+def evaluate_parameter_grid(cube: FeatureCube, parameter_grid: List[Dict],
+                            initial_capital: float = 1000000,
+                            chunk_size: int = 4096) -> pd.DataFrame:
+    """Evaluate every parameter set in ``parameter_grid`` against the cube.
+
+    Returns:
+        DataFrame with one row per parameter set (same order) holding
+        total_return, total_trades, win_rate, sharpe_ratio, max_drawdown and
+        final_portfolio, as ``MiniBacktester.run_quick_backtest`` reports them
+    """
+    if cube.features.empty or not parameter_grid:
+        return pd.DataFrame({'error': ['No trading days found'] * len(parameter_grid)})
+    return evaluate_feature_arrays(
+        cube_arrays(cube), len(cube.days), parameter_grid,
+        initial_capital=initial_capital, chunk_size=chunk_size,
+    )
+
+
+def evaluate_feature_arrays(arrays: Dict[str, np.ndarray], n_days: int, parameter_grid: List[Dict],
+                            initial_capital: float = 1000000,
+                            chunk_size: int = 4096) -> pd.DataFrame:
+    """Array-level core of ``evaluate_parameter_grid``.
+
+    ``arrays`` holds the ``FEATURE_ARRAYS`` columns; they may be read-only
+    views into shared memory, as nothing here writes to them.
+    """
+    n_rows = len(arrays["n_bars"])
+    day_onehot = np.zeros((n_rows, n_days))
+    day_onehot[np.arange(n_rows), arrays["day_index"].astype(np.intp)] = 1.0
+
+    n_bars = arrays["n_bars"]
+    valid = n_bars >= MIN_BARS
+    close = arrays["last_close"]
+    volume = arrays["last_volume"]
+    mean_volume = arrays["mean_volume"]
+    prev_close = arrays["prev_close"]
+    prev_volume = arrays["prev_volume"]
+    vwap_deviation = arrays["vwap_deviation"]
+    with np.errstate(invalid='ignore'):
+        up = close > prev_close
+    has_obv = n_bars > 10
+    obv_change = close * volume - prev_close * prev_volume
+    long_pnl_per_share = close * 1.01 - close
+    short_pnl_per_share = close - close * 0.99
+    pnl_per_share = np.where(up, long_pnl_per_share, short_pnl_per_share)
+
+    results = []
+    for start in range(0, len(parameter_grid), chunk_size):
+        chunk = parameter_grid[start:start + chunk_size]
+        min_score = _grid_array(chunk, 'min_score_threshold', 0.6)[:, None]
+        obv_threshold = _grid_array(chunk, 'obv_slope_threshold', 0.2)[:, None]
+        vwap_band = _grid_array(chunk, 'vwap_deviation_band', 0.02)[:, None]
+        risk = _grid_array(chunk, 'risk_per_trade', 0.02)[:, None]
+        leverage = _grid_array(chunk, 'leverage', 5)[:, None]
+        volume_ratio = _grid_array(chunk, 'volume_ratio_threshold', 1.5)[:, None]
+
+        with np.errstate(invalid='ignore'):
+            score = (
+                np.where(volume > volume_ratio * mean_volume, 0.2, 0.0)
+                + np.where(up, 0.2, 0.0)
+                + np.where(has_obv & (obv_change > obv_threshold), 0.3, 0.0)
+                + np.where(np.abs(vwap_deviation) < vwap_band, 0.3, 0.0)
+            )
+            traded = valid & (score >= min_score)
+            quantity = np.trunc(np.where(traded, (initial_capital * risk * leverage) / close, 0.0))
+        pnl = np.where(traded, pnl_per_share * quantity, 0.0)
+
+        daily_pnl = pnl @ day_onehot
+        portfolio = initial_capital + np.cumsum(daily_pnl, axis=1)
+        peak = np.maximum.accumulate(np.maximum(portfolio, initial_capital), axis=1)
+        max_drawdown = ((peak - portfolio) / peak).max(axis=1)
+
+        total_trades = traded.sum(axis=1)
+        wins = (traded & (pnl > 0)).sum(axis=1)
+        returns = daily_pnl / initial_capital
+        std_return = returns.std(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            sharpe = np.where(std_return > 0, returns.mean(axis=1) / std_return * math.sqrt(252), 0.0)
+            win_rate = np.where(total_trades > 0, wins / np.maximum(total_trades, 1) * 100, 0.0)
+
+        final_portfolio = portfolio[:, -1]
+        results.append(pd.DataFrame({
+            'total_return': (final_portfolio - initial_capital) / initial_capital * 100,
+            'total_trades': total_trades,
+            'win_rate': win_rate,
+            'sharpe_ratio': sharpe,
+            'max_drawdown': max_drawdown,
+            'final_portfolio': final_portfolio,
+        }))
+
+    return pd.concat(results, ignore_index=True)
+
+
+def composite_scores(metrics: pd.DataFrame) -> np.ndarray:
+    """``OptimizationEngine.evaluate_parameters`` scoring over grid metrics."""
+    if 'error' in metrics.columns:
+        return np.full(len(metrics), -100.0)
+    score = metrics['sharpe_ratio'] * 10 + metrics['total_return'] * 0.1 + metrics['win_rate'] * 0.5
+    return np.where(metrics['total_trades'] > 0, score, -100.0)
@@ -24,6 +24,8 @@ import json
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from src.infrastructure.core.singleton_database import DuckDBConnectionManager, create_db_manager
+from src.application.scanners.backtests.feature_cube import FeatureCube, composite_scores, evaluate_parameter_grid
+from src.application.scanners.backtests.parallel_optimizer import ParallelWalkForwardOptimizer
 
 class OptimizationEngine:
     """
@@ -31,7 +33,8 @@ class OptimizationEngine:
     """
 
     def __init__(self, db_path: str = "data/financial_data.duckdb",
-                 start_date: str = "2015-01-01", end_date: str = "2025-12-31"):
+                 start_date: str = "2015-01-01", end_date: str = "2025-12-31",
+                 cube_dir: Optional[str] = "data/feature_cubes"):
         """Initialize the optimization engine"""
         self.db_path = db_path
         self.start_date = pd.to_datetime(start_date).date()
@@ -39,9 +42,14 @@ class OptimizationEngine:
 
         # Optimization parameters
         self.parameter_grid = self.create_parameter_grid()
+        self.max_parameter_sets: Optional[int] = None  # None = full grid
         self.optimization_results = []
         self.best_parameters = {}
 
+        # Feature cubes: built once per window, stored as Parquet under cube_dir
+        self.cube_dir = cube_dir
+        self.feature_cubes: Dict[Tuple[date, date], FeatureCube] = {}
+
         # Database connection
         self.db_manager = None
         self.initialize_database()
@@ -107,11 +115,8 @@ class OptimizationEngine:
         print(f"📊 Generated {len(parameter_grid)} parameter combinations")
         return parameter_grid
 
-    def run_walk_forward_optimization(self):
-        """Run walk-forward optimization across 10 years"""
-        print("🚀 STARTING WALK-FORWARD OPTIMIZATION")
-        print("="*80)
-
+    def create_optimization_windows(self) -> List[Dict]:
+        """Create rolling training/validation windows"""
         # Define optimization windows
         training_years = 3  # Use 3 years for training
         validation_years = 1  # Use 1 year for validation
@@ -136,6 +141,14 @@ class OptimizationEngine:
 
             current_start = current_start + timedelta(days=365*step_years)
 
+        return optimization_windows
+
+    def run_walk_forward_optimization(self):
+        """Run walk-forward optimization across 10 years"""
+        print("🚀 STARTING WALK-FORWARD OPTIMIZATION")
+        print("="*80)
+
+        optimization_windows = self.create_optimization_windows()
         print(f"📊 Created {len(optimization_windows)} optimization windows")
 
         # Run optimization for each window
@@ -158,26 +171,87 @@ class OptimizationEngine:
 
         self.generate_optimization_report()
 
+    def run_parallel_walk_forward_optimization(self, max_workers: Optional[int] = None,
+                                               chunk_size: int = 4096,
+                                               patience: Optional[int] = None,
+                                               target_score: Optional[float] = None):
+        """Run walk-forward optimization with windows × grid chunks on a process pool"""
+        print("🚀 STARTING PARALLEL WALK-FORWARD OPTIMIZATION")
+        print("="*80)
+
+        optimization_windows = self.create_optimization_windows()
+        print(f"📊 Created {len(optimization_windows)} optimization windows")
+
+        test_params = self.parameter_grid
+        if self.max_parameter_sets is not None:
+            test_params = test_params[:self.max_parameter_sets]
+
+        optimizer = ParallelWalkForwardOptimizer(
+            db_path=self.db_path,
+            parameter_grid=test_params,
+            cube_dir=self.cube_dir,
+            max_workers=max_workers,
+            chunk_size=chunk_size,
+            patience=patience,
+            target_score=target_score
+        )
+
+        results = []
+        for result in optimizer.run(optimization_windows):
+            validation = result['validation_result']
+            print(f"\n✅ Window {result['window_index'] + 1}/{len(optimization_windows)} done: "
+                  f"best {result['best_score']:.2f} over {result['evaluated']} parameter sets")
+            if 'error' not in validation:
+                print(f"   📊 Validation: {validation['total_return']:.2f}% return, "
+                      f"{validation['win_rate']:.1f}% win rate")
+            results.append(result)
+
+        results.sort(key=lambda r: r['window_index'])
+        self.optimization_results = [
+            {
+                'window': r['window'],
+                'best_parameters': r['best_parameters'],
+                'validation_result': r['validation_result']
+            }
+            for r in results
+        ]
+
+        self.generate_optimization_report()
+
+    def get_feature_cube(self, start_date: date, end_date: date) -> FeatureCube:
+        """Get the feature cube for a window, materializing it on first use"""
+        key = (start_date, end_date)
+        if key not in self.feature_cubes:
+            self.feature_cubes[key] = FeatureCube.load_or_build(
+                self.db_manager, start_date, end_date, cache_dir=self.cube_dir
+            )
+        return self.feature_cubes[key]
+
     def optimize_window(self, window: Dict) -> Dict:
-        """Optimize parameters for a specific time window"""
-        print(f"   🔍 Optimizing parameters...")
+        """Optimize parameters for a specific time window
 
-        best_performance = -np.inf
-        best_params = None
+        Warmup features are materialized once for the window; every parameter
+        set is then scored by array filtering over the cube, which produces
+        the same metrics as running MiniBacktester per parameter set.
+        """
+        print(f"   🔍 Optimizing parameters...")
 
-        # Test first 50 parameter combinations for speed
-        test_params = self.parameter_grid[:50]
+        test_params = self.parameter_grid
+        if self.max_parameter_sets is not None:
+            test_params = test_params[:self.max_parameter_sets]
 
-        for i, params in enumerate(test_params):
-            if (i + 1) % 10 == 0:
-                print(f"   📊 Tested {i+1}/{len(test_params)} parameter sets...")
+        try:
+            cube = self.get_feature_cube(window['training_start'], window['training_end'])
+            scores = composite_scores(evaluate_parameter_grid(cube, test_params))
+        except Exception as e:
+            print(f"   ❌ Feature cube evaluation failed: {e}")
+            scores = np.full(len(test_params), -100.0)
 
-            # Run backtest with these parameters
-            performance = self.evaluate_parameters(window, params)
+        print(f"   📊 Tested {len(test_params)} parameter sets")
 
-            if performance > best_performance:
-                best_performance = performance
-                best_params = params
+        best_index = int(np.argmax(scores))
+        best_performance = scores[best_index]
+        best_params = test_params[best_index]
 
         print(f"   ✅ Best performance: {best_performance:.2f}")
         return best_params
@@ -662,6 +736,8 @@ def main():
                        help='Start date for optimization (YYYY-MM-DD)')
     parser.add_argument('--end-date', default='2025-12-31',
                        help='End date for optimization (YYYY-MM-DD)')
+    parser.add_argument('--workers', type=int, default=0,
+                       help='Worker processes for parallel optimization (0 = serial)')
 
     args = parser.parse_args()
 
@@ -673,7 +749,10 @@ def main():
     )
 
     # Run walk-forward optimization
-    optimizer.run_walk_forward_optimization()
+    if args.workers > 0:
+        optimizer.run_parallel_walk_forward_optimization(max_workers=args.workers)
+    else:
+        optimizer.run_walk_forward_optimization()
 
     # Run final validation
     final_result = optimizer.run_final_validation()
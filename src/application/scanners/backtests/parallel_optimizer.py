@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Parallel Walk-Forward Optimizer
+
+Fans walk-forward windows × parameter-grid chunks across a process pool:
+
+- Each worker opens its own read-only DuckDB handle (nothing holding a
+  connection is pickled across the process boundary).
+- Window feature cubes are built by the workers, then published once into
+  ``multiprocessing.shared_memory``; scoring tasks attach to the block and
+  read the feature columns zero-copy.
+- Chunk results stream back as they complete, with progress reporting and
+  optional per-window early stopping.
+- A failed cube build or scoring chunk is recorded in its window's
+  ``errors`` and the run carries on with the remaining work.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import date
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.application.scanners.backtests.feature_cube import (
+    FEATURE_ARRAYS,
+    FeatureCube,
+    composite_scores,
+    cube_arrays,
+    evaluate_feature_arrays,
+)
+from src.infrastructure.core.singleton_database import create_db_manager
+
+# Per-process read-only database handle, opened by the pool initializer
+_worker_db = None
+
+
+def _init_worker(db_path: str):
+    global _worker_db
+    _worker_db = create_db_manager(db_path=db_path, read_only=True)
+
+
+def _build_cube_task(start_date: date, end_date: date, cube_dir: Optional[str]) -> pd.DataFrame:
+    return FeatureCube.load_or_build(_worker_db, start_date, end_date, cache_dir=cube_dir).features
+
+
+def _validate_task(start_date: date, end_date: date, params: Dict) -> Dict:
+    from src.application.scanners.backtests.optimization_engine import MiniBacktester
+
+    return MiniBacktester(_worker_db, start_date, end_date, params).run_quick_backtest()
+
+
+@dataclass(frozen=True)
+class SharedCubeHandle:
+    """Picklable reference to a feature cube published in shared memory."""
+    name: str
+    n_rows: int
+    n_days: int
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return (len(FEATURE_ARRAYS), self.n_rows)
+
+
+class SharedFeatureCube:
+    """Owner side of a feature cube copied once into a shared memory block."""
+
+    def __init__(self, cube: FeatureCube):
+        arrays = cube_arrays(cube)
+        n_rows = len(cube.features)
+        self._shm = shared_memory.SharedMemory(
+            create=True, size=max(1, len(FEATURE_ARRAYS) * n_rows * 8)
+        )
+        self.handle = SharedCubeHandle(self._shm.name, n_rows, len(cube.days))
+        matrix = np.ndarray(self.handle.shape, dtype=np.float64, buffer=self._shm.buf)
+        for i, name in enumerate(FEATURE_ARRAYS):
+            matrix[i] = arrays[name]
+        del matrix
+
+    def release(self):
+        """Close and unlink the block; call once no task will attach again."""
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+
+def _score_chunk_task(handle: SharedCubeHandle, offset: int, parameter_chunk: List[Dict]) -> Tuple[int, np.ndarray]:
+    """Score one grid chunk against a shared cube; returns (offset, scores)."""
+    shm = shared_memory.SharedMemory(name=handle.name)
+    try:
+        matrix = np.ndarray(handle.shape, dtype=np.float64, buffer=shm.buf)
+        matrix.flags.writeable = False
+        arrays = {name: matrix[i] for i, name in enumerate(FEATURE_ARRAYS)}
+        scores = composite_scores(evaluate_feature_arrays(arrays, handle.n_days, parameter_chunk))
+        del arrays, matrix
+    finally:
+        shm.close()
+    return offset, scores
+
+
+@dataclass
+class _WindowSearch:
+    """Parent-side bookkeeping for one window's grid search."""
+    index: int
+    window: Dict
+    shared: Optional[SharedFeatureCube] = None
+    pending: Dict[Future, int] = field(default_factory=dict)
+    best_score: float = -np.inf
+    best_index: int = 0
+    evaluated: int = 0
+    stale_chunks: int = 0
+    stopped_early: bool = False
+    errors: List[str] = field(default_factory=list)
+
+    def record(self, offset: int, scores: np.ndarray):
+        self.evaluated += len(scores)
+        local = int(np.argmax(scores))
+        score, index = float(scores[local]), offset + local
+        improved = score > self.best_score
+        if improved or (score == self.best_score and index < self.best_index):
+            self.best_score, self.best_index = score, index
+        self.stale_chunks = 0 if improved else self.stale_chunks + 1
+
+
+class ParallelWalkForwardOptimizer:
+    """
+    Process-pool walk-forward optimizer over feature cubes.
+
+    With ``patience=None`` and no ``target_score`` every chunk is scored and
+    the selected parameters are exactly those of the serial
+    ``OptimizationEngine.optimize_window`` (highest score, lowest grid index).
+    Early stopping trades that guarantee for time: a window stops once
+    ``patience`` consecutive completed chunks fail to improve its best score,
+    or once the best score reaches ``target_score``; chunks that have not
+    started yet are cancelled.
+    """
+
+    def __init__(self, db_path: str, parameter_grid: List[Dict],
+                 cube_dir: Optional[str] = "data/feature_cubes",
+                 max_workers: Optional[int] = None, chunk_size: int = 4096,
+                 patience: Optional[int] = None, target_score: Optional[float] = None):
+        self.db_path = db_path
+        self.parameter_grid = parameter_grid
+        self.cube_dir = cube_dir
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.patience = patience
+        self.target_score = target_score
+
+    def _should_stop(self, search: _WindowSearch) -> bool:
+        if self.target_score is not None and search.best_score >= self.target_score:
+            return True
+        return self.patience is not None and search.stale_chunks >= self.patience
+
+    def _submit_chunks(self, executor: ProcessPoolExecutor, search: _WindowSearch, cube: FeatureCube):
+        if cube.features.empty:
+            # Same outcome as the serial path: every parameter set scores -100
+            search.best_score, search.best_index = -100.0, 0
+            search.evaluated = len(self.parameter_grid)
+            return
+        search.shared = SharedFeatureCube(cube)
+        for offset in range(0, len(self.parameter_grid), self.chunk_size):
+            chunk = self.parameter_grid[offset:offset + self.chunk_size]
+            future = executor.submit(_score_chunk_task, search.shared.handle, offset, chunk)
+            search.pending[future] = offset
+
+    def _window_result(self, search: _WindowSearch, validation_result: Dict) -> Dict:
+        return {
+            'window_index': search.index,
+            'window': search.window,
+            'best_parameters': self.parameter_grid[search.best_index],
+            'best_score': search.best_score,
+            'evaluated': search.evaluated,
+            'stopped_early': search.stopped_early,
+            'errors': search.errors,
+            'validation_result': validation_result,
+        }
+
+    def run(self, windows: List[Dict]) -> Iterator[Dict]:
+        """Optimize and validate every window, yielding each result as it completes.
+
+        Results carry ``window_index`` so callers can restore window order,
+        and ``errors`` listing the window's failed cube build or chunks. A
+        window whose chunks all failed is not validated.
+        """
+        total_chunks = len(windows) * -(-len(self.parameter_grid) // self.chunk_size)
+        searches = [_WindowSearch(i, window) for i, window in enumerate(windows)]
+        done_chunks = 0
+
+        # Start the tracker before workers fork so they share it; otherwise each
+        # worker's own tracker "cleans up" blocks it merely attached to.
+        resource_tracker.ensure_running()
+
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                 initargs=(self.db_path,)) as executor:
+            cube_futures = {
+                executor.submit(_build_cube_task, w['training_start'], w['training_end'], self.cube_dir): search
+                for search, w in zip(searches, windows)
+            }
+            chunk_owner: Dict[Future, _WindowSearch] = {}
+            validations: Dict[Future, _WindowSearch] = {}
+
+            def finish_search(search: _WindowSearch) -> Optional[Future]:
+                if search.shared is not None:
+                    search.shared.release()
+                    search.shared = None
+                if not search.evaluated:
+                    return None
+                params = self.parameter_grid[search.best_index]
+                w = search.window
+                future = executor.submit(_validate_task, w['validation_start'], w['validation_end'], params)
+                validations[future] = search
+                return future
+
+            try:
+                outstanding = set(cube_futures)
+                while outstanding:
+                    finished, outstanding = wait(outstanding, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        if future in cube_futures:
+                            search = cube_futures[future]
+                            try:
+                                features = future.result()
+                            except Exception as e:
+                                print(f"   ❌ Feature cube failed for window {search.index + 1}: {e}")
+                                search.errors.append(f"feature cube: {e}")
+                                features = pd.DataFrame()
+                            w = search.window
+                            self._submit_chunks(executor, search, FeatureCube(w['training_start'], w['training_end'], features))
+                            for chunk_future in search.pending:
+                                chunk_owner[chunk_future] = search
+                            outstanding |= set(search.pending)
+                            if not search.pending:
+                                validation = finish_search(search)
+                                if validation is None:
+                                    yield self._window_result(search, {'error': 'no parameter sets were scored'})
+                                else:
+                                    outstanding.add(validation)
+
+                        elif future in chunk_owner:
+                            search = chunk_owner.pop(future)
+                            offset = search.pending.pop(future, None)
+                            if future.cancelled():
+                                continue
+                            done_chunks += 1
+                            try:
+                                offset, scores = future.result()
+                            except Exception as e:
+                                print(f"   ❌ Window {search.index + 1}: chunk at parameter set {offset} failed: {e}")
+                                search.errors.append(f"chunk {offset}: {e}")
+                            else:
+                                search.record(offset, scores)
+                                print(f"   📊 Window {search.index + 1}: {search.evaluated}/{len(self.parameter_grid)} "
+                                      f"parameter sets, best {search.best_score:.2f} "
+                                      f"({done_chunks}/{total_chunks} chunks)")
+
+                            if search.pending and not search.stopped_early and self._should_stop(search):
+                                for pending in list(search.pending):
+                                    if pending.cancel():
+                                        search.pending.pop(pending)
+                                        chunk_owner.pop(pending, None)
+                                        outstanding.discard(pending)
+                                search.stopped_early = True
+                                print(f"   ⏹️  Window {search.index + 1}: early stop after {search.evaluated} parameter sets")
+
+                            if not search.pending:
+                                validation = finish_search(search)
+                                if validation is None:
+                                    yield self._window_result(search, {'error': 'no parameter sets were scored'})
+                                else:
+                                    outstanding.add(validation)
+
+                        elif future in validations:
+                            search = validations.pop(future)
+                            try:
+                                validation_result = future.result()
+                            except Exception as e:
+                                validation_result = {'error': str(e)}
+                            yield self._window_result(search, validation_result)
+            finally:
+                for search in searches:
+                    if search.shared is not None:
+                        search.shared.release()
+                        search.shared = None
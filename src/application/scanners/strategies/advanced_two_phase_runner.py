@@ -24,7 +24,15 @@ import numpy as np
 # Add project root to path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
+from ....domain.services.technical.streaming import StreamingIndicators
 from ...ports.market_read_port import MarketReadPort
+from .vectorized_intraday_scan import (
+    VectorizedScanParams,
+    order_like,
+    prefilter_batch,
+    restrict_to,
+    scan_batch,
+)
 
 
 class AdvancedTwoPhaseRunner:
@@ -66,6 +74,7 @@ class AdvancedTwoPhaseRunner:
         self.trades = []
         self.shortlist = []
         self.scoreboard = {}  # Continuous ranking system
+        self.live_indicators: Dict[str, StreamingIndicators] = {}  # Per-symbol session state
         self.session_phase = "morning"  # morning/midday/afternoon
 
         print("🚀 ADVANCED TWO-PHASE INTRADAY RUNNER")
@@ -160,6 +169,19 @@ class AdvancedTwoPhaseRunner:
 
         return df
 
+    def update_live_indicators(self, symbol: str, high: float, low: float,
+                               close: float, volume: float) -> Dict[str, float]:
+        """Advance a symbol's session indicators by one minute bar in O(1).
+
+        Values equal the last row of calculate_advanced_indicators over all of
+        the session's bars so far (vwap, obv, atr, adx, di_plus, di_minus,
+        volume_ma, volume_ratio).
+        """
+        indicators = self.live_indicators.get(symbol)
+        if indicators is None:
+            indicators = self.live_indicators[symbol] = StreamingIndicators.two_phase_defaults()
+        return indicators.update_bar(high, low, close, volume)
+
     def detect_sideways_movement(self, df: pd.DataFrame) -> bool:
         """Detect if stock is in sideways movement"""
         if df.empty or len(df) < 20:
@@ -339,6 +361,71 @@ class AdvancedTwoPhaseRunner:
             print(f"❌ Error scanning {symbol}: {e}")
             return None
 
+    def scan_params(self) -> VectorizedScanParams:
+        """Thresholds for the vectorized scan path, taken from this runner."""
+        return VectorizedScanParams(
+            min_volume=self.min_volume,
+            target_shortlist_size=self.target_shortlist_size,
+        )
+
+    def supports_batch_reads(self) -> bool:
+        """Whether the injected port can return all symbols' bars in one read."""
+        return hasattr(self, 'market_read') and hasattr(self.market_read, 'get_minute_window')
+
+    def vectorized_scan(self, symbols: List[str]) -> List[Dict]:
+        """Pre-filter and scan all symbols for today from a single batched read.
+
+        Equivalent to ``pre_market_filter`` followed by ``scan_symbol_advanced``
+        per symbol, but pulls the 09:15-09:50 window once and evaluates every
+        symbol with grouped, vectorized operations.
+        """
+        bars = self.market_read.get_minute_window(self.today, self.today, time(9, 15), time(9, 50), symbols)
+        if bars.empty:
+            print(f"✅ Pre-market filter: {len(symbols)} → 0 symbols")
+            return []
+
+        params = self.scan_params()
+        passed = prefilter_batch(bars, params)
+        filtered = order_like(passed, symbols)[:self.target_shortlist_size]
+        print(f"✅ Pre-market filter: {len(symbols)} → {len(filtered)} symbols")
+        if not filtered:
+            return []
+
+        candidates = scan_batch(restrict_to(bars, passed[passed['symbol'].isin(filtered)]), params)
+        rank = {symbol: i for i, symbol in enumerate(filtered)}
+        candidates = candidates.assign(_rank=candidates['symbol'].map(rank)).sort_values('_rank', kind='mergesort')
+        return candidates.drop(columns=['_rank', 'trading_date']).to_dict('records')
+
+    def scan_date_range(self, start_date: date, end_date: date, chunk_days: int = 30) -> pd.DataFrame:
+        """Run the 09:50 scan for every trading day in a range (backtesting).
+
+        Bars are read ``chunk_days`` calendar days at a time, one query per
+        chunk, and all symbols and days in a chunk are scored together.
+
+        Returns:
+            DataFrame of LONG/SHORT candidates with a ``trading_date`` column,
+            ordered by date and descending score
+        """
+        if not self.supports_batch_reads():
+            raise RuntimeError("MarketReadPort does not support get_minute_window()")
+
+        params = self.scan_params()
+        frames = []
+        chunk_start = start_date
+        while chunk_start <= end_date:
+            chunk_end = min(chunk_start + timedelta(days=chunk_days - 1), end_date)
+            bars = self.market_read.get_minute_window(chunk_start, chunk_end, time(9, 15), time(9, 50))
+            if not bars.empty:
+                passed = prefilter_batch(bars, params)
+                if not passed.empty:
+                    frames.append(scan_batch(restrict_to(bars, passed), params))
+            chunk_start = chunk_end + timedelta(days=1)
+
+        if not frames:
+            return pd.DataFrame()
+        result = pd.concat(frames, ignore_index=True)
+        return result.sort_values(['trading_date', 'score'], ascending=[True, False]).reset_index(drop=True)
+
     def phase1_optimized_scan(self) -> List[Dict]:
         """Phase 1: Optimized scan at 09:50 with pre-filtering"""
         print("\n🔍 PHASE 1: OPTIMIZED SCAN AT 09:50 IST")
@@ -350,16 +437,20 @@ class AdvancedTwoPhaseRunner:
             print("❌ No symbols found for today")
             return []
 
-        # Apply pre-market filters
-        filtered_symbols = self.pre_market_filter(all_symbols)
+        if self.supports_batch_reads():
+            print("🔍 Applying pre-market filters and scanning (vectorized)...")
+            shortlist = self.vectorized_scan(all_symbols)
+        else:
+            # Apply pre-market filters
+            filtered_symbols = self.pre_market_filter(all_symbols)
 
-        print(f"📊 Scanning {len(filtered_symbols)} pre-filtered symbols...")
+            print(f"📊 Scanning {len(filtered_symbols)} pre-filtered symbols...")
 
-        shortlist = []
-        for symbol in filtered_symbols:
-            result = self.scan_symbol_advanced(symbol)
-            if result:
-                shortlist.append(result)
+            shortlist = []
+            for symbol in filtered_symbols:
+                result = self.scan_symbol_advanced(symbol)
+                if result:
+                    shortlist.append(result)
 
         # Sort by score (highest first)
         shortlist.sort(key=lambda x: x['score'], reverse=True)
@@ -14,6 +14,7 @@ import pandas as pd
 import numpy as np
 import csv
 import os
+from itertools import groupby
 
 from ..base_scanner import BaseScanner
 from ...interfaces.base_scanner_interface import IBaseScanner
@@ -52,7 +53,8 @@ class CRPScanner(BaseScanner):
             'max_price': 2000,                # Maximum stock price
             'max_results_per_day': 3,         # Top 3 stocks per day with highest probability
             'crp_cutoff_time': time(9, 50),   # Default CRP detection time
-            'end_of_day_time': time(15, 15)   # Default end-of-day time
+            'end_of_day_time': time(15, 15),  # Default end-of-day time
+            'use_range_query': True           # Scan the whole date range in one query
         }
 
     def scan_date_range(self,
@@ -88,6 +90,69 @@ class CRPScanner(BaseScanner):
 
         print(f"📅 Found {len(trading_days)} trading days to analyze")
 
+        if self._supports_range_query():
+            all_results = self._scan_range_crp(trading_days, cutoff_time, end_of_day_time)
+        else:
+            all_results = self._scan_daily_crp(trading_days, cutoff_time, end_of_day_time)
+
+        if not all_results:
+            print("❌ No CRP patterns found across the date range")
+            return []
+
+        # Add performance metrics
+        all_results = self._add_performance_metrics(all_results)
+
+        print(f"\n✅ Enhanced CRP Analysis Complete!")
+        print(f"📊 Total CRP opportunities: {len(all_results)}")
+        print(f"📅 Trading days analyzed: {len(trading_days)}")
+
+        return all_results
+
+    def _supports_range_query(self) -> bool:
+        """Whether the whole range can be scanned with one set-based query."""
+        return (self.config.get('use_range_query', True)
+                and callable(getattr(getattr(self, 'scanner_read', None), 'get_crp_candidates_range', None)))
+
+    def _scan_range_crp(self, trading_days: List[date], cutoff_time: time, end_of_day_time: time) -> List[Dict[str, Any]]:
+        """Scan all trading days in one query (candidates and EOD prices), then merge day by day."""
+        try:
+            print(f"📊 Scanning {trading_days[0]} to {trading_days[-1]} in one pass...")
+            rows = self.scanner_read.get_crp_candidates_range(
+                start_date=trading_days[0],
+                end_date=trading_days[-1],
+                cutoff_time=cutoff_time,
+                end_time=end_of_day_time,
+                config=self.config,
+                max_results=self.config.get('max_results_per_day', 3),
+            )
+        except Exception as e:
+            print(f"❌ Error in date range CRP scan: {e}")
+            return []
+
+        eod_fields = ('eod_price', 'eod_high', 'eod_low', 'eod_volume')
+        days = set(trading_days)
+        all_results = []
+
+        for scan_date, day_rows in groupby(rows, key=lambda r: r['scan_date']):
+            if scan_date not in days:
+                continue
+            crp_results = []
+            eod_prices = {}
+            for row in day_rows:
+                crp = {k: v for k, v in row.items() if k not in eod_fields}
+                crp['crp_time'] = cutoff_time
+                crp_results.append(crp)
+                eod_prices[row['symbol']] = {k: row[k] for k in eod_fields}
+
+            daily_results = self._merge_crp_and_eod_data(crp_results, eod_prices, scan_date)
+            if daily_results:
+                all_results.extend(daily_results)
+                print(f"   ✅ {scan_date}: Found {len(daily_results)} CRP candidates")
+
+        return all_results
+
+    def _scan_daily_crp(self, trading_days: List[date], cutoff_time: time, end_of_day_time: time) -> List[Dict[str, Any]]:
+        """Scan day by day: one candidate query and one EOD query per trading day."""
         all_results = []
 
         for scan_date in trading_days:
@@ -110,17 +175,6 @@ class CRPScanner(BaseScanner):
             except Exception as e:
                 print(f"   ❌ Error scanning {scan_date}: {e}")
 
-        if not all_results:
-            print("❌ No CRP patterns found across the date range")
-            return []
-
-        # Add performance metrics
-        all_results = self._add_performance_metrics(all_results)
-
-        print(f"\n✅ Enhanced CRP Analysis Complete!")
-        print(f"📊 Total CRP opportunities: {len(all_results)}")
-        print(f"📅 Trading days analyzed: {len(trading_days)}")
-
         return all_results
 
     def scan(self, scan_date: date, cutoff_time: time = time(9, 50)) -> pd.DataFrame:
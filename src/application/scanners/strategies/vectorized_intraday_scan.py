@@ -0,0 +1,292 @@
+"""
+Vectorized Cross-Symbol Intraday Scan
+=====================================
+
+Batched counterpart of ``AdvancedTwoPhaseRunner.calculate_advanced_indicators``,
+``calculate_dynamic_score``, ``pre_market_filter`` and ``scan_symbol_advanced``.
+
+Instead of one query and one pandas pipeline per symbol per day, the whole
+opening window for every symbol (and optionally every day of a backtest range)
+is loaded as a single long frame. Indicators are computed with grouped window
+operations over ``(symbol, trading_date)`` and the pre-filter and LONG/SHORT
+setup rules are applied as vectorized masks over the last bar of each group.
+Results match the per-symbol path row for row.
+"""
+
+from dataclasses import dataclass
+from datetime import date, time
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+GROUP_COLUMNS = ["symbol", "trading_date"]
+
+# Rows per sliding-window block; bounds the temporary used by rolling std
+_ROLLING_CHUNK = 250_000
+
+INDICATOR_COLUMNS = [
+    "vwap", "returns", "obv", "obv_slope", "tr", "atr", "atr_pct",
+    "dm_plus", "dm_minus", "di_plus", "di_minus", "dx", "adx",
+    "volume_ma", "volume_ratio", "vwap_deviation", "orb_high", "orb_low",
+]
+
+
+@dataclass
+class VectorizedScanParams:
+    """Thresholds shared with the per-symbol runner."""
+    min_volume: float = 100000
+    target_shortlist_size: int = 20
+    min_bars: int = 30
+    orb_bars: int = 30
+    prefilter_end: time = time(9, 45)
+    long_obv_slope: float = 0.2
+    short_obv_slope: float = -0.2
+    min_setup_score: float = 0.6
+
+
+def _prepare(bars: pd.DataFrame) -> pd.DataFrame:
+    """Sort a long OHLCV frame by group and time with a clean RangeIndex."""
+    df = bars.copy()
+    df["timestamp"] = pd.to_datetime(df["timestamp"])
+    if "trading_date" not in df.columns:
+        df["trading_date"] = df["timestamp"].dt.date
+    df = df.sort_values(GROUP_COLUMNS + ["timestamp"], kind="mergesort")
+    return df.reset_index(drop=True)
+
+
+def _shift(values: np.ndarray, position: np.ndarray, periods: int) -> np.ndarray:
+    """Group-wise ``shift(periods)`` for rows sorted by group."""
+    out = np.full(len(values), np.nan)
+    out[periods:] = values[:-periods]
+    out[position < periods] = np.nan
+    return out
+
+
+def _rolling(values: np.ndarray, position: np.ndarray, window: int, how: str = "mean") -> np.ndarray:
+    """Group-wise ``rolling(window).mean()/.std()`` for rows sorted by group.
+
+    Windows are evaluated over the flat array in bounded chunks and those
+    reaching back across a group boundary are masked out, so no Python-level
+    work is done per group.
+    """
+    n = len(values)
+    out = np.full(n, np.nan)
+    if n < window:
+        return out
+
+    values = values.astype(float, copy=False)
+    n_windows = n - window + 1
+    for start in range(0, n_windows, _ROLLING_CHUNK):
+        stop = min(start + _ROLLING_CHUNK, n_windows)
+        windows = sliding_window_view(values[start:stop + window - 1], window)
+        if how == "std":
+            out[start + window - 1:stop + window - 1] = windows.std(axis=1, ddof=1)
+        else:
+            out[start + window - 1:stop + window - 1] = windows.mean(axis=1)
+
+    out[position < window - 1] = np.nan
+    return out
+
+
+def compute_indicators_batch(bars: pd.DataFrame, orb_bars: int = 30) -> pd.DataFrame:
+    """Compute the runner's advanced indicators for every (symbol, day) group.
+
+    Args:
+        bars: Long frame with symbol, timestamp, open, high, low, close, volume
+            and optionally trading_date
+        orb_bars: Number of opening bars defining the ORB range
+
+    Returns:
+        Frame sorted by symbol, trading_date and timestamp with the indicator
+        columns added and a ``bar_count`` column holding each group's size.
+    """
+    df = _prepare(bars)
+    if df.empty:
+        for col in INDICATOR_COLUMNS + ["bar_count"]:
+            df[col] = pd.Series(dtype=float)
+        return df
+
+    group_id = df.groupby(GROUP_COLUMNS, sort=False).ngroup().to_numpy()
+    position = df.groupby(group_id, sort=False).cumcount().to_numpy()
+
+    def group_cumsum(values: np.ndarray) -> np.ndarray:
+        return pd.Series(values).groupby(group_id, sort=False).cumsum().to_numpy()
+
+    close = df["close"].to_numpy(dtype=float)
+    high = df["high"].to_numpy(dtype=float)
+    low = df["low"].to_numpy(dtype=float)
+    volume = df["volume"].to_numpy(dtype=float)
+
+    prev_close = _shift(close, position, 1)
+    prev_high = _shift(high, position, 1)
+    prev_low = _shift(low, position, 1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        vwap = group_cumsum(close * volume) / group_cumsum(volume)
+        returns = close / prev_close - 1
+
+        obv = group_cumsum(np.nan_to_num(np.sign(close - prev_close) * volume, nan=0.0))
+        obv_slope = (obv - _shift(obv, position, 10)) / _rolling(obv, position, 20, "std")
+
+        tr = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+        atr = _rolling(tr, position, 14)
+
+        up_move = high - prev_high
+        down_move = prev_low - low
+        dm_plus = np.where(up_move > down_move, np.maximum(up_move, 0), 0)
+        dm_minus = np.where(down_move > up_move, np.maximum(down_move, 0), 0)
+        di_plus = 100 * (_rolling(dm_plus, position, 14) / atr)
+        di_minus = 100 * (_rolling(dm_minus, position, 14) / atr)
+        dx = 100 * np.abs(di_plus - di_minus) / (di_plus + di_minus)
+
+        volume_ma = _rolling(volume, position, 20)
+
+        df["vwap"] = vwap
+        df["returns"] = returns
+        df["obv"] = obv
+        df["obv_slope"] = obv_slope
+        df["tr"] = tr
+        df["atr"] = atr
+        df["atr_pct"] = atr / close
+        df["dm_plus"] = dm_plus
+        df["dm_minus"] = dm_minus
+        df["di_plus"] = di_plus
+        df["di_minus"] = di_minus
+        df["dx"] = dx
+        df["adx"] = _rolling(dx, position, 14)
+        df["volume_ma"] = volume_ma
+        df["volume_ratio"] = volume / volume_ma
+        df["vwap_deviation"] = (close - vwap) / vwap
+
+    opening = pd.Series(position < orb_bars)
+    by_group = df.groupby(group_id, sort=False)
+    df["orb_high"] = df["high"].where(opening).groupby(group_id, sort=False).transform("max")
+    df["orb_low"] = df["low"].where(opening).groupby(group_id, sort=False).transform("min")
+    df["bar_count"] = by_group["close"].transform("size")
+
+    return df
+
+
+def last_bars(indicators: pd.DataFrame) -> pd.DataFrame:
+    """Last bar of every (symbol, day) group, plus each group's first open and close."""
+    g = indicators.groupby(GROUP_COLUMNS, sort=False)
+    latest = g.tail(1).copy()
+    first = g[["open", "close"]].first().rename(columns={"open": "first_open", "close": "first_close"})
+    latest = latest.merge(first, left_on=GROUP_COLUMNS, right_index=True, how="left")
+    return latest.reset_index(drop=True)
+
+
+def dynamic_score_batch(latest: pd.DataFrame) -> np.ndarray:
+    """Vectorized ``calculate_dynamic_score`` over last-bar rows."""
+    obv_slope = latest["obv_slope"].to_numpy(dtype=float)
+    vwap_dev = latest["vwap_deviation"].to_numpy(dtype=float)
+    volume_ratio = latest["volume_ratio"].to_numpy(dtype=float)
+    returns = latest["returns"].to_numpy(dtype=float)
+    atr_pct = latest["atr_pct"].to_numpy(dtype=float)
+    adx = latest["adx"].to_numpy(dtype=float)
+
+    score = np.clip(obv_slope, -1, 1) * 0.15 + 0.15
+    score = score + (1 - np.minimum(np.abs(vwap_dev), 0.02) / 0.02) * 0.2
+    score = score + np.minimum(volume_ratio, 3) / 3 * 0.2
+    score = score + np.clip(returns, -0.02, 0.02) / 0.02 * 0.1 + 0.1
+    score = score + np.minimum(atr_pct / 0.01, 1) * 0.2
+    score = score + np.minimum(adx / 50, 1) * 0.1
+    return np.minimum(score, 1.0)
+
+
+def prefilter_mask(latest: pd.DataFrame, params: VectorizedScanParams) -> np.ndarray:
+    """Vectorized ``pre_market_filter`` rules: at least 3 of 4 must pass."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        gap_pct = np.abs(latest["first_open"] - latest["first_close"]) / latest["first_close"]
+        passed = (
+            (latest["volume"] > params.min_volume).astype(int)
+            + ((latest["bar_count"] >= 2) & (gap_pct < 0.05)).astype(int)
+            + (latest["volume_ratio"] > 1.5).astype(int)
+            + (latest["returns"] > 0).astype(int)
+        )
+    return ((latest["bar_count"] >= params.min_bars) & (passed >= 3)).to_numpy()
+
+
+def prefilter_batch(bars: pd.DataFrame, params: VectorizedScanParams) -> pd.DataFrame:
+    """Apply the pre-market filter to every (symbol, day) in ``bars``.
+
+    Only bars up to ``params.prefilter_end`` are considered. Returns the
+    passing (symbol, trading_date) pairs, capped per day at the shortlist size
+    in symbol order.
+    """
+    window = bars[pd.to_datetime(bars["timestamp"]).dt.time <= params.prefilter_end]
+    latest = last_bars(compute_indicators_batch(window, params.orb_bars))
+    passed = latest[prefilter_mask(latest, params)]
+    passed = passed.groupby("trading_date", sort=True).head(params.target_shortlist_size)
+    return passed[GROUP_COLUMNS].reset_index(drop=True)
+
+
+def scan_batch(bars: pd.DataFrame, params: VectorizedScanParams) -> pd.DataFrame:
+    """Vectorized ``scan_symbol_advanced`` over every (symbol, day) in ``bars``.
+
+    Returns one row per LONG/SHORT candidate with the same fields the
+    per-symbol scan reports, plus ``trading_date``.
+    """
+    latest = last_bars(compute_indicators_batch(bars, params.orb_bars))
+    latest = latest[latest["bar_count"] >= params.min_bars].reset_index(drop=True)
+    score = dynamic_score_batch(latest)
+    latest["score"] = score
+
+    above_score = score > params.min_setup_score
+    long_mask = (
+        (latest["close"] > latest["vwap"])
+        & (latest["close"] > latest["orb_high"])
+        & (latest["obv_slope"] > params.long_obv_slope)
+        & above_score
+    )
+    short_mask = (
+        (latest["close"] < latest["vwap"])
+        & (latest["close"] < latest["orb_low"])
+        & (latest["obv_slope"] < params.short_obv_slope)
+        & above_score
+        & ~long_mask
+    )
+
+    latest["direction"] = np.select([long_mask, short_mask], ["LONG", "SHORT"], default="HOLD")
+    latest["setup_type"] = np.select([long_mask, short_mask], ["breakout", "breakdown"], default="neutral")
+
+    columns = [
+        "trading_date", "symbol", "direction", "score", "setup_type", "close", "volume", "vwap",
+        "orb_high", "orb_low", "obv_slope", "atr_pct", "adx", "timestamp",
+    ]
+    return latest.loc[long_mask | short_mask, columns].reset_index(drop=True)
+
+
+def shortlists_by_day(bars: pd.DataFrame, params: VectorizedScanParams) -> Dict[date, List[Dict]]:
+    """Pre-filter and scan ``bars``, returning each day's shortlist.
+
+    Shortlists are ordered by descending score, ties kept in symbol order, as
+    the per-symbol backtest loops build them. Days without candidates are
+    absent from the result.
+    """
+    passed = prefilter_batch(bars, params)
+    if passed.empty:
+        return {}
+
+    candidates = scan_batch(restrict_to(bars, passed), params)
+    shortlists: Dict[date, List[Dict]] = {}
+    for trading_date, group in candidates.groupby("trading_date", sort=True):
+        ranked = group.sort_values("score", ascending=False, kind="mergesort")
+        shortlists[trading_date] = ranked.drop(columns=["trading_date"]).to_dict("records")
+    return shortlists
+
+
+def restrict_to(bars: pd.DataFrame, pairs: pd.DataFrame) -> pd.DataFrame:
+    """Keep only bars belonging to the given (symbol, trading_date) pairs."""
+    df = bars if "trading_date" in bars.columns else bars.assign(
+        trading_date=pd.to_datetime(bars["timestamp"]).dt.date
+    )
+    return df.merge(pairs[GROUP_COLUMNS].drop_duplicates(), on=GROUP_COLUMNS, how="inner")
+
+
+def order_like(candidates: pd.DataFrame, symbols: Sequence[str]) -> List[str]:
+    """Symbols from ``candidates`` in the order they appear in ``symbols``."""
+    present = set(candidates["symbol"])
+    return [s for s in symbols if s in present]
@@ -0,0 +1,212 @@
+"""
+Incremental Technical Indicators
+
+Per-(symbol, timeframe) indicator state for tail-only updates. The state
+holds the streaming kernels for one trading day (EMA seeds, rolling
+windows, OBV / A/D totals, previous bar), so new bars are computed in
+O(1) each instead of recalculating the whole day.
+
+Streamed columns match ``TechnicalIndicatorsCalculator``'s pandas
+implementations row for row. Columns derived from the whole day -
+support/resistance and supply/demand zones and ``data_quality_score`` -
+are left empty on incremental rows and filled when the day is
+recalculated (see ``TechnicalIndicatorsUpdater``).
+"""
+
+import json
+import math
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .streaming import RollingRank, StreamingIndicators
+
+#: Columns that need the full day and are only set on recalculation
+DEFERRED_COLUMNS = (
+    [f"support_level_{i}" for i in (1, 2, 3)]
+    + [f"support_strength_{i}" for i in (1, 2, 3)]
+    + [f"resistance_level_{i}" for i in (1, 2, 3)]
+    + [f"resistance_strength_{i}" for i in (1, 2, 3)]
+    + [f"{zone}_zone_{field}" for zone in ("supply", "demand") for field in ("high", "low", "volume", "strength")]
+    + ["data_quality_score"]
+)
+
+#: Version of the persisted state layout; other versions are rejected on load
+STATE_FORMAT_VERSION = 1
+
+_UNAVAILABLE = ("adx_14", "adx_21", "di_plus", "di_minus", "cmf", "mfi", "trend_strength")
+
+
+def _regime(value: float, high: float, low: float) -> str:
+    if value > high:
+        return "high"
+    if value < low:
+        return "low"
+    return "medium"
+
+
+class IncrementalIndicatorState:
+    """
+    Streaming state for one symbol/timeframe within a single trading day.
+
+    Indicators in the calculator restart every day, so the state is
+    day-scoped: ``update`` refuses bars from another day and callers start
+    a fresh state when the day rolls over.
+    """
+
+    def __init__(self, symbol: str, timeframe: str, day: date):
+        """
+        Initialize an empty state.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe string
+            day: Trading day the state covers
+        """
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.day = day
+        self.last_timestamp: Optional[pd.Timestamp] = None
+        self.rows = 0
+        self.indicators = StreamingIndicators.calculator_defaults(timeframe)
+        self._atr_rank = RollingRank(50, min_periods=1)
+        self._prev_bar = (math.nan, math.nan, math.nan, math.nan)
+
+    def new_bars(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Rows of ``df`` after the last bar already folded into the state."""
+        if self.last_timestamp is None:
+            return df
+        return df[pd.to_datetime(df['timestamp']) > self.last_timestamp]
+
+    def update(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Fold new bars into the state and return their indicator rows.
+
+        Args:
+            df: OHLCV DataFrame with bars newer than ``last_timestamp``
+
+        Returns:
+            pd.DataFrame: Indicator rows in calculator column naming
+        """
+        if df.empty:
+            return pd.DataFrame()
+
+        df = df.sort_values('timestamp').reset_index(drop=True)
+        timestamps = pd.to_datetime(df['timestamp'])
+        if (timestamps.dt.date != self.day).any():
+            raise ValueError(f"Bars outside {self.day} passed to {self.symbol} {self.timeframe} state")
+        if self.last_timestamp is not None and timestamps.iloc[0] <= self.last_timestamp:
+            raise ValueError(f"Bars at or before {self.last_timestamp} already processed")
+
+        records: List[Dict] = []
+        for row in zip(df['open'].to_numpy(dtype=float), df['high'].to_numpy(dtype=float),
+                       df['low'].to_numpy(dtype=float), df['close'].to_numpy(dtype=float),
+                       df['volume'].to_numpy(dtype=float)):
+            records.append(self._update_bar(*row))
+
+        result = df[['timestamp', 'open', 'high', 'low', 'close', 'volume']].copy()
+        result['symbol'] = self.symbol
+        result['timeframe'] = self.timeframe
+        result['date_partition'] = timestamps.dt.date
+        result['calculation_timestamp'] = datetime.now()
+        result['lookback_periods'] = np.arange(self.rows + 1, self.rows + len(df) + 1)
+        result = pd.concat([result, pd.DataFrame(records)], axis=1)
+        for column in _UNAVAILABLE:
+            result[column] = None
+
+        self.rows += len(df)
+        self.last_timestamp = timestamps.iloc[-1]
+        return result
+
+    def _update_bar(self, open_: float, high: float, low: float, close: float, volume: float) -> Dict:
+        values = dict(self.indicators.update_bar(high, low, close, volume))
+        prev_open, prev_high, prev_low, prev_close = self._prev_bar
+        self._prev_bar = (open_, high, low, close)
+
+        # Price action (comparisons against NaN are False, as in pandas)
+        values['higher_high'] = high > prev_high
+        values['higher_low'] = low > prev_low
+        values['lower_high'] = high < prev_high
+        values['lower_low'] = low < prev_low
+
+        body = abs(close - open_)
+        candle_range = high - low
+        lower_shadow = min(open_, close) - low
+        upper_shadow = high - max(open_, close)
+        values['doji'] = candle_range != 0 and body / candle_range <= 0.1
+        values['hammer'] = lower_shadow >= 2 * body and upper_shadow <= body
+        values['shooting_star'] = upper_shadow >= 2 * body and lower_shadow <= body
+        values['engulfing_bullish'] = (close > open_ and prev_close < prev_open
+                                       and open_ < prev_close and close > prev_open)
+        values['engulfing_bearish'] = (close < open_ and prev_close > prev_open
+                                       and open_ > prev_close and close < prev_open)
+
+        # Market structure
+        ema_20, ema_50 = values['ema_20'], values['ema_50']
+        values['trend_direction'] = ('bullish' if ema_20 > ema_50
+                                     else 'bearish' if ema_20 < ema_50 else 'sideways')
+        values['volatility_regime'] = _regime(self._atr_rank.update(values['atr_14']), 0.7, 0.3)
+        values['volume_regime'] = _regime(values['volume_ratio'], 1.5, 0.7)
+        return values
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-data form of the state (JSON-safe)."""
+        return {
+            'format': STATE_FORMAT_VERSION,
+            'symbol': self.symbol,
+            'timeframe': self.timeframe,
+            'day': self.day.isoformat(),
+            'last_timestamp': None if self.last_timestamp is None else self.last_timestamp.isoformat(),
+            'rows': self.rows,
+            'indicators': self.indicators.state_dict(),
+            'atr_rank': self._atr_rank.state_dict(),
+            'prev_bar': [None if math.isnan(v) else v for v in self._prev_bar],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'IncrementalIndicatorState':
+        """
+        Rebuild a state from ``to_dict`` output.
+
+        The kernels are constructed for the stored timeframe and their
+        running state restored into them.
+
+        Raises:
+            ValueError: If the format version or any kernel does not match
+        """
+        if data.get('format') != STATE_FORMAT_VERSION:
+            raise ValueError(f"State format {data.get('format')!r}, expected {STATE_FORMAT_VERSION}")
+        state = cls(data['symbol'], data['timeframe'], date.fromisoformat(data['day']))
+        if data['last_timestamp'] is not None:
+            state.last_timestamp = pd.Timestamp(data['last_timestamp'])
+        state.rows = int(data['rows'])
+        state.indicators.load_state_dict(data['indicators'])
+        state._atr_rank.load_state_dict(data['atr_rank'])
+        state._prev_bar = tuple(math.nan if v is None else float(v) for v in data['prev_bar'])
+        return state
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Persist the state as JSON atomically (write to a temp file, then rename)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, allow_nan=False)
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> Optional['IncrementalIndicatorState']:
+        """
+        Load a persisted state, or None if missing.
+
+        Raises:
+            ValueError: If the file is not a state this version can restore
+        """
+        path = Path(path)
+        if not path.exists():
+            return None
+        with open(path, encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
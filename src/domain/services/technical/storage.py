@@ -3,6 +3,10 @@ Technical Indicators Storage Manager
 
 Handles storage and retrieval of pre-calculated technical indicators in parquet format.
 Provides efficient read/write operations with proper partitioning and indexing.
+
+Incremental updates append small delta files next to a day's parquet file
+(``<day file stem>.delta-000001.parquet``, ...). Readers merge them in, and
+``compact_indicators`` folds them back into the day file.
 """
 
 import pandas as pd
@@ -17,6 +21,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 
 from .schema import TechnicalIndicatorsSchema, TimeFrame
+from .incremental import IncrementalIndicatorState
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +35,10 @@ class TechnicalIndicatorsStorage:
     - Batch read/write operations
     - Data validation and schema enforcement
     - Concurrent operations for performance
+    - Append-only delta files with compaction for incremental updates
     """
+
+    STATE_DIR = "_state"
     
     def __init__(self, base_path: Union[str, Path] = "/Users/apple/Downloads/duckDbData/data/technical_indicators"):
         """
@@ -95,6 +103,8 @@ class TechnicalIndicatorsStorage:
                     use_dictionary=True,
                     row_group_size=10000
                 )
+                # A full rewrite supersedes any incremental deltas
+                self._remove_deltas(file_path)
             
             logger.info(f"Stored {len(df)} indicators for {symbol} {timeframe} {date_partition}")
             return True
@@ -103,6 +113,156 @@ class TechnicalIndicatorsStorage:
             logger.error(f"Error storing indicators for {symbol} {timeframe} {date_partition}: {e}")
             return False
     
+    def append_indicators(self,
+                          df: pd.DataFrame,
+                          symbol: str,
+                          timeframe: str,
+                          date_partition: date) -> bool:
+        """
+        Append new indicator rows for a symbol/timeframe/date as a delta file.
+
+        The first rows of a day become the day file itself; later rows are
+        written as numbered delta files until ``compact_indicators`` merges them.
+
+        Args:
+            df: DataFrame with indicator rows newer than those already stored
+            symbol: Trading symbol
+            timeframe: Timeframe string
+            date_partition: Date for partitioning
+
+        Returns:
+            bool: True if successful
+        """
+        try:
+            if df.empty:
+                return True
+
+            if not self.schema.validate_dataframe(df):
+                logger.error(f"DataFrame validation failed for {symbol} {timeframe} {date_partition}")
+                return False
+
+            file_path = self.schema.get_file_path(symbol, timeframe, date_partition, self.base_path)
+            self.schema.ensure_directory_exists(file_path)
+            df_to_store = self._prepare_dataframe_for_storage(df)
+
+            with self._lock:
+                table = pa.Table.from_pandas(df_to_store, schema=self.schema.get_parquet_schema(),
+                                             preserve_index=False)
+                if file_path.exists():
+                    deltas = self.get_delta_paths(symbol, timeframe, date_partition)
+                    sequence = int(deltas[-1].name.rsplit('.delta-', 1)[1].split('.')[0]) + 1 if deltas else 1
+                    target = file_path.with_name(f"{file_path.stem}.delta-{sequence:06d}.parquet")
+                else:
+                    target = file_path
+                pq.write_table(table, target, compression='snappy', use_dictionary=True)
+
+            logger.debug(f"Appended {len(df)} indicators for {symbol} {timeframe} {date_partition}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error appending indicators for {symbol} {timeframe} {date_partition}: {e}")
+            return False
+
+    def get_delta_paths(self, symbol: str, timeframe: str, date_partition: date) -> List[Path]:
+        """
+        Get the delta files pending compaction for a symbol/timeframe/date, oldest first.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe string
+            date_partition: Date partition
+
+        Returns:
+            List[Path]: Delta file paths
+        """
+        file_path = self.schema.get_file_path(symbol, timeframe, date_partition, self.base_path)
+        if not file_path.parent.exists():
+            return []
+        return sorted(file_path.parent.glob(f"{file_path.stem}.delta-*.parquet"))
+
+    def compact_indicators(self, symbol: str, timeframe: str, date_partition: date) -> bool:
+        """
+        Merge a day's delta files into its parquet file.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe string
+            date_partition: Date partition
+
+        Returns:
+            bool: True if successful (or nothing to compact)
+        """
+        try:
+            file_path = self.schema.get_file_path(symbol, timeframe, date_partition, self.base_path)
+
+            with self._lock:
+                deltas = self.get_delta_paths(symbol, timeframe, date_partition)
+                if not deltas or not file_path.exists():
+                    return True
+
+                schema = self.schema.get_parquet_schema()
+                tables = [pq.read_table(path).cast(schema) for path in [file_path] + deltas]
+                table = pa.concat_tables(tables).combine_chunks()
+
+                tmp_path = file_path.with_name(file_path.name + '.tmp')
+                pq.write_table(
+                    table,
+                    tmp_path,
+                    compression='snappy',
+                    use_dictionary=True,
+                    row_group_size=10000
+                )
+                os.replace(tmp_path, file_path)
+                for path in deltas:
+                    path.unlink()
+
+            logger.info(f"Compacted {len(deltas)} delta files for {symbol} {timeframe} {date_partition}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error compacting indicators for {symbol} {timeframe} {date_partition}: {e}")
+            return False
+
+    def get_state_path(self, symbol: str, timeframe: str) -> Path:
+        """Path of the persisted incremental state for a symbol/timeframe."""
+        return self.base_path / self.STATE_DIR / timeframe / f"{symbol}.json"
+
+    def save_state(self, state: IncrementalIndicatorState) -> bool:
+        """
+        Persist incremental indicator state.
+
+        Args:
+            state: State to persist
+
+        Returns:
+            bool: True if successful
+        """
+        try:
+            state.save(self.get_state_path(state.symbol, state.timeframe))
+            return True
+        except Exception as e:
+            logger.error(f"Error saving indicator state for {state.symbol} {state.timeframe}: {e}")
+            return False
+
+    def load_state(self, symbol: str, timeframe: str) -> Optional[IncrementalIndicatorState]:
+        """
+        Load persisted incremental indicator state.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe string
+
+        Returns:
+            Optional[IncrementalIndicatorState]: State, or None if missing or unreadable
+        """
+        path = self.get_state_path(symbol, timeframe)
+        try:
+            return IncrementalIndicatorState.load(path)
+        except Exception as e:
+            logger.warning(f"Rejected stored indicator state {path} for {symbol} {timeframe}, "
+                           f"the day will be recalculated in full: {e}")
+            return None
+
     def load_indicators(self, 
                        symbol: str, 
                        timeframe: str, 
@@ -139,13 +299,16 @@ class TechnicalIndicatorsStorage:
             # Load and combine data
             dataframes = []
             for file_path in file_paths:
-                if file_path.exists():
+                if not file_path.exists():
+                    continue
+                delta_paths = sorted(file_path.parent.glob(f"{file_path.stem}.delta-*.parquet"))
+                for path in [file_path] + delta_paths:
                     try:
-                        df = pd.read_parquet(file_path, columns=columns)
+                        df = pd.read_parquet(path, columns=columns)
                         if not df.empty:
                             dataframes.append(df)
                     except Exception as e:
-                        logger.warning(f"Error reading {file_path}: {e}")
+                        logger.warning(f"Error reading {path}: {e}")
             
             if not dataframes:
                 return self.schema.create_empty_dataframe()
@@ -377,6 +540,7 @@ class TechnicalIndicatorsStorage:
             
             if file_path.exists():
                 file_path.unlink()
+                self._remove_deltas(file_path)
                 logger.info(f"Deleted indicators for {symbol} {timeframe} {date_partition}")
                 return True
             else:
@@ -451,6 +615,12 @@ class TechnicalIndicatorsStorage:
         
         return stats
     
+    @staticmethod
+    def _remove_deltas(file_path: Path) -> None:
+        """Remove delta files belonging to a day file."""
+        for path in file_path.parent.glob(f"{file_path.stem}.delta-*.parquet"):
+            path.unlink()
+
     def _prepare_dataframe_for_storage(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Prepare DataFrame for storage by ensuring proper types and schema compliance.
@@ -0,0 +1,865 @@
+"""
+Streaming Technical Indicators
+
+Stateful indicator kernels updated in O(1) per bar (amortized for the
+rolling extremes; ``RollingRank`` is the exception, see its docstring), for
+live candles and bar-by-bar replay. Each kernel reproduces the batch formula it mirrors
+(``TechnicalIndicatorsCalculator`` pandas implementations, or the
+two-phase runners' indicators), including warm-up NaNs:
+
+- EMA: ``Series.ewm(span).mean()`` (adjusted weights)
+- SMA / rolling std: ``Series.rolling(n)``, via running sums and Welford
+- RSI, ATR, ADX: rolling-mean smoothing as in the batch code, or Wilder
+  smoothing (``smoothing="wilder"``)
+- OBV, VWAP: cumulative
+- Rolling max/min and Aroon: monotonic deques
+- Stochastic, A/D line, Keltner, pivots, Fibonacci levels: composed from
+  the above over bounded windows
+- Rolling percentile rank: a sorted window with binary searches
+
+Kernels can be fed one bar at a time (``update`` / ``update_bar``) or a
+batch of bars (``update_batch``); ``StreamingIndicators`` bundles several
+kernels behind one per-bar call.
+
+``state_dict`` / ``load_state_dict`` snapshot a kernel's running state as
+JSON-safe plain data. Loading restores into a kernel built with the same
+configuration and rejects snapshots of another kernel type, configuration
+or field layout with ``ValueError``.
+"""
+
+import bisect
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+NAN = float("nan")
+
+#: Timeframes whose pivots come from the previous session rather than the previous bar
+INTRADAY_TIMEFRAMES = ("1T", "5T", "15T", "1H")
+
+Output = Union[float, Dict[str, float]]
+
+
+def _is_nan(value: float) -> bool:
+    return value != value
+
+
+class StreamingIndicator(ABC):
+    """Base class: kernels consume bars and return their latest value."""
+
+    @abstractmethod
+    def update_bar(self, high: float, low: float, close: float, volume: float) -> Output:
+        """Feed one bar; returns the kernel's latest value."""
+
+    def reset(self) -> None:
+        self.__init__(**self._init_kwargs())
+
+    def _init_kwargs(self) -> Dict:
+        return {}
+
+    def state_dict(self) -> Dict[str, Any]:
+        """JSON-safe snapshot of the kernel's configuration and running state."""
+        return _dump_object(self)
+
+    def load_state_dict(self, state: Dict[str, Any]) -> None:
+        """Restore a ``state_dict`` into this kernel (built with the same configuration)."""
+        _load_object(self, state)
+
+
+def _object_fields(obj) -> Dict[str, Any]:
+    """Running-state fields of a kernel or helper; configuration is left out."""
+    names = list(vars(obj)) if hasattr(obj, "__dict__") else list(type(obj).__slots__)
+    config = obj._init_kwargs() if isinstance(obj, StreamingIndicator) else {}
+    return {name: getattr(obj, name) for name in names if name not in config}
+
+
+def _dump_object(obj) -> Dict[str, Any]:
+    state = {"kernel": type(obj).__name__,
+             "fields": {name: _dump_value(value) for name, value in _object_fields(obj).items()}}
+    if isinstance(obj, StreamingIndicator):
+        state["config"] = obj._init_kwargs()
+    return state
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, (StreamingIndicator, _KahanSum, _Wilder)):
+        return _dump_object(value)
+    if isinstance(value, deque):
+        return {"deque": [_dump_value(v) for v in value]}
+    if isinstance(value, tuple):
+        return {"tuple": [_dump_value(v) for v in value]}
+    if isinstance(value, list):
+        return [_dump_value(v) for v in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return {"float": repr(value)}
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    raise TypeError(f"Cannot snapshot {type(value).__name__} in kernel state")
+
+
+def _load_object(obj, state: Dict[str, Any]) -> None:
+    name = type(obj).__name__
+    if not isinstance(state, dict) or state.get("kernel") != name:
+        raise ValueError(f"State for {state.get('kernel') if isinstance(state, dict) else state!r}, expected {name}")
+    if isinstance(obj, StreamingIndicator) and state.get("config") != obj._init_kwargs():
+        raise ValueError(f"{name} state has configuration {state.get('config')}, expected {obj._init_kwargs()}")
+    current = _object_fields(obj)
+    fields = state.get("fields", {})
+    if set(fields) != set(current):
+        raise ValueError(f"{name} state fields {sorted(fields)} do not match {sorted(current)}")
+    for field, template in current.items():
+        if isinstance(template, (StreamingIndicator, _KahanSum, _Wilder)):
+            _load_object(template, fields[field])
+        else:
+            restored = _load_value(fields[field])
+            if isinstance(template, deque):
+                restored = deque(restored, maxlen=template.maxlen)
+            setattr(obj, field, restored)
+
+
+def _load_value(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_load_value(v) for v in value]
+    if not isinstance(value, dict):
+        return value
+    if "deque" in value:
+        return deque(_load_value(v) for v in value["deque"])
+    if "tuple" in value:
+        return tuple(_load_value(v) for v in value["tuple"])
+    if "float" in value:
+        return float(value["float"])
+    raise ValueError(f"Unexpected value in kernel state: {value!r}")
+
+
+class SingleInputIndicator(StreamingIndicator):
+    """Kernel over one bar field (``source``), also fed values directly."""
+
+    #: Bar field read by ``update_bar``
+    source: str = "close"
+
+    @abstractmethod
+    def update(self, value: float) -> Output:
+        """Feed one value; returns the kernel's latest value."""
+
+    def update_bar(self, high: float, low: float, close: float, volume: float) -> Output:
+        """Feed one bar; reads ``self.source``."""
+        bar = {"high": high, "low": low, "close": close, "volume": volume}
+        return self.update(bar[self.source])
+
+    def update_batch(self, values: Iterable[float]) -> np.ndarray:
+        """Feed many values in order; returns the value after each."""
+        return np.array([self.update(float(v)) for v in values], dtype=float)
+
+
+class _KahanSum:
+    """Compensated running sum supporting add and remove."""
+
+    __slots__ = ("total", "_compensation")
+
+    def __init__(self):
+        self.total = 0.0
+        self._compensation = 0.0
+
+    def add(self, value: float):
+        y = value - self._compensation
+        t = self.total + y
+        self._compensation = (t - self.total) - y
+        self.total = t
+
+
+class SMA(SingleInputIndicator):
+    """Simple moving average; NaN until ``window`` non-NaN values are in the window."""
+
+    def __init__(self, window: int, source: str = "close"):
+        self.window = window
+        self.source = source
+        self._values = deque()
+        self._sum = _KahanSum()
+        self._nans = 0
+
+    def _init_kwargs(self):
+        return {"window": self.window, "source": self.source}
+
+    def update(self, value: float) -> float:
+        self._values.append(value)
+        if _is_nan(value):
+            self._nans += 1
+        else:
+            self._sum.add(value)
+        if len(self._values) > self.window:
+            old = self._values.popleft()
+            if _is_nan(old):
+                self._nans -= 1
+            else:
+                self._sum.add(-old)
+        return self.value
+
+    @property
+    def value(self) -> float:
+        if len(self._values) < self.window or self._nans:
+            return NAN
+        return self._sum.total / self.window
+
+
+class RollingStd(SingleInputIndicator):
+    """Rolling standard deviation (sample, ddof=1) with sliding Welford updates."""
+
+    def __init__(self, window: int, ddof: int = 1, source: str = "close"):
+        self.window = window
+        self.ddof = ddof
+        self.source = source
+        self._values = deque()
+        self._n = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._nans = 0
+
+    def _init_kwargs(self):
+        return {"window": self.window, "ddof": self.ddof, "source": self.source}
+
+    def _add(self, x: float):
+        self._n += 1
+        delta = x - self._mean
+        self._mean += delta / self._n
+        self._m2 += delta * (x - self._mean)
+
+    def _remove(self, x: float):
+        self._n -= 1
+        if self._n == 0:
+            self._mean = self._m2 = 0.0
+            return
+        delta = x - self._mean
+        self._mean -= delta / self._n
+        self._m2 -= delta * (x - self._mean)
+
+    def update(self, value: float) -> float:
+        self._values.append(value)
+        if _is_nan(value):
+            self._nans += 1
+        else:
+            self._add(value)
+        if len(self._values) > self.window:
+            old = self._values.popleft()
+            if _is_nan(old):
+                self._nans -= 1
+            else:
+                self._remove(old)
+        return self.value
+
+    @property
+    def value(self) -> float:
+        if len(self._values) < self.window or self._nans or self._n <= self.ddof:
+            return NAN
+        return math.sqrt(max(self._m2, 0.0) / (self._n - self.ddof))
+
+
+class EMA(SingleInputIndicator):
+    """Exponential moving average matching ``Series.ewm(span=span).mean()``."""
+
+    def __init__(self, span: int, source: str = "close"):
+        self.span = span
+        self.source = source
+        self._decay = 1.0 - 2.0 / (span + 1.0)
+        self._numerator = 0.0
+        self._denominator = 0.0
+
+    def _init_kwargs(self):
+        return {"span": self.span, "source": self.source}
+
+    def update(self, value: float) -> float:
+        if not _is_nan(value):
+            self._numerator = value + self._decay * self._numerator
+            self._denominator = 1.0 + self._decay * self._denominator
+        else:
+            self._numerator *= self._decay
+            self._denominator *= self._decay
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return self._numerator / self._denominator if self._denominator else NAN
+
+
+class _Wilder:
+    """Wilder smoothing seeded with the mean of the first ``period`` values."""
+
+    __slots__ = ("period", "value", "_seed")
+
+    def __init__(self, period: int):
+        self.period = period
+        self.value = NAN
+        self._seed: List[float] = []
+
+    def update(self, x: float) -> float:
+        if _is_nan(x):
+            return self.value
+        if _is_nan(self.value):
+            self._seed.append(x)
+            if len(self._seed) == self.period:
+                self.value = sum(self._seed) / self.period
+                self._seed = []
+        else:
+            self.value = (self.value * (self.period - 1) + x) / self.period
+        return self.value
+
+
+def _smoother(period: int, smoothing: str):
+    if smoothing == "sma":
+        return SMA(period)
+    if smoothing == "wilder":
+        return _Wilder(period)
+    raise ValueError(f"Unknown smoothing: {smoothing}")
+
+
+def _ratio(numerator: float, denominator: float) -> float:
+    """``numerator / denominator`` with pandas float semantics (x/0 -> ±inf, 0/0 -> NaN)."""
+    if denominator == 0:
+        if numerator == 0 or _is_nan(numerator):
+            return NAN
+        return math.copysign(math.inf, numerator)
+    return numerator / denominator
+
+
+class RSI(SingleInputIndicator):
+    """Relative Strength Index.
+
+    ``smoothing="sma"`` matches ``TechnicalIndicatorsCalculator``'s pandas
+    fallback (rolling means of gains/losses); ``"wilder"`` is the classic
+    Wilder RSI.
+    """
+
+    def __init__(self, period: int = 14, smoothing: str = "sma", source: str = "close"):
+        self.period = period
+        self.smoothing = smoothing
+        self.source = source
+        self._prev = NAN
+        self._gain = _smoother(period, smoothing)
+        self._loss = _smoother(period, smoothing)
+        self._first = True
+
+    def _init_kwargs(self):
+        return {"period": self.period, "smoothing": self.smoothing, "source": self.source}
+
+    def update(self, value: float) -> float:
+        delta = value - self._prev
+        self._prev = value
+        if self.smoothing == "wilder" and self._first:
+            # Wilder starts from the first price change
+            self._first = False
+            return NAN
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        avg_gain = self._gain.update(gain)
+        avg_loss = self._loss.update(loss)
+        return self._rsi(avg_gain, avg_loss)
+
+    @staticmethod
+    def _rsi(avg_gain: float, avg_loss: float) -> float:
+        rs = _ratio(avg_gain, avg_loss)
+        if _is_nan(rs):
+            return NAN
+        return 100.0 - 100.0 / (1.0 + rs)
+
+
+class TrueRange(StreamingIndicator):
+    """True range; NaN on the first bar, as in the batch ``shift(1)`` formula."""
+
+    def __init__(self):
+        self._prev_close = NAN
+
+    def update_bar(self, high: float, low: float, close: float, volume: float = 0.0) -> float:
+        prev = self._prev_close
+        self._prev_close = close
+        if _is_nan(prev):
+            return NAN
+        return max(high - low, max(abs(high - prev), abs(low - prev)))
+
+
+class ATR(StreamingIndicator):
+    """Average True Range (rolling mean of TR, or Wilder smoothing)."""
+
+    def __init__(self, period: int = 14, smoothing: str = "sma"):
+        self.period = period
+        self.smoothing = smoothing
+        self._tr = TrueRange()
+        self._avg = _smoother(period, smoothing)
+
+    def _init_kwargs(self):
+        return {"period": self.period, "smoothing": self.smoothing}
+
+    def update_bar(self, high: float, low: float, close: float, volume: float = 0.0) -> float:
+        return self._avg.update(self._tr.update_bar(high, low, close))
+
+
+class ADX(StreamingIndicator):
+    """Average Directional Index with +DI/-DI.
+
+    ``smoothing="sma"`` reproduces the two-phase runners' simplified ADX
+    (rolling means of TR, DM and DX); ``"wilder"`` is the classic ADX.
+    """
+
+    def __init__(self, period: int = 14, smoothing: str = "sma"):
+        self.period = period
+        self.smoothing = smoothing
+        self._tr = TrueRange()
+        self._atr = _smoother(period, smoothing)
+        self._dm_plus = _smoother(period, smoothing)
+        self._dm_minus = _smoother(period, smoothing)
+        self._adx = _smoother(period, smoothing)
+        self._prev_high = NAN
+        self._prev_low = NAN
+
+    def _init_kwargs(self):
+        return {"period": self.period, "smoothing": self.smoothing}
+
+    def update_bar(self, high: float, low: float, close: float, volume: float = 0.0) -> Dict[str, float]:
+        up = high - self._prev_high
+        down = self._prev_low - low
+        self._prev_high, self._prev_low = high, low
+        tr = self._tr.update_bar(high, low, close)
+
+        # NaN comparisons are False, so the first bar contributes zero DM
+        dm_plus = max(up, 0.0) if up > down else 0.0
+        dm_minus = max(down, 0.0) if down > up else 0.0
+        if self.smoothing == "wilder" and _is_nan(tr):
+            # Wilder starts smoothing DM from the first bar with a TR
+            return self.value(NAN, NAN, NAN)
+
+        atr = self._atr.update(tr)
+        di_plus = 100.0 * _ratio(self._dm_plus.update(dm_plus), atr)
+        di_minus = 100.0 * _ratio(self._dm_minus.update(dm_minus), atr)
+        dx = 100.0 * _ratio(abs(di_plus - di_minus), di_plus + di_minus)
+        return self.value(di_plus, di_minus, self._adx.update(dx))
+
+    @staticmethod
+    def value(di_plus: float, di_minus: float, adx: float) -> Dict[str, float]:
+        return {"adx": adx, "di_plus": di_plus, "di_minus": di_minus}
+
+
+class OBV(StreamingIndicator):
+    """On-Balance Volume starting at 0 on the first bar."""
+
+    def __init__(self):
+        self._prev_close = NAN
+        self.value = 0.0
+
+    def update_bar(self, high: float, low: float, close: float, volume: float) -> float:
+        if close > self._prev_close:
+            self.value += volume
+        elif close < self._prev_close:
+            self.value -= volume
+        self._prev_close = close
+        return self.value
+
+
+class VWAP(StreamingIndicator):
+    """Cumulative VWAP; ``price="typical"`` uses (H+L+C)/3. ``reset()`` starts a session."""
+
+    def __init__(self, price: str = "typical"):
+        self.price = price
+        self._pv = _KahanSum()
+        self._volume = _KahanSum()
+
+    def _init_kwargs(self):
+        return {"price": self.price}
+
+    def update_bar(self, high: float, low: float, close: float, volume: float) -> float:
+        price = (high + low + close) / 3 if self.price == "typical" else close
+        self._pv.add(price * volume)
+        self._volume.add(volume)
+        return _ratio(self._pv.total, self._volume.total)
+
+
+class BollingerBands(SingleInputIndicator):
+    """Bollinger Bands over a rolling window (middle = SMA, sample std)."""
+
+    def __init__(self, window: int = 20, num_std: float = 2.0, prefix: str = "bb"):
+        self.window = window
+        self.num_std = num_std
+        self.prefix = prefix
+        self._mean = SMA(window)
+        self._std = RollingStd(window)
+
+    def _init_kwargs(self):
+        return {"window": self.window, "num_std": self.num_std, "prefix": self.prefix}
+
+    def update(self, value: float) -> Dict[str, float]:
+        middle = self._mean.update(value)
+        std = self._std.update(value)
+        upper = middle + self.num_std * std
+        lower = middle - self.num_std * std
+        width = upper - lower
+        return {
+            f"{self.prefix}_middle": middle,
+            f"{self.prefix}_upper": upper,
+            f"{self.prefix}_lower": lower,
+            f"{self.prefix}_width": width,
+            f"{self.prefix}_percent": _ratio(value - lower, width),
+        }
+
+
+class _RollingExtreme(SingleInputIndicator):
+    """Rolling max/min with a monotonic deque of (index, value)."""
+
+    def __init__(self, window: int, min_periods: Optional[int] = None, source: str = "close"):
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self.source = source
+        self._deque = deque()
+        self._index = -1
+        self._seen = deque()
+
+    def _init_kwargs(self):
+        return {"window": self.window, "min_periods": self.min_periods, "source": self.source}
+
+    @abstractmethod
+    def _dominates(self, kept: float, new: float) -> bool:
+        """True if ``kept`` stays ahead of a newer ``new`` in the deque."""
+
+    def update(self, value: float) -> float:
+        self._index += 1
+        start = self._index - self.window + 1
+        while self._deque and self._deque[0][0] < start:
+            self._deque.popleft()
+        while self._seen and self._seen[0] < start:
+            self._seen.popleft()
+        if not _is_nan(value):
+            while self._deque and not self._dominates(self._deque[-1][1], value):
+                self._deque.pop()
+            self._deque.append((self._index, value))
+            self._seen.append(self._index)
+        if len(self._seen) < self.min_periods or not self._deque:
+            return NAN
+        return self._deque[0][1]
+
+    @property
+    def offset(self) -> int:
+        """Bars from the start of the current window to the extreme (0 = oldest bar)."""
+        return self._deque[0][0] - (self._index - self.window + 1)
+
+
+class RollingMax(_RollingExtreme):
+    def _dominates(self, kept: float, new: float) -> bool:
+        return kept > new
+
+
+class RollingMin(_RollingExtreme):
+    def _dominates(self, kept: float, new: float) -> bool:
+        return kept < new
+
+
+class _EarliestMax(_RollingExtreme):
+    """Rolling max whose ``offset`` points at the first occurrence of a tie."""
+
+    def _dominates(self, kept: float, new: float) -> bool:
+        return kept >= new
+
+
+class _EarliestMin(_RollingExtreme):
+    """Rolling min whose ``offset`` points at the first occurrence of a tie."""
+
+    def _dominates(self, kept: float, new: float) -> bool:
+        return kept <= new
+
+
+class MACD(SingleInputIndicator):
+    """MACD line, signal and histogram from adjusted EMAs."""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast, self.slow, self.signal = fast, slow, signal
+        self._fast = EMA(fast)
+        self._slow = EMA(slow)
+        self._signal = EMA(signal)
+
+    def _init_kwargs(self):
+        return {"fast": self.fast, "slow": self.slow, "signal": self.signal}
+
+    def update(self, value: float) -> Dict[str, float]:
+        line = self._fast.update(value) - self._slow.update(value)
+        signal = self._signal.update(line)
+        return {"macd_line": line, "macd_signal": signal, "macd_histogram": line - signal}
+
+
+class Ratio(SingleInputIndicator):
+    """Current value of ``source`` over its rolling mean (e.g. volume ratio)."""
+
+    def __init__(self, window: int = 20, source: str = "volume"):
+        self.window = window
+        self.source = source
+        self._mean = SMA(window)
+
+    def _init_kwargs(self):
+        return {"window": self.window, "source": self.source}
+
+    def update(self, value: float) -> float:
+        return _ratio(value, self._mean.update(value))
+
+
+class Stochastic(StreamingIndicator):
+    """Stochastic %K / %D and Williams %R over ``period`` bars."""
+
+    def __init__(self, period: int = 14, smooth: int = 3):
+        self.period = period
+        self.smooth = smooth
+        self._high = RollingMax(period)
+        self._low = RollingMin(period)
+        self._d = SMA(smooth)
+
+    def _init_kwargs(self):
+        return {"period": self.period, "smooth": self.smooth}
+
+    def update_bar(self, high: float, low: float, close: float, volume: float = 0.0) -> Dict[str, float]:
+        highest = self._high.update(high)
+        lowest = self._low.update(low)
+        k = _ratio(close - lowest, highest - lowest) * 100
+        return {
+            "stoch_k": k,
+            "stoch_d": self._d.update(k),
+            "williams_r": _ratio(highest - close, highest - lowest) * -100,
+        }
+
+
+class Aroon(StreamingIndicator):
+    """Aroon up/down/oscillator; bars since the window high/low, first occurrence wins.
+
+    The window high and low come from monotonic deques, so each bar is O(1)
+    amortized. A NaN anywhere in the window makes the matching line NaN.
+    """
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._highs = _EarliestMax(period)
+        self._lows = _EarliestMin(period)
+
+    def _init_kwargs(self):
+        return {"period": self.period}
+
+    def _score(self, extreme: _RollingExtreme, value: float) -> float:
+        if _is_nan(value):
+            return NAN
+        return ((extreme.offset + 1) / self.period) * 100
+
+    def update_bar(self, high: float, low: float, close: float = 0.0, volume: float = 0.0) -> Dict[str, float]:
+        up = self._score(self._highs, self._highs.update(high))
+        down = self._score(self._lows, self._lows.update(low))
+        return {"aroon_up": up, "aroon_down": down, "aroon_oscillator": up - down}
+
+
+class ADLine(StreamingIndicator):
+    """Accumulation/Distribution line; bars with an undefined CLV are NaN and skipped."""
+
+    def __init__(self):
+        self._total = _KahanSum()
+
+    def update_bar(self, high: float, low: float, close: float, volume: float) -> float:
+        flow = _ratio((close - low) - (high - close), high - low) * volume
+        if _is_nan(flow):
+            return NAN
+        self._total.add(flow)
+        return self._total.total
+
+
+class KeltnerChannels(StreamingIndicator):
+    """Keltner channels: EMA midline with ``multiplier`` x ATR bands."""
+
+    def __init__(self, span: int = 20, atr_period: int = 14, multiplier: float = 2.0):
+        self.span = span
+        self.atr_period = atr_period
+        self.multiplier = multiplier
+        self._ema = EMA(span)
+        self._atr = ATR(atr_period)
+
+    def _init_kwargs(self):
+        return {"span": self.span, "atr_period": self.atr_period, "multiplier": self.multiplier}
+
+    def update_bar(self, high: float, low: float, close: float, volume: float = 0.0) -> Dict[str, float]:
+        middle = self._ema.update(close)
+        atr = self._atr.update_bar(high, low, close)
+        return {
+            "keltner_middle": middle,
+            "keltner_upper": middle + (self.multiplier * atr),
+            "keltner_lower": middle - (self.multiplier * atr),
+        }
+
+
+class PivotPoints(StreamingIndicator):
+    """Floor pivots from the preceding ``lookback`` bars (375 ~ one intraday session, 1 for daily)."""
+
+    def __init__(self, lookback: int = 375):
+        self.lookback = lookback
+        self._high = RollingMax(lookback, min_periods=1)
+        self._low = RollingMin(lookback, min_periods=1)
+        self._closes = deque(maxlen=lookback + 1)
+        self._prev = (NAN, NAN)
+
+    def _init_kwargs(self):
+        return {"lookback": self.lookback}
+
+    @classmethod
+    def for_timeframe(cls, timeframe: str) -> "PivotPoints":
+        return cls(375 if timeframe in INTRADAY_TIMEFRAMES else 1)
+
+    def update_bar(self, high: float, low: float, close: float, volume: float = 0.0) -> Dict[str, float]:
+        prev_high = self._high.update(self._prev[0])
+        prev_low = self._low.update(self._prev[1])
+        self._prev = (high, low)
+        self._closes.append(close)
+        prev_close = self._closes[0] if len(self._closes) > self.lookback else NAN
+
+        pivot = (prev_high + prev_low + prev_close) / 3
+        return {
+            "pivot_point": pivot,
+            "pivot_r1": 2 * pivot - prev_low,
+            "pivot_r2": pivot + (prev_high - prev_low),
+            "pivot_r3": prev_high + 2 * (pivot - prev_low),
+            "pivot_s1": 2 * pivot - prev_high,
+            "pivot_s2": pivot - (prev_high - prev_low),
+            "pivot_s3": prev_low - 2 * (prev_high - pivot),
+        }
+
+
+class FibonacciLevels(StreamingIndicator):
+    """Retracement levels within the rolling swing high/low of ``window`` bars."""
+
+    LEVELS = {"fib_23_6": 0.236, "fib_38_2": 0.382, "fib_50_0": 0.500, "fib_61_8": 0.618, "fib_78_6": 0.786}
+
+    def __init__(self, window: int = 50):
+        self.window = window
+        self._high = RollingMax(window, min_periods=1)
+        self._low = RollingMin(window, min_periods=1)
+
+    def _init_kwargs(self):
+        return {"window": self.window}
+
+    def update_bar(self, high: float, low: float, close: float = 0.0, volume: float = 0.0) -> Dict[str, float]:
+        swing_high = self._high.update(high)
+        swing_range = swing_high - self._low.update(low)
+        return {name: swing_high - (swing_range * ratio) for name, ratio in self.LEVELS.items()}
+
+
+class RollingRank(SingleInputIndicator):
+    """Percentile rank of the latest value in its window (``rolling(window).rank(pct=True)``).
+
+    The window's non-NaN values are kept sorted, so ranking takes two binary
+    searches. Inserting and evicting shift the sorted list, which is
+    O(window) memory movement per bar, not O(1).
+    """
+
+    def __init__(self, window: int, min_periods: Optional[int] = None, source: str = "close"):
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self.source = source
+        self._values = deque()
+        self._sorted: List[float] = []
+
+    def _init_kwargs(self):
+        return {"window": self.window, "min_periods": self.min_periods, "source": self.source}
+
+    def update(self, value: float) -> float:
+        self._values.append(value)
+        if not _is_nan(value):
+            bisect.insort(self._sorted, value)
+        if len(self._values) > self.window:
+            old = self._values.popleft()
+            if not _is_nan(old):
+                del self._sorted[bisect.bisect_left(self._sorted, old)]
+        if _is_nan(value) or len(self._sorted) < self.min_periods:
+            return NAN
+        below = bisect.bisect_left(self._sorted, value)
+        ties = bisect.bisect_right(self._sorted, value) - below
+        return (below + (ties + 1) / 2) / len(self._sorted)
+
+
+class StreamingIndicators:
+    """A named set of kernels fed together, one bar at a time or in batches."""
+
+    def __init__(self, kernels: Dict[str, StreamingIndicator]):
+        self.kernels = kernels
+        self.values: Dict[str, float] = {}
+
+    @classmethod
+    def calculator_defaults(cls, timeframe: str = "1T") -> "StreamingIndicators":
+        """Kernels matching ``TechnicalIndicatorsCalculator``'s pandas implementations."""
+        kernels: Dict[str, StreamingIndicator] = {}
+        for n in (10, 20, 50, 100, 200):
+            kernels[f"sma_{n}"] = SMA(n)
+        for n in (10, 20, 50, 100, 200):
+            kernels[f"ema_{n}"] = EMA(n)
+        kernels["rsi_14"] = RSI(14)
+        kernels["rsi_21"] = RSI(21)
+        kernels["atr_14"] = ATR(14)
+        kernels["atr_21"] = ATR(21)
+        kernels["bollinger"] = BollingerBands(20, 2.0)
+        kernels["obv"] = OBV()
+        kernels["vwap"] = VWAP("typical")
+        kernels["volume_sma_20"] = SMA(20, source="volume")
+        kernels["volume_ratio"] = Ratio(20, source="volume")
+        kernels["macd"] = MACD(12, 26, 9)
+        kernels["stochastic"] = Stochastic(14, 3)
+        kernels["aroon"] = Aroon(14)
+        kernels["ad_line"] = ADLine()
+        kernels["keltner"] = KeltnerChannels(20, 14)
+        kernels["pivots"] = PivotPoints.for_timeframe(timeframe)
+        kernels["fibonacci"] = FibonacciLevels(50)
+        return cls(kernels)
+
+    @classmethod
+    def two_phase_defaults(cls) -> "StreamingIndicators":
+        """Kernels matching the two-phase runners' intraday indicators."""
+        return cls({
+            "vwap": VWAP("close"),
+            "obv": OBV(),
+            "atr": ATR(14),
+            "adx": ADX(14),
+            "volume_ma": SMA(20, source="volume"),
+            "volume_ratio": Ratio(20, source="volume"),
+        })
+
+    def update_bar(self, high: float, low: float, close: float, volume: float) -> Dict[str, float]:
+        """Feed one bar to every kernel; returns the flattened latest values."""
+        values: Dict[str, float] = {}
+        for name, kernel in self.kernels.items():
+            out = kernel.update_bar(high, low, close, volume)
+            if isinstance(out, dict):
+                values.update(out)
+            else:
+                values[name] = out
+        self.values = values
+        return values
+
+    def update_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Feed bars from a frame with high/low/close/volume columns, in order."""
+        rows = [
+            self.update_bar(h, l, c, v)
+            for h, l, c, v in zip(
+                df["high"].to_numpy(dtype=float), df["low"].to_numpy(dtype=float),
+                df["close"].to_numpy(dtype=float), df["volume"].to_numpy(dtype=float),
+            )
+        ]
+        return pd.DataFrame(rows, index=df.index)
+
+    def reset(self) -> None:
+        for kernel in self.kernels.values():
+            kernel.reset()
+        self.values = {}
+
+    def state_dict(self) -> Dict[str, Any]:
+        """JSON-safe snapshot of every kernel, keyed by name."""
+        return {name: kernel.state_dict() for name, kernel in self.kernels.items()}
+
+    def load_state_dict(self, state: Dict[str, Any]) -> None:
+        """Restore a ``state_dict`` into a set built with the same kernels."""
+        if set(state) != set(self.kernels):
+            raise ValueError(f"State kernels {sorted(state)} do not match {sorted(self.kernels)}")
+        for name, kernel in self.kernels.items():
+            kernel.load_state_dict(state[name])
+        self.values = {}
+
+
+IndicatorFactory = Callable[[], StreamingIndicators]
@@ -3,6 +3,12 @@ Technical Indicators Updater
 
 Provides update mechanisms to refresh technical indicators when market data is updated.
 Supports incremental updates, batch processing, and automatic triggering.
+
+Incremental mode keeps per-(symbol, timeframe) streaming state for the current
+day, computes only bars newer than the last processed one and appends them as
+delta files. Deltas are compacted every ``compact_threshold`` appends, and a day
+is recalculated in full once the next day starts, which fills the whole-day
+zone columns that incremental rows leave empty.
 """
 
 import pandas as pd
@@ -15,6 +21,7 @@ import threading
 import time
 
 from .calculator import TechnicalIndicatorsCalculator
+from .incremental import IncrementalIndicatorState
 from .storage import TechnicalIndicatorsStorage
 from .schema import TimeFrame
 try:
@@ -39,12 +46,15 @@ class TechnicalIndicatorsUpdater:
     - Automatic detection of data changes
     - Concurrent processing for performance
     - Rollback capability for failed updates
+    - Tail-only recompute from persisted indicator state
     """
     
     def __init__(self, 
                  db_manager: DuckDBManager,
                  storage: Optional[TechnicalIndicatorsStorage] = None,
-                 calculator: Optional[TechnicalIndicatorsCalculator] = None):
+                 calculator: Optional[TechnicalIndicatorsCalculator] = None,
+                 incremental: bool = True,
+                 compact_threshold: int = 20):
         """
         Initialize the updater.
         
@@ -52,12 +62,21 @@ class TechnicalIndicatorsUpdater:
             db_manager: DuckDB manager for accessing market data
             storage: Storage manager (creates new if None)
             calculator: Calculator instance (creates new if None)
+            incremental: Compute only new bars from persisted state
+            compact_threshold: Delta files per day before they are compacted
         """
         self.db_manager = db_manager
         self.storage = storage or TechnicalIndicatorsStorage()
         self.calculator = calculator or TechnicalIndicatorsCalculator()
         self._lock = threading.Lock()
         
+        # Streaming state mirrors the calculator's pandas implementations only
+        self.incremental = incremental and not (self.calculator.use_ta or self.calculator.use_talib)
+        if incremental and not self.incremental:
+            logger.info("Incremental updates disabled: calculator uses an external TA library")
+        self.compact_threshold = compact_threshold
+        self._states: Dict[Tuple[str, str], IncrementalIndicatorState] = {}
+        
         # Update statistics
         self.stats = {
             'symbols_processed': 0,
@@ -373,6 +392,12 @@ class TechnicalIndicatorsUpdater:
             
             for current_date, day_data in market_data.groupby('date'):
                 try:
+                    if self.incremental and not force_recalculate:
+                        records_updated += self._update_day_incremental(
+                            symbol, timeframe, current_date, day_data
+                        )
+                        continue
+                    
                     # Check if we need to update this date
                     if not force_recalculate and self._indicators_exist(symbol, timeframe, current_date):
                         continue
@@ -390,6 +415,8 @@ class TechnicalIndicatorsUpdater:
                         
                         if success:
                             records_updated += len(indicators_df)
+                            # Stored rows may now run past the state; rebuild it on next update
+                            self._drop_state(symbol, timeframe, current_date)
                         else:
                             logger.warning(f"Failed to store indicators for {symbol} {timeframe} {current_date}")
                 
@@ -406,6 +433,111 @@ class TechnicalIndicatorsUpdater:
             logger.error(f"Error updating {symbol} {timeframe}: {e}")
             return False
     
+    def _update_day_incremental(self,
+                                symbol: str,
+                                timeframe: str,
+                                current_date: date,
+                                day_data: pd.DataFrame) -> int:
+        """
+        Compute and append indicators for bars newer than the persisted state.
+        
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe string
+            current_date: Trading day of ``day_data``
+            day_data: Market data for the day
+            
+        Returns:
+            int: Number of indicator records written
+        """
+        state = self._get_state(symbol, timeframe)
+        
+        if state is not None and current_date < state.day:
+            # State has moved past this day; only fill days never stored
+            if self._indicators_exist(symbol, timeframe, current_date):
+                return 0
+            return self._recalculate_day(symbol, timeframe, current_date, day_data)
+        
+        if state is not None and current_date > state.day:
+            # New day: recalculate the finished one so its whole-day zones are filled
+            self._finalize_day(state)
+            state = None
+        
+        try:
+            if state is None:
+                state = IncrementalIndicatorState(symbol, timeframe, current_date)
+                if self._indicators_exist(symbol, timeframe, current_date):
+                    # Stored without state: recalculate once, then stream from the end
+                    records = self._recalculate_day(symbol, timeframe, current_date, day_data)
+                    state.update(day_data)
+                    self._set_state(state)
+                    return records
+            
+            new_bars = state.new_bars(day_data)
+            if new_bars.empty:
+                return 0
+            
+            indicators_df = state.update(new_bars)
+            if not self.storage.append_indicators(indicators_df, symbol, timeframe, current_date):
+                raise RuntimeError(f"Failed to append indicators for {symbol} {timeframe} {current_date}")
+            self._set_state(state)
+        except Exception:
+            # State may be ahead of storage; the next run rebuilds it
+            self._drop_state(symbol, timeframe, current_date)
+            raise
+        
+        if len(self.storage.get_delta_paths(symbol, timeframe, current_date)) >= self.compact_threshold:
+            self.storage.compact_indicators(symbol, timeframe, current_date)
+        
+        return len(indicators_df)
+    
+    def _recalculate_day(self,
+                         symbol: str,
+                         timeframe: str,
+                         current_date: date,
+                         day_data: pd.DataFrame) -> int:
+        """Recalculate and overwrite a full day of indicators; returns records written."""
+        indicators_df = self.calculator.calculate_all_indicators(day_data, symbol, timeframe)
+        if indicators_df.empty:
+            return 0
+        if not self.storage.store_indicators(indicators_df, symbol, timeframe, current_date, overwrite=True):
+            logger.warning(f"Failed to store indicators for {symbol} {timeframe} {current_date}")
+            return 0
+        return len(indicators_df)
+    
+    def _finalize_day(self, state: IncrementalIndicatorState) -> None:
+        """Replace a finished day's incremental rows with a full recalculation."""
+        day_data = self._get_market_data(state.symbol, state.timeframe, state.day, state.day)
+        if not day_data.empty:
+            self._recalculate_day(state.symbol, state.timeframe, state.day, day_data)
+    
+    def _get_state(self, symbol: str, timeframe: str) -> Optional[IncrementalIndicatorState]:
+        """Get cached or persisted incremental state for a symbol/timeframe."""
+        key = (symbol, timeframe)
+        with self._lock:
+            if key in self._states:
+                return self._states[key]
+        state = self.storage.load_state(symbol, timeframe)
+        if state is not None:
+            with self._lock:
+                self._states[key] = state
+        return state
+    
+    def _set_state(self, state: IncrementalIndicatorState) -> None:
+        """Cache and persist incremental state."""
+        with self._lock:
+            self._states[(state.symbol, state.timeframe)] = state
+        self.storage.save_state(state)
+    
+    def _drop_state(self, symbol: str, timeframe: str, current_date: date) -> None:
+        """Discard state for the given day, if that is the day it covers."""
+        state = self._get_state(symbol, timeframe)
+        if state is None or state.day != current_date:
+            return
+        with self._lock:
+            self._states.pop((symbol, timeframe), None)
+        self.storage.get_state_path(symbol, timeframe).unlink(missing_ok=True)
+    
     def _get_market_data(self, 
                         symbol: str, 
                         timeframe: str, 
@@ -471,9 +603,13 @@ class TechnicalIndicatorsUpdater:
                 available_dates = self.storage.get_available_dates(symbol, timeframe)
                 
                 if available_dates:
-                    # Start from the day after the latest available data
+                    # Start from the day after the latest available data; incremental
+                    # updates also revisit that day, which may still be partial
                     latest_available = max(available_dates)
-                    needed_date = latest_available + timedelta(days=1)
+                    if self.incremental:
+                        needed_date = latest_available
+                    else:
+                        needed_date = latest_available + timedelta(days=1)
                 else:
                     # No existing data, start from 30 days ago
                     needed_date = end_date - timedelta(days=30)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-from datetime import date, datetime
-from typing import List
+from datetime import date, datetime, time
+from typing import List, Optional, Sequence
 import pandas as pd
 
 from src.application.ports.market_read_port import MarketReadPort
@@ -44,3 +44,27 @@ class DuckDBMarketReadAdapter(MarketReadPort):
             """,
             [symbol, trading_date, start, end],
         )
+
+    def get_minute_window(
+        self,
+        start_date: date,
+        end_date: date,
+        start_time: time,
+        end_time: time,
+        symbols: Optional[Sequence[str]] = None,
+    ) -> pd.DataFrame:
+        symbol_filter = "AND list_contains(?, symbol)" if symbols else ""
+        params = [start_date, end_date, start_time, end_time]
+        if symbols:
+            params.append(list(symbols))
+        return self._adapter.execute_query(
+            f"""
+                SELECT symbol, timestamp, open, high, low, close, volume
+                FROM market_data_unified
+                WHERE date_partition BETWEEN ? AND ?
+                  AND CAST(timestamp AS TIME) BETWEEN ? AND ?
+                  {symbol_filter}
+                ORDER BY symbol, timestamp
+            """,
+            params,
+        )
@@ -13,14 +13,19 @@ from functools import lru_cache
 import time as time_module
 
 import duckdb
+import pandas as pd
 
 from src.application.ports.scanner_read_port import ScannerReadPort
 from src.infrastructure.database.unified_duckdb import UnifiedDuckDBManager, DuckDBConfig
 from src.infrastructure.config.settings import get_settings
 from src.infrastructure.logging import get_logger
+from src.infrastructure.services.result_cache import ArrowResultCache
 
 logger = get_logger(__name__)
 
+# Tables scanner results are derived from; a write to either invalidates them
+MARKET_DATA_TABLES = ("market_data", "market_data_unified")
+
 
 class DuckDBScannerReadAdapter(ScannerReadPort):
     """
@@ -52,8 +57,8 @@ class DuckDBScannerReadAdapter(ScannerReadPort):
         """
         self.legacy_mode = legacy_mode
         self.enable_cache = enable_cache
+        self._cache = ArrowResultCache(ttl=cache_ttl) if enable_cache else None
         self.cache_ttl = cache_ttl
-        self._cache = {} if enable_cache else None
         self._logger = get_logger(__name__)
 
         if unified_manager:
@@ -72,6 +77,9 @@ class DuckDBScannerReadAdapter(ScannerReadPort):
                 read_only=True,  # Scanner operations are typically read-only
                 enable_httpfs=getattr(settings.database, 'enable_httpfs', True),
                 parquet_root=getattr(settings.database, 'parquet_root', None),
+                compacted_parquet_root=getattr(settings.database, 'compacted_parquet_root', None),
+                compaction_granularity=getattr(settings.database, 'compaction_granularity', 'month'),
+                use_parquet_catalog=getattr(settings.database, 'use_parquet_catalog', False),
                 use_parquet_in_unified_view=getattr(settings.database, 'use_parquet_in_unified_view', True)
             )
             self.unified_manager = UnifiedDuckDBManager(config)
@@ -84,6 +92,16 @@ class DuckDBScannerReadAdapter(ScannerReadPort):
             self._memory_limit = getattr(settings.database, "memory_limit", None)
             self._threads = getattr(settings.database, "threads", None)
 
+    @property
+    def cache_ttl(self) -> float:
+        return self._cache_ttl
+
+    @cache_ttl.setter
+    def cache_ttl(self, value: float):
+        self._cache_ttl = value
+        if self._cache is not None:
+            self._cache.ttl = value
+
     def _truncate_query(self, query: str, max_length: int = 200) -> str:
         """Truncate query for logging purposes."""
         if len(query) <= max_length:
@@ -140,6 +158,27 @@ class DuckDBScannerReadAdapter(ScannerReadPort):
             pass
         return "market_data"
 
+    def _market_data_source(
+        self,
+        scan_date: date,
+        symbols: Optional[List[str]] = None,
+        end_date: Optional[date] = None,
+    ) -> str:
+        """Unified mode: relation to scan for one day (or through ``end_date``).
+
+        Uses the parquet catalog's exact file list when the manager has one,
+        so the scan does not list the whole Parquet tree.
+        """
+        if getattr(self.unified_manager, 'parquet_catalog', None) is None:
+            return "market_data"
+        try:
+            return self.unified_manager.market_data_relation(
+                symbols=symbols, start_date=scan_date, end_date=end_date or scan_date
+            )
+        except Exception as e:
+            self._logger.warning(f"Parquet catalog lookup failed, falling back to market_data: {e}")
+            return "market_data"
+
     def _log_scanner_operation(self, operation: str, start_time: float, result_count: int = None):
         """Log scanner operation with performance metrics."""
         duration = time_module.time() - start_time
@@ -161,29 +200,19 @@ class DuckDBScannerReadAdapter(ScannerReadPort):
         return "|".join(key_parts)
 
     def _get_cached_result(self, cache_key: str) -> Optional[Any]:
-        """Get result from cache if available and not expired."""
-        if not self.enable_cache or not self._cache:
+        """Get result from cache if available, not expired and not invalidated by a write."""
+        if not self.enable_cache or self._cache is None:
             return None
 
-        cached_item = self._cache.get(cache_key)
-        if cached_item:
-            timestamp, result = cached_item
-            current_time = time_module.time()
-            time_diff = current_time - timestamp
-            if time_diff < self.cache_ttl:
-                self._logger.debug(f"Cache hit for key: {cache_key}")
-                return result
-            else:
-                # Remove expired cache entry
-                del self._cache[cache_key]
-                self._logger.debug(f"Cache expired for key: {cache_key}, age: {time_diff}s")
-
-        return None
+        result = self._cache.get(cache_key)
+        if result is not None:
+            self._logger.debug(f"Cache hit for key: {cache_key}")
+        return result
 
     def _set_cached_result(self, cache_key: str, result: Any):
         """Store result in cache."""
         if self.enable_cache and self._cache is not None:
-            self._cache[cache_key] = (time_module.time(), result)
+            self._cache.put(cache_key, result, MARKET_DATA_TABLES)
             self._logger.debug(f"Cached result for key: {cache_key}")
 
     def get_crp_candidates(
@@ -375,6 +404,7 @@ class DuckDBScannerReadAdapter(ScannerReadPort):
         """Unified mode CRP candidates implementation."""
         try:
             # Build optimized CRP query using unified layer
+            source = self._market_data_source(scan_date)
             query = """
                 WITH crp_candidates AS (
                     SELECT
@@ -438,7 +468,7 @@ class DuckDBScannerReadAdapter(ScannerReadPort):
                             WHEN ABS(close - low) / NULLIF(low, 0) * 100 <= {close_threshold_pct} THEN 'Near Low'
                             ELSE 'Mid Range'
                         END as close_position
-                    FROM market_data
+                    FROM {source}
                     WHERE date_partition = '{scan_date}'
                       AND CAST(timestamp AS TIME) <= '{cutoff_time}'
                       AND close BETWEEN {min_price} AND {max_price}
@@ -449,7 +479,7 @@ class DuckDBScannerReadAdapter(ScannerReadPort):
                   AND crp_probability_score > 30
                 ORDER BY crp_probability_score DESC
                 LIMIT {max_results}
-            """
+            """.replace("{source}", source)
 
             # Execute query through unified manager
             df_results = self.unified_manager.analytics_query(
@@ -601,6 +631,7 @@ class DuckDBScannerReadAdapter(ScannerReadPort):
         try:
             # Build placeholders for SQL query
             placeholders = ','.join(['?' for _ in symbols])
+            source = self._market_data_source(scan_date, symbols)
 
             query = f"""
                 SELECT
@@ -609,7 +640,7 @@ class DuckDBScannerReadAdapter(ScannerReadPort):
                     high as eod_high,
                     low as eod_low,
                     volume as eod_volume
-                FROM market_data
+                FROM {source}
                 WHERE date_partition = ?
                   AND symbol IN ({placeholders})
                   AND CAST(timestamp AS TIME) <= ?
@@ -708,7 +739,7 @@ class DuckDBScannerReadAdapter(ScannerReadPort):
                         volume as current_volume,
                         high - close as breakout_above_resistance,
                         (high - close) / NULLIF(close, 0) * 100 as breakout_pct,
-                        volume / NULLIF(AVG(volume) OVER (PARTITION BY symbol ORDER BY date_partition ROWS 4 PRECEDING), 0) as volume_ratio,
+                        volume / NULLIF(AVG(volume) OVER (PARTITION BY symbol, date_partition ORDER BY timestamp ROWS 4 PRECEDING), 0) as volume_ratio,
                         (
                             CASE WHEN ((high - close) / NULLIF(close, 0) * 100) > 2.0 THEN 0.5
                                  WHEN ((high - close) / NULLIF(close, 0) * 100) > 1.0 THEN 0.3
@@ -780,7 +811,8 @@ class DuckDBScannerReadAdapter(ScannerReadPort):
         try:
             # Build optimized breakout query using unified layer
             # Build query with proper parameter placeholders
-            query = """
+            source = self._market_data_source(scan_date)
+            query = f"""
                 WITH breakout_candidates AS (
                     SELECT
                         symbol,
@@ -791,7 +823,7 @@ class DuckDBScannerReadAdapter(ScannerReadPort):
                         volume as current_volume,
                         high - close as breakout_above_resistance,
                         (high - close) / NULLIF(close, 0) * 100 as breakout_pct,
-                        volume / NULLIF(AVG(volume) OVER (PARTITION BY symbol ORDER BY date_partition ROWS 4 PRECEDING), 0) as volume_ratio,
+                        volume / NULLIF(AVG(volume) OVER (PARTITION BY symbol, date_partition ORDER BY timestamp ROWS 4 PRECEDING), 0) as volume_ratio,
                         (
                             CASE WHEN ((high - close) / NULLIF(close, 0) * 100) > 2.0 THEN 0.5
                                  WHEN ((high - close) / NULLIF(close, 0) * 100) > 1.0 THEN 0.3
@@ -803,7 +835,7 @@ class DuckDBScannerReadAdapter(ScannerReadPort):
                                  ELSE 0.05 END +
                             CASE WHEN (close - open) / NULLIF(open, 0) > 0.01 THEN 0.2 ELSE 0 END
                         ) * 100 as probability_score
-                    FROM market_data
+                    FROM {source}
                     WHERE date_partition = ?
                       AND CAST(timestamp AS TIME) <= ?
                       AND close BETWEEN ? AND ?
@@ -863,9 +895,327 @@ class DuckDBScannerReadAdapter(ScannerReadPort):
             )
             raise
 
+    # ------------------------------------------------------------------
+    # Date-range scans
+    # ------------------------------------------------------------------
+
+    # Positional parameters shared by the range queries:
+    #   $1 start_date, $2 end_date, $3 cutoff_time, $4 end_time,
+    #   $5 max_results, $6 min_price, $7 max_price
+    _RANGE_EOD_SQL = """
+                ranked AS (
+                    SELECT * FROM candidates
+                    WHERE {filter}
+                    QUALIFY ROW_NUMBER() OVER (
+                        PARTITION BY scan_date ORDER BY {score} DESC, symbol, bar_timestamp
+                    ) <= $5
+                ),
+                eod AS (
+                    SELECT
+                        symbol,
+                        date_partition as scan_date,
+                        close as eod_price,
+                        high as eod_high,
+                        low as eod_low,
+                        volume as eod_volume
+                    FROM {source}
+                    WHERE date_partition BETWEEN $1 AND $2
+                      AND CAST(timestamp AS TIME) <= $4
+                      AND symbol IN (SELECT symbol FROM ranked)
+                    QUALIFY ROW_NUMBER() OVER (PARTITION BY symbol, date_partition ORDER BY timestamp DESC) = 1
+                )
+                SELECT ranked.*, eod.eod_price, eod.eod_high, eod.eod_low, eod.eod_volume
+                FROM ranked
+                LEFT JOIN eod USING (symbol, scan_date)
+                ORDER BY scan_date, {score} DESC, symbol, bar_timestamp
+    """
+
+    def _range_source(self, start_date: date, end_date: date) -> str:
+        """Relation to scan for a date range in the current mode."""
+        if self.legacy_mode:
+            return self._resolve_market_data_relation(self._conn_or_open())
+        return self._market_data_source(start_date, end_date=end_date)
+
+    def _range_query(self, query: str, params: List[Any]) -> pd.DataFrame:
+        """Run a range query through the direct connection or the unified manager."""
+        if self.legacy_mode:
+            return self._conn_or_open().execute(query, params).df()
+        return self.unified_manager.persistence_query(query, params)
+
+    @staticmethod
+    def _range_params(
+        start_date: date,
+        end_date: date,
+        cutoff_time: time,
+        end_time: time,
+        config: Dict[str, Any],
+        max_results: int,
+    ) -> List[Any]:
+        return [
+            start_date.isoformat(),
+            end_date.isoformat(),
+            cutoff_time.isoformat(),
+            end_time.isoformat(),
+            max_results,
+            config.get('min_price', 50),
+            config.get('max_price', 2000),
+        ]
+
+    @staticmethod
+    def _number(value: Any, cast=float) -> Any:
+        """Convert a nullable numeric cell, mapping NULL/NaN to 0."""
+        if value is None or pd.isna(value):
+            return cast(0)
+        return cast(value)
+
+    def _with_eod(self, row: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+        result['scan_date'] = pd.Timestamp(row['scan_date']).date()
+        result.update({
+            'eod_price': self._number(row.get('eod_price')),
+            'eod_high': self._number(row.get('eod_high')),
+            'eod_low': self._number(row.get('eod_low')),
+            'eod_volume': self._number(row.get('eod_volume'), int),
+        })
+        return result
+
+    def get_crp_candidates_range(
+        self,
+        start_date: date,
+        end_date: date,
+        cutoff_time: time,
+        end_time: time,
+        config: Dict[str, Any],
+        max_results: int,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get CRP candidates with end-of-day prices for every day in a range.
+
+        Scores every (symbol, date) in one windowed query, keeps the top
+        ``max_results`` per day and joins each candidate's end-of-day bar in
+        the same statement, replacing one candidate and one EOD query per day.
+
+        Args:
+            start_date: First date to scan
+            end_date: Last date to scan
+            cutoff_time: Time cutoff for candidate bars
+            end_time: End time for the trading day
+            config: Scanner configuration parameters
+            max_results: Maximum number of candidates per day
+
+        Returns:
+            List of CRP candidate dictionaries ordered by scan_date and rank
+        """
+        start_time = time_module.time()
+        cache_key = self._get_cache_key(
+            "crp_candidates_range", start_date, end_date, cutoff_time, end_time, str(config), max_results
+        )
+        cached_result = self._get_cached_result(cache_key)
+        if cached_result is not None:
+            self._log_scanner_operation("crp_candidates_range_cache_hit", start_time, len(cached_result))
+            return cached_result
+
+        query = ""
+        params = self._range_params(start_date, end_date, cutoff_time, end_time, config, max_results) + [
+            config.get('close_threshold_pct', 2.0),
+            config.get('range_threshold_pct', 3.0),
+            config.get('min_volume', 50000),
+            config.get('max_volume', 5000000),
+        ]
+        try:
+            source = self._range_source(start_date, end_date)
+            query = f"""
+                WITH scored AS (
+                    SELECT
+                        symbol,
+                        date_partition as scan_date,
+                        timestamp as bar_timestamp,
+                        close as crp_price,
+                        open as open_price,
+                        high as current_high,
+                        low as current_low,
+                        volume as current_volume,
+                        (high - low) / NULLIF(close, 0) * 100 as current_range_pct,
+                        CASE
+                            WHEN ABS(close - high) / NULLIF(high, 0) * 100 <= $8 THEN 0.4
+                            WHEN ABS(close - low) / NULLIF(low, 0) * 100 <= $8 THEN 0.4
+                            ELSE 0.1
+                        END as close_score,
+                        CASE
+                            WHEN (high - low) / NULLIF(close, 0) * 100 <= $9 THEN 0.3
+                            WHEN (high - low) / NULLIF(close, 0) * 100 <= $9 * 1.5 THEN 0.2
+                            ELSE 0.05
+                        END as range_score,
+                        CASE
+                            WHEN volume > 75000 THEN 0.2
+                            WHEN volume > 50000 THEN 0.15
+                            WHEN volume > 25000 THEN 0.1
+                            ELSE 0.05
+                        END as volume_score,
+                        CASE
+                            WHEN (close - open) / NULLIF(open, 0) > 0.01 THEN 0.1
+                            WHEN (close - open) / NULLIF(open, 0) > 0 THEN 0.05
+                            ELSE 0.02
+                        END as momentum_score,
+                        CASE
+                            WHEN ABS(close - high) / NULLIF(high, 0) * 100 <= $8 THEN 'Near High'
+                            WHEN ABS(close - low) / NULLIF(low, 0) * 100 <= $8 THEN 'Near Low'
+                            ELSE 'Mid Range'
+                        END as close_position
+                    FROM {source}
+                    WHERE date_partition BETWEEN $1 AND $2
+                      AND CAST(timestamp AS TIME) <= $3
+                      AND close BETWEEN $6 AND $7
+                      AND volume BETWEEN $10 AND $11
+                ),
+                candidates AS (
+                    SELECT
+                        *,
+                        (close_score + range_score + volume_score + momentum_score) * 100 as crp_probability_score
+                    FROM scored
+                ),
+            """ + self._RANGE_EOD_SQL.format(
+                source=source,
+                score="crp_probability_score",
+                filter="(close_score + range_score + volume_score + momentum_score) > 0.5 AND crp_probability_score > 30",
+            )
+
+            df_results = self._range_query(query, params)
+
+            results = []
+            for row in df_results.to_dict('records'):
+                results.append(self._with_eod(row, {
+                    'symbol': str(row['symbol']),
+                    'crp_price': self._number(row['crp_price']),
+                    'open_price': self._number(row['open_price']),
+                    'current_high': self._number(row['current_high']),
+                    'current_low': self._number(row['current_low']),
+                    'current_volume': self._number(row['current_volume'], int),
+                    'current_range_pct': self._number(row['current_range_pct']),
+                    'close_score': self._number(row['close_score']),
+                    'range_score': self._number(row['range_score']),
+                    'volume_score': self._number(row['volume_score']),
+                    'momentum_score': self._number(row['momentum_score']),
+                    'crp_probability_score': self._number(row['crp_probability_score']),
+                    'close_position': str(row['close_position'] or 'Unknown'),
+                }))
+
+            if cache_key:
+                self._set_cached_result(cache_key, results)
+
+            self._log_scanner_operation("get_crp_candidates_range", start_time, len(results))
+            return results
+
+        except Exception as e:
+            self._log_db_error("get_crp_candidates_range", query, params, e)
+            raise
+
+    def get_breakout_candidates_range(
+        self,
+        start_date: date,
+        end_date: date,
+        cutoff_time: time,
+        end_time: time,
+        config: Dict[str, Any],
+        max_results: int,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get breakout candidates with end-of-day prices for every day in a range.
+
+        The volume ratio window is partitioned by (symbol, date), so each day
+        is scored exactly as ``get_breakout_candidates`` scores it alone.
+
+        Args:
+            start_date: First date to scan
+            end_date: Last date to scan
+            cutoff_time: Time cutoff for candidate bars
+            end_time: End time for the trading day
+            config: Scanner configuration parameters
+            max_results: Maximum number of candidates per day
+
+        Returns:
+            List of breakout candidate dictionaries ordered by scan_date and rank
+        """
+        start_time = time_module.time()
+        cache_key = self._get_cache_key(
+            "breakout_candidates_range", start_date, end_date, cutoff_time, end_time, str(config), max_results
+        )
+        cached_result = self._get_cached_result(cache_key)
+        if cached_result is not None:
+            self._log_scanner_operation("breakout_candidates_range_cache_hit", start_time, len(cached_result))
+            return cached_result
+
+        query = ""
+        params = self._range_params(start_date, end_date, cutoff_time, end_time, config, max_results)
+        try:
+            source = self._range_source(start_date, end_date)
+            query = f"""
+                WITH candidates AS (
+                    SELECT
+                        symbol,
+                        date_partition as scan_date,
+                        timestamp as bar_timestamp,
+                        close as breakout_price,
+                        open as open_price,
+                        high as current_high,
+                        low as current_low,
+                        volume as current_volume,
+                        high - close as breakout_above_resistance,
+                        (high - close) / NULLIF(close, 0) * 100 as breakout_pct,
+                        volume / NULLIF(AVG(volume) OVER (PARTITION BY symbol, date_partition ORDER BY timestamp ROWS 4 PRECEDING), 0) as volume_ratio,
+                        (
+                            CASE WHEN ((high - close) / NULLIF(close, 0) * 100) > 2.0 THEN 0.5
+                                 WHEN ((high - close) / NULLIF(close, 0) * 100) > 1.0 THEN 0.3
+                                 WHEN ((high - close) / NULLIF(close, 0) * 100) > 0.5 THEN 0.2
+                                 ELSE 0.1 END +
+                            CASE WHEN volume > 50000 THEN 0.3
+                                 WHEN volume > 20000 THEN 0.2
+                                 WHEN volume > 10000 THEN 0.1
+                                 ELSE 0.05 END +
+                            CASE WHEN (close - open) / NULLIF(open, 0) > 0.01 THEN 0.2 ELSE 0 END
+                        ) * 100 as probability_score
+                    FROM {source}
+                    WHERE date_partition BETWEEN $1 AND $2
+                      AND CAST(timestamp AS TIME) <= $3
+                      AND close BETWEEN $6 AND $7
+                      AND high > close * 1.005
+                      AND volume > 10000
+                ),
+            """ + self._RANGE_EOD_SQL.format(
+                source=source,
+                score="probability_score",
+                filter="probability_score > 10",
+            )
+
+            df_results = self._range_query(query, params)
+
+            results = []
+            for row in df_results.to_dict('records'):
+                results.append(self._with_eod(row, {
+                    'symbol': str(row['symbol']),
+                    'breakout_price': self._number(row['breakout_price']),
+                    'open_price': self._number(row['open_price']),
+                    'current_high': self._number(row['current_high']),
+                    'current_low': self._number(row['current_low']),
+                    'current_volume': self._number(row['current_volume'], int),
+                    'breakout_above_resistance': self._number(row['breakout_above_resistance']),
+                    'breakout_pct': self._number(row['breakout_pct']),
+                    'volume_ratio': self._number(row['volume_ratio']),
+                    'probability_score': self._number(row['probability_score']),
+                }))
+
+            if cache_key:
+                self._set_cached_result(cache_key, results)
+
+            self._log_scanner_operation("get_breakout_candidates_range", start_time, len(results))
+            return results
+
+        except Exception as e:
+            self._log_db_error("get_breakout_candidates_range", query, params, e)
+            raise
+
     def clear_cache(self):
         """Clear all cached results."""
-        if self._cache:
+        if self._cache is not None:
             self._cache.clear()
             self._logger.info("Scanner result cache cleared")
 
@@ -874,14 +1224,14 @@ class DuckDBScannerReadAdapter(ScannerReadPort):
         if not self.enable_cache or self._cache is None:
             return {"enabled": False}
 
-        total_entries = len(self._cache)
-        current_time = time_module.time()
-        expired_entries = sum(1 for _, (timestamp, _) in self._cache.items()
-                             if current_time - timestamp > self.cache_ttl)
-
+        stats = self._cache.get_stats()
         return {
             "enabled": self.enable_cache,
-            "total_entries": total_entries,
-            "expired_entries": expired_entries,
+            "total_entries": stats.entries,
+            "expired_entries": stats.expirations,
+            "invalidated_entries": stats.invalidations,
+            "evicted_entries": stats.evictions,
+            "cached_bytes": stats.bytes,
+            "hit_rate": stats.hit_rate,
             "ttl_seconds": self.cache_ttl
         }
@@ -25,6 +25,12 @@ class DatabaseSettings(BaseSettings):
     parquet_glob: Optional[str] = Field(default=None)
     # Whether to auto-create a unified view that unions DB table with Parquet scan
     use_parquet_in_unified_view: bool = Field(default=True)
+    # Root of the compacted, symbol-sorted period files produced by ParquetCompactor
+    compacted_parquet_root: Optional[str] = Field(default=None)
+    # Period size of compacted files: day, month or year
+    compaction_granularity: str = Field(default="month")
+    # Maintain a parquet_catalog table and read exact file lists instead of globbing
+    use_parquet_catalog: bool = Field(default=False)
     # Performance/diagnostics switches
     enable_object_cache: bool = Field(default=True)
     enable_profiling: bool = Field(default=False)
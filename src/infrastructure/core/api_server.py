@@ -3,7 +3,7 @@ REST API Server for DuckDB Financial Infrastructure
 Provides HTTP endpoints for querying and resampling financial data.
 """
 
-from fastapi import FastAPI, HTTPException, Query, Depends
+from fastapi import FastAPI, HTTPException, Query, Depends, Header
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any, Union
@@ -15,6 +15,7 @@ import json
 from .singleton_database import DuckDBConnectionManager
 from .query_api import QueryAPI, TimeFrame
 from .data_loader import DataLoader
+from .response_formats import JSON, negotiate_format, stream_response
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -55,6 +56,14 @@ app = FastAPI(
     - **Close**: Closing price
     - **Volume**: Trading volume
 
+    ### Response Formats
+    `/market-data` and `/resample` negotiate the response format from the `Accept`
+    header (or a `format` query parameter) and stream large results in chunks:
+    - `application/json` - buffered JSON (default)
+    - `application/vnd.apache.arrow.stream` (`format=arrow`) - Arrow IPC stream
+    - `application/vnd.apache.parquet` (`format=parquet`) - Parquet file
+    - `application/x-ndjson` (`format=ndjson`) - one JSON record per line
+
     ### Authentication
     Currently no authentication required. In production, implement appropriate security measures.
 
@@ -425,13 +434,19 @@ async def health_check():
                               "count": 1,
                               "columns": ["symbol", "timestamp", "open", "high", "low", "close", "volume", "date_partition"]
                           }
-                      }
+                      },
+                      "application/vnd.apache.arrow.stream": {},
+                      "application/vnd.apache.parquet": {},
+                      "application/x-ndjson": {}
                   }
               },
               400: {"description": "Invalid request parameters"},
               500: {"description": "Internal server error"}
           })
-async def get_market_data(request: QueryRequest, db: DuckDBConnectionManager = Depends(get_db_manager)):
+async def get_market_data(request: QueryRequest,
+                          accept: Optional[str] = Header(None),
+                          format: Optional[str] = Query(None, description="arrow, parquet, ndjson or json"),
+                          db: DuckDBConnectionManager = Depends(get_db_manager)):
     """
     ## Get Raw Market Data
     
@@ -451,8 +466,25 @@ async def get_market_data(request: QueryRequest, db: DuckDBConnectionManager = D
     - Typical response time: <10ms for 1000 records
     - Supports queries across millions of records
     - Optimized for time-series analysis
+    - Arrow, Parquet and NDJSON responses are streamed batch by batch
     """
     try:
+        media_type = negotiate_format(accept, format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        if media_type != JSON:
+            reader = QueryAPI(db).market_data_reader(
+                symbol=request.symbol,
+                start_date=request.start_date,
+                end_date=request.end_date,
+                start_time=request.start_time,
+                end_time=request.end_time,
+                limit=request.limit
+            )
+            return stream_response(reader, media_type, filename=f"market_data_{request.symbol or 'all'}")
+        
         df = db.query_market_data(
             symbol=request.symbol,
             start_date=request.start_date,
@@ -493,13 +525,19 @@ async def get_market_data(request: QueryRequest, db: DuckDBConnectionManager = D
                               "count": 1,
                               "columns": ["symbol", "timestamp", "open", "high", "low", "close", "volume", "tick_count", "timeframe"]
                           }
-                      }
+                      },
+                      "application/vnd.apache.arrow.stream": {},
+                      "application/vnd.apache.parquet": {},
+                      "application/x-ndjson": {}
                   }
               },
               400: {"description": "Invalid timeframe or parameters"},
               500: {"description": "Internal server error"}
           })
-async def resample_data(request: ResampleRequest, query_api: QueryAPI = Depends(get_query_api)):
+async def resample_data(request: ResampleRequest,
+                        accept: Optional[str] = Header(None),
+                        format: Optional[str] = Query(None, description="arrow, parquet, ndjson or json"),
+                        query_api: QueryAPI = Depends(get_query_api)):
     """
     ## Resample Data to Higher Timeframes
     
@@ -534,13 +572,30 @@ async def resample_data(request: ResampleRequest, query_api: QueryAPI = Depends(
     - Typical response time: 2-5ms per timeframe
     - Uses DuckDB's optimized time_bucket function
     - Handles millions of records efficiently
+    - Arrow, Parquet and NDJSON responses are streamed batch by batch
     """
+    try:
+        media_type = negotiate_format(accept, format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     try:
         # Validate timeframe
         valid_timeframes = ["1T", "5T", "15T", "30T", "1H", "4H", "1D", "1W", "1M"]
         if request.timeframe not in valid_timeframes:
             raise HTTPException(status_code=400, detail=f"Invalid timeframe. Must be one of: {valid_timeframes}")
         
+        if media_type != JSON:
+            reader = query_api.resample_reader(
+                symbol=request.symbol,
+                timeframe=request.timeframe,
+                start_date=request.start_date,
+                end_date=request.end_date,
+                start_time=request.start_time,
+                end_time=request.end_time
+            )
+            return stream_response(reader, media_type, filename=f"{request.symbol}_{request.timeframe}")
+        
         df = query_api.resample_data(
             symbol=request.symbol,
             timeframe=request.timeframe,
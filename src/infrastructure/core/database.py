@@ -6,11 +6,14 @@ Provides connection and schema management for parquet-based financial data.
 import duckdb
 import os
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 import logging
 from datetime import datetime, date, timedelta
 import pandas as pd
 
+from src.infrastructure.services.result_cache import bump_table_version
+from .ohlcv_rollups import build_rollups, day_ranges, frame_ranges, refresh_rollups
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -140,6 +143,18 @@ class DuckDBManager:
         
         logger.info("Created database schema with tables: market_data, symbols")
     
+    def create_rollups(self) -> int:
+        """
+        Build the materialized 5m/15m/30m/1h/1d OHLCV rollups.
+        
+        Once built, every load through this manager refreshes the affected
+        buckets and ``QueryAPI`` resamples from the rollups.
+        
+        Returns:
+            Number of 5-minute buckets written
+        """
+        return build_rollups(self.connect())
+    
     def get_available_symbols(self) -> List[str]:
         """
         Get list of available symbols from the file system.
@@ -222,7 +237,8 @@ class DuckDBManager:
         
         logger.info(f"Loading data for {symbol} from {start_date} to {end_date}")
         
-        # Iterate through date range
+        # Collect the symbol's daily files in the date range
+        file_paths = []
         current_date = start_date
         while current_date <= end_date:
             year = current_date.year
@@ -231,44 +247,60 @@ class DuckDBManager:
             
             # Construct file path
             file_path = self.data_root / str(year) / f"{month:02d}" / f"{day:02d}" / f"{symbol}_minute_{current_date}.parquet"
-            
             if file_path.exists():
-                try:
-                    # Read parquet file
-                    df = pd.read_parquet(file_path)
-                    
-                    if not df.empty:
-                        # Add metadata columns
-                        df['symbol'] = symbol
-                        df['date_partition'] = current_date
-                        
-                        # Create timestamp from index (assuming index represents minutes from market open)
-                        # Reset index to ensure we have a clean integer sequence
-                        df = df.reset_index(drop=True)
-                        market_open = pd.to_datetime(f"{current_date} 09:15:00")
-                        df['timestamp'] = market_open + pd.to_timedelta(df.index, unit='m')
-                        
-                        # Reorder columns
-                        df = df[['symbol', 'timestamp', 'open', 'high', 'low', 'close', 'volume', 'date_partition']]
-                        
-                        # Insert into database using DuckDB's efficient bulk insert
-                        conn.execute("INSERT INTO market_data SELECT * FROM df")
-                        records_loaded += len(df)
-                        
-                        logger.debug(f"Loaded {len(df)} records for {symbol} on {current_date}")
-                
-                except Exception as e:
-                    logger.error(f"Error loading {file_path}: {e}")
+                file_paths.append(str(file_path))
             
             # Move to next day using safe arithmetic
             current_date = current_date + timedelta(days=1)
         
-        # Update symbols table
+        if file_paths:
+            try:
+                # One INSERT ... SELECT over all files instead of a pandas round trip per day
+                records_loaded = self._insert_symbol_files(conn, symbol, file_paths)
+            except Exception as e:
+                logger.warning(f"Bulk load failed for {symbol}, loading files one by one: {e}")
+                for file_path in file_paths:
+                    try:
+                        records_loaded += self._insert_symbol_files(conn, symbol, [file_path])
+                    except Exception as e:
+                        logger.error(f"Error loading {file_path}: {e}")
+        
+        # Update symbols table and the rollup buckets of the loaded days
         self._update_symbol_metadata(symbol)
+        if records_loaded:
+            refresh_rollups(conn, day_ranges(symbol, start_date, end_date))
+        bump_table_version('market_data', 'symbols')
         
         logger.info(f"Loaded {records_loaded} records for {symbol}")
         return records_loaded
     
+    @staticmethod
+    def _insert_symbol_files(conn: duckdb.DuckDBPyConnection, symbol: str, file_paths: List[str]) -> int:
+        """
+        Insert a symbol's daily minute files with a single INSERT ... SELECT.
+        
+        Timestamps are synthesized as minutes from the 09:15 market open (row
+        order within each file); the date partition comes from the file name.
+        
+        Args:
+            conn: DuckDB connection
+            symbol: Symbol the files belong to
+            file_paths: Parquet files named SYMBOL_minute_YYYY-MM-DD.parquet
+            
+        Returns:
+            Number of records inserted
+        """
+        return conn.execute(r"""
+            INSERT INTO market_data (symbol, timestamp, open, high, low, close, volume, date_partition)
+            SELECT ?, file_date + INTERVAL '9 hours 15 minutes' + to_minutes(file_row_number),
+                   open, high, low, close, volume, file_date
+            FROM (
+                SELECT open, high, low, close, volume, file_row_number,
+                       CAST(regexp_extract(filename, '(\d{4}-\d{2}-\d{2})\.parquet$', 1) AS DATE) AS file_date
+                FROM read_parquet(?, filename = true, file_row_number = true, union_by_name = true)
+            )
+        """, [symbol, file_paths]).fetchone()[0]
+    
     def _update_symbol_metadata(self, symbol: str):
         """Update metadata for a symbol in the symbols table."""
         conn = self.connect()
@@ -319,7 +351,22 @@ class DuckDBManager:
             DataFrame with filtered market data
         """
         conn = self.connect()
+        query, params = self.market_data_query(symbol, start_date, end_date, start_time, end_time, limit)
+        return conn.execute(query, params).df()
+    
+    @staticmethod
+    def market_data_query(symbol: Optional[str] = None,
+                          start_date: Optional[date] = None,
+                          end_date: Optional[date] = None,
+                          start_time: Optional[str] = None,
+                          end_time: Optional[str] = None,
+                          limit: Optional[int] = None) -> Tuple[str, List[Any]]:
+        """
+        Build the filtered market data query used by ``query_market_data``.
         
+        Returns:
+            Tuple of (SQL, parameters)
+        """
         # Build query
         where_clauses = []
         params = []
@@ -354,9 +401,9 @@ class DuckDBManager:
         """
         
         if limit:
-            query += f" LIMIT {limit}"
+            query += f" LIMIT {int(limit)}"
         
-        return conn.execute(query, params).df()
+        return query, params
     
     def get_symbols_info(self) -> pd.DataFrame:
         """
@@ -412,6 +459,8 @@ class DuckDBManager:
             # Get count of records that were actually inserted
             # Since we use ON CONFLICT DO NOTHING, we need to check what was actually inserted
             records_inserted = len(df_insert)
+            refresh_rollups(conn, frame_ranges(df_insert))
+            bump_table_version('market_data')
             
             logger.info(f"Inserted {records_inserted} records into market_data table")
             return records_inserted
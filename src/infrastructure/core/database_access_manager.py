@@ -3,59 +3,132 @@ Database Access Manager - Handles Concurrent Database Access
 
 This module provides a proper database access management system that can handle
 concurrent requests, manage locks, and ensure data consistency.
+
+Requests carry an intent. Reads are served by a pool of reader threads and run
+in parallel; writes go through a single writer thread that commits queued
+writes in groups. When the manager is given a ``ConnectionPool`` each
+operation receives a connection: reads get their own cursor on the shared
+database instance (an MVCC snapshot), writes get the writer lane inside the
+group's transaction.
 """
 
 import threading
 import queue
 import time
 import logging
-from typing import Any, Callable, Optional
+from collections import deque
+from concurrent.futures import Future
+from enum import Enum
+from itertools import count
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, Optional
 from contextlib import contextmanager
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+if TYPE_CHECKING:
+    from src.infrastructure.database.unified_duckdb import ConnectionPool
 
 logger = logging.getLogger(__name__)
 
 
+class AccessIntent(str, Enum):
+    """Whether a request only reads or also modifies the database."""
+    READ = "read"
+    WRITE = "write"
+
+
 @dataclass
 class DatabaseRequest:
     """Represents a database access request."""
     request_id: str
-    operation: Callable[[], Any]
+    operation: Callable[..., Any]
     callback: Optional[Callable[[Any], None]] = None
     priority: int = 1  # Higher priority = processed first
+    intent: AccessIntent = AccessIntent.WRITE
+    submitted_at: float = field(default_factory=time.perf_counter)
+    future: Future = field(default_factory=Future)
+
+
+class _IntentStats:
+    """Counters and recent wait/run times for one intent."""
+
+    def __init__(self, window: int = 1000):
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.wait_times: Deque[float] = deque(maxlen=window)
+        self.run_times: Deque[float] = deque(maxlen=window)
+
+    @staticmethod
+    def _summary(samples: Deque[float]) -> Dict[str, float]:
+        if not samples:
+            return {'avg_ms': 0.0, 'p95_ms': 0.0, 'max_ms': 0.0}
+        ordered = sorted(samples)
+        return {
+            'avg_ms': sum(ordered) / len(ordered) * 1000,
+            'p95_ms': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+            'max_ms': ordered[-1] * 1000,
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'wait': self._summary(self.wait_times),
+            'latency': self._summary(self.run_times),
+        }
 
 
 class DatabaseAccessManager:
     """
     Manages concurrent database access with proper queuing and synchronization.
 
-    This class ensures that database operations are processed sequentially
-    to avoid lock conflicts while allowing multiple threads to queue requests.
+    Reads run concurrently on ``max_readers`` threads. Writes are processed
+    sequentially by one writer to avoid lock conflicts; consecutive queued
+    writes (up to ``max_group_size``) share one transaction. If any write in
+    a group fails the group is rolled back and its writes are retried one by
+    one, so only the failing request reports an error.
     """
 
-    def __init__(self, max_queue_size: int = 100, max_workers: int = 1):
+    def __init__(self, max_queue_size: int = 100, max_workers: int = 1,
+                 max_readers: int = 4, max_group_size: int = 32,
+                 connection_pool: Optional["ConnectionPool"] = None):
         """
         Initialize the database access manager.
 
         Args:
-            max_queue_size: Maximum number of queued requests
-            max_workers: Number of worker threads (keep at 1 for database safety)
+            max_queue_size: Maximum number of queued requests per intent
+            max_workers: Number of write worker threads (keep at 1 for database safety)
+            max_readers: Number of reader threads serving read requests in parallel
+            max_group_size: Maximum number of writes committed in one transaction
+            connection_pool: Optional pool whose ``reader()``/``writer()``
+                connections are passed to operations
         """
         self.max_queue_size = max_queue_size
         self.max_workers = max_workers
+        self.max_readers = max_readers
+        self.max_group_size = max_group_size
+        self.connection_pool = connection_pool
 
         # Thread synchronization
         self._lock = threading.RLock()
-        self._queue = queue.PriorityQueue(maxsize=max_queue_size)
-        self._results = {}  # request_id -> result
-        self._errors = {}   # request_id -> error
-
-        # Worker thread
-        self._worker_thread = None
+        self._queues = {
+            AccessIntent.READ: queue.PriorityQueue(maxsize=max_queue_size),
+            AccessIntent.WRITE: queue.PriorityQueue(maxsize=max_queue_size),
+        }
+        self._futures: Dict[str, Future] = {}  # request_id -> pending or finished result
+        self._stats = {intent: _IntentStats() for intent in AccessIntent}
+        self._groups_committed = 0
+        self._grouped_writes = 0
+        self._sequence = count()
+
+        # Worker threads
+        self._threads: List[threading.Thread] = []
         self._running = False
         self._request_counter = 0
 
-        logger.info(f"Database Access Manager initialized (max_queue: {max_queue_size}, workers: {max_workers})")
+        logger.info(f"Database Access Manager initialized (max_queue: {max_queue_size}, "
+                    f"writers: {max_workers}, readers: {max_readers})")
 
     def start(self):
         """Start the database access manager."""
@@ -64,42 +137,55 @@ class DatabaseAccessManager:
                 return
 
             self._running = True
-            self._worker_thread = threading.Thread(target=self._worker_loop, daemon=True)
-            self._worker_thread.start()
+            workers = [(self._reader_loop, f"db-reader-{i}") for i in range(self.max_readers)]
+            workers += [(self._writer_loop, f"db-writer-{i}") for i in range(self.max_workers)]
+            self._threads = [threading.Thread(target=target, name=name, daemon=True) for target, name in workers]
+            for thread in self._threads:
+                thread.start()
 
             logger.info("Database Access Manager started")
 
     def stop(self):
-        """Stop the database access manager."""
+        """Stop the database access manager, finishing queued requests first."""
         with self._lock:
             if not self._running:
                 return
 
             self._running = False
-            # Add a sentinel value to stop the worker
-            try:
-                self._queue.put_nowait((0, None))  # Priority 0, None request = stop signal
-            except:
-                pass
+            # One stop sentinel per worker, ordered after all queued requests
+            for intent, workers in ((AccessIntent.READ, self.max_readers), (AccessIntent.WRITE, self.max_workers)):
+                for _ in range(workers):
+                    try:
+                        self._queues[intent].put((float('inf'), next(self._sequence), None), timeout=5)
+                    except queue.Full:
+                        pass
+
+            threads, self._threads = self._threads, []
 
-            if self._worker_thread:
-                self._worker_thread.join(timeout=5)
+        for thread in threads:
+            thread.join(timeout=5)
 
-            logger.info("Database Access Manager stopped")
+        logger.info("Database Access Manager stopped")
 
     def submit_request(
         self,
-        operation: Callable[[], Any],
+        operation: Callable[..., Any],
         priority: int = 1,
-        timeout: float = 30.0
+        timeout: float = 30.0,
+        intent: AccessIntent = AccessIntent.WRITE,
+        callback: Optional[Callable[[Any], None]] = None
     ) -> str:
         """
         Submit a database operation request.
 
         Args:
-            operation: Callable that performs the database operation
+            operation: Callable that performs the database operation; it is
+                called with a connection when the manager has a pool
             priority: Priority level (higher = processed first)
             timeout: Maximum time to wait for queue space
+            intent: ``AccessIntent.READ`` for read-only operations that may
+                run in parallel; anything else goes through the writer
+            callback: Called with the result once the operation succeeds
 
         Returns:
             Request ID for tracking the operation
@@ -107,6 +193,7 @@ class DatabaseAccessManager:
         Raises:
             queue.Full: If queue is full and timeout is exceeded
         """
+        intent = AccessIntent(intent)
         with self._lock:
             if not self._running:
                 raise RuntimeError("Database Access Manager is not running")
@@ -117,17 +204,26 @@ class DatabaseAccessManager:
             request = DatabaseRequest(
                 request_id=request_id,
                 operation=operation,
-                priority=priority
+                callback=callback,
+                priority=priority,
+                intent=intent
             )
+            self._futures[request_id] = request.future
 
-            # Use negative priority for Python's PriorityQueue (lower value = higher priority)
-            try:
-                self._queue.put((-priority, request), timeout=timeout)
-                logger.debug(f"Request {request_id} queued (priority: {priority})")
-                return request_id
-            except queue.Full:
-                logger.error(f"Request queue full, failed to submit request {request_id}")
-                raise
+        # Use negative priority for Python's PriorityQueue (lower value = higher priority);
+        # the sequence number keeps equal priorities FIFO
+        try:
+            self._queues[intent].put((-priority, next(self._sequence), request), timeout=timeout)
+        except queue.Full:
+            with self._lock:
+                self._futures.pop(request_id, None)
+            logger.error(f"Request queue full, failed to submit request {request_id}")
+            raise
+
+        with self._lock:
+            self._stats[intent].submitted += 1
+        logger.debug(f"Request {request_id} queued ({intent.value}, priority: {priority})")
+        return request_id
 
     def get_result(self, request_id: str, timeout: float = 30.0) -> Any:
         """
@@ -144,29 +240,27 @@ class DatabaseAccessManager:
             TimeoutError: If result not available within timeout
             Exception: If operation failed
         """
-        start_time = time.time()
-
-        while time.time() - start_time < timeout:
-            with self._lock:
-                if request_id in self._errors:
-                    error = self._errors[request_id]
-                    del self._errors[request_id]
-                    raise error
-
-                if request_id in self._results:
-                    result = self._results[request_id]
-                    del self._results[request_id]
-                    return result
-
-            time.sleep(0.1)  # Brief wait before checking again
-
-        raise TimeoutError(f"Result for request {request_id} not available within {timeout}s")
+        with self._lock:
+            future = self._futures.get(request_id)
+        if future is None:
+            raise KeyError(f"Unknown request {request_id}")
+
+        try:
+            result = future.result(timeout=timeout)
+        except TimeoutError:
+            raise TimeoutError(f"Result for request {request_id} not available within {timeout}s")
+        finally:
+            if future.done():
+                with self._lock:
+                    self._futures.pop(request_id, None)
+        return result
 
     def execute_sync(
         self,
-        operation: Callable[[], Any],
+        operation: Callable[..., Any],
         priority: int = 1,
-        timeout: float = 30.0
+        timeout: float = 30.0,
+        intent: AccessIntent = AccessIntent.WRITE
     ) -> Any:
         """
         Execute a database operation synchronously.
@@ -175,60 +269,197 @@ class DatabaseAccessManager:
             operation: Callable that performs the database operation
             priority: Priority level for the operation
             timeout: Maximum time to wait for completion
+            intent: Read or write intent of the operation
 
         Returns:
             Operation result
         """
-        request_id = self.submit_request(operation, priority, timeout)
+        request_id = self.submit_request(operation, priority, timeout, intent)
         return self.get_result(request_id, timeout)
 
-    def _worker_loop(self):
-        """Main worker loop that processes queued requests."""
-        logger.info("Database Access Manager worker started")
+    def execute_read(self, operation: Callable[..., Any], priority: int = 1, timeout: float = 30.0) -> Any:
+        """Run a read-only operation, concurrently with other reads."""
+        return self.execute_sync(operation, priority, timeout, AccessIntent.READ)
+
+    def execute_write(self, operation: Callable[..., Any], priority: int = 1, timeout: float = 30.0) -> Any:
+        """Run a write through the single writer (possibly group-committed)."""
+        return self.execute_sync(operation, priority, timeout, AccessIntent.WRITE)
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
 
-        while self._running:
+    def _next_request(self, intent: AccessIntent) -> Optional[DatabaseRequest]:
+        """Block for the next request; None means stop."""
+        while True:
             try:
-                # Get next request from queue
-                priority, request = self._queue.get(timeout=1.0)
+                _, _, request = self._queues[intent].get(timeout=1.0)
+            except queue.Empty:
+                if not self._running:
+                    return None
+                continue
+            self._queues[intent].task_done()
+            if request is not None:
+                self._record_wait(request)
+            return request
 
-                if request is None:  # Stop signal
-                    break
+    def _record_wait(self, request: DatabaseRequest):
+        with self._lock:
+            self._stats[request.intent].wait_times.append(time.perf_counter() - request.submitted_at)
+
+    def _finish(self, request: DatabaseRequest, started: float, result: Any = None,
+                error: Optional[BaseException] = None):
+        """Record timing and hand the outcome to the waiting caller."""
+        with self._lock:
+            stats = self._stats[request.intent]
+            stats.run_times.append(time.perf_counter() - started)
+            if error is None:
+                stats.completed += 1
+            else:
+                stats.failed += 1
+
+        if error is not None:
+            logger.error(f"Request {request.request_id} failed: {error}")
+            request.future.set_exception(error)
+            return
+
+        request.future.set_result(result)
+        logger.debug(f"Request {request.request_id} completed successfully")
+        if request.callback:
+            try:
+                request.callback(result)
+            except Exception as e:
+                logger.error(f"Callback for request {request.request_id} failed: {e}")
 
-                logger.debug(f"Processing request {request.request_id}")
+    def _reader_loop(self):
+        """Serve read requests; many of these run side by side."""
+        logger.info("Database Access Manager reader started")
 
-                try:
-                    # Execute the operation
-                    result = request.operation()
+        while True:
+            request = self._next_request(AccessIntent.READ)
+            if request is None:
+                break
 
-                    # Store the result
-                    with self._lock:
-                        self._results[request.request_id] = result
+            started = time.perf_counter()
+            try:
+                if self.connection_pool is not None:
+                    with self.connection_pool.reader() as conn:
+                        result = request.operation(conn)
+                else:
+                    result = request.operation()
+            except Exception as e:
+                self._finish(request, started, error=e)
+            else:
+                self._finish(request, started, result)
 
-                    logger.debug(f"Request {request.request_id} completed successfully")
+        logger.info("Database Access Manager reader stopped")
 
-                except Exception as e:
-                    logger.error(f"Request {request.request_id} failed: {e}")
+    def _writer_loop(self):
+        """Serve write requests one group at a time."""
+        logger.info("Database Access Manager worker started")
 
-                    # Store the error
-                    with self._lock:
-                        self._errors[request.request_id] = e
+        while True:
+            request = self._next_request(AccessIntent.WRITE)
+            if request is None:
+                break
 
-                finally:
-                    # Mark task as done
-                    self._queue.task_done()
+            group = [request]
+            stop = False
+            while len(group) < self.max_group_size:
+                try:
+                    _, _, queued = self._queues[AccessIntent.WRITE].get_nowait()
+                except queue.Empty:
+                    break
+                self._queues[AccessIntent.WRITE].task_done()
+                if queued is None:
+                    stop = True
+                    break
+                self._record_wait(queued)
+                group.append(queued)
 
-            except queue.Empty:
-                continue
+            try:
+                self._run_write_group(group)
             except Exception as e:
                 logger.error(f"Worker loop error: {e}")
-                time.sleep(1.0)  # Brief pause on error
+                for pending in group:
+                    if not pending.future.done():
+                        pending.future.set_exception(e)
+
+            if stop:
+                break
 
         logger.info("Database Access Manager worker stopped")
 
+    def _run_write_group(self, group: List[DatabaseRequest]):
+        """Commit a group of writes together, isolating failures on retry."""
+        if self.connection_pool is None:
+            # Operations manage their own connections; nothing to group under
+            for request in group:
+                self._run_write(request, None)
+            return
+
+        with self.connection_pool.writer() as conn:
+            if len(group) > 1:
+                started = time.perf_counter()
+                results = []
+                try:
+                    conn.begin()
+                    for request in group:
+                        results.append(request.operation(conn))
+                    conn.commit()
+                except Exception as e:
+                    conn.rollback()
+                    logger.warning(f"Write group of {len(group)} rolled back ({e}); retrying individually")
+                else:
+                    with self._lock:
+                        self._groups_committed += 1
+                        self._grouped_writes += len(group)
+                    for request, result in zip(group, results):
+                        self._finish(request, started, result)
+                    return
+
+            for request in group:
+                self._run_write(request, conn)
+
+    def _run_write(self, request: DatabaseRequest, conn):
+        started = time.perf_counter()
+        try:
+            if conn is None:
+                result = request.operation()
+            else:
+                conn.begin()
+                try:
+                    result = request.operation(conn)
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+        except Exception as e:
+            self._finish(request, started, error=e)
+        else:
+            self._finish(request, started, result)
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth, wait time and latency per intent, plus group-commit counts."""
+        with self._lock:
+            stats = {intent.value: self._stats[intent].snapshot() for intent in AccessIntent}
+            for intent in AccessIntent:
+                stats[intent.value]['queue_depth'] = self._queues[intent].qsize()
+            stats['write_groups'] = {
+                'committed': self._groups_committed,
+                'writes': self._grouped_writes,
+                'avg_size': self._grouped_writes / self._groups_committed if self._groups_committed else 0.0,
+            }
+            return stats
+
     @property
     def queue_size(self) -> int:
         """Get current queue size."""
-        return self._queue.qsize()
+        return sum(q.qsize() for q in self._queues.values())
 
     @property
     def is_running(self) -> bool:
@@ -259,16 +490,11 @@ def database_access_context():
 
     Usage:
         with database_access_context() as db:
-            result = db.execute_query("SELECT * FROM table")
+            result = db.execute_read(lambda: repo.query("SELECT * FROM table"))
     """
     manager = get_database_access_manager()
 
-    # This would need to be integrated with the actual database manager
-    # For now, it's a placeholder for the concept
     try:
         yield manager
     finally:
         pass
-
-
-
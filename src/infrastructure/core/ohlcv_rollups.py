@@ -0,0 +1,227 @@
+"""
+Materialized multi-timeframe OHLCV rollups.
+
+Resampling used to aggregate raw minute bars on every request. The rollup
+tables hold the same ``time_bucket`` FIRST/MAX/MIN/LAST/SUM aggregates,
+derived hierarchically so every level reads the one below it:
+
+    minute bars -> 5m -> 15m -> 30m -> 1h -> 1d
+
+Rollups are opt-in: ``build_rollups`` creates and fills the tables, after
+which ingest paths call ``refresh_rollups`` with the (symbol, time range)
+they wrote and only the buckets covering those ranges are recomputed.
+Parquet files entering or leaving the lake behind ``market_data_unified``
+are handled by ``SchemaManager.refresh_parquet_catalog``, which refreshes
+the days those files cover.
+``rollup_for`` picks the coarsest level a requested timeframe can be
+re-aggregated from (e.g. 4H from 1h, weekly and monthly from 1d).
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import duckdb
+import pandas as pd
+
+from src.infrastructure.services.result_cache import bump_table_version
+
+logger = logging.getLogger(__name__)
+
+#: (symbol, first timestamp, last timestamp) written by an ingest, inclusive
+RollupRange = Tuple[str, datetime, datetime]
+
+
+@dataclass(frozen=True)
+class RollupLevel:
+    """One materialized timeframe and the relation it is aggregated from."""
+    timeframe: str
+    minutes: int
+    table: str
+    interval: str
+    parent: Optional[str]  # None: the minute-bar source
+
+    @property
+    def bucket_sql(self) -> str:
+        return f"time_bucket(INTERVAL '{self.interval}', timestamp)"
+
+
+ROLLUP_LEVELS: Tuple[RollupLevel, ...] = (
+    RollupLevel("5T", 5, "market_data_5m", "5 minutes", None),
+    RollupLevel("15T", 15, "market_data_15m", "15 minutes", "market_data_5m"),
+    RollupLevel("30T", 30, "market_data_30m", "30 minutes", "market_data_15m"),
+    RollupLevel("1H", 60, "market_data_1h", "1 hours", "market_data_30m"),
+    RollupLevel("1D", 1440, "market_data_1d", "1 day", "market_data_1h"),
+)
+
+#: Width in minutes of each resample timeframe; months are only whole days
+TIMEFRAME_MINUTES = {
+    "1T": 1, "5T": 5, "15T": 15, "30T": 30, "1H": 60, "4H": 240,
+    "1D": 1440, "1W": 10080, "1M": None,
+}
+
+_CREATE_SQL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        symbol VARCHAR NOT NULL,
+        timestamp TIMESTAMP NOT NULL,
+        open DOUBLE,
+        high DOUBLE,
+        low DOUBLE,
+        close DOUBLE,
+        volume BIGINT,
+        tick_count BIGINT,
+        date_partition DATE
+    )
+"""
+
+
+def rollup_for(timeframe: str, has_time_filter: bool = False) -> Optional[RollupLevel]:
+    """
+    Coarsest rollup a timeframe can be re-aggregated from, or None for raw bars.
+
+    Intraday time-of-day filters apply to minute timestamps, so they always
+    read the raw bars.
+    """
+    if has_time_filter or timeframe not in TIMEFRAME_MINUTES:
+        return None
+    minutes = TIMEFRAME_MINUTES[timeframe]
+    candidates = [level for level in ROLLUP_LEVELS
+                  if (minutes is None and level.minutes == 1440)
+                  or (minutes is not None and minutes % level.minutes == 0)]
+    return candidates[-1] if candidates else None
+
+
+def _relation_exists(conn: duckdb.DuckDBPyConnection, name: str) -> bool:
+    return conn.execute(
+        "SELECT (SELECT count(*) FROM duckdb_tables() WHERE table_name = ?)"
+        " + (SELECT count(*) FROM duckdb_views() WHERE view_name = ?)",
+        [name, name]).fetchone()[0] > 0
+
+
+def rollups_enabled(conn: duckdb.DuckDBPyConnection) -> bool:
+    """True once ``build_rollups`` has created every rollup table."""
+    count = conn.execute(
+        "SELECT count(*) FROM duckdb_tables() WHERE table_name IN ({})".format(
+            ", ".join("?" for _ in ROLLUP_LEVELS)),
+        [level.table for level in ROLLUP_LEVELS]).fetchone()[0]
+    return count == len(ROLLUP_LEVELS)
+
+
+def source_relation(conn: duckdb.DuckDBPyConnection) -> str:
+    """Minute bars the rollups summarize: the unified view when present, as resampling reads it."""
+    return "market_data_unified" if _relation_exists(conn, "market_data_unified") else "market_data"
+
+
+def _aggregate_sql(level: RollupLevel, source: str, where: str = "") -> str:
+    tick_count = "COUNT(*)" if level.parent is None else "SUM(tick_count)"
+    return f"""
+        SELECT symbol,
+               {level.bucket_sql} AS bucket,
+               FIRST(open ORDER BY timestamp) AS open,
+               MAX(high) AS high,
+               MIN(low) AS low,
+               LAST(close ORDER BY timestamp) AS close,
+               SUM(volume) AS volume,
+               {tick_count} AS tick_count,
+               CAST({level.bucket_sql} AS DATE) AS date_partition
+        FROM {level.parent or source} src
+        {where}
+        GROUP BY symbol, bucket
+    """
+
+
+def _run_in_transaction(conn: duckdb.DuckDBPyConnection, statements: Iterable[Tuple[str, list]]):
+    """Run statements atomically, joining the caller's transaction if one is open."""
+    try:
+        conn.begin()
+    except duckdb.TransactionException:
+        for sql, params in statements:
+            conn.execute(sql, params)
+        return
+    try:
+        for sql, params in statements:
+            conn.execute(sql, params)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def build_rollups(conn: duckdb.DuckDBPyConnection) -> int:
+    """
+    Create (or rebuild) every rollup table from the minute bars.
+
+    Returns the number of 5-minute buckets written.
+    """
+    source = source_relation(conn)
+    statements = []
+    for level in ROLLUP_LEVELS:
+        statements.append((_CREATE_SQL.format(table=level.table), []))
+        statements.append((f"DELETE FROM {level.table}", []))
+        statements.append((f"INSERT INTO {level.table} {_aggregate_sql(level, source)}", []))
+    _run_in_transaction(conn, statements)
+    bump_table_version(*(level.table for level in ROLLUP_LEVELS))
+    count = conn.execute(f"SELECT count(*) FROM {ROLLUP_LEVELS[0].table}").fetchone()[0]
+    logger.info(f"Built OHLCV rollups from {source}: {count} 5-minute buckets")
+    return count
+
+
+def refresh_rollups(conn: duckdb.DuckDBPyConnection, ranges: Sequence[RollupRange]) -> bool:
+    """
+    Recompute only the rollup buckets that overlap newly written minute bars.
+
+    Each level deletes and re-aggregates the buckets covering the ranges,
+    reading the level below (already refreshed). Does nothing when rollups
+    have not been built.
+
+    Args:
+        conn: Connection that wrote the bars
+        ranges: (symbol, first timestamp, last timestamp) per written span
+
+    Returns:
+        True if rollups were refreshed
+    """
+    if not ranges or not rollups_enabled(conn):
+        return False
+
+    frame = pd.DataFrame(list(ranges), columns=["symbol", "lo", "hi"])
+    frame["lo"] = pd.to_datetime(frame["lo"])
+    frame["hi"] = pd.to_datetime(frame["hi"])
+
+    source = source_relation(conn)
+    statements = []
+    for level in ROLLUP_LEVELS:
+        width = f"INTERVAL '{level.interval}'"
+        covered = (f"r.symbol = {{alias}}.symbol "
+                   f"AND {{alias}}.timestamp >= time_bucket({width}, r.lo) "
+                   f"AND {{alias}}.timestamp < time_bucket({width}, r.hi) + {width}")
+        statements.append((
+            f"DELETE FROM {level.table} t USING rollup_ranges r WHERE {covered.format(alias='t')}", []))
+        where = f"WHERE EXISTS (SELECT 1 FROM rollup_ranges r WHERE {covered.format(alias='src')})"
+        statements.append((f"INSERT INTO {level.table} {_aggregate_sql(level, source, where)}", []))
+
+    conn.register("rollup_ranges", frame)
+    try:
+        _run_in_transaction(conn, statements)
+    finally:
+        conn.unregister("rollup_ranges")
+    bump_table_version(*(level.table for level in ROLLUP_LEVELS))
+    logger.debug(f"Refreshed OHLCV rollups for {frame['symbol'].nunique()} symbols")
+    return True
+
+
+def day_ranges(symbol: str, start_date: date, end_date: date) -> List[RollupRange]:
+    """Range covering whole trading days, for loaders that write by date."""
+    return [(symbol, datetime.combine(start_date, time.min),
+             datetime.combine(end_date, time.min) + timedelta(days=1) - timedelta(microseconds=1))]
+
+
+def frame_ranges(df: pd.DataFrame, symbol_column: str = "symbol",
+                 timestamp_column: str = "timestamp") -> List[RollupRange]:
+    """Per-symbol first/last timestamp of rows about to be (or just) written."""
+    if df.empty:
+        return []
+    spans = df.assign(**{timestamp_column: pd.to_datetime(df[timestamp_column])}) \
+        .groupby(symbol_column)[timestamp_column].agg(["min", "max"])
+    return [(symbol, row["min"].to_pydatetime(), row["max"].to_pydatetime()) for symbol, row in spans.iterrows()]
@@ -4,12 +4,16 @@ Supports complex queries, resampling, and analytical operations.
 """
 
 import pandas as pd
+import pyarrow as pa
 from typing import Optional, List, Dict, Any, Union
 from datetime import date, datetime, timedelta
 import logging
 from enum import Enum
 
 from .database import DuckDBManager
+from .ohlcv_rollups import rollup_for, rollups_enabled
+from .response_formats import DEFAULT_BATCH_SIZE, execute_reader
+from ..duckdb_framework.correlation import correlation_frame, load_returns
 
 logger = logging.getLogger(__name__)
 
@@ -32,20 +36,23 @@ class QueryAPI:
     Advanced query interface for financial data with resampling and analytical capabilities.
     
     Features:
-    - Data resampling to higher timeframes
+    - Data resampling to higher timeframes (served from the materialized
+      OHLCV rollups when they have been built)
     - Technical indicators calculation
     - Complex analytical queries
     - Performance optimization
     """
     
-    def __init__(self, db_manager: DuckDBManager):
+    def __init__(self, db_manager: DuckDBManager, use_rollups: bool = True):
         """
         Initialize query API.
         
         Args:
             db_manager: DuckDB manager instance
+            use_rollups: Resample from the coarsest valid rollup table when available
         """
         self.db_manager = db_manager
+        self.use_rollups = use_rollups
     
     def resample_data(self, 
                      symbol: str,
@@ -69,7 +76,60 @@ class QueryAPI:
             DataFrame with resampled OHLCV data
         """
         conn = self.db_manager.connect()
+        query, params, tf_str = self._resample_query(symbol, timeframe, start_date, end_date,
+                                                     start_time, end_time)
         
+        df = conn.execute(query, params).df()
+        
+        if not df.empty:
+            df['timeframe'] = tf_str
+        
+        logger.info(f"Resampled {symbol} to {tf_str}: {len(df)} periods")
+        return df
+    
+    def resample_reader(self,
+                        symbol: str,
+                        timeframe: Union[TimeFrame, str],
+                        start_date: Optional[date] = None,
+                        end_date: Optional[date] = None,
+                        start_time: Optional[str] = None,
+                        end_time: Optional[str] = None,
+                        batch_size: int = DEFAULT_BATCH_SIZE) -> pa.RecordBatchReader:
+        """
+        Resampled OHLCV data as a lazy Arrow record batch reader.
+        
+        Same rows as ``resample_data`` (including the ``timeframe`` column),
+        produced ``batch_size`` rows at a time for streaming responses.
+        """
+        query, params, tf_str = self._resample_query(symbol, timeframe, start_date, end_date,
+                                                     start_time, end_time)
+        query = f"SELECT *, ? AS timeframe FROM ({query}) ORDER BY timestamp"
+        return execute_reader(self.db_manager.connect(), query, [tf_str] + params, batch_size)
+    
+    def market_data_reader(self,
+                           symbol: Optional[str] = None,
+                           start_date: Optional[date] = None,
+                           end_date: Optional[date] = None,
+                           start_time: Optional[str] = None,
+                           end_time: Optional[str] = None,
+                           limit: Optional[int] = None,
+                           batch_size: int = DEFAULT_BATCH_SIZE) -> pa.RecordBatchReader:
+        """
+        Raw market data (as ``DuckDBManager.query_market_data``) as a lazy
+        Arrow record batch reader.
+        """
+        query, params = DuckDBManager.market_data_query(symbol, start_date, end_date,
+                                                        start_time, end_time, limit)
+        return execute_reader(self.db_manager.connect(), query, params, batch_size)
+    
+    def _resample_query(self,
+                        symbol: Union[str, List[str]],
+                        timeframe: Union[TimeFrame, str],
+                        start_date: Optional[date],
+                        end_date: Optional[date],
+                        start_time: Optional[str],
+                        end_time: Optional[str]):
+        """Build the resampling query; returns (SQL, parameters, timeframe string)."""
         # Convert timeframe to string if enum
         if isinstance(timeframe, TimeFrame):
             tf_str = timeframe.value
@@ -77,8 +137,12 @@ class QueryAPI:
             tf_str = timeframe
         
         # Build base query with filters
-        where_clauses = ["symbol = ?"]
-        params = [symbol]
+        if isinstance(symbol, str):
+            where_clauses = ["symbol = ?"]
+            params = [symbol]
+        else:
+            where_clauses = [f"symbol IN ({', '.join('?' for _ in symbol)})"]
+            params = list(symbol)
         
         if start_date:
             where_clauses.append("date_partition >= ?")
@@ -89,15 +153,22 @@ class QueryAPI:
             params.append(end_date)
         
         if start_time:
-            where_clauses.append("TIME(timestamp) >= ?")
+            where_clauses.append("CAST(timestamp AS TIME) >= ?")
             params.append(start_time)
         
         if end_time:
-            where_clauses.append("TIME(timestamp) <= ?")
+            where_clauses.append("CAST(timestamp AS TIME) <= ?")
             params.append(end_time)
         
         where_clause = " AND ".join(where_clauses)
         
+        # Re-aggregate the coarsest rollup that nests inside the target buckets
+        source, tick_count = "market_data_unified", "COUNT(*)"
+        if self.use_rollups:
+            level = rollup_for(tf_str, bool(start_time or end_time))
+            if level is not None and rollups_enabled(self.db_manager.connect()):
+                source, tick_count = level.table, "CAST(SUM(tick_count) AS BIGINT)"
+        
         # Use DuckDB's time_bucket function for efficient resampling
         if tf_str in ["5T", "15T", "30T"]:
             # For minute-based intervals
@@ -125,20 +196,13 @@ class QueryAPI:
                 MIN(low) as low,
                 LAST(close ORDER BY timestamp) as close,
                 SUM(volume) as volume,
-                COUNT(*) as tick_count
-            FROM market_data_unified
+                {tick_count} as tick_count
+            FROM {source}
             WHERE {where_clause}
             GROUP BY symbol, {bucket_sql}
             ORDER BY timestamp
         """
-        
-        df = conn.execute(query, params).df()
-        
-        if not df.empty:
-            df['timeframe'] = tf_str
-        
-        logger.info(f"Resampled {symbol} to {tf_str}: {len(df)} periods")
-        return df
+        return query, params, tf_str
     
     def get_multiple_timeframes(self,
                               symbol: str,
@@ -365,30 +429,23 @@ class QueryAPI:
         Returns:
             Correlation matrix as DataFrame
         """
-        # Get data for all symbols
-        all_data = []
-        
-        for symbol in symbols:
-            df = self.resample_data(symbol, timeframe, start_date, end_date)
-            if not df.empty:
-                if method == 'returns':
-                    df['value'] = df['close'].pct_change()
-                else:
-                    df['value'] = df['close']
-                
-                df = df[['timestamp', 'value']].rename(columns={'value': symbol})
-                all_data.append(df)
-        
-        if not all_data:
+        if not symbols:
             return pd.DataFrame()
         
-        # Merge all data on timestamp
-        merged_df = all_data[0]
-        for df in all_data[1:]:
-            merged_df = merged_df.merge(df, on='timestamp', how='outer')
+        # Resample every symbol in one query; returns come from each symbol's own consecutive bars
+        bars_query, params, _ = self._resample_query(list(symbols), timeframe, start_date, end_date, None, None)
+        if method == 'returns':
+            value_sql = "close / LAG(close) OVER (PARTITION BY symbol ORDER BY timestamp) - 1"
+        else:
+            value_sql = "close"
+        query = f"SELECT symbol, timestamp, {value_sql} AS value FROM ({bars_query}) bars"
+        
+        matrix = load_returns(self.db_manager.connect(), query, params, order=symbols, drop_empty=True)
+        if not matrix.symbols:
+            return pd.DataFrame()
         
         # Calculate correlation matrix
-        correlation_matrix = merged_df.drop('timestamp', axis=1).corr()
+        correlation_matrix = correlation_frame(matrix)
         
         logger.info(f"Calculated correlation matrix for {len(symbols)} symbols")
         return correlation_matrix
@@ -0,0 +1,216 @@
+"""
+Streaming Response Formats
+==========================
+
+Content negotiation and chunked encoders for tabular API responses.
+
+Results are read from DuckDB as an Arrow ``RecordBatchReader`` and encoded
+one record batch at a time, so server memory stays bounded by the batch
+size rather than the result size:
+
+- ``application/vnd.apache.arrow.stream``: Arrow IPC stream
+- ``application/vnd.apache.parquet``: Parquet, one row group per batch
+- ``application/x-ndjson``: one JSON object per line
+- ``application/json``: the existing buffered JSON body (default)
+"""
+
+import json
+import logging
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Any, Iterator, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+PARQUET = "application/vnd.apache.parquet"
+NDJSON = "application/x-ndjson"
+JSON = "application/json"
+
+STREAMING_FORMATS = (ARROW_STREAM, PARQUET, NDJSON)
+
+#: Default rows per record batch read from DuckDB
+DEFAULT_BATCH_SIZE = 65536
+
+_ALIASES = {
+    "arrow": ARROW_STREAM,
+    ARROW_STREAM: ARROW_STREAM,
+    "parquet": PARQUET,
+    PARQUET: PARQUET,
+    "application/x-parquet": PARQUET,
+    "ndjson": NDJSON,
+    "jsonl": NDJSON,
+    NDJSON: NDJSON,
+    "application/jsonlines": NDJSON,
+    "json": JSON,
+    JSON: JSON,
+}
+
+_EXTENSIONS = {ARROW_STREAM: "arrows", PARQUET: "parquet", NDJSON: "ndjson"}
+
+
+def negotiate_format(accept: Optional[str] = None, format: Optional[str] = None) -> str:
+    """
+    Pick the response media type.
+
+    An explicit ``format`` (``arrow``, ``parquet``, ``ndjson``, ``json`` or a
+    media type) wins over the ``Accept`` header. Accept entries are ranked by
+    q-value; wildcards and unknown types fall back to JSON.
+
+    Raises:
+        ValueError: If ``format`` names an unsupported format
+    """
+    if format:
+        media_type = _ALIASES.get(format.strip().lower())
+        if media_type is None:
+            raise ValueError(f"Unsupported format '{format}'. Use one of: arrow, parquet, ndjson, json")
+        return media_type
+
+    if not accept:
+        return JSON
+
+    candidates: List[Tuple[float, int, str]] = []
+    for position, item in enumerate(accept.split(",")):
+        media, *params = [part.strip() for part in item.split(";")]
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            candidates.append((-quality, position, media.lower()))
+
+    for _, _, media in sorted(candidates):
+        if media in _ALIASES:
+            return _ALIASES[media]
+    return JSON
+
+
+def execute_reader(conn, query: str, params: Optional[List[Any]] = None,
+                   batch_size: int = DEFAULT_BATCH_SIZE) -> pa.RecordBatchReader:
+    """Run ``query`` on a dedicated cursor and return a lazy record batch reader.
+
+    The cursor keeps the pending result isolated from other queries issued
+    on ``conn`` while the response is being streamed.
+    """
+    cursor = conn.cursor()
+    cursor.execute(query, params or [])
+    to_reader = getattr(cursor, "to_arrow_reader", None) or cursor.fetch_record_batch
+    return to_reader(batch_size)
+
+
+class _ChunkSink:
+    """Write-only file object that buffers bytes until drained."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize values the same way ``df_to_json_response`` does."""
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, timedelta):
+        return str(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def iter_encoded(reader: pa.RecordBatchReader, media_type: str) -> Iterator[bytes]:
+    """
+    Encode a record batch reader chunk by chunk.
+
+    Args:
+        reader: Source of record batches
+        media_type: One of ``STREAMING_FORMATS``
+
+    Yields:
+        Encoded bytes, one chunk per record batch (plus stream header/footer)
+    """
+    try:
+        if media_type == NDJSON:
+            for batch in reader:
+                lines = [json.dumps(row, default=_json_default) for row in batch.to_pylist()]
+                if lines:
+                    yield ("\n".join(lines) + "\n").encode()
+            return
+
+        sink = _ChunkSink()
+        if media_type == ARROW_STREAM:
+            writer = pa.ipc.new_stream(sink, reader.schema)
+            write = writer.write_batch
+        elif media_type == PARQUET:
+            writer = pq.ParquetWriter(sink, reader.schema, compression='snappy')
+            write = writer.write_batch
+        else:
+            raise ValueError(f"Unsupported streaming media type: {media_type}")
+
+        with writer:
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+            for batch in reader:
+                if batch.num_rows:
+                    write(batch)
+                    yield sink.drain()
+        chunk = sink.drain()
+        if chunk:
+            yield chunk
+    finally:
+        reader.close()
+
+
+def stream_response(reader: pa.RecordBatchReader, media_type: str,
+                    filename: Optional[str] = None) -> StreamingResponse:
+    """
+    Wrap a record batch reader in a chunked ``StreamingResponse``.
+
+    Args:
+        reader: Source of record batches
+        media_type: One of ``STREAMING_FORMATS``
+        filename: Optional download name (extension added per format)
+
+    Returns:
+        StreamingResponse
+    """
+    headers = {}
+    if filename:
+        headers["Content-Disposition"] = f'attachment; filename="{filename}.{_EXTENSIONS[media_type]}"'
+    return StreamingResponse(iter_encoded(reader, media_type), media_type=media_type, headers=headers)
@@ -31,6 +31,12 @@ class SimpleDuckDBConnector:
         self.read_only = read_only
         self._connection = None
 
+    def __getstate__(self):
+        """Pickle without the live connection; each process reconnects itself."""
+        state = self.__dict__.copy()
+        state['_connection'] = None
+        return state
+
     def connect(self):
         """Connect to the database."""
         if not os.path.exists(self.db_path):
@@ -13,6 +13,16 @@ from .unified_duckdb import (
     SchemaManager,
     QueryExecutor,
 )
+from .parquet_catalog import (
+    CatalogRefreshResult,
+    ParquetCatalog,
+)
+from .parquet_compaction import (
+    CompactionConfig,
+    CompactionResult,
+    ParquetCompactor,
+)
+from .prepared_statements import PreparedStatementCache
 
 __all__ = [
     'UnifiedDuckDBManager',
@@ -20,4 +30,10 @@ __all__ = [
     'ConnectionPool',
     'SchemaManager',
     'QueryExecutor',
+    'CatalogRefreshResult',
+    'ParquetCatalog',
+    'CompactionConfig',
+    'CompactionResult',
+    'ParquetCompactor',
+    'PreparedStatementCache',
 ]
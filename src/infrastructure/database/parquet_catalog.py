@@ -0,0 +1,250 @@
+"""
+Parquet Partition Catalog
+=========================
+
+Persistent manifest of the Parquet lake stored inside the DuckDB database.
+
+One row is kept per (file, symbol, date) with row counts, timestamp and close
+ranges, byte size and mtime. Readers build an exact ``read_parquet([...])``
+file list for a (symbol set, date range) predicate from the catalog instead of
+re-listing the whole ``YYYY/MM/DD`` tree on every query. The catalog is
+maintained incrementally: only new or changed files are re-scanned.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence
+
+import pyarrow as pa
+from duckdb import DuckDBPyConnection
+
+from src.infrastructure.logging import get_logger
+from .parquet_compaction import (
+    CompactionConfig,
+    ParquetCompactor,
+    _sql_list,
+    normalized_parquet_select,
+)
+
+logger = get_logger(__name__)
+
+CATALOG_TABLE = "parquet_catalog"
+
+
+@dataclass
+class CatalogRefreshResult:
+    """Summary of a catalog refresh."""
+    files_scanned: int = 0
+    files_removed: int = 0
+    rows_upserted: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+class ParquetCatalog:
+    """Maintains the ``parquet_catalog`` table and answers file-list lookups."""
+
+    def __init__(
+        self,
+        parquet_root: str,
+        compacted_root: Optional[str] = None,
+        compaction_granularity: str = "month",
+        batch_size: int = 500,
+    ):
+        self.parquet_root = Path(parquet_root)
+        self.compacted_root = Path(compacted_root) if compacted_root else None
+        self.compaction_granularity = compaction_granularity
+        self.batch_size = batch_size
+
+    def ensure_table(self, conn: DuckDBPyConnection) -> None:
+        """Create the catalog table if it does not exist."""
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {CATALOG_TABLE} (
+                file_path VARCHAR NOT NULL,
+                symbol VARCHAR NOT NULL,
+                date DATE NOT NULL,
+                row_count BIGINT,
+                min_timestamp TIMESTAMP,
+                max_timestamp TIMESTAMP,
+                min_close DOUBLE,
+                max_close DOUBLE,
+                file_size BIGINT,
+                file_mtime_ns BIGINT,
+                PRIMARY KEY (file_path, symbol, date)
+            )
+        """)
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{CATALOG_TABLE}_symbol_date ON {CATALOG_TABLE}(symbol, date)"
+        )
+
+    def table_exists(self, conn: DuckDBPyConnection) -> bool:
+        row = conn.execute(
+            "SELECT 1 FROM information_schema.tables WHERE table_name = ?", [CATALOG_TABLE]
+        ).fetchone()
+        return row is not None
+
+    def is_empty(self, conn: DuckDBPyConnection) -> bool:
+        return conn.execute(f"SELECT COUNT(*) FROM {CATALOG_TABLE}").fetchone()[0] == 0
+
+    def discover_files(self) -> List[Path]:
+        """Files that currently make up the lake.
+
+        With a compacted store configured this is the compacted period files
+        plus daily files not yet compacted, so no row is cataloged twice.
+        """
+        if self.compacted_root is not None:
+            compactor = ParquetCompactor(CompactionConfig(
+                source_root=str(self.parquet_root),
+                target_root=str(self.compacted_root),
+                granularity=self.compaction_granularity,
+            ))
+            return compactor.compacted_files() + compactor.pending_source_files()
+
+        return ParquetCompactor(CompactionConfig(
+            source_root=str(self.parquet_root), target_root=str(self.parquet_root)
+        )).discover_source_files()
+
+    def refresh(
+        self,
+        conn: DuckDBPyConnection,
+        paths: Optional[Iterable[str]] = None,
+        removed_paths: Optional[Iterable[str]] = None,
+    ) -> CatalogRefreshResult:
+        """Bring the catalog up to date.
+
+        Args:
+            conn: Writable connection to the database holding the catalog
+            paths: Files just written by an ingest path. When omitted the lake
+                is re-listed and files no longer part of it are dropped.
+            removed_paths: Files that left the lake, e.g. daily files folded
+                into a compacted file. Listed paths that no longer exist on
+                disk are dropped as well.
+
+        Returns:
+            CatalogRefreshResult with counts of scanned and removed files
+        """
+        result = CatalogRefreshResult()
+        self.ensure_table(conn)
+
+        full_refresh = paths is None and removed_paths is None
+        candidates = self.discover_files() if full_refresh else [Path(p) for p in paths or []]
+
+        known = {
+            row[0]: (row[1], row[2])
+            for row in conn.execute(
+                f"SELECT DISTINCT file_path, file_size, file_mtime_ns FROM {CATALOG_TABLE}"
+            ).fetchall()
+        }
+
+        changed: List[Path] = []
+        missing: List[str] = []
+        for path in candidates:
+            try:
+                stat = path.stat()
+            except OSError:
+                missing.append(str(path))
+                continue
+            if known.get(str(path)) != (stat.st_size, stat.st_mtime_ns):
+                changed.append(path)
+
+        if full_refresh:
+            current = {str(p) for p in candidates}
+            stale = [p for p in known if p not in current]
+        else:
+            stale = [p for p in dict.fromkeys(missing + [str(p) for p in removed_paths or []]) if p in known]
+        if stale:
+            self._delete_files(conn, stale)
+            result.files_removed = len(stale)
+
+        for i in range(0, len(changed), self.batch_size):
+            batch = changed[i:i + self.batch_size]
+            try:
+                result.rows_upserted += self._upsert_batch(conn, batch)
+                result.files_scanned += len(batch)
+            except Exception as e:
+                logger.error("Catalog refresh batch failed", files=len(batch), error=str(e))
+                result.errors.append(str(e))
+
+        logger.info(
+            "Parquet catalog refreshed",
+            full_refresh=full_refresh,
+            files_scanned=result.files_scanned,
+            files_removed=result.files_removed,
+            rows_upserted=result.rows_upserted,
+        )
+        return result
+
+    def _delete_files(self, conn: DuckDBPyConnection, files: Sequence[str]) -> None:
+        conn.execute(
+            f"DELETE FROM {CATALOG_TABLE} WHERE list_contains(?, file_path)", [list(files)]
+        )
+
+    def _upsert_batch(self, conn: DuckDBPyConnection, batch: List[Path]) -> int:
+        files = [str(p) for p in batch]
+        stats = {}
+        for path in batch:
+            stat = path.stat()
+            stats[str(path)] = (stat.st_size, stat.st_mtime_ns)
+
+        self._delete_files(conn, files)
+
+        select = normalized_parquet_select(conn, files, include_filename=True)
+        file_stats = pa.table({
+            "file_path": files,
+            "file_size": [stats[f][0] for f in files],
+            "file_mtime_ns": [stats[f][1] for f in files],
+        })
+        conn.register("_catalog_file_stats", file_stats)
+        try:
+            inserted = conn.execute(f"""
+                INSERT INTO {CATALOG_TABLE}
+                SELECT
+                    src.filename AS file_path,
+                    src.symbol,
+                    src.date_partition AS date,
+                    COUNT(*) AS row_count,
+                    MIN(src.timestamp) AS min_timestamp,
+                    MAX(src.timestamp) AS max_timestamp,
+                    MIN(src.close) AS min_close,
+                    MAX(src.close) AS max_close,
+                    ANY_VALUE(fs.file_size) AS file_size,
+                    ANY_VALUE(fs.file_mtime_ns) AS file_mtime_ns
+                FROM ({select}) src
+                JOIN _catalog_file_stats fs ON fs.file_path = src.filename
+                WHERE src.symbol IS NOT NULL AND src.date_partition IS NOT NULL
+                GROUP BY src.filename, src.symbol, src.date_partition
+            """).fetchone()[0]
+        finally:
+            conn.unregister("_catalog_file_stats")
+        return int(inserted)
+
+    def files_for(
+        self,
+        conn: DuckDBPyConnection,
+        symbols: Optional[Sequence[str]] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> List[str]:
+        """Exact list of files holding rows for the given symbols and date range."""
+        where = []
+        params: List = []
+        if symbols:
+            where.append("list_contains(?, symbol)")
+            params.append(list(symbols))
+        if start_date:
+            where.append("date >= ?")
+            params.append(start_date)
+        if end_date:
+            where.append("date <= ?")
+            params.append(end_date)
+
+        where_sql = f"WHERE {' AND '.join(where)}" if where else ""
+        rows = conn.execute(
+            f"SELECT DISTINCT file_path FROM {CATALOG_TABLE} {where_sql} ORDER BY file_path", params
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    @staticmethod
+    def read_parquet_sql(files: Sequence[str]) -> str:
+        """read_parquet() call over an exact file list."""
+        return f"read_parquet({_sql_list(list(files))}, filename=true, union_by_name=true)"
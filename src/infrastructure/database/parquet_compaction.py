@@ -0,0 +1,401 @@
+"""
+Parquet Lake Compaction
+=======================
+
+Rewrites the one-file-per-symbol-per-day layout
+(``YYYY/MM/DD/{SYMBOL}_minute_{date}.parquet``) into a small number of
+period files (monthly by default) sorted by ``(symbol, timestamp)``.
+
+Sorted, period-sized files let DuckDB prune row groups on ``symbol`` and
+``timestamp`` min/max statistics instead of opening and reading footers of
+millions of tiny files. Compaction is incremental: a state file records which
+daily source files (by size and mtime) are already folded into the compacted
+store, so re-running the job only rewrites the periods that received new or
+changed daily files.
+"""
+
+import json
+import os
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import duckdb
+from duckdb import DuckDBPyConnection
+
+from src.infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Columns written to every compacted file, in this order
+COMPACTED_COLUMNS = [
+    "symbol", "timestamp", "open", "high", "low", "close", "volume", "timeframe", "date_partition"
+]
+
+_GRANULARITIES = ("day", "month", "year")
+
+
+@dataclass
+class CompactionConfig:
+    """Configuration for the Parquet compaction job."""
+    source_root: str
+    target_root: str
+    granularity: str = "month"
+    row_group_size: int = 122_880
+    compression: str = "zstd"
+    remove_sources: bool = False
+    state_file: str = "_compaction_state.json"
+    threads: int = 4
+    memory_limit: str = "2GB"
+
+    def __post_init__(self):
+        if self.granularity not in _GRANULARITIES:
+            raise ValueError(f"Invalid granularity '{self.granularity}', expected one of {_GRANULARITIES}")
+        if self.row_group_size <= 0:
+            raise ValueError("row_group_size must be positive")
+
+
+@dataclass
+class CompactionResult:
+    """Summary of a compaction run."""
+    partitions_written: List[str] = field(default_factory=list)
+    source_files_compacted: int = 0
+    rows_written: int = 0
+    errors: Dict[str, str] = field(default_factory=dict)
+    written_files: List[str] = field(default_factory=list)
+    compacted_sources: List[str] = field(default_factory=list)
+
+    @property
+    def success(self) -> bool:
+        return not self.errors
+
+
+def _sql_literal(value: str) -> str:
+    """Quote a string for inline use in DuckDB SQL."""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _sql_list(values: List[str]) -> str:
+    return "[" + ", ".join(_sql_literal(v) for v in values) + "]"
+
+
+def daily_parquet_path(source_root: str, symbol: str, trading_date: date) -> Path:
+    """Lake path of the daily file holding ``symbol``'s minute bars for ``trading_date``."""
+    return (
+        Path(source_root)
+        / f"{trading_date.year:04d}" / f"{trading_date.month:02d}" / f"{trading_date.day:02d}"
+        / f"{symbol}_minute_{trading_date.isoformat()}.parquet"
+    )
+
+
+def normalized_parquet_select(
+    conn: DuckDBPyConnection, files: List[str], include_filename: bool = False
+) -> str:
+    """SELECT projecting daily or compacted files onto the compacted schema."""
+    source = f"read_parquet({_sql_list(files)}, filename=true, union_by_name=true)"
+    return normalized_projection(conn, source, include_filename)
+
+
+def normalized_projection(
+    conn: DuckDBPyConnection, source: str, include_filename: bool = False
+) -> str:
+    """SELECT projecting a read_parquet() relation onto the compacted schema.
+
+    Daily files do not always carry ``symbol`` or ``timeframe``; missing
+    columns are derived from the filename or defaulted. The relation must be
+    read with ``filename=true``.
+    """
+    cols = {
+        row[0] for row in conn.execute(f"DESCRIBE SELECT * FROM {source}").fetchall()
+    }
+
+    symbol_from_file = "regexp_extract(filename, '.*/([A-Za-z0-9._-]+)_minute_.*', 1)"
+    parts = [
+        f"CAST(COALESCE(symbol, {symbol_from_file}) AS VARCHAR) AS symbol" if "symbol" in cols
+        else f"CAST({symbol_from_file} AS VARCHAR) AS symbol",
+        "CAST(timestamp AS TIMESTAMP) AS timestamp",
+        "CAST(open AS DOUBLE) AS open",
+        "CAST(high AS DOUBLE) AS high",
+        "CAST(low AS DOUBLE) AS low",
+        "CAST(close AS DOUBLE) AS close",
+        "CAST(COALESCE(volume, 0) AS BIGINT) AS volume" if "volume" in cols
+        else "CAST(0 AS BIGINT) AS volume",
+        "CAST(COALESCE(timeframe, '1m') AS VARCHAR) AS timeframe" if "timeframe" in cols
+        else "'1m' AS timeframe",
+        "CAST(timestamp AS DATE) AS date_partition",
+    ]
+    if include_filename:
+        parts.append("filename")
+    return "SELECT " + ", ".join(parts) + f" FROM {source}"
+
+
+class ParquetCompactor:
+    """Compacts daily per-symbol Parquet files into sorted period files."""
+
+    def __init__(self, config: CompactionConfig, connection: Optional[DuckDBPyConnection] = None):
+        self.config = config
+        self.source_root = Path(config.source_root)
+        self.target_root = Path(config.target_root)
+        self._connection = connection
+        self._owns_connection = connection is None
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Layout helpers
+    # ------------------------------------------------------------------
+
+    def partition_key(self, source_file: Path) -> Optional[str]:
+        """Return the period key for a daily source file, or None if it is outside the layout."""
+        try:
+            rel = source_file.relative_to(self.source_root)
+        except ValueError:
+            return None
+
+        parts = rel.parts
+        if len(parts) != 4:
+            return None
+
+        year, month, day = parts[0], parts[1], parts[2]
+        if not (year.isdigit() and month.isdigit() and day.isdigit()):
+            return None
+
+        if self.config.granularity == "year":
+            return year
+        if self.config.granularity == "month":
+            return f"{year}-{month}"
+        return f"{year}-{month}-{day}"
+
+    def partition_path(self, key: str) -> Path:
+        """Path of the compacted file for a period key."""
+        return self.target_root / f"market_data_{key}.parquet"
+
+    def compacted_glob(self) -> str:
+        """Glob matching every compacted file."""
+        return str(self.target_root / "market_data_*.parquet")
+
+    def compacted_files(self) -> List[Path]:
+        """List compacted period files currently on disk."""
+        if not self.target_root.exists():
+            return []
+        return sorted(self.target_root.glob("market_data_*.parquet"))
+
+    def discover_source_files(self) -> List[Path]:
+        """Walk the YYYY/MM/DD tree and return every daily Parquet file."""
+        files: List[Path] = []
+        if not self.source_root.exists():
+            return files
+
+        for year_dir in sorted(self._iter_digit_dirs(self.source_root)):
+            for month_dir in sorted(self._iter_digit_dirs(year_dir)):
+                for day_dir in sorted(self._iter_digit_dirs(month_dir)):
+                    with os.scandir(day_dir) as entries:
+                        for entry in entries:
+                            if entry.is_file() and entry.name.endswith(".parquet"):
+                                files.append(Path(entry.path))
+        return files
+
+    @staticmethod
+    def _iter_digit_dirs(parent: Path):
+        with os.scandir(parent) as entries:
+            for entry in entries:
+                if entry.is_dir() and entry.name.isdigit():
+                    yield Path(entry.path)
+
+    # ------------------------------------------------------------------
+    # State tracking
+    # ------------------------------------------------------------------
+
+    @property
+    def state_path(self) -> Path:
+        return self.target_root / self.config.state_file
+
+    def load_state(self) -> Dict[str, Any]:
+        """Load compaction state, resetting it if the granularity changed."""
+        empty = {"version": 1, "granularity": self.config.granularity, "files": {}}
+        if not self.state_path.exists():
+            return empty
+        try:
+            with open(self.state_path, "r") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            logger.warning("Unreadable compaction state, starting fresh", state_path=str(self.state_path))
+            return empty
+
+        if state.get("granularity") != self.config.granularity:
+            logger.warning(
+                "Compaction granularity changed, full recompaction required",
+                previous=state.get("granularity"),
+                current=self.config.granularity,
+            )
+            return empty
+        state.setdefault("files", {})
+        return state
+
+    def _save_state(self, state: Dict[str, Any]) -> None:
+        self.target_root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def _file_signature(self, path: Path) -> Tuple[int, int]:
+        stat = path.stat()
+        return stat.st_size, stat.st_mtime_ns
+
+    def _state_key(self, path: Path) -> str:
+        return path.relative_to(self.source_root).as_posix()
+
+    def pending_source_files(self, state: Optional[Dict[str, Any]] = None) -> List[Path]:
+        """Daily files that are new or changed since they were last compacted."""
+        state = state if state is not None else self.load_state()
+        known = state.get("files", {})
+        pending = []
+        for path in self.discover_source_files():
+            signature = known.get(self._state_key(path))
+            if signature is None or tuple(signature) != self._file_signature(path):
+                pending.append(path)
+        return pending
+
+    # ------------------------------------------------------------------
+    # Compaction
+    # ------------------------------------------------------------------
+
+    def compact(self, partitions: Optional[List[str]] = None) -> CompactionResult:
+        """Compact all pending daily files, optionally restricted to some period keys."""
+        result = CompactionResult()
+
+        with self._lock:
+            state = self.load_state()
+            grouped: Dict[str, List[Path]] = defaultdict(list)
+            for path in self.pending_source_files(state):
+                key = self.partition_key(path)
+                if key is None:
+                    continue
+                if partitions and key not in partitions:
+                    continue
+                grouped[key].append(path)
+
+            if not grouped:
+                logger.info("Parquet store already compacted", target_root=str(self.target_root))
+                return result
+
+            self.target_root.mkdir(parents=True, exist_ok=True)
+
+            for key in sorted(grouped):
+                files = grouped[key]
+                try:
+                    rows = self.compact_partition(key, files)
+                except Exception as e:
+                    logger.error("Partition compaction failed", partition=key, error=str(e))
+                    result.errors[key] = str(e)
+                    continue
+
+                for path in files:
+                    state["files"][self._state_key(path)] = list(self._file_signature(path))
+                self._save_state(state)
+
+                if self.config.remove_sources:
+                    for path in files:
+                        try:
+                            path.unlink()
+                        except OSError as e:
+                            logger.warning("Failed to remove compacted source", path=str(path), error=str(e))
+
+                result.partitions_written.append(key)
+                result.source_files_compacted += len(files)
+                result.rows_written += rows
+                result.written_files.append(str(self.partition_path(key)))
+                result.compacted_sources.extend(str(path) for path in files)
+
+        logger.info(
+            "Parquet compaction finished",
+            partitions=len(result.partitions_written),
+            source_files=result.source_files_compacted,
+            rows=result.rows_written,
+            errors=len(result.errors),
+        )
+        return result
+
+    def compact_partition(self, key: str, source_files: List[Path]) -> int:
+        """Merge daily files into the period file for ``key`` and return its row count.
+
+        Rows already in the period file for a (symbol, date) present in the
+        incoming files are replaced, so re-delivered daily files do not duplicate.
+        """
+        target = self.partition_path(key)
+        tmp_target = target.with_suffix(".parquet.tmp")
+        conn = self._get_connection()
+
+        incoming_select = normalized_parquet_select(conn, [str(p) for p in source_files])
+
+        if target.exists():
+            merged = f"""
+            WITH incoming AS ({incoming_select}),
+            replaced AS (SELECT DISTINCT symbol, date_partition FROM incoming)
+            SELECT * FROM (
+                SELECT {', '.join('e.' + c for c in COMPACTED_COLUMNS)}
+                FROM read_parquet({_sql_literal(str(target))}) e
+                ANTI JOIN replaced r
+                  ON e.symbol = r.symbol AND e.date_partition = r.date_partition
+                UNION ALL
+                SELECT * FROM incoming
+            )
+            """
+        else:
+            merged = f"SELECT * FROM ({incoming_select})"
+
+        conn.execute(f"""
+            COPY ({merged} ORDER BY symbol, timestamp)
+            TO {_sql_literal(str(tmp_target))}
+            (FORMAT PARQUET, COMPRESSION {self.config.compression},
+             ROW_GROUP_SIZE {int(self.config.row_group_size)})
+        """)
+        os.replace(tmp_target, target)
+
+        rows = conn.execute(
+            f"SELECT COUNT(*) FROM read_parquet({_sql_literal(str(target))})"
+        ).fetchone()[0]
+        logger.debug("Compacted partition", partition=key, files=len(source_files), rows=rows)
+        return int(rows)
+
+    def _get_connection(self) -> DuckDBPyConnection:
+        if self._connection is None:
+            self._connection = duckdb.connect(
+                ":memory:",
+                config={"threads": self.config.threads, "memory_limit": self.config.memory_limit},
+            )
+        return self._connection
+
+    def close(self) -> None:
+        """Close the compactor's private DuckDB connection."""
+        if self._owns_connection and self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def compaction_sources(
+    source_root: str,
+    target_root: str,
+    granularity: str = "month",
+) -> Tuple[List[str], List[str]]:
+    """Return (compacted files, pending daily files) for building read views.
+
+    Used by the unified view so queries read the compacted store plus only those
+    daily files that have not been folded in yet.
+    """
+    compactor = ParquetCompactor(CompactionConfig(
+        source_root=source_root, target_root=target_root, granularity=granularity
+    ))
+    compacted = [str(p) for p in compactor.compacted_files()]
+    pending = [str(p) for p in compactor.pending_source_files()]
+    return compacted, pending
+
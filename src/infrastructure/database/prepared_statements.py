@@ -0,0 +1,85 @@
+"""
+Prepared Statement Cache
+========================
+
+Per-connection cache of parsed statements.
+
+DuckDB's Python ``execute(query, params)`` parses the query text on every
+call. For the small parameterized lookups issued repeatedly by the API and
+scanners, that parse is a large share of the cost. This cache parses each
+distinct query text once per connection (``extract_statements``) and runs
+the parsed statement afterwards with the parameters bound by DuckDB, so
+values keep their Python types (dates, decimals, NULLs) instead of being
+rendered into SQL. Multi-statement or unparsable text falls back to a plain
+execute.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Sequence
+
+from duckdb import DuckDBPyConnection
+
+from src.infrastructure.logging import get_logger
+
+logger = get_logger(__name__)
+
+_UNPREPARABLE = object()
+
+
+class PreparedStatementCache:
+    """LRU cache of parsed statements bound to a single connection."""
+
+    def __init__(self, conn: DuckDBPyConnection, max_statements: int = 64):
+        self.conn = conn
+        self.max_statements = max_statements
+        self._statements: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def execute(self, query: str, params: Optional[Sequence[Any]] = None) -> DuckDBPyConnection:
+        """Execute ``query`` with ``params`` bound to its cached parsed statement."""
+        if not params or self.max_statements <= 0:
+            return self._plain(query, params)
+
+        with self._lock:
+            statement = self._statements.get(query)
+            if statement is None:
+                self.misses += 1
+                statement = self._parse(query)
+                self._remember(query, statement)
+            else:
+                self.hits += 1
+                self._statements.move_to_end(query)
+
+        if statement is _UNPREPARABLE:
+            return self._plain(query, params)
+        return self.conn.execute(statement, list(params))
+
+    def clear(self) -> None:
+        """Drop all cached statements."""
+        with self._lock:
+            self._statements.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(1 for statement in self._statements.values() if statement is not _UNPREPARABLE)
+
+    def _plain(self, query: str, params: Optional[Sequence[Any]]) -> DuckDBPyConnection:
+        if params:
+            return self.conn.execute(query, params)
+        return self.conn.execute(query)
+
+    def _parse(self, query: str) -> Any:
+        try:
+            statements = self.conn.extract_statements(query)
+        except Exception as e:
+            logger.debug("Statement not parsable, executing directly", error=str(e))
+            return _UNPREPARABLE
+        return statements[0] if len(statements) == 1 else _UNPREPARABLE
+
+    def _remember(self, query: str, statement: Any) -> None:
+        self._statements[query] = statement
+        while len(self._statements) > self.max_statements:
+            self._statements.popitem(last=False)
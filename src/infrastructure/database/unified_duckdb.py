@@ -11,15 +11,28 @@ import threading
 import time
 from contextlib import contextmanager
 from dataclasses import dataclass
+from datetime import date
 from pathlib import Path
-from queue import Queue, Empty
-from typing import Any, Dict, List, Optional, Union, Protocol
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Union, Protocol
 
 import duckdb
 import pandas as pd
 from duckdb import DuckDBPyConnection
 
 from src.infrastructure.logging import get_logger
+from src.infrastructure.services.result_cache import bump_table_version
+from .parquet_catalog import CATALOG_TABLE, CatalogRefreshResult, ParquetCatalog
+from .parquet_compaction import (
+    CompactionConfig,
+    CompactionResult,
+    ParquetCompactor,
+    compaction_sources,
+    daily_parquet_path,
+    normalized_parquet_select,
+    normalized_projection,
+)
+from .prepared_statements import PreparedStatementCache
 
 logger = get_logger(__name__)
 
@@ -39,88 +52,234 @@ class DuckDBConfig:
     parquet_root: Optional[str] = None
     parquet_glob: Optional[str] = None
     use_parquet_in_unified_view: bool = True
+    compacted_parquet_root: Optional[str] = None
+    compaction_granularity: str = "month"
+    use_parquet_catalog: bool = False
+    health_check_interval: float = 60.0
+    statement_cache_size: int = 64
 
 
 class ConnectionPool:
-    """Thread-safe connection pool for DuckDB connections."""
+    """Reader/writer-aware connection pool over a single DuckDB database instance.
+
+    One root connection owns the database and serves as the writer lane: all
+    writes go through it one at a time, so concurrent writers never hit MVCC
+    write conflicts. Readers are cursors (``conn.cursor()``) on the same
+    instance, handed out FIFO with a bounded wait of ``connection_timeout``
+    seconds. Idle cursors are only health-checked when they have been unused
+    for longer than ``health_check_interval``. Every pooled connection carries
+    its own prepared-statement cache.
+    """
 
     def __init__(self, config: DuckDBConfig):
         self.config = config
-        self._pool: Queue[DuckDBPyConnection] = Queue(maxsize=config.max_connections)
-        self._lock = threading.Lock()
+        self._idle: Deque[DuckDBPyConnection] = deque()
+        self._cond = threading.Condition()
+        self._waiters: Deque[object] = deque()
         self._active_connections = 0
         self._closed = False
 
+        self._root: Optional[DuckDBPyConnection] = None
+        self._root_lock = threading.Lock()
+        self._writer_lock = threading.RLock()
+
+        self._last_used: Dict[int, float] = {}
+        self._statement_caches: Dict[int, PreparedStatementCache] = {}
+
         # Ensure database directory exists
         db_path = Path(config.database_path)
         db_path.parent.mkdir(parents=True, exist_ok=True)
 
         logger.info("Connection pool initialized", max_connections=config.max_connections)
 
-    def get_connection(self) -> DuckDBPyConnection:
-        """Get a connection from the pool, creating one if necessary."""
+    def get_connection(self, timeout: Optional[float] = None) -> DuckDBPyConnection:
+        """Get a read cursor from the pool, waiting up to ``timeout`` seconds.
+
+        Waiters are served in arrival order. Raises RuntimeError if no cursor
+        becomes available before the timeout.
+        """
         if self._closed:
             raise RuntimeError("Connection pool is closed")
 
-        try:
-            # Try to get existing connection from pool
-            conn = self._pool.get_nowait()
-            logger.debug("Reusing connection from pool")
-            return conn
-        except Empty:
-            pass
-
-        # Create new connection if pool is not full
-        with self._lock:
-            if self._active_connections >= self.config.max_connections:
-                raise RuntimeError(f"Connection pool exhausted (max: {self.config.max_connections})")
+        wait = self.config.connection_timeout if timeout is None else timeout
+        deadline = time.monotonic() + max(wait, 0.0)
+        ticket = object()
+        conn: Optional[DuckDBPyConnection] = None
 
-            self._active_connections += 1
+        with self._cond:
+            self._waiters.append(ticket)
+            try:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Connection pool is closed")
+                    if self._waiters[0] is ticket:
+                        if self._idle:
+                            conn = self._idle.pop()
+                            break
+                        if self._active_connections < self.config.max_connections:
+                            self._active_connections += 1
+                            break
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise RuntimeError(
+                            f"Connection pool exhausted (max: {self.config.max_connections}, "
+                            f"waited {wait:.1f}s)"
+                        )
+                    self._cond.wait(remaining)
+            finally:
+                self._waiters.remove(ticket)
+                self._cond.notify_all()
+
+        if conn is not None:
+            if not self._is_stale(conn) or self._is_healthy(conn):
+                logger.debug("Reusing connection from pool")
+                return conn
+            # Keep the slot and replace the dead cursor in place
+            self._forget(conn)
+            logger.warning("Stale connection discarded from pool")
 
         try:
-            conn = self._create_connection()
+            conn = self._create_reader()
             logger.debug("Created new connection")
             return conn
-        except Exception as e:
-            with self._lock:
+        except Exception:
+            with self._cond:
                 self._active_connections -= 1
+                self._cond.notify_all()
             raise
 
-    def release_connection(self, conn: DuckDBPyConnection) -> None:
-        """Return a connection to the pool."""
+    def release_connection(self, conn: DuckDBPyConnection, discard: bool = False) -> None:
+        """Return a read cursor to the pool.
+
+        No round trip is made here; pass ``discard=True`` when the caller saw
+        a connection-level failure so the cursor is dropped instead.
+        """
         if self._closed:
-            conn.close()
+            self._close_quietly(conn)
             return
 
-        try:
-            # Test if connection is still valid
-            conn.execute("SELECT 1").fetchone()
-            self._pool.put_nowait(conn)
-            logger.debug("Connection returned to pool")
-        except Exception:
-            # Connection is invalid, close it and reduce active count
-            conn.close()
-            with self._lock:
-                self._active_connections -= 1
+        if discard:
+            self._discard(conn)
             logger.warning("Invalid connection discarded from pool")
+            return
+
+        self._last_used[id(conn)] = time.monotonic()
+        with self._cond:
+            self._idle.append(conn)
+            self._cond.notify_all()
+        logger.debug("Connection returned to pool")
+
+    @contextmanager
+    def reader(self, timeout: Optional[float] = None):
+        """Borrow a read cursor for the duration of the block."""
+        conn = self.get_connection(timeout)
+        discard = False
+        try:
+            yield conn
+        except duckdb.ConnectionException:
+            discard = True
+            raise
+        finally:
+            self.release_connection(conn, discard=discard)
+
+    @contextmanager
+    def writer(self, timeout: Optional[float] = None):
+        """Hold the single writer lane for the duration of the block.
+
+        Writes are serialized; the lane is re-entrant for the holding thread.
+        """
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+
+        wait = self.config.connection_timeout if timeout is None else timeout
+        if not self._writer_lock.acquire(timeout=max(wait, 0.0)):
+            raise RuntimeError(f"Writer lane busy (waited {wait:.1f}s)")
+        try:
+            yield self._get_root()
+        finally:
+            self._writer_lock.release()
+
+    def statements(self, conn: DuckDBPyConnection) -> PreparedStatementCache:
+        """Prepared-statement cache bound to ``conn``."""
+        with self._cond:
+            cache = self._statement_caches.get(id(conn))
+            if cache is None or cache.conn is not conn:
+                cache = PreparedStatementCache(conn, self.config.statement_cache_size)
+                self._statement_caches[id(conn)] = cache
+            return cache
 
     def close_all(self) -> None:
         """Close all connections in the pool."""
-        self._closed = True
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._active_connections = 0
+            self._cond.notify_all()
 
-        # Close connections currently in pool
-        while not self._pool.empty():
-            try:
-                conn = self._pool.get_nowait()
-                conn.close()
-            except Empty:
-                break
+        for conn in idle:
+            self._close_quietly(conn)
+        with self._cond:
+            self._statement_caches.clear()
+        self._last_used.clear()
 
-        with self._lock:
-            self._active_connections = 0
+        with self._root_lock:
+            if self._root is not None:
+                self._close_quietly(self._root)
+                self._root = None
 
         logger.info("All connections closed")
 
+    def _get_root(self) -> DuckDBPyConnection:
+        """Connection owning the database instance, created on first use."""
+        if self._root is None:
+            with self._root_lock:
+                if self._root is None:
+                    self._root = self._create_connection()
+        return self._root
+
+    def _create_reader(self) -> DuckDBPyConnection:
+        conn = self._get_root().cursor()
+        if self.config.enable_profiling:
+            try:
+                conn.execute("PRAGMA enable_profiling='json'")
+                conn.execute("PRAGMA profiling_output='duckdb_profile.json'")
+            except Exception:
+                pass
+        return conn
+
+    def _is_stale(self, conn: DuckDBPyConnection) -> bool:
+        last_used = self._last_used.get(id(conn))
+        return last_used is not None and time.monotonic() - last_used > self.config.health_check_interval
+
+    @staticmethod
+    def _is_healthy(conn: DuckDBPyConnection) -> bool:
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except Exception:
+            return False
+
+    def _forget(self, conn: DuckDBPyConnection) -> None:
+        with self._cond:
+            self._statement_caches.pop(id(conn), None)
+        self._last_used.pop(id(conn), None)
+        self._close_quietly(conn)
+
+    def _discard(self, conn: DuckDBPyConnection) -> None:
+        self._forget(conn)
+        with self._cond:
+            self._active_connections = max(self._active_connections - 1, 0)
+            self._cond.notify_all()
+
+    @staticmethod
+    def _close_quietly(conn: DuckDBPyConnection) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
     def _create_connection(self) -> DuckDBPyConnection:
         """Create a new DuckDB connection with proper configuration."""
         # DuckDB configuration - only use valid options
@@ -170,7 +329,12 @@ class ConnectionPool:
     @property
     def available_connections(self) -> int:
         """Get the number of available connections in the pool."""
-        return self._pool.qsize()
+        return len(self._idle)
+
+    @property
+    def waiting_requests(self) -> int:
+        """Get the number of callers currently waiting for a connection."""
+        return len(self._waiters)
 
 
 class SchemaManager:
@@ -181,6 +345,13 @@ class SchemaManager:
         self.connection_pool = connection_pool
         self._schema_initialized = False
         self._lock = threading.Lock()
+        self.parquet_catalog: Optional[ParquetCatalog] = None
+        if config.use_parquet_catalog and config.parquet_root:
+            self.parquet_catalog = ParquetCatalog(
+                config.parquet_root,
+                compacted_root=config.compacted_parquet_root,
+                compaction_granularity=config.compaction_granularity,
+            )
 
     def initialize_schema(self) -> None:
         """Initialize database schema if not already done."""
@@ -194,6 +365,7 @@ class SchemaManager:
             with self._get_connection() as conn:
                 self._create_tables(conn)
                 self._create_indexes(conn)
+                self._initialize_parquet_catalog_if_configured(conn)
                 self._initialize_external_parquet_view_if_configured(conn)
 
             self._schema_initialized = True
@@ -230,6 +402,80 @@ class SchemaManager:
         except Exception:
             logger.warning("Could not load schema configuration for indexes")
 
+    def _initialize_parquet_catalog_if_configured(self, conn: DuckDBPyConnection) -> None:
+        """Create the parquet catalog and bootstrap it on first use."""
+        if self.parquet_catalog is None or self.config.read_only:
+            return
+
+        try:
+            self.parquet_catalog.ensure_table(conn)
+            if self.parquet_catalog.is_empty(conn):
+                self.parquet_catalog.refresh(conn)
+        except Exception as e:
+            logger.warning("Could not initialize parquet catalog", error=str(e))
+
+    def refresh_parquet_catalog(
+        self,
+        paths: Optional[List[str]] = None,
+        removed_paths: Optional[List[str]] = None,
+    ) -> Optional[CatalogRefreshResult]:
+        """Update the catalog for written or removed files and rebuild the unified view.
+
+        The view is rebuilt either way, so it picks up the current compacted
+        and pending daily files, and its cached results are invalidated.
+        Materialized OHLCV rollups, which aggregate the view, are refreshed
+        for the (symbol, date) days whose files changed.
+        """
+        from src.infrastructure.core.ohlcv_rollups import rollups_enabled
+
+        result = None
+        with self._get_connection() as conn:
+            track_rollups = self.config.use_parquet_in_unified_view and rollups_enabled(conn)
+            touched = None if paths is None and removed_paths is None else [*(paths or []), *(removed_paths or [])]
+            if self.parquet_catalog is not None:
+                if track_rollups:
+                    self.parquet_catalog.ensure_table(conn)
+                    before = self._catalog_rows(conn, touched)
+                result = self.parquet_catalog.refresh(conn, paths, removed_paths)
+            self._initialize_external_parquet_view_if_configured(conn)
+            if track_rollups:
+                if self.parquet_catalog is not None:
+                    days = {(row[1], row[2]) for row in before ^ self._catalog_rows(conn, touched)}
+                else:
+                    days = self._parquet_file_days(conn, paths)
+                self._refresh_rollups(conn, days)
+        bump_table_version('market_data_unified')
+        return result
+
+    @staticmethod
+    def _catalog_rows(conn: DuckDBPyConnection, files: Optional[List[str]]) -> set:
+        """Catalog rows (file, symbol, date, size, mtime) for some files, or all of them."""
+        select = f"SELECT file_path, symbol, date, file_size, file_mtime_ns FROM {CATALOG_TABLE}"
+        if files is None:
+            return set(conn.execute(select).fetchall())
+        return set(conn.execute(f"{select} WHERE list_contains(?, file_path)", [files]).fetchall())
+
+    @staticmethod
+    def _parquet_file_days(conn: DuckDBPyConnection, paths: Optional[List[str]]) -> set:
+        """(symbol, date) pairs held by the given Parquet files that still exist."""
+        files = [p for p in paths or [] if os.path.exists(p)]
+        if not files:
+            return set()
+        return set(conn.execute(f"""
+            SELECT DISTINCT symbol, date_partition
+            FROM ({normalized_parquet_select(conn, files)})
+            WHERE symbol IS NOT NULL AND date_partition IS NOT NULL
+        """).fetchall())
+
+    @staticmethod
+    def _refresh_rollups(conn: DuckDBPyConnection, days: set) -> None:
+        """Recompute the rollup buckets of (symbol, date) days whose Parquet files changed."""
+        from src.infrastructure.core.ohlcv_rollups import day_ranges, refresh_rollups
+
+        ranges = [span for symbol, day in sorted(days) for span in day_ranges(symbol, day, day)]
+        if refresh_rollups(conn, ranges):
+            logger.info("OHLCV rollups refreshed for parquet files", days=len(ranges))
+
     def _initialize_external_parquet_view_if_configured(self, conn: DuckDBPyConnection) -> None:
         """Create unified view combining table + parquet data."""
         if not self.config.use_parquet_in_unified_view:
@@ -238,7 +484,19 @@ class SchemaManager:
         glob = self._parquet_glob()
         if not glob:
             return
+        parquet_source = self._parquet_source(conn, glob)
+
+        unified_select = self.build_unified_select(conn, parquet_source)
+        conn.execute(f"CREATE OR REPLACE VIEW market_data_unified AS {unified_select}")
+        logger.info("Unified market_data_unified view created", parquet_glob=glob)
 
+    def build_unified_select(self, conn: DuckDBPyConnection, parquet_source: Optional[str]) -> str:
+        """SELECT unioning the market_data table with a read_parquet() relation.
+
+        Args:
+            conn: Connection used to inspect the market_data table
+            parquet_source: read_parquet(...) relation, or None for table rows only
+        """
         # Check if market_data table exists
         table_exists = False
         cols = set()
@@ -262,11 +520,6 @@ class SchemaManager:
         except Exception:
             table_exists = False
 
-        # Unified schema columns
-        unified_cols = [
-            "symbol", "timestamp", "open", "high", "low", "close", "volume", "timeframe", "date_partition"
-        ]
-
         # Build table projection
         table_select = None
         if table_exists:
@@ -286,33 +539,74 @@ class SchemaManager:
             ]
             table_select = "SELECT " + ", ".join(parts) + " FROM market_data"
 
-        # Build parquet projection
-        parquet_select = f"""
-        SELECT
-            COALESCE(symbol, regexp_extract(filename, '.*/([A-Za-z0-9._-]+)_minute_.*', 1)) AS symbol,
-            CAST(timestamp AS TIMESTAMP) AS timestamp,
-            CAST(open AS DOUBLE) AS open,
-            CAST(high AS DOUBLE) AS high,
-            CAST(low AS DOUBLE) AS low,
-            CAST(close AS DOUBLE) AS close,
-            CAST(COALESCE(volume, 0) AS BIGINT) AS volume,
-            COALESCE(timeframe, '1m') AS timeframe,
-            COALESCE(CAST(timestamp AS DATE), CURRENT_DATE) AS date_partition
-        FROM read_parquet('{glob}', filename=true)
-        """
+        if parquet_source is None:
+            if table_select:
+                return table_select
+            # Typed empty relation so callers can still filter and project
+            return """
+            SELECT CAST(NULL AS VARCHAR) AS symbol, CAST(NULL AS TIMESTAMP) AS timestamp,
+                   CAST(NULL AS DOUBLE) AS open, CAST(NULL AS DOUBLE) AS high,
+                   CAST(NULL AS DOUBLE) AS low, CAST(NULL AS DOUBLE) AS close,
+                   CAST(NULL AS BIGINT) AS volume, '1m' AS timeframe,
+                   CAST(NULL AS DATE) AS date_partition
+            WHERE false
+            """
+
+        # Build parquet projection from the files' actual columns
+        try:
+            parquet_select = normalized_projection(conn, parquet_source)
+        except Exception:
+            parquet_select = f"""
+            SELECT
+                COALESCE(symbol, regexp_extract(filename, '.*/([A-Za-z0-9._-]+)_minute_.*', 1)) AS symbol,
+                CAST(timestamp AS TIMESTAMP) AS timestamp,
+                CAST(open AS DOUBLE) AS open,
+                CAST(high AS DOUBLE) AS high,
+                CAST(low AS DOUBLE) AS low,
+                CAST(close AS DOUBLE) AS close,
+                CAST(COALESCE(volume, 0) AS BIGINT) AS volume,
+                COALESCE(timeframe, '1m') AS timeframe,
+                COALESCE(CAST(timestamp AS DATE), CURRENT_DATE) AS date_partition
+            FROM {parquet_source}
+            """
 
         if table_select:
-            view_sql = f"""
-            CREATE OR REPLACE VIEW market_data_unified AS
+            return f"""
             {table_select}
             UNION ALL
             {parquet_select}
             """
-        else:
-            view_sql = f"CREATE OR REPLACE VIEW market_data_unified AS {parquet_select}"
+        return parquet_select
+
+    def _parquet_source(self, conn: DuckDBPyConnection, glob: str) -> str:
+        """Build the read_parquet() relation backing the unified view.
+
+        Preference order: the compacted store plus daily files not yet
+        compacted, then the glob. The parquet catalog is not used here: an
+        unfiltered view would have to inline every cataloged path, so the
+        catalog only prunes predicate-bound reads (``market_data_relation``).
+        """
+        default_source = f"read_parquet('{glob}', filename=true)"
+        if self.config.parquet_glob:
+            return default_source
 
-        conn.execute(view_sql)
-        logger.info("Unified market_data_unified view created", parquet_glob=glob, table_included=table_select is not None)
+        compacted_root = self.config.compacted_parquet_root
+        if not compacted_root:
+            return default_source
+
+        try:
+            compacted, pending = compaction_sources(
+                self.config.parquet_root, compacted_root, self.config.compaction_granularity
+            )
+        except Exception as e:
+            logger.warning("Could not inspect compacted parquet store", error=str(e))
+            return default_source
+
+        if not compacted:
+            return default_source
+
+        logger.info("Using compacted parquet store", compacted_files=len(compacted), pending_files=len(pending))
+        return ParquetCatalog.read_parquet_sql(compacted + pending)
 
     def _parquet_glob(self) -> Optional[str]:
         """Build glob pattern for partitioned parquet files."""
@@ -385,12 +679,9 @@ class SchemaManager:
 
     @contextmanager
     def _get_connection(self):
-        """Get a connection for schema operations."""
-        conn = self.connection_pool.get_connection()
-        try:
+        """Get the writer lane for schema operations."""
+        with self.connection_pool.writer() as conn:
             yield conn
-        finally:
-            self.connection_pool.release_connection(conn)
 
 
 class QueryExecutor:
@@ -403,10 +694,7 @@ class QueryExecutor:
         """Execute a SELECT query and return results as DataFrame."""
         with self._get_connection() as conn:
             try:
-                if params:
-                    result = conn.execute(query, params)
-                else:
-                    result = conn.execute(query)
+                result = self.connection_pool.statements(conn).execute(query, params)
                 return result.df()
             except Exception as e:
                 logger.error(
@@ -419,12 +707,9 @@ class QueryExecutor:
 
     def execute_command(self, command: str, params: Optional[List[Any]] = None) -> int:
         """Execute a DML command (INSERT, UPDATE, DELETE) and return affected rows."""
-        with self._get_connection() as conn:
+        with self._get_writer() as conn:
             try:
-                if params:
-                    result = conn.execute(command, params)
-                else:
-                    result = conn.execute(command)
+                result = self.connection_pool.statements(conn).execute(command, params)
                 return result.rows_changed
             except Exception as e:
                 logger.error(
@@ -480,12 +765,15 @@ class QueryExecutor:
 
     @contextmanager
     def _get_connection(self):
-        """Get a connection for query execution."""
-        conn = self.connection_pool.get_connection()
-        try:
+        """Get a read connection for query execution."""
+        with self.connection_pool.reader() as conn:
+            yield conn
+
+    @contextmanager
+    def _get_writer(self):
+        """Get the writer lane for DML commands."""
+        with self.connection_pool.writer() as conn:
             yield conn
-        finally:
-            self.connection_pool.release_connection(conn)
 
 
 class UnifiedDuckDBManager:
@@ -496,6 +784,7 @@ class UnifiedDuckDBManager:
         self.connection_pool = ConnectionPool(config)
         self.schema_manager = SchemaManager(config, self.connection_pool)
         self.query_executor = QueryExecutor(self.connection_pool)
+        self.parquet_catalog = self.schema_manager.parquet_catalog
 
         # Initialize schema on first use
         self.schema_manager.initialize_schema()
@@ -518,11 +807,100 @@ class UnifiedDuckDBManager:
         """Execute query directly on Parquet file."""
         return self.query_executor.execute_parquet_query(parquet_path, query)
 
+    def refresh_parquet_catalog(
+        self,
+        paths: Optional[List[str]] = None,
+        removed_paths: Optional[List[str]] = None,
+    ) -> Optional[CatalogRefreshResult]:
+        """Record written or removed Parquet files in the catalog (all files when both are None)."""
+        return self.schema_manager.refresh_parquet_catalog(paths, removed_paths)
+
+    def write_daily_parquet(self, symbol: str, trading_date: date, data: pd.DataFrame) -> str:
+        """Write one symbol-day of minute bars into the Parquet lake and catalog it.
+
+        The file lands at ``parquet_root/YYYY/MM/DD/{SYMBOL}_minute_{date}.parquet``,
+        replacing any previous delivery for that day.
+
+        Args:
+            symbol: Trading symbol
+            trading_date: Trading date of the bars
+            data: Frame with timestamp, open, high, low, close and volume columns
+
+        Returns:
+            Path of the written file
+        """
+        if not self.config.parquet_root:
+            raise ValueError("parquet_root is not configured")
+
+        target = daily_parquet_path(self.config.parquet_root, symbol, trading_date)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_target = target.with_suffix(".parquet.tmp")
+        data.to_parquet(tmp_target, index=False)
+        os.replace(tmp_target, target)
+
+        self.refresh_parquet_catalog(paths=[str(target)])
+        logger.info("Daily parquet file written", symbol=symbol, date=str(trading_date), rows=len(data))
+        return str(target)
+
+    def compact_parquet(self, compaction_config: CompactionConfig) -> CompactionResult:
+        """Compact daily Parquet files and bring the catalog and unified view up to date.
+
+        Compacted files are cataloged only when ``compaction_config.target_root``
+        is the configured ``compacted_parquet_root``; daily files folded into
+        them (or deleted by ``remove_sources``) leave the catalog.
+        """
+        with ParquetCompactor(compaction_config) as compactor:
+            result = compactor.compact()
+
+        compacted_root = self.config.compacted_parquet_root
+        in_lake = bool(compacted_root) and (
+            Path(compacted_root).resolve() == Path(compaction_config.target_root).resolve()
+        )
+        if in_lake or compaction_config.remove_sources:
+            self.refresh_parquet_catalog(
+                paths=result.written_files if in_lake else [],
+                removed_paths=result.compacted_sources,
+            )
+        return result
+
+    def market_data_relation(
+        self,
+        symbols: Optional[List[str]] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> str:
+        """Return a FROM-clause relation over market data pruned to the predicate.
+
+        With the parquet catalog enabled, the Parquet side reads only the files
+        the catalog lists for the symbols and date range. Otherwise this is
+        simply ``market_data_unified``.
+        """
+        if self.parquet_catalog is None:
+            return "market_data_unified"
+
+        with self.query_executor._get_connection() as conn:
+            if not self.parquet_catalog.table_exists(conn):
+                return "market_data_unified"
+            files = self.parquet_catalog.files_for(conn, symbols, start_date, end_date)
+            parquet_source = ParquetCatalog.read_parquet_sql(files) if files else None
+            unified_select = self.schema_manager.build_unified_select(conn, parquet_source)
+
+        filters = []
+        if symbols:
+            filters.append("symbol IN (" + ", ".join("'" + s.replace("'", "''") + "'" for s in symbols) + ")")
+        if start_date:
+            filters.append(f"date_partition >= DATE '{start_date.isoformat()}'")
+        if end_date:
+            filters.append(f"date_partition <= DATE '{end_date.isoformat()}'")
+        where_sql = f" WHERE {' AND '.join(filters)}" if filters else ""
+        return f"(SELECT * FROM ({unified_select}){where_sql}) AS market_data_pruned"
+
     def get_connection_stats(self) -> Dict[str, int]:
         """Get connection pool statistics."""
         return {
             'active_connections': self.connection_pool.active_connections,
             'available_connections': self.connection_pool.available_connections,
+            'waiting_requests': self.connection_pool.waiting_requests,
             'max_connections': self.config.max_connections
         }
 
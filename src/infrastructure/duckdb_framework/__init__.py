@@ -5,12 +5,14 @@ DuckDB Advanced Framework for Financial Data Analysis
 This framework provides:
 - Advanced query building and optimization
 - Analytical functions for financial data
+- Cross-sectional and streaming correlations
 - Scanner framework for pattern recognition
 - Real-time trading infrastructure
 """
 
 from .query_builder import QueryBuilder, AdvancedQueryBuilder
 from .analytics import FinancialAnalytics, TechnicalIndicators
+from .correlation import StreamingCorrelation
 from .scanner import ScannerFramework, SignalEngine
 from .realtime import RealtimeManager, OrderManager
 
@@ -19,6 +21,7 @@ __all__ = [
     'AdvancedQueryBuilder',
     'FinancialAnalytics',
     'TechnicalIndicators',
+    'StreamingCorrelation',
     'ScannerFramework',
     'SignalEngine',
     'RealtimeManager',
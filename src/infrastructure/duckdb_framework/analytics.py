@@ -17,6 +17,8 @@ from datetime import datetime, timedelta
 from dataclasses import dataclass
 from enum import Enum
 
+from .correlation import ReturnsMatrix, correlation_frame, load_returns, top_k_neighbors
+
 
 class TechnicalIndicator(Enum):
     """Technical indicators supported."""
@@ -362,30 +364,41 @@ class FinancialAnalytics:
 
     def correlation_matrix(self, symbols: List[str],
                           start_date: str, end_date: str) -> pd.DataFrame:
-        """Calculate correlation matrix for symbols."""
-        returns_data = []
-
-        for symbol in symbols:
-            query = """
+        """Calculate correlation matrix of daily returns for symbols."""
+        return correlation_frame(self.daily_returns(symbols, start_date, end_date))
+
+    def correlation_neighbors(self, symbols: List[str], start_date: str, end_date: str,
+                              k: int = 10, block_size: int = 256) -> pd.DataFrame:
+        """Top-k most correlated symbols for each symbol, without the full N x N matrix."""
+        return top_k_neighbors(self.daily_returns(symbols, start_date, end_date),
+                               k=k, block_size=block_size)
+
+    def daily_returns(self, symbols: List[str], start_date: str, end_date: str) -> ReturnsMatrix:
+        """Daily close-to-close returns for all symbols in one query, aligned by date."""
+        if not symbols:
+            return ReturnsMatrix(index=np.array([], dtype='datetime64[us]'), symbols=[], values=np.empty((0, 0)))
+
+        placeholders = ", ".join("?" for _ in symbols)
+        query = f"""
+        WITH daily AS (
             SELECT
+                symbol,
                 date_trunc('day', timestamp) as date,
-                (close - LAG(close) OVER (ORDER BY timestamp)) /
-                NULLIF(LAG(close) OVER (ORDER BY timestamp), 0) as daily_return
+                LAST(close ORDER BY timestamp) as close
             FROM market_data
-            WHERE symbol = ?
+            WHERE symbol IN ({placeholders})
               AND timestamp BETWEEN ? AND ?
-            ORDER BY date
-            """
-
-            df = self.connection.execute(query, [symbol, start_date, end_date]).fetchdf()
-            df = df.set_index('date')
-            returns_data.append(df['daily_return'].rename(symbol))
-
-        # Combine all returns into a single DataFrame
-        combined_df = pd.concat(returns_data, axis=1)
-        correlation_matrix = combined_df.corr()
+            GROUP BY symbol, date
+        )
+        SELECT
+            symbol,
+            date,
+            (close - LAG(close) OVER w) / NULLIF(LAG(close) OVER w, 0) as daily_return
+        FROM daily
+        WINDOW w AS (PARTITION BY symbol ORDER BY date)
+        """
 
-        return correlation_matrix
+        return load_returns(self.connection, query, [*symbols, start_date, end_date], order=symbols)
 
     def sector_analysis(self, sector_symbols: Dict[str, List[str]],
                        start_date: str, end_date: str) -> Dict[str, Dict]:
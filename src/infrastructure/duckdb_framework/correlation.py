@@ -0,0 +1,313 @@
+"""
+Cross-Sectional Correlation Engine
+==================================
+
+Correlations across a universe of symbols without per-symbol round trips:
+
+- ``load_returns`` runs one query yielding (symbol, timestamp, value) rows
+  and scatters them into a dense (bars x symbols) NumPy matrix, NaN where a
+  symbol has no bar
+- ``correlation`` computes pairwise-complete Pearson correlations (the same
+  result as ``DataFrame.corr()``) with a handful of matrix products
+- ``top_k_neighbors`` walks the matrix in row blocks so only
+  ``block_size x N`` correlations exist at a time
+- ``StreamingCorrelation`` keeps rolling-window or exponentially weighted
+  sums that are updated once per new bar
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import List, Mapping, Optional, Sequence, Union
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReturnsMatrix:
+    """Values aligned on a shared time index, one column per symbol."""
+    index: np.ndarray  # sorted timestamps, length T
+    symbols: List[str]  # column labels, length N
+    values: np.ndarray  # (T, N) float64, NaN where a symbol has no value
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.values, index=pd.Index(self.index, name='timestamp'), columns=self.symbols)
+
+
+def pivot_returns(symbols: np.ndarray, timestamps: np.ndarray, values: np.ndarray,
+                  order: Optional[Sequence[str]] = None, drop_empty: bool = False) -> ReturnsMatrix:
+    """
+    Scatter long-format (symbol, timestamp, value) arrays into a dense matrix.
+
+    Args:
+        symbols, timestamps, values: Parallel arrays, one entry per row
+        order: Column order; symbols not listed are ignored. Defaults to
+            sorted unique symbols
+        drop_empty: Drop columns without a single non-NaN value
+    """
+    values = np.ma.filled(np.ma.asarray(values, dtype=np.float64), np.nan)
+    columns = list(dict.fromkeys(order)) if order is not None else sorted(set(symbols.tolist()))
+    codes = pd.Categorical(symbols, categories=columns).codes
+    keep = codes >= 0
+    index, rows = np.unique(timestamps[keep], return_inverse=True)
+
+    matrix = np.full((len(index), len(columns)), np.nan)
+    matrix[rows, codes[keep]] = values[keep]
+
+    if drop_empty:
+        present = ~np.isnan(matrix).all(axis=0)
+        matrix = matrix[:, present]
+        columns = [symbol for symbol, ok in zip(columns, present) if ok]
+    return ReturnsMatrix(index=index, symbols=columns, values=matrix)
+
+
+def load_returns(conn: duckdb.DuckDBPyConnection, query: str, params: Optional[list] = None,
+                 order: Optional[Sequence[str]] = None, drop_empty: bool = False) -> ReturnsMatrix:
+    """
+    Run a query returning ``symbol, timestamp, value`` columns (in that order)
+    for every symbol at once and pivot it with ``pivot_returns``.
+    """
+    result = conn.execute(query, params or []).fetchnumpy()
+    symbols, timestamps, values = (result[name] for name in list(result)[:3])
+    return pivot_returns(symbols, timestamps, values, order=order, drop_empty=drop_empty)
+
+
+def _centered(values: np.ndarray):
+    """Column-centred values with NaN zeroed, and the observation mask as floats."""
+    mask = ~np.isnan(values)
+    counts = mask.sum(axis=0)
+    means = np.divide(np.where(mask, values, 0.0).sum(axis=0), counts,
+                      out=np.zeros(values.shape[1]), where=counts > 0)
+    # Centring first keeps the one-pass sums below from cancelling badly
+    return np.where(mask, values - means, 0.0), mask.astype(np.float64), bool(mask.all())
+
+
+def _block_correlation(x: np.ndarray, m: np.ndarray, dense: bool, columns: slice,
+                       min_periods: int) -> np.ndarray:
+    """Correlations of ``columns`` against every column, shape (block, N)."""
+    xb = x[:, columns]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if dense:
+            scale = np.sqrt((x * x).sum(axis=0))
+            z = x / scale
+            corr = z[:, columns].T @ z
+            pairs = np.full(corr.shape, float(x.shape[0]))
+        else:
+            # Pairwise-complete sums over the rows where both columns have values
+            mb = m[:, columns]
+            pairs = mb.T @ m
+            sum_x = xb.T @ m
+            sum_y = mb.T @ x
+            cov = xb.T @ x - sum_x * sum_y / pairs
+            var_x = (xb * xb).T @ m - sum_x ** 2 / pairs
+            var_y = mb.T @ (x * x) - sum_y ** 2 / pairs
+            corr = cov / np.sqrt(var_x * var_y)
+    corr[pairs < max(min_periods, 2)] = np.nan
+    return np.clip(corr, -1.0, 1.0, out=corr)
+
+
+def correlation(values: np.ndarray, min_periods: int = 1) -> np.ndarray:
+    """
+    Pairwise-complete Pearson correlation of the columns of ``values``.
+
+    Matches ``DataFrame.corr(min_periods=...)``: each pair uses the rows where
+    both columns are present; pairs with fewer than two such rows (or a
+    constant column) are NaN.
+    """
+    x, m, dense = _centered(values)
+    corr = _block_correlation(x, m, dense, slice(None), min_periods)
+    diagonal = np.diag_indices_from(corr)
+    corr[diagonal] = np.where(np.isnan(corr[diagonal]), np.nan, 1.0)
+    return corr
+
+
+def correlation_frame(matrix: ReturnsMatrix, min_periods: int = 1) -> pd.DataFrame:
+    """Correlation matrix labelled by symbol, like ``matrix.to_frame().corr()``."""
+    corr = correlation(matrix.values, min_periods)
+    return pd.DataFrame(corr, index=pd.Index(matrix.symbols), columns=pd.Index(matrix.symbols))
+
+
+def top_k_neighbors(matrix: ReturnsMatrix, k: int = 10, block_size: int = 256,
+                    min_periods: int = 2, absolute: bool = False) -> pd.DataFrame:
+    """
+    Most correlated other symbols for every symbol.
+
+    Correlations are computed ``block_size`` symbols at a time, so memory is
+    O(block_size x N) rather than O(N^2).
+
+    Args:
+        matrix: Aligned returns
+        k: Neighbours per symbol
+        block_size: Symbols per block
+        min_periods: Minimum overlapping bars for a pair to be ranked
+        absolute: Rank by ``|correlation|`` (strongest anti-correlation too)
+
+    Returns:
+        DataFrame with symbol, neighbor, correlation and rank (1 = closest)
+    """
+    symbols = np.asarray(matrix.symbols, dtype=object)
+    n = len(symbols)
+    k = min(k, n - 1)
+    columns = ['symbol', 'neighbor', 'correlation', 'rank']
+    if k <= 0:
+        return pd.DataFrame(columns=columns)
+
+    x, m, dense = _centered(matrix.values)
+    parts = []
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        corr = _block_correlation(x, m, dense, slice(start, stop), min_periods)
+        rows = np.arange(stop - start)
+        corr[rows, rows + start] = np.nan
+
+        score = np.abs(corr) if absolute else corr.copy()
+        score[np.isnan(score)] = -np.inf
+        top = np.argpartition(-score, k - 1, axis=1)[:, :k]
+        top = np.take_along_axis(top, np.argsort(-np.take_along_axis(score, top, axis=1), axis=1), axis=1)
+
+        ranked = np.isfinite(np.take_along_axis(score, top, axis=1))
+        block_rows = np.repeat(rows[:, None], k, axis=1)
+        parts.append(pd.DataFrame({
+            'symbol': symbols[block_rows[ranked] + start],
+            'neighbor': symbols[top[ranked]],
+            'correlation': corr[block_rows[ranked], top[ranked]],
+            'rank': np.tile(np.arange(1, k + 1), (stop - start, 1))[ranked],
+        }))
+
+    return pd.concat(parts, ignore_index=True)
+
+
+class StreamingCorrelation:
+    """
+    Correlation across symbols maintained incrementally, one bar at a time.
+
+    Keeps a weight total, per-symbol sums and the cross-product matrix. With
+    ``window`` the sums cover the last ``window`` bars (the oldest bar is
+    subtracted as a new one arrives); with ``alpha`` or ``halflife`` every bar
+    is exponentially down-weighted by ``1 - alpha`` per new bar. Each update
+    is a rank-one change to the cross products; the correlation itself is
+    only formed when read.
+
+    A symbol without a value in a bar contributes a zero return for that bar.
+    """
+
+    def __init__(self, symbols: Sequence[str], window: Optional[int] = None,
+                 alpha: Optional[float] = None, halflife: Optional[float] = None,
+                 min_periods: int = 2):
+        if halflife is not None:
+            alpha = 1.0 - 0.5 ** (1.0 / halflife)
+        if (window is None) == (alpha is None):
+            raise ValueError("Specify exactly one of window, alpha or halflife")
+        if window is not None and window < 2:
+            raise ValueError("window must be at least 2")
+        if alpha is not None and not 0.0 < alpha <= 1.0:
+            raise ValueError("alpha must be in (0, 1]")
+
+        self.symbols = list(symbols)
+        self.window = window
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self._positions = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+        n = len(self.symbols)
+        self._weight = 0.0
+        self._sum = np.zeros(n)
+        self._cross = np.zeros((n, n))
+        self._bars = 0
+        if window is not None:
+            self._buffer = np.zeros((window, n))
+            self._filled = 0
+            self._cursor = 0
+
+    @classmethod
+    def from_returns(cls, matrix: ReturnsMatrix, **kwargs) -> 'StreamingCorrelation':
+        """Warm up from historical aligned returns, oldest bar first."""
+        stream = cls(matrix.symbols, **kwargs)
+        for row in matrix.values:
+            stream.update(row)
+        return stream
+
+    @property
+    def count(self) -> int:
+        """Bars currently contributing (all bars seen in EW mode)."""
+        return self._filled if self.window is not None else self._bars
+
+    def _vector(self, returns: Union[Mapping[str, float], Sequence[float], np.ndarray]) -> np.ndarray:
+        if isinstance(returns, Mapping):
+            row = np.zeros(len(self.symbols))
+            for symbol, value in returns.items():
+                position = self._positions.get(symbol)
+                if position is not None:
+                    row[position] = value
+        else:
+            row = np.array(returns, dtype=np.float64)
+            if row.shape != (len(self.symbols),):
+                raise ValueError(f"Expected {len(self.symbols)} returns, got {row.shape}")
+        return np.nan_to_num(row, nan=0.0, posinf=0.0, neginf=0.0)
+
+    def update(self, returns: Union[Mapping[str, float], Sequence[float], np.ndarray]):
+        """Add one bar of returns, either aligned with ``symbols`` or keyed by symbol."""
+        row = self._vector(returns)
+        self._bars += 1
+
+        if self.window is None:
+            decay = 1.0 - self.alpha
+            self._weight = decay * self._weight + 1.0
+            self._sum *= decay
+            self._cross *= decay
+        elif self._filled == self.window:
+            oldest = self._buffer[self._cursor]
+            self._sum -= oldest
+            self._cross -= np.outer(oldest, oldest)
+        else:
+            self._filled += 1
+            self._weight = float(self._filled)
+
+        self._sum += row
+        self._cross += np.outer(row, row)
+
+        if self.window is not None:
+            self._buffer[self._cursor] = row
+            self._cursor = (self._cursor + 1) % self.window
+            if self._bars % self.window == 0:
+                # Re-derive the sums so add/subtract rounding does not accumulate
+                live = self._buffer[:self._filled]
+                self._sum = live.sum(axis=0)
+                self._cross = live.T @ live
+
+    def _covariance(self, rows=slice(None)) -> np.ndarray:
+        mean = self._sum / self._weight
+        return self._cross[rows] / self._weight - np.multiply.outer(mean[rows], mean)
+
+    def _normalise(self, cov: np.ndarray, rows=slice(None)) -> np.ndarray:
+        variance = np.diag(self._cross) / self._weight - (self._sum / self._weight) ** 2
+        std = np.sqrt(np.clip(variance, 0.0, None))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = cov / np.multiply.outer(std[rows], std)
+        corr[~np.isfinite(corr)] = np.nan
+        return np.clip(corr, -1.0, 1.0, out=corr)
+
+    def correlation(self) -> pd.DataFrame:
+        """Current correlation matrix (NaN until ``min_periods`` bars)."""
+        n = len(self.symbols)
+        if self.count < max(self.min_periods, 2):
+            corr = np.full((n, n), np.nan)
+        else:
+            corr = self._normalise(self._covariance())
+            diagonal = np.diag_indices(n)
+            corr[diagonal] = np.where(np.isnan(corr[diagonal]), np.nan, 1.0)
+        return pd.DataFrame(corr, index=self.symbols, columns=self.symbols)
+
+    def neighbors(self, symbol: str, k: int = 10, absolute: bool = False) -> pd.Series:
+        """Top-k correlated symbols for one symbol; O(N) without forming the matrix."""
+        if self.count < max(self.min_periods, 2):
+            return pd.Series(dtype=np.float64)
+        position = self._positions[symbol]
+        row = self._normalise(self._covariance(slice(position, position + 1)),
+                              slice(position, position + 1))[0]
+        series = pd.Series(row, index=self.symbols).drop(symbol).dropna()
+        order = series.abs() if absolute else series
+        return series.loc[order.sort_values(ascending=False).index[:k]]
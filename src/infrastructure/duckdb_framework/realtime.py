@@ -6,14 +6,19 @@ Provides:
 - Live data streaming
 - Order management system
 - Risk monitoring
-- Market data ingestion
+- Market data ingestion (micro-batched, with a write-ahead spill)
 - Alert system
 """
 
 import asyncio
+import os
 import websockets
 import json
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.ipc as ipc
 import threading
 from typing import Dict, List, Optional, Callable, Any, Union, Tuple
 from dataclasses import dataclass
@@ -21,6 +26,9 @@ from datetime import datetime, timedelta
 from enum import Enum
 import logging
 from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from ..services.result_cache import bump_table_version
 
 
 class OrderType(Enum):
@@ -91,6 +99,214 @@ class MarketData:
     ask_size: Optional[int] = None
 
 
+class TickIngestionBuffer:
+    """
+    Micro-batching tick writer.
+
+    Ticks are appended to preallocated NumPy column buffers. A full buffer,
+    or the flush interval elapsing, seals it into an Arrow table that is
+    written to a write-ahead spill file (fsynced) and queued for the
+    writer, which inserts the whole batch with one ``INSERT ... SELECT``
+    and deletes the spill file once committed. Rows whose
+    ``(symbol, timestamp, timeframe)`` key is already stored (or repeated
+    within the batch) are skipped, so a duplicate tick never rejects the
+    rest of its batch.
+
+    The pending queue is bounded: when the writer falls behind, ``append``
+    waits for room, so backpressure reaches the websocket reader instead
+    of growing memory. A crash loses at most the unsealed buffer (one flush
+    window); spilled batches are replayed by ``start()``. Replay is
+    at-least-once: a batch committed just before a crash is replayed and
+    its rows skipped as duplicates. Spill files that still fail to replay
+    are moved to ``<spill_dir>/quarantine`` rather than retried on every
+    start.
+    """
+
+    COLUMNS = ("symbol", "timestamp", "price", "volume")
+
+    def __init__(self, connection, table: str = "market_data", batch_size: int = 2048,
+                 flush_interval: float = 0.25, max_pending_batches: int = 8,
+                 spill_dir: Optional[str] = None,
+                 executor: Optional[ThreadPoolExecutor] = None):
+        self.connection = connection
+        self.table = table
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self.executor = executor or ThreadPoolExecutor(max_workers=1)
+        self.logger = logging.getLogger(__name__)
+
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending_batches)
+        self._seal_lock = asyncio.Lock()
+        self._writer_task: Optional[asyncio.Task] = None
+        self._timer_task: Optional[asyncio.Task] = None
+        self._sequence = 0
+        self._first_tick_at: Optional[float] = None
+        self.rows_written = 0
+        self._allocate()
+
+    def _allocate(self):
+        self._symbol = np.empty(self.batch_size, dtype=object)
+        self._timestamp = np.empty(self.batch_size, dtype="datetime64[us]")
+        self._price = np.empty(self.batch_size, dtype=np.float64)
+        self._volume = np.empty(self.batch_size, dtype=np.int64)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def pending_batches(self) -> int:
+        return self._queue.qsize()
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    async def append(self, data: "MarketData"):
+        """Buffer one tick; seals and queues the buffer when it is full."""
+        i = self._size
+        self._symbol[i] = data.symbol
+        self._timestamp[i] = np.datetime64(data.timestamp, "us")
+        self._price[i] = data.price
+        self._volume[i] = data.volume
+        self._size = i + 1
+        if i == 0:
+            self._first_tick_at = asyncio.get_running_loop().time()
+        if self._size >= self.batch_size:
+            await self.flush()
+
+    async def flush(self):
+        """Seal the current buffer (if any rows), spill it and queue it for writing."""
+        async with self._seal_lock:
+            if not self._size:
+                return
+            n = self._size
+            batch = pa.table({
+                "symbol": pa.array(self._symbol[:n], type=pa.string()),
+                "timestamp": pa.array(self._timestamp[:n]),
+                "price": pa.array(self._price[:n]),
+                "volume": pa.array(self._volume[:n]),
+            })
+            # Arrow may share the numeric buffers, so start a fresh set
+            self._allocate()
+            self._first_tick_at = None
+            self._sequence += 1
+            spill_path = None
+            if self.spill_dir is not None:
+                loop = asyncio.get_running_loop()
+                spill_path = await loop.run_in_executor(self.executor, self._spill, batch, self._sequence)
+            await self._queue.put((batch, spill_path))
+
+    def _spill(self, batch: pa.Table, sequence: int) -> Path:
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        path = self.spill_dir / f"ticks-{sequence:012d}-{os.getpid()}.arrow"
+        with open(path, "wb") as f:
+            with ipc.new_file(f, batch.schema) as writer:
+                writer.write_table(batch)
+            f.flush()
+            os.fsync(f.fileno())
+        return path
+
+    # ------------------------------------------------------------------
+    # Writer side
+    # ------------------------------------------------------------------
+
+    def _write_batch(self, batch: pa.Table) -> int:
+        """Insert a sealed batch, skipping stored keys; returns the rows inserted."""
+        view = f"tick_batch_{id(batch)}"
+        self.connection.register(view, batch)
+        first, last = pc.min_max(batch["timestamp"]).values()
+        try:
+            inserted = self.connection.execute(f"""
+            INSERT INTO {self.table} (symbol, timestamp, timeframe, open, high, low, close, volume, date_partition)
+            SELECT symbol, timestamp, '1m', price, price, price, price, volume, CAST(timestamp AS DATE)
+            FROM {view} t
+            WHERE NOT EXISTS (
+                SELECT 1 FROM {self.table} m
+                WHERE m.timestamp >= ? AND m.timestamp <= ?
+                  AND m.symbol = t.symbol AND m.timestamp = t.timestamp AND m.timeframe = '1m'
+            )
+            QUALIFY row_number() OVER (PARTITION BY symbol, timestamp) = 1
+            """, [first.as_py(), last.as_py()]).fetchone()[0]
+            self.connection.commit()
+            bump_table_version(self.table)
+        finally:
+            self.connection.unregister(view)
+        return inserted
+
+    async def _writer(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch, spill_path = await self._queue.get()
+            try:
+                self.rows_written += await loop.run_in_executor(self.executor, self._write_batch, batch)
+                if spill_path is not None:
+                    spill_path.unlink(missing_ok=True)
+            except Exception as e:
+                # The spill file stays behind and is replayed on the next start()
+                self.logger.error(f"Database error writing {batch.num_rows} ticks: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _timer(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.flush_interval / 2)
+            started = self._first_tick_at
+            if started is not None and loop.time() - started >= self.flush_interval:
+                await self.flush()
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        """Replay leftover spill files, then start the writer and flush timer."""
+        if self._writer_task is not None:
+            return
+        replayed = await asyncio.get_running_loop().run_in_executor(self.executor, self.recover)
+        if replayed:
+            self.logger.info(f"Replayed {replayed} spilled ticks")
+        self._writer_task = asyncio.create_task(self._writer())
+        self._timer_task = asyncio.create_task(self._timer())
+
+    async def stop(self):
+        """Flush the open buffer, drain the queue and stop the background tasks."""
+        if self._writer_task is None:
+            return
+        self._timer_task.cancel()
+        await self.flush()
+        await self._queue.join()
+        self._writer_task.cancel()
+        await asyncio.gather(self._writer_task, self._timer_task, return_exceptions=True)
+        self._writer_task = self._timer_task = None
+
+    def recover(self) -> int:
+        """Insert batches left in the spill directory by an earlier run; returns the rows inserted."""
+        if self.spill_dir is None or not self.spill_dir.exists():
+            return 0
+        rows = 0
+        for path in sorted(self.spill_dir.glob("ticks-*.arrow")):
+            try:
+                with pa.memory_map(str(path)) as source:
+                    batch = ipc.open_file(source).read_all()
+                inserted = self._write_batch(batch)
+            except Exception as e:
+                self._quarantine(path, e)
+                continue
+            rows += inserted
+            path.unlink()
+        return rows
+
+    def _quarantine(self, path: Path, error: Exception):
+        """Set aside a spill file that cannot be replayed so later starts skip it."""
+        quarantine = self.spill_dir / "quarantine"
+        quarantine.mkdir(parents=True, exist_ok=True)
+        os.replace(path, quarantine / path.name)
+        self.logger.error(f"Could not replay spill file {path}, moved to {quarantine}: {error}")
+
+
 class RealtimeManager:
     """
     Real-time market data manager.
@@ -103,6 +319,14 @@ class RealtimeManager:
         self.is_running = False
         self.executor = ThreadPoolExecutor(max_workers=4)
         self.logger = logging.getLogger(__name__)
+        self.ingestion = TickIngestionBuffer(
+            connection,
+            batch_size=self.config.get('ingest_batch_size', 2048),
+            flush_interval=self.config.get('ingest_flush_interval', 0.25),
+            max_pending_batches=self.config.get('ingest_max_pending_batches', 8),
+            spill_dir=self.config.get('ingest_spill_dir'),
+            executor=ThreadPoolExecutor(max_workers=1),  # single writer keeps batches ordered
+        )
 
     def get_default_config(self) -> Dict[str, Any]:
         return {
@@ -111,13 +335,18 @@ class RealtimeManager:
             'data_retention_hours': 24,
             'websocket_url': 'wss://websocket.example.com/marketdata',
             'api_key': None,
-            'api_secret': None
+            'api_secret': None,
+            'ingest_batch_size': 2048,          # ticks per flush
+            'ingest_flush_interval': 0.25,      # seconds before a partial buffer is flushed
+            'ingest_max_pending_batches': 8,    # sealed batches queued before append() waits
+            'ingest_spill_dir': 'data/tick_spill'
         }
 
     async def start_streaming(self):
         """Start real-time data streaming."""
         self.is_running = True
         self.logger.info("Starting real-time data streaming")
+        await self.ingestion.start()
 
         try:
             # Connect to websocket
@@ -141,6 +370,8 @@ class RealtimeManager:
 
         except Exception as e:
             self.logger.error(f"Error in real-time streaming: {e}")
+        finally:
+            await self.ingestion.stop()
 
     def stop_streaming(self):
         """Stop real-time data streaming."""
@@ -195,29 +426,8 @@ class RealtimeManager:
             self.logger.error(f"Error processing market data: {e}")
 
     async def _store_market_data(self, data: MarketData):
-        """Store market data in database."""
-        query = """
-        INSERT INTO market_data (symbol, timestamp, timeframe, open, high, low, close, volume, date_partition)
-        VALUES (?, ?, '1m', ?, ?, ?, ?, ?, ?)
-        """
-
-        # Use thread pool for database operations
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(
-            self.executor,
-            self._execute_query,
-            query,
-            (
-                data.symbol,
-                data.timestamp,
-                data.price,  # open
-                data.price,  # high
-                data.price,  # low
-                data.price,  # close
-                data.volume,
-                data.timestamp.date()
-            )
-        )
+        """Buffer market data for the next batched insert (waits when the writer is behind)."""
+        await self.ingestion.append(data)
 
     def _execute_query(self, query: str, params: Tuple):
         """Execute database query in thread pool."""
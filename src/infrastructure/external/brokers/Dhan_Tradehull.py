@@ -21,6 +21,12 @@ import urllib.parse
 import threading
 import asyncio
 from dhanhq import DhanContext
+try:
+	from .instrument_index import (InstrumentIndex, OPTION_MATCH_INDEX, OPTION_MATCH_MCX, OPTION_MATCH_STOCK,
+		normalize_instruments, read_snapshot, snapshot_path, write_snapshot)
+except ImportError:
+	from instrument_index import (InstrumentIndex, OPTION_MATCH_INDEX, OPTION_MATCH_MCX, OPTION_MATCH_STOCK,
+		normalize_instruments, read_snapshot, snapshot_path, write_snapshot)
 
 warnings.filterwarnings("ignore", category=FutureWarning)
 print("Codebase Version 3")
@@ -149,13 +155,17 @@ class Tradehull:
 		Args:
 			tradingsymbol: Trading symbol to search for
 			exchange: Exchange to search in
-			instrument_df: Optional instrument dataframe, uses self.instrument_df if not provided
+			instrument_df: Optional instrument dataframe or InstrumentIndex, uses the indexed self.instrument_df if not provided
 			
 		Returns:
 			Security ID if found, raises exception if not found
 		"""
-		if instrument_df is None:
-			instrument_df = self.instrument_df.copy()
+		if instrument_df is None or instrument_df is getattr(self, 'instrument_df', None):
+			index = self._get_instrument_index()
+		elif isinstance(instrument_df, InstrumentIndex):
+			index = instrument_df
+		else:
+			index = InstrumentIndex.for_frame(instrument_df)
 			
 		instrument_exchange = self._get_instrument_exchange_mapping()
 
@@ -192,17 +202,15 @@ class Tradehull:
 				# Some feeds might use CE/PE in custom symbol as well
 				custom_variant_cepe = f"{underlying} {day} {month} {strike_token} {side_cepe}"
 				
-				candidates = instrument_df[instrument_df['SEM_EXM_EXCH_ID'] == 'MCX']
 				# 1) Exact match on custom symbol (CALL/PUT or CE/PE)
-				security_check = candidates[
-					(candidates['SEM_CUSTOM_SYMBOL'].str.upper() == custom_variant_callput) |
-					(candidates['SEM_CUSTOM_SYMBOL'].str.upper() == custom_variant_cepe)
-				]
-				if not security_check.empty:
-					return security_check.iloc[-1]['SEM_SMST_SECURITY_ID']
+				for variant in (custom_variant_callput, custom_variant_cepe):
+					security_id = index.mcx_custom_symbol(variant)
+					if security_id is not None:
+						return security_id
 				
 				# 2) Component-wise fallback using underlying + strike (+/- scaling) + side
 				# Handle possible strike scaling (e.g., 57000 provided vs 5700 in file)
+				candidates = index.mcx_rows
 				strike_candidates = set()
 				try:
 					strike_val = int(strike_token)
@@ -228,42 +236,28 @@ class Tradehull:
 
 		# Handle pure commodity futures by underlying
 		if symbol_upper in self.commodity_step_dict.keys():
-			security_check = instrument_df[
-				(instrument_df['SEM_EXM_EXCH_ID'] == 'MCX') &
-				(instrument_df['SM_SYMBOL_NAME'].str.upper() == symbol_upper) &
-				(instrument_df['SEM_INSTRUMENT_NAME'] == 'FUTCOM')
-			]
-			if not security_check.empty:
-				return security_check.sort_values(by='SEM_EXPIRY_DATE').iloc[0]['SEM_SMST_SECURITY_ID']
+			security_id = index.nearest_commodity_future(symbol_upper)
+			if security_id is not None:
+				return security_id
 			# Fall through if not found
 
 		# Generic handling for regular symbols
 		exch_val = instrument_exchange[exchange_key]
-		candidates = instrument_df[instrument_df['SEM_EXM_EXCH_ID'] == exch_val]
 		
 		# 1) Exact match on trading/custom symbol
-		security_check = candidates[
-			(candidates['SEM_TRADING_SYMBOL'] == symbol_raw) |
-			(candidates['SEM_CUSTOM_SYMBOL'] == symbol_raw)
-		]
-		if not security_check.empty:
-			return security_check.iloc[-1]['SEM_SMST_SECURITY_ID']
+		security_id = index.security_id(symbol_raw, exch_val)
+		if security_id is not None:
+			return security_id
 		
 		# 2) Case-insensitive equality
-		security_check = candidates[
-			(candidates['SEM_TRADING_SYMBOL'].str.upper() == symbol_upper) |
-			(candidates['SEM_CUSTOM_SYMBOL'].str.upper() == symbol_upper)
-		]
-		if not security_check.empty:
-			return security_check.iloc[-1]['SEM_SMST_SECURITY_ID']
+		security_id = index.security_id_upper(symbol_upper, exch_val)
+		if security_id is not None:
+			return security_id
 		
 		# 3) Startswith fallback (helps for derivatives with suffixes)
-		startswith_check = candidates[
-			candidates['SEM_TRADING_SYMBOL'].str.upper().str.startswith(symbol_upper) |
-			candidates['SEM_CUSTOM_SYMBOL'].str.upper().str.startswith(symbol_upper)
-		]
-		if not startswith_check.empty:
-			return startswith_check.iloc[-1]['SEM_SMST_SECURITY_ID']
+		security_id = index.security_id_by_prefix(symbol_upper, exch_val)
+		if security_id is not None:
+			return security_id
 		
 		raise Exception("Check the Tradingsymbol")
 
@@ -307,36 +301,29 @@ class Tradehull:
 		else:
 			return expiry_list[expiry_index]
 
-	def _prepare_option_conditions(self, underlying, exchange, expiry_date):
-		"""Prepare common option filtering conditions"""
-		instrument_df = self.instrument_df.copy()
-		
+	def _get_option_match(self, underlying, exchange):
+		"""Symbol matching rule used to pick the option contracts of an underlying"""
 		if underlying in self.index_step_dict:
-			ce_condition_base = (
-				(instrument_df['SEM_EXM_EXCH_ID'] == exchange) & 
-				((instrument_df['SEM_TRADING_SYMBOL'].str.startswith(underlying)) |
-				 (instrument_df['SEM_CUSTOM_SYMBOL'].str.startswith(underlying))) & 
-				(instrument_df['ContractExpiration'] == expiry_date)
-			)
+			return OPTION_MATCH_INDEX
 		elif exchange == "MCX":
-			ce_condition_base = (
-				(instrument_df['SEM_EXM_EXCH_ID'] == exchange) & 
-				((instrument_df['SEM_TRADING_SYMBOL'].str.startswith(underlying)) |
-				 (instrument_df['SEM_CUSTOM_SYMBOL'].str.startswith(underlying))) & 
-				(instrument_df['ContractExpiration'] == expiry_date) & 
-				(instrument_df['SM_SYMBOL_NAME'] == underlying)
-			)
+			return OPTION_MATCH_MCX
 		elif underlying in self.stock_step_df:
-			ce_condition_base = (
-				(instrument_df['SEM_EXM_EXCH_ID'] == exchange) & 
-				((instrument_df['SEM_TRADING_SYMBOL'].str.startswith(underlying + '-')) &
-				 (instrument_df['SEM_CUSTOM_SYMBOL'].str.startswith(underlying))) & 
-				(instrument_df['ContractExpiration'] == expiry_date)
-			)
+			return OPTION_MATCH_STOCK
 		else:
 			raise Exception(f'{underlying} Not in the step list')
-			
-		return ce_condition_base, instrument_df
+
+	def _get_option_chain(self, underlying, exchange, expiry_date):
+		"""Indexed CE/PE strikes of an underlying for one expiry"""
+		match = self._get_option_match(underlying, exchange)
+		return self._get_instrument_index().option_chain(underlying, exchange, str(expiry_date), match)
+
+	def _get_instrument_index(self):
+		"""Instrument index for today, reloading the master when the trading day has rolled over"""
+		index = getattr(self, 'instrument_index', None)
+		if index is None or index.trading_date != datetime.date.today():
+			index = self.instrument_index = InstrumentIndex.load("Dependencies", self.get_instrument_file)
+			self.instrument_df = index.instrument_df
+		return index
 
 	def get_login(self,ClientCode,token_id):
 		try:
@@ -348,7 +335,8 @@ class Tradehull:
 			dhan_context = DhanContext(ClientCode, token_id)
 			self.Dhan = dhanhq(dhan_context)
 			
-			self.instrument_df 									= self.get_instrument_file()
+			self.instrument_index 								= InstrumentIndex.load("Dependencies", self.get_instrument_file)
+			self.instrument_df 									= self.instrument_index.instrument_df
 			print('Got the instrument file')
 		except Exception as e:
 			print(e)
@@ -691,7 +679,7 @@ class Tradehull:
 			if tradingsymbol in index_exchange:
 				exchange = index_exchange[tradingsymbol]
 
-			security_id = self._find_security_by_symbol(tradingsymbol, exchange, instrument_df)
+			security_id = self._find_security_by_symbol(tradingsymbol, exchange)
 			exchange_segment = script_exchange[exchange]
 
 			# Get additional instrument details using either symbol match or the resolved security_id row
@@ -776,7 +764,7 @@ class Tradehull:
 			if tradingsymbol in index_exchange:
 				exchange = index_exchange[tradingsymbol]
 				
-			security_id = self._find_security_by_symbol(tradingsymbol, exchange, instrument_df)
+			security_id = self._find_security_by_symbol(tradingsymbol, exchange)
 			exchange_segment = script_exchange[exchange]
 
 			# Get additional instrument details for commodity symbols
@@ -875,7 +863,7 @@ class Tradehull:
 					# Check for MCX options first (like "CRUDEOIL 17 SEPT 57000 CALL")
 					if any(x in name for x in [" CALL", " PUT", " CE", " PE"]) and any(commodity in name for commodity in self.commodity_step_dict.keys()):
 						try:
-							security_id = self._find_security_by_symbol(original_name, "MCX", instrument_df)
+							security_id = self._find_security_by_symbol(original_name, "MCX")
 							instruments['MCX_COMM'].append(int(security_id))
 							instrument_names[str(security_id)]=original_name
 							continue
@@ -982,12 +970,6 @@ class Tradehull:
 		try:
 			Underlying = Underlying.upper()
 			strike = 0
-			instrument_df = self.instrument_df.copy()
-
-			instrument_df['SEM_EXPIRY_DATE'] = pd.to_datetime(instrument_df['SEM_EXPIRY_DATE'], errors='coerce')
-			instrument_df['ContractExpiration'] = instrument_df['SEM_EXPIRY_DATE'].dt.date
-			instrument_df['ContractExpiration'] = instrument_df['ContractExpiration'].astype(str)
-
 			# Use common helper methods
 			exchange, expiry_exchange = self._get_exchange_for_underlying(Underlying)
 			Expiry_date = self._get_expiry_date_from_list(Underlying, Expiry, expiry_exchange)
@@ -1000,45 +982,12 @@ class Tradehull:
 			step = self._get_step_size_for_underlying(Underlying)
 			strike = round(ltp/step) * step
 			
-			# Use common helper method for option conditions
-			ce_condition_base, instrument_df = self._prepare_option_conditions(Underlying, exchange, Expiry_date)
-			
-			ce_condition = ce_condition_base & (instrument_df['SEM_OPTION_TYPE']=='CE')
-			pe_condition = ce_condition_base & (instrument_df['SEM_OPTION_TYPE']=='PE')
-
-			ce_df = instrument_df[ce_condition].copy()
-			pe_df = instrument_df[pe_condition].copy()
-
-			if ce_df.empty or pe_df.empty:
+			chain = self._get_option_chain(Underlying, exchange, Expiry_date)
+			if chain.ce.empty or chain.pe.empty:
 				raise Exception(f"Unable to find the ATM strike for the {Underlying}")
 
-			ce_df['SEM_STRIKE_PRICE'] = ce_df['SEM_STRIKE_PRICE'].astype("int")
-			pe_df['SEM_STRIKE_PRICE'] = pe_df['SEM_STRIKE_PRICE'].astype("int")
-
-			ce_df = ce_df[ce_df['SEM_STRIKE_PRICE']==strike]
-			pe_df = pe_df[pe_df['SEM_STRIKE_PRICE']==strike]
-
-			if ce_df.empty or pe_df.empty:
-				raise Exception(f"Unable to find the ATM strike for the {Underlying}")			
-
-			if ce_df.empty or len(ce_df)==0:
-				ce_df['diff'] = abs(ce_df['SEM_STRIKE_PRICE'] - strike)
-				closest_index = ce_df['diff'].idxmin()
-				strike = ce_df.loc[closest_index, 'SEM_STRIKE_PRICE']
-				ce_df = ce_df[ce_df['SEM_STRIKE_PRICE']==strike]
-			
-			ce_df = ce_df.iloc[-1]	
-
-			if pe_df.empty or len(pe_df)==0:
-				pe_df['diff'] = abs(pe_df['SEM_STRIKE_PRICE'] - strike)
-				closest_index = pe_df['diff'].idxmin()
-				strike = pe_df.loc[closest_index, 'SEM_STRIKE_PRICE']
-				pe_df = pe_df[pe_df['SEM_STRIKE_PRICE']==strike]
-			
-			pe_df = pe_df.iloc[-1]			
-
-			ce_strike = ce_df['SEM_CUSTOM_SYMBOL']
-			pe_strike = pe_df['SEM_CUSTOM_SYMBOL']
+			# Nearest strike listed on both sides when the rounded ATM strike is not
+			strike, ce_strike, pe_strike = chain.nearest_common(strike)
 
 			if ce_strike== None:
 				self.logger.info("No Scripts to Select from ce_spot_difference for ")
@@ -1059,12 +1008,6 @@ class Tradehull:
 			Underlying = Underlying.upper()
 			# Expiry = pd.to_datetime(Expiry, format='%d-%m-%Y').strftime('%Y-%m-%d')
 			exchange_index = {"BANKNIFTY": "NSE","NIFTY":"NSE","MIDCPNIFTY":"NSE", "FINNIFTY":"NSE","SENSEX":"BSE","BANKEX":"BSE"}
-			instrument_df = self.instrument_df.copy()
-
-			instrument_df['SEM_EXPIRY_DATE'] = pd.to_datetime(instrument_df['SEM_EXPIRY_DATE'], errors='coerce')
-			instrument_df['ContractExpiration'] = instrument_df['SEM_EXPIRY_DATE'].dt.date
-			instrument_df['ContractExpiration'] = instrument_df['ContractExpiration'].astype(str)
-
 			if Underlying in exchange_index:
 				exchange = exchange_index[Underlying]
 				expiry_exchange = 'INDEX'
@@ -1108,52 +1051,12 @@ class Tradehull:
 			ce_OTM_price = strike+step
 			pe_OTM_price = strike-step
 
-			if Underlying in self.index_step_dict:
-				ce_condition = (instrument_df['SEM_EXM_EXCH_ID'] == exchange) & ((instrument_df['SEM_TRADING_SYMBOL'].str.startswith(Underlying))|(instrument_df['SEM_CUSTOM_SYMBOL'].str.startswith(Underlying))) & (instrument_df['ContractExpiration'] == Expiry_date) & (instrument_df['SEM_OPTION_TYPE']=='CE') 
-				pe_condition = (instrument_df['SEM_EXM_EXCH_ID'] == exchange) & ((instrument_df['SEM_TRADING_SYMBOL'].str.startswith(Underlying))|(instrument_df['SEM_CUSTOM_SYMBOL'].str.startswith(Underlying))) & (instrument_df['ContractExpiration'] == Expiry_date) & (instrument_df['SEM_OPTION_TYPE']=='PE')
-			elif exchange =="MCX": 		
-				ce_condition = (instrument_df['SEM_EXM_EXCH_ID'] == exchange) & ((instrument_df['SEM_TRADING_SYMBOL'].str.startswith(Underlying))|(instrument_df['SEM_CUSTOM_SYMBOL'].str.startswith(Underlying))) & (instrument_df['ContractExpiration'] == Expiry_date) & (instrument_df['SEM_OPTION_TYPE']=='CE') & (instrument_df['SM_SYMBOL_NAME']==Underlying) 
-				pe_condition = (instrument_df['SEM_EXM_EXCH_ID'] == exchange) & ((instrument_df['SEM_TRADING_SYMBOL'].str.startswith(Underlying))|(instrument_df['SEM_CUSTOM_SYMBOL'].str.startswith(Underlying))) & (instrument_df['ContractExpiration'] == Expiry_date) & (instrument_df['SEM_OPTION_TYPE']=='PE') & (instrument_df['SM_SYMBOL_NAME']==Underlying)
-			elif Underlying in self.stock_step_df:
-				ce_condition = (instrument_df['SEM_EXM_EXCH_ID'] == exchange) & ((instrument_df['SEM_TRADING_SYMBOL'].str.startswith(Underlying + '-'))&(instrument_df['SEM_CUSTOM_SYMBOL'].str.startswith(Underlying))) & (instrument_df['ContractExpiration'] == Expiry_date) & (instrument_df['SEM_OPTION_TYPE']=='CE')
-				pe_condition = (instrument_df['SEM_EXM_EXCH_ID'] == exchange) & ((instrument_df['SEM_TRADING_SYMBOL'].str.startswith(Underlying + '-'))&(instrument_df['SEM_CUSTOM_SYMBOL'].str.startswith(Underlying))) & (instrument_df['ContractExpiration'] == Expiry_date) & (instrument_df['SEM_OPTION_TYPE']=='PE')		
-			else:
-				data = f'{Underlying} Not in the step list'
-				raise Exception(data)				 			
-			
-			ce_df = instrument_df[ce_condition].copy()
-			pe_df = instrument_df[pe_condition].copy()
-
-			if ce_df.empty or pe_df.empty:
-				raise Exception(f"Unable to find the OTM strike for the {Underlying}")			
+			chain = self._get_option_chain(Underlying, exchange, Expiry_date)
+			if chain.ce.empty or chain.pe.empty:
+				raise Exception(f"Unable to find the OTM strike for the {Underlying}")
 
-			ce_df['SEM_STRIKE_PRICE'] = ce_df['SEM_STRIKE_PRICE'].astype("int")
-			pe_df['SEM_STRIKE_PRICE'] = pe_df['SEM_STRIKE_PRICE'].astype("int")
-
-			ce_df =ce_df[ce_df['SEM_STRIKE_PRICE']==ce_OTM_price]
-			pe_df =pe_df[pe_df['SEM_STRIKE_PRICE']==pe_OTM_price]
-
-			if ce_df.empty or pe_df.empty:
-				raise Exception(f"Unable to find the ITM strike for the {Underlying}")			
-
-			if ce_df.empty or len(ce_df)==0:
-				ce_df['diff'] = abs(ce_df['SEM_STRIKE_PRICE'] - ce_OTM_price)
-				closest_index = ce_df['diff'].idxmin()
-				ce_OTM_price = ce_df.loc[closest_index, 'SEM_STRIKE_PRICE']
-				ce_df =ce_df[ce_df['SEM_STRIKE_PRICE']==ce_OTM_price]
-			
-			ce_df = ce_df.iloc[-1]	
-
-			if pe_df.empty or len(pe_df)==0:
-				pe_df['diff'] = abs(pe_df['SEM_STRIKE_PRICE'] - pe_OTM_price)
-				closest_index = pe_df['diff'].idxmin()
-				pe_OTM_price = pe_df.loc[closest_index, 'SEM_STRIKE_PRICE']
-				pe_df =pe_df[pe_df['SEM_STRIKE_PRICE']==pe_OTM_price]
-			
-			pe_df = pe_df.iloc[-1]			
-
-			ce_strike = ce_df['SEM_CUSTOM_SYMBOL']
-			pe_strike = pe_df['SEM_CUSTOM_SYMBOL']
+			ce_OTM_price, ce_strike = chain.ce.nearest(ce_OTM_price)
+			pe_OTM_price, pe_strike = chain.pe.nearest(pe_OTM_price)
 
 			if ce_strike== None:
 				self.logger.info("No Scripts to Select from ce_spot_difference for ")
@@ -1175,12 +1078,6 @@ class Tradehull:
 			Underlying = Underlying.upper()
 			# Expiry = pd.to_datetime(Expiry, format='%d-%m-%Y').strftime('%Y-%m-%d')
 			exchange_index = {"BANKNIFTY": "NSE","NIFTY":"NSE","MIDCPNIFTY":"NSE", "FINNIFTY":"NSE","SENSEX":"BSE","BANKEX":"BSE"}
-			instrument_df = self.instrument_df.copy()
-
-			instrument_df['SEM_EXPIRY_DATE'] = pd.to_datetime(instrument_df['SEM_EXPIRY_DATE'], errors='coerce')
-			instrument_df['ContractExpiration'] = instrument_df['SEM_EXPIRY_DATE'].dt.date
-			instrument_df['ContractExpiration'] = instrument_df['ContractExpiration'].astype(str)
-
 			if Underlying in exchange_index:
 				exchange = exchange_index[Underlying]
 				expiry_exchange = 'INDEX'
@@ -1222,52 +1119,12 @@ class Tradehull:
 			ce_ITM_price = strike-step
 			pe_ITM_price = strike+step
 
-			if Underlying in self.index_step_dict:
-				ce_condition = (instrument_df['SEM_EXM_EXCH_ID'] == exchange) & ((instrument_df['SEM_TRADING_SYMBOL'].str.startswith(Underlying))|(instrument_df['SEM_CUSTOM_SYMBOL'].str.startswith(Underlying))) & (instrument_df['ContractExpiration'] == Expiry_date) & (instrument_df['SEM_OPTION_TYPE']=='CE') 
-				pe_condition = (instrument_df['SEM_EXM_EXCH_ID'] == exchange) & ((instrument_df['SEM_TRADING_SYMBOL'].str.startswith(Underlying))|(instrument_df['SEM_CUSTOM_SYMBOL'].str.startswith(Underlying))) & (instrument_df['ContractExpiration'] == Expiry_date) & (instrument_df['SEM_OPTION_TYPE']=='PE')
-			elif exchange =="MCX": 		
-				ce_condition = (instrument_df['SEM_EXM_EXCH_ID'] == exchange) & ((instrument_df['SEM_TRADING_SYMBOL'].str.startswith(Underlying))|(instrument_df['SEM_CUSTOM_SYMBOL'].str.startswith(Underlying))) & (instrument_df['ContractExpiration'] == Expiry_date) & (instrument_df['SEM_OPTION_TYPE']=='CE') & (instrument_df['SM_SYMBOL_NAME']==Underlying) 
-				pe_condition = (instrument_df['SEM_EXM_EXCH_ID'] == exchange) & ((instrument_df['SEM_TRADING_SYMBOL'].str.startswith(Underlying))|(instrument_df['SEM_CUSTOM_SYMBOL'].str.startswith(Underlying))) & (instrument_df['ContractExpiration'] == Expiry_date) & (instrument_df['SEM_OPTION_TYPE']=='PE') & (instrument_df['SM_SYMBOL_NAME']==Underlying)
-			elif Underlying in self.stock_step_df:
-				ce_condition = (instrument_df['SEM_EXM_EXCH_ID'] == exchange) & ((instrument_df['SEM_TRADING_SYMBOL'].str.startswith(Underlying + '-'))&(instrument_df['SEM_CUSTOM_SYMBOL'].str.startswith(Underlying))) & (instrument_df['ContractExpiration'] == Expiry_date) & (instrument_df['SEM_OPTION_TYPE']=='CE')
-				pe_condition = (instrument_df['SEM_EXM_EXCH_ID'] == exchange) & ((instrument_df['SEM_TRADING_SYMBOL'].str.startswith(Underlying + '-'))&(instrument_df['SEM_CUSTOM_SYMBOL'].str.startswith(Underlying))) & (instrument_df['ContractExpiration'] == Expiry_date) & (instrument_df['SEM_OPTION_TYPE']=='PE')
-			else:
-				data = f'{Underlying} Not in the step list'
-				raise Exception(data)			
-			 			
-			ce_df = instrument_df[ce_condition].copy()
-			pe_df = instrument_df[pe_condition].copy()
-
-			if ce_df.empty or pe_df.empty:
-				raise Exception(f"Unable to find the ITM strike for the {Underlying}")			
-
-			ce_df['SEM_STRIKE_PRICE'] = ce_df['SEM_STRIKE_PRICE'].astype("int")
-			pe_df['SEM_STRIKE_PRICE'] = pe_df['SEM_STRIKE_PRICE'].astype("int")
-
-			ce_df =ce_df[ce_df['SEM_STRIKE_PRICE']==ce_ITM_price].copy()
-			pe_df =pe_df[pe_df['SEM_STRIKE_PRICE']==pe_ITM_price]
-
-			if ce_df.empty or pe_df.empty:
+			chain = self._get_option_chain(Underlying, exchange, Expiry_date)
+			if chain.ce.empty or chain.pe.empty:
 				raise Exception(f"Unable to find the ITM strike for the {Underlying}")
 
-			if ce_df.empty or len(ce_df)==0:
-				ce_df['diff'] = abs(ce_df['SEM_STRIKE_PRICE'] - ce_ITM_price)
-				closest_index = ce_df['diff'].idxmin()
-				ce_ITM_price = ce_df.loc[closest_index, 'SEM_STRIKE_PRICE']
-				ce_df =ce_df[ce_df['SEM_STRIKE_PRICE']==ce_ITM_price]
-			
-			ce_df = ce_df.iloc[-1]	
-
-			if pe_df.empty or len(pe_df)==0:
-				pe_df['diff'] = abs(pe_df['SEM_STRIKE_PRICE'] - pe_ITM_price)
-				closest_index = pe_df['diff'].idxmin()
-				pe_ITM_price = pe_df.loc[closest_index, 'SEM_STRIKE_PRICE']
-				pe_df =pe_df[pe_df['SEM_STRIKE_PRICE']==pe_ITM_price]
-			
-			pe_df = pe_df.iloc[-1]			
-
-			ce_strike = ce_df['SEM_CUSTOM_SYMBOL']
-			pe_strike = pe_df['SEM_CUSTOM_SYMBOL']
+			ce_ITM_price, ce_strike = chain.ce.nearest(ce_ITM_price)
+			pe_ITM_price, pe_strike = chain.pe.nearest(pe_ITM_price)
 
 			if ce_strike== None:
 				self.logger.info("No Scripts to Select from ce_spot_difference for ")
@@ -0,0 +1,366 @@
+"""
+Instrument Index for the Dhan scrip master
+==========================================
+
+The Dhan instrument master has ~200k rows. Looking contracts up by masking
+the whole DataFrame costs tens of milliseconds per call, and the option
+strike selection used to copy it and re-parse expiry strings every time.
+
+``InstrumentIndex`` is built once per trading day from the master and
+answers the same questions without scanning it:
+
+- exact / case-insensitive symbol -> security id via hash maps keyed by
+  exchange (last row in file order wins, as with ``.iloc[-1]``)
+- prefix lookups via sorted NumPy arrays and ``searchsorted``
+- nearest commodity future per underlying
+- option chains per (underlying, expiry, CE/PE) as sorted strike arrays,
+  so nearest-strike selection is a binary search
+
+The normalized master is persisted as a Parquet snapshot next to the CSV,
+so a restart on the same day neither re-downloads nor re-parses the CSV.
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+#: Largest code point, used as the exclusive upper bound of a prefix range
+_PREFIX_END = "\U0010ffff"
+
+#: Option chain membership rules, mirroring the strike selection filters
+OPTION_MATCH_INDEX = "index"    # symbol starts with the underlying
+OPTION_MATCH_MCX = "mcx"        # ... and SM_SYMBOL_NAME equals it
+OPTION_MATCH_STOCK = "stock"    # trading symbol starts with "<underlying>-"
+
+
+def normalize_instruments(instrument_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add the derived columns lookups need, parsing expiries once.
+
+    Adds ``ContractExpiration`` (expiry date as ``YYYY-MM-DD`` string) and
+    leaves the raw Dhan columns untouched.
+    """
+    df = instrument_df
+    if 'ContractExpiration' not in df.columns:
+        expiry = pd.to_datetime(df['SEM_EXPIRY_DATE'], errors='coerce')
+        df = df.assign(ContractExpiration=expiry.dt.date.astype(str))
+    return df
+
+
+def snapshot_path(directory: str, trading_date: date) -> str:
+    """Path of the Parquet snapshot for a trading day."""
+    return os.path.join(directory, f"all_instrument {trading_date.isoformat()}.parquet")
+
+
+def write_snapshot(instrument_df: pd.DataFrame, path: str) -> bool:
+    """Persist the normalized master as Parquet (write to temp, then rename)."""
+    tmp_path = path + ".tmp"
+    try:
+        df = instrument_df.loc[:, ~instrument_df.columns.astype(str).str.startswith('Unnamed')].copy()
+        # Mixed-type object columns (symbols that parse as numbers) are stored as strings
+        for column in df.columns[df.dtypes == object]:
+            df[column] = df[column].where(df[column].isna(), df[column].astype(str))
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        return True
+    except Exception as e:
+        logger.warning(f"Could not write instrument snapshot {path}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+
+
+def read_snapshot(path: str) -> Optional[pd.DataFrame]:
+    """Load a Parquet snapshot, or None if missing or unreadable."""
+    if not os.path.exists(path):
+        return None
+    try:
+        return pd.read_parquet(path)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable instrument snapshot {path}: {e}")
+        return None
+
+
+@dataclass(frozen=True)
+class OptionSide:
+    """Strikes and contract symbols of one option type for one expiry, sorted by strike."""
+
+    strikes: np.ndarray
+    symbols: np.ndarray
+    security_ids: np.ndarray
+
+    @property
+    def empty(self) -> bool:
+        return len(self.strikes) == 0
+
+    def nearest(self, strike: float) -> Tuple[float, str]:
+        """
+        Closest listed strike to ``strike`` and its contract symbol.
+
+        Ties go to the lower strike. Raises ``ValueError`` on an empty side.
+        """
+        if self.empty:
+            raise ValueError("No strikes listed")
+        i = _nearest_position(self.strikes, strike)
+        return _strike_value(self.strikes[i]), self.symbols[i]
+
+
+def _nearest_position(strikes: np.ndarray, strike: float) -> int:
+    """Position of the closest value in sorted, non-empty ``strikes`` (ties go low)."""
+    i = int(np.searchsorted(strikes, strike))
+    if i == len(strikes) or (i > 0 and strike - strikes[i - 1] <= strikes[i] - strike):
+        i -= 1
+    return i
+
+
+def _strike_value(value: np.floating) -> float:
+    value = value.item()
+    return int(value) if float(value).is_integer() else value
+
+
+_EMPTY_SIDE = OptionSide(np.empty(0), np.empty(0, dtype=object), np.empty(0, dtype=object))
+
+
+@dataclass(frozen=True)
+class OptionChain:
+    """CE and PE strikes of one underlying and expiry."""
+
+    ce: OptionSide
+    pe: OptionSide
+
+    def nearest_common(self, strike: float) -> Tuple[float, str, str]:
+        """
+        Closest strike listed on both sides, with its CE and PE contract symbols.
+
+        Ties go to the lower strike. Raises ``ValueError`` when no strike is
+        listed on both sides.
+        """
+        common, ce_at, pe_at = np.intersect1d(self.ce.strikes, self.pe.strikes,
+                                              assume_unique=True, return_indices=True)
+        if len(common) == 0:
+            raise ValueError("No strike listed on both the CE and PE side")
+        i = _nearest_position(common, strike)
+        return _strike_value(common[i]), self.ce.symbols[ce_at[i]], self.pe.symbols[pe_at[i]]
+
+
+class InstrumentIndex:
+    """
+    Lookup structures over one day's instrument master.
+
+    Build with ``InstrumentIndex(df)`` (or ``load`` for the snapshot-aware
+    path, ``for_frame`` for a cached index over a caller's frame); the
+    DataFrame is not modified.
+    """
+
+    #: Indexes built by ``for_frame``, keyed by ``id`` of the source frame
+    _frame_cache: 'OrderedDict[int, Tuple[pd.DataFrame, InstrumentIndex]]' = OrderedDict()
+    _frame_cache_size = 4
+    _frame_cache_lock = threading.Lock()
+
+    def __init__(self, instrument_df: pd.DataFrame, trading_date: Optional[date] = None):
+        """
+        Build the index.
+
+        Args:
+            instrument_df: Dhan scrip master (raw or already normalized)
+            trading_date: Day the master belongs to (defaults to today)
+        """
+        self.instrument_df = normalize_instruments(instrument_df)
+        self.trading_date = trading_date or date.today()
+        df = self.instrument_df
+
+        exchanges = df['SEM_EXM_EXCH_ID'].to_numpy(dtype=object)
+        security_ids = df['SEM_SMST_SECURITY_ID'].to_numpy(dtype=object)
+        positions = np.arange(len(df))
+        trading = df['SEM_TRADING_SYMBOL']
+        custom = df['SEM_CUSTOM_SYMBOL']
+
+        self._security_ids = security_ids
+        self._exact = self._build_map(exchanges, security_ids, positions, trading, custom)
+        self._upper = self._build_map(exchanges, security_ids, positions,
+                                      trading.str.upper(), custom.str.upper())
+        self._any = self._build_map(np.full(len(df), None, dtype=object), security_ids, positions, trading, custom)
+        self._prefix = self._build_prefix(exchanges, positions, trading.str.upper(), custom.str.upper())
+
+        is_mcx = exchanges == 'MCX'
+        mcx_custom = custom.str.upper().where(is_mcx)
+        self._mcx_custom = self._last_by(mcx_custom.to_numpy(dtype=object), security_ids, positions)
+        self.mcx_rows = df[is_mcx]
+
+        futcom = self.mcx_rows[self.mcx_rows['SEM_INSTRUMENT_NAME'] == 'FUTCOM']
+        futcom = futcom.assign(_expiry=pd.to_datetime(futcom['SEM_EXPIRY_DATE'], errors='coerce'))
+        futcom = futcom.sort_values('_expiry', kind='mergesort')
+        names = futcom['SM_SYMBOL_NAME'].astype(str).str.upper()
+        self._nearest_future = dict(zip(names[::-1], futcom['SEM_SMST_SECURITY_ID'][::-1]))
+
+        options = df[df['SEM_OPTION_TYPE'].isin(['CE', 'PE'])]
+        self._options = options.assign(_strike=pd.to_numeric(options['SEM_STRIKE_PRICE'], errors='coerce'))
+        self._chains: Dict[Tuple[str, str, str], Dict[str, OptionChain]] = {}
+
+    @classmethod
+    def load(cls, directory: str, read_master, trading_date: Optional[date] = None) -> 'InstrumentIndex':
+        """
+        Build the index from today's Parquet snapshot, creating it if needed.
+
+        Args:
+            directory: Directory holding the snapshot
+            read_master: Callable returning the raw master DataFrame (CSV/download)
+            trading_date: Day to load (defaults to today)
+        """
+        trading_date = trading_date or date.today()
+        path = snapshot_path(directory, trading_date)
+        df = read_snapshot(path)
+        if df is None:
+            df = normalize_instruments(read_master())
+            write_snapshot(df, path)
+        return cls(df, trading_date)
+
+    @classmethod
+    def for_frame(cls, instrument_df: pd.DataFrame) -> 'InstrumentIndex':
+        """
+        Index over ``instrument_df``, built once per frame object.
+
+        Entries hold a reference to their frame, so an ``id`` cannot be
+        reused while cached. Frames are treated as immutable: pass a new
+        frame (or build ``InstrumentIndex`` directly) after editing one.
+        """
+        key = id(instrument_df)
+        with cls._frame_cache_lock:
+            entry = cls._frame_cache.get(key)
+            if entry is not None and entry[0] is instrument_df:
+                cls._frame_cache.move_to_end(key)
+                return entry[1]
+
+        index = cls(instrument_df)
+        with cls._frame_cache_lock:
+            cls._frame_cache[key] = (instrument_df, index)
+            while len(cls._frame_cache) > cls._frame_cache_size:
+                cls._frame_cache.popitem(last=False)
+        return index
+
+    @staticmethod
+    def _last_by(keys: np.ndarray, values: np.ndarray, positions: np.ndarray) -> Dict[Hashable, object]:
+        """Map each non-null key to the value of its last row."""
+        valid = pd.notna(keys)
+        return dict(zip(keys[valid], values[positions[valid]]))
+
+    def _build_map(self, exchanges, security_ids, positions, *columns: pd.Series) -> Dict[Tuple[str, str], object]:
+        """(exchange, symbol) -> security id across several symbol columns, last row wins."""
+        keys, ids, order = [], [], []
+        for column in columns:
+            values = column.to_numpy(dtype=object)
+            valid = pd.notna(values)
+            keys.append(list(zip(exchanges[valid], values[valid])))
+            ids.append(security_ids[valid])
+            order.append(positions[valid])
+        flat_keys = [key for part in keys for key in part]
+        flat_ids = np.concatenate(ids) if ids else np.empty(0, dtype=object)
+        # Stable sort by row so later rows overwrite earlier ones in the dict
+        by_row = np.argsort(np.concatenate(order), kind='mergesort')
+        return {flat_keys[i]: flat_ids[i] for i in by_row}
+
+    @staticmethod
+    def _build_prefix(exchanges, positions, *columns: pd.Series) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """Per exchange: sorted upper-case symbols and the row each came from."""
+        frames = []
+        for column in columns:
+            frames.append(pd.DataFrame({'exchange': exchanges, 'symbol': column.to_numpy(dtype=object),
+                                        'row': positions}).dropna())
+        symbols = pd.concat(frames, ignore_index=True).sort_values(['exchange', 'symbol'], kind='mergesort')
+        return {
+            exchange: (group['symbol'].to_numpy(dtype=str), group['row'].to_numpy())
+            for exchange, group in symbols.groupby('exchange', sort=False)
+        }
+
+    # ------------------------------------------------------------------
+    # Symbol lookups
+    # ------------------------------------------------------------------
+
+    def security_id(self, symbol: str, exchange: str) -> Optional[object]:
+        """Security id by exact trading/custom symbol on an exchange."""
+        return self._exact.get((exchange, symbol))
+
+    def security_id_upper(self, symbol: str, exchange: str) -> Optional[object]:
+        """Security id by case-insensitive trading/custom symbol (``symbol`` upper-cased)."""
+        return self._upper.get((exchange, symbol))
+
+    def security_id_any_exchange(self, symbol: str) -> Optional[object]:
+        """Security id by exact symbol on any exchange (last row in the master wins)."""
+        return self._any.get((None, symbol))
+
+    def security_id_by_prefix(self, prefix: str, exchange: str) -> Optional[object]:
+        """Security id of the last row whose upper-case symbol starts with ``prefix``."""
+        symbols, rows = self._prefix.get(exchange, (None, None))
+        if symbols is None:
+            return None
+        lo = np.searchsorted(symbols, prefix, side='left')
+        hi = np.searchsorted(symbols, prefix + _PREFIX_END, side='left')
+        if lo == hi:
+            return None
+        return self._security_ids[rows[lo:hi].max()]
+
+    def mcx_custom_symbol(self, symbol: str) -> Optional[object]:
+        """Security id of an MCX contract by upper-case custom symbol."""
+        return self._mcx_custom.get(symbol)
+
+    def nearest_commodity_future(self, underlying: str) -> Optional[object]:
+        """Security id of the nearest-expiry MCX FUTCOM contract for an underlying."""
+        return self._nearest_future.get(underlying.upper())
+
+    # ------------------------------------------------------------------
+    # Option chains
+    # ------------------------------------------------------------------
+
+    def option_chain(self, underlying: str, exchange: str, expiry: str, match: str) -> OptionChain:
+        """
+        CE/PE strikes of ``underlying`` for one expiry (``YYYY-MM-DD``).
+
+        All expiries of an underlying are indexed on first use and cached
+        for the life of the index.
+
+        Args:
+            underlying: Underlying symbol (upper case)
+            exchange: Exchange id (NSE, BSE, MCX)
+            expiry: Contract expiration date string
+            match: One of ``OPTION_MATCH_INDEX``, ``OPTION_MATCH_MCX``, ``OPTION_MATCH_STOCK``
+        """
+        key = (underlying, exchange, match)
+        chains = self._chains.get(key)
+        if chains is None:
+            chains = self._chains[key] = self._build_chains(underlying, exchange, match)
+        return chains.get(expiry, OptionChain(_EMPTY_SIDE, _EMPTY_SIDE))
+
+    def _build_chains(self, underlying: str, exchange: str, match: str) -> Dict[str, OptionChain]:
+        options = self._options[self._options['SEM_EXM_EXCH_ID'] == exchange]
+        trading = options['SEM_TRADING_SYMBOL'].astype(str)
+        custom = options['SEM_CUSTOM_SYMBOL'].astype(str)
+        if match == OPTION_MATCH_STOCK:
+            mask = trading.str.startswith(underlying + '-') & custom.str.startswith(underlying)
+        else:
+            mask = trading.str.startswith(underlying) | custom.str.startswith(underlying)
+            if match == OPTION_MATCH_MCX:
+                mask &= options['SM_SYMBOL_NAME'] == underlying
+        rows = options[mask & options['_strike'].notna()]
+
+        sides: Dict[str, Dict[str, OptionSide]] = {}
+        for (expiry, option_type), group in rows.groupby(['ContractExpiration', 'SEM_OPTION_TYPE'], sort=False):
+            # Keep the last listed contract per strike, then sort by strike
+            group = group.drop_duplicates('_strike', keep='last').sort_values('_strike', kind='mergesort')
+            sides.setdefault(expiry, {})[option_type] = OptionSide(
+                group['_strike'].to_numpy(dtype=float),
+                group['SEM_CUSTOM_SYMBOL'].to_numpy(dtype=object),
+                group['SEM_SMST_SECURITY_ID'].to_numpy(dtype=object),
+            )
+        return {
+            expiry: OptionChain(side.get('CE', _EMPTY_SIDE), side.get('PE', _EMPTY_SIDE))
+            for expiry, side in sides.items()
+        }
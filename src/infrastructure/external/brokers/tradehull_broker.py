@@ -489,18 +489,11 @@ class TradehullBrokerWrapper:
     def _get_security_id_for_symbol(self, symbol: str, exchange_segment: int) -> Optional[int]:
         """Get security ID for a symbol."""
         try:
-            # Use Tradehull's existing method to find security ID
-            # This is a simplified implementation
-            if hasattr(self._tradehull, 'instrument_df') and self._tradehull.instrument_df is not None:
-                # Search in instrument dataframe
-                df = self._tradehull.instrument_df
-                matches = df[
-                    (df['SEM_CUSTOM_SYMBOL'] == symbol.upper()) |
-                    (df['SEM_TRADING_SYMBOL'] == symbol.upper())
-                ]
-                
-                if not matches.empty:
-                    return int(matches.iloc[-1]['SEM_SMST_SECURITY_ID'])
+            # Use Tradehull's instrument index (hash lookup, no DataFrame scan)
+            if getattr(self._tradehull, 'instrument_index', None) is not None:
+                security_id = self._tradehull.instrument_index.security_id_any_exchange(symbol.upper())
+                if security_id is not None:
+                    return int(security_id)
             
             # Fallback to common mappings
             common_mappings = {
@@ -1,10 +1,12 @@
 """Data ingestion pipeline for loading market data."""
 
 import os
+import re
+import time
 from datetime import date, datetime
 from decimal import Decimal
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
 import pandas as pd
 
@@ -13,10 +15,28 @@ from ...domain.entities.symbol import Symbol
 from ...domain.events import DataIngestedEvent
 from ...infrastructure.messaging.event_bus import publish_event
 from ...infrastructure.repositories.duckdb_market_repo import DuckDBMarketDataRepository
+from ..core.ohlcv_rollups import RollupRange, frame_ranges, refresh_rollups, rollups_enabled
 from ..logging import get_logger
+from ..services.result_cache import bump_table_version
 
 logger = get_logger(__name__)
 
+# Source column names (lower-cased) accepted for each market_data column, in priority order
+COLUMN_ALIASES = {
+    'timestamp': ['timestamp', 'date', 'datetime', 'time'],
+    'open': ['open', 'o'],
+    'high': ['high', 'h'],
+    'low': ['low', 'l'],
+    'close': ['close', 'c'],
+    'volume': ['volume', 'v', 'vol'],
+}
+
+# Timezone-aware timestamps are stored as exchange wall-clock time
+MARKET_TIMEZONE = 'Asia/Kolkata'
+
+# Files without a timestamp column hold one row per minute from the market open
+MARKET_OPEN_OFFSET = "INTERVAL '9 hours 15 minutes'"
+
 
 class DataIngestionPipeline:
     """Pipeline for ingesting market data from various sources."""
@@ -30,76 +50,33 @@ class DataIngestionPipeline:
         self,
         data_directory: str,
         symbol_pattern: str = "*.parquet",
-        batch_size: int = 1000
+        batch_size: int = 1000,
+        threads: Optional[int] = None
     ) -> Dict[str, Any]:
-        """Ingest market data from Parquet files."""
-        data_path = Path(data_directory)
-        if not data_path.exists():
-            raise ValueError(f"Data directory does not exist: {data_directory}")
-
-        logger.info("Starting Parquet file ingestion", data_directory=str(data_directory))
+        """
+        Ingest market data from Parquet files.
 
-        total_files = 0
-        total_records = 0
-        processed_symbols = []
+        Files are loaded by DuckDB in batches of ``batch_size`` files, each
+        with one INSERT ... SELECT (see ``bulk_ingest_files``).
+        """
+        parquet_files = self._find_files(data_directory, symbol_pattern)
+        logger.info("Starting Parquet file ingestion", data_directory=str(data_directory), count=len(parquet_files))
 
-        # Find all Parquet files
-        parquet_files = list(data_path.rglob(symbol_pattern))
-        logger.info("Found Parquet files", count=len(parquet_files))
-
-        for file_path in parquet_files:
-            try:
-                symbol = self._extract_symbol_from_filename(file_path.name)
-                if not symbol:
-                    logger.warning("Could not extract symbol from filename", filename=file_path.name)
-                    continue
-
-                # Read Parquet file
-                df = pd.read_parquet(file_path)
-                if df.empty:
-                    logger.warning("Empty Parquet file", file=str(file_path))
-                    continue
-
-                # Process and save data
-                records_saved = self._process_dataframe(df, symbol, batch_size)
-                total_records += records_saved
-                processed_symbols.append(symbol)
-                total_files += 1
-
-                logger.info(
-                    "Processed Parquet file",
-                    file=str(file_path),
-                    symbol=symbol,
-                    records=records_saved
-                )
-
-            except Exception as e:
-                logger.error(
-                    "Failed to process Parquet file",
-                    file=str(file_path),
-                    error=str(e)
-                )
-                continue
-
-        result = {
-            'total_files': total_files,
-            'total_records': total_records,
-            'processed_symbols': processed_symbols,
-            'success': True
-        }
+        result = self.bulk_ingest_files(parquet_files, "parquet", files_per_batch=batch_size, threads=threads)
 
         logger.info(
             "Parquet ingestion completed",
-            total_files=total_files,
-            total_records=total_records,
-            processed_symbols=len(processed_symbols)
+            total_files=result['total_files'],
+            total_records=result['total_records'],
+            processed_symbols=len(result['processed_symbols']),
+            duration_seconds=round(result['duration_seconds'], 2)
         )
 
         # Publish event
         publish_event(DataIngestedEvent(
             symbol="BATCH",
             timeframe="MULTIPLE",
-            records_count=total_records,
+            records_count=result['total_records'],
             start_date=date.today(),
             end_date=date.today()
         ))
@@ -110,72 +87,264 @@ class DataIngestionPipeline:
         self,
         data_directory: str,
         symbol_pattern: str = "*.csv",
-        batch_size: int = 1000
+        batch_size: int = 1000,
+        threads: Optional[int] = None
     ) -> Dict[str, Any]:
-        """Ingest market data from CSV files."""
-        data_path = Path(data_directory)
-        if not data_path.exists():
-            raise ValueError(f"Data directory does not exist: {data_directory}")
+        """
+        Ingest market data from CSV files.
 
-        logger.info("Starting CSV file ingestion", data_directory=str(data_directory))
+        Files are loaded by DuckDB in batches of ``batch_size`` files, each
+        with one INSERT ... SELECT (see ``bulk_ingest_files``).
+        """
+        csv_files = self._find_files(data_directory, symbol_pattern)
+        logger.info("Starting CSV file ingestion", data_directory=str(data_directory), count=len(csv_files))
 
-        total_files = 0
-        total_records = 0
-        processed_symbols = []
+        result = self.bulk_ingest_files(csv_files, "csv", files_per_batch=batch_size, threads=threads)
 
-        # Find all CSV files
-        csv_files = list(data_path.rglob(symbol_pattern))
-        logger.info("Found CSV files", count=len(csv_files))
+        logger.info(
+            "CSV ingestion completed",
+            total_files=result['total_files'],
+            total_records=result['total_records'],
+            processed_symbols=len(result['processed_symbols']),
+            duration_seconds=round(result['duration_seconds'], 2)
+        )
 
-        for file_path in csv_files:
-            try:
-                symbol = self._extract_symbol_from_filename(file_path.name)
-                if not symbol:
-                    logger.warning("Could not extract symbol from filename", filename=file_path.name)
-                    continue
-
-                # Read CSV file
-                df = pd.read_csv(file_path)
-                if df.empty:
-                    logger.warning("Empty CSV file", file=str(file_path))
-                    continue
-
-                # Process and save data
-                records_saved = self._process_dataframe(df, symbol, batch_size)
-                total_records += records_saved
-                processed_symbols.append(symbol)
-                total_files += 1
-
-                logger.info(
-                    "Processed CSV file",
-                    file=str(file_path),
-                    symbol=symbol,
-                    records=records_saved
-                )
+        return result
 
-            except Exception as e:
-                logger.error(
-                    "Failed to process CSV file",
-                    file=str(file_path),
-                    error=str(e)
-                )
+    def bulk_ingest_files(
+        self,
+        files: List[Path],
+        file_format: str = "parquet",
+        files_per_batch: int = 1000,
+        threads: Optional[int] = None,
+        timeframe: str = "1m",
+        timezone: str = MARKET_TIMEZONE
+    ) -> Dict[str, Any]:
+        """
+        Load files straight into market_data, one INSERT ... SELECT per batch of files.
+
+        DuckDB scans each batch with a single read_parquet/read_csv call and
+        does the column renames, type casts, timezone conversion and symbol
+        assignment in SQL, so rows never pass through pandas. A batch that
+        fails is retried file by file so one bad file does not drop the rest.
+
+        Args:
+            files: Parquet or CSV files; the symbol is derived from each file name
+            file_format: "parquet" or "csv"
+            files_per_batch: Number of files read by each INSERT
+            threads: DuckDB worker threads for the load (current setting if None)
+            timeframe: Timeframe stored with the rows
+            timezone: Zone that timezone-aware timestamps are converted to
+
+        Returns:
+            Totals plus a ``batches`` list with per-batch files, records, bytes and throughput
+        """
+        if file_format not in ("parquet", "csv"):
+            raise ValueError(f"Unsupported file format: {file_format}")
+
+        file_rows = []
+        for file_path in files:
+            symbol = self._extract_symbol_from_filename(Path(file_path).name)
+            if not symbol:
+                logger.warning("Could not extract symbol from filename", filename=Path(file_path).name)
                 continue
+            file_rows.append((str(file_path), symbol, self._extract_date_from_filename(Path(file_path).name)))
 
         result = {
-            'total_files': total_files,
-            'total_records': total_records,
-            'processed_symbols': processed_symbols,
+            'total_files': 0,
+            'total_records': 0,
+            'processed_symbols': [],
+            'failed_files': [],
+            'batches': [],
+            'duration_seconds': 0.0,
             'success': True
         }
+        started = time.perf_counter()
+        symbols = set()
+        db_manager = self.repository.adapter.db_manager
+
+        with db_manager.connection_pool.writer() as conn:
+            previous_threads = conn.execute("SELECT current_setting('threads')").fetchone()[0]
+            if threads:
+                conn.execute(f"SET threads = {int(threads)}")
+            # Written (symbol, time) spans, collected only when there are rollups to refresh
+            written: Optional[List[RollupRange]] = [] if rollups_enabled(conn) else None
+            try:
+                for start in range(0, len(file_rows), files_per_batch):
+                    batch = file_rows[start:start + files_per_batch]
+                    try:
+                        loaded, stats = batch, self._insert_file_batch(conn, batch, file_format, timeframe, timezone,
+                                                                       written)
+                    except Exception as e:
+                        logger.warning("File batch failed, loading files one by one", files=len(batch), error=str(e))
+                        loaded, stats = self._insert_files_individually(conn, batch, file_format, timeframe, timezone,
+                                                                        written)
+                        result['failed_files'].extend(item[0] for item in batch if item not in loaded)
+
+                    stats['batch'] = len(result['batches'])
+                    result['batches'].append(stats)
+                    result['total_files'] += len(loaded)
+                    result['total_records'] += stats['records']
+                    symbols.update(symbol for _, symbol, _ in loaded)
+
+                    logger.info("Ingested file batch", **stats)
+                if written:
+                    refresh_rollups(conn, written)
+            finally:
+                if threads:
+                    conn.execute(f"SET threads = {int(previous_threads)}")
+
+        if result['total_records']:
+            bump_table_version('market_data')
+
+        result['processed_symbols'] = sorted(symbols)
+        result['duration_seconds'] = time.perf_counter() - started
+        return result
 
-        logger.info(
-            "CSV ingestion completed",
-            total_files=total_files,
-            total_records=total_records,
-            processed_symbols=len(processed_symbols)
-        )
+    def _insert_files_individually(
+        self,
+        conn,
+        batch: List[Tuple[str, str, Optional[date]]],
+        file_format: str,
+        timeframe: str,
+        timezone: str,
+        written: Optional[List[RollupRange]] = None
+    ) -> Tuple[List[Tuple[str, str, Optional[date]]], Dict[str, Any]]:
+        """Fallback for a failed batch: insert each file on its own, skipping bad ones."""
+        loaded = []
+        stats = {'files': 0, 'records': 0, 'bytes': 0, 'seconds': 0.0}
+        for item in batch:
+            try:
+                file_stats = self._insert_file_batch(conn, [item], file_format, timeframe, timezone, written)
+            except Exception as e:
+                logger.error("Failed to ingest file", file=item[0], error=str(e))
+                continue
+            loaded.append(item)
+            for key in stats:
+                stats[key] += file_stats[key]
+        return loaded, self._with_throughput(stats)
 
-        return result
+    def _insert_file_batch(
+        self,
+        conn,
+        batch: List[Tuple[str, str, Optional[date]]],
+        file_format: str,
+        timeframe: str,
+        timezone: str,
+        written: Optional[List[RollupRange]] = None
+    ) -> Dict[str, Any]:
+        """
+        Insert one batch of files with a single INSERT ... SELECT and return its stats.
+
+        When ``written`` is given, the per-symbol time spans of the inserted
+        rows are appended to it.
+        """
+        paths = [path for path, _, _ in batch]
+        source = self._file_source(paths, file_format)
+        columns = {
+            name.lower(): (name, dtype)
+            for name, dtype, *_ in conn.execute(f"DESCRIBE SELECT * FROM {source}").fetchall()
+        }
+        select_list = self._normalized_select_list(columns, file_format, timezone)
+
+        started = time.perf_counter()
+        conn.register('ingest_files', pd.DataFrame({
+            'filename': paths,
+            'symbol': [symbol for _, symbol, _ in batch],
+            'file_date': pd.to_datetime([file_date for _, _, file_date in batch]),
+        }))
+        returning = "RETURNING symbol, timestamp" if written is not None else ""
+        try:
+            result = conn.execute(f"""
+                INSERT OR REPLACE INTO market_data
+                (symbol, timestamp, open, high, low, close, volume, timeframe, date_partition)
+                SELECT symbol, timestamp, open, high, low, close, volume, ?, CAST(timestamp AS DATE)
+                FROM (
+                    SELECT f.symbol, {select_list}
+                    FROM {source} s
+                    JOIN ingest_files f ON s.filename = f.filename
+                )
+                WHERE timestamp IS NOT NULL AND open IS NOT NULL AND high IS NOT NULL
+                  AND low IS NOT NULL AND close IS NOT NULL AND volume IS NOT NULL
+                {returning}
+            """, [timeframe])
+            if written is None:
+                records = result.fetchone()[0]
+            else:
+                rows = result.df()
+                records = len(rows)
+                written.extend(frame_ranges(rows))
+        finally:
+            conn.unregister('ingest_files')
+
+        return self._with_throughput({
+            'files': len(batch),
+            'records': records,
+            'bytes': sum(os.path.getsize(path) for path in paths),
+            'seconds': time.perf_counter() - started,
+        })
+
+    @staticmethod
+    def _with_throughput(stats: Dict[str, Any]) -> Dict[str, Any]:
+        """Add records/s and MB/s to batch stats."""
+        seconds = stats['seconds'] or 1e-9
+        stats['records_per_second'] = round(stats['records'] / seconds)
+        stats['mb_per_second'] = round(stats['bytes'] / seconds / 1e6, 2)
+        stats['seconds'] = round(stats['seconds'], 4)
+        return stats
+
+    @staticmethod
+    def _file_source(paths: List[str], file_format: str) -> str:
+        """DuckDB table function reading all ``paths`` with their file names."""
+        file_list = "[" + ", ".join("'" + path.replace("'", "''") + "'" for path in paths) + "]"
+        if file_format == "parquet":
+            return f"read_parquet({file_list}, filename = true, file_row_number = true, union_by_name = true)"
+        return f"read_csv({file_list}, filename = true, union_by_name = true)"
+
+    @staticmethod
+    def _normalized_select_list(columns: Dict[str, Tuple[str, str]], file_format: str, timezone: str) -> str:
+        """
+        SQL expressions mapping source columns to timestamp/open/high/low/close/volume.
+
+        Mirrors ``_normalize_columns`` and ``_convert_data_types``: aliases are
+        matched case-insensitively and unparseable values become NULL.
+        """
+        source = {}
+        for target, aliases in COLUMN_ALIASES.items():
+            match = next((columns[alias] for alias in aliases if alias in columns), None)
+            if match is not None:
+                source[target] = ('s."' + match[0].replace('"', '""') + '"', match[1])
+
+        missing = [col for col in COLUMN_ALIASES if col not in source and col != 'timestamp']
+        if 'timestamp' not in source and file_format != "parquet":
+            missing.insert(0, 'timestamp')
+        if missing:
+            raise ValueError(f"Missing required columns: {missing}")
+
+        if 'timestamp' not in source:
+            timestamp = f"f.file_date + {MARKET_OPEN_OFFSET} + to_minutes(s.file_row_number)"
+        else:
+            column, dtype = source['timestamp']
+            if dtype.startswith('TIMESTAMP WITH TIME ZONE'):
+                timestamp = f"timezone('{timezone}', {column})"
+            elif dtype.startswith('TIMESTAMP') or dtype == 'DATE':
+                timestamp = f"CAST({column} AS TIMESTAMP)"
+            else:
+                timestamp = f"TRY_CAST({column} AS TIMESTAMP)"
+
+        expressions = [f"{timestamp} AS timestamp"]
+        for target in ('open', 'high', 'low', 'close'):
+            expressions.append(f"TRY_CAST({source[target][0]} AS DOUBLE) AS {target}")
+        expressions.append(f"CAST(trunc(TRY_CAST({source['volume'][0]} AS DOUBLE)) AS BIGINT) AS volume")
+        return ",\n                           ".join(expressions)
+
+    @staticmethod
+    def _find_files(data_directory: str, pattern: str) -> List[Path]:
+        """All files under ``data_directory`` matching ``pattern``, in path order."""
+        data_path = Path(data_directory)
+        if not data_path.exists():
+            raise ValueError(f"Data directory does not exist: {data_directory}")
+        return sorted(data_path.rglob(pattern))
 
     def ingest_from_dataframe(
         self,
@@ -289,24 +458,12 @@ class DataIngestionPipeline:
 
     def _normalize_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         """Normalize column names to standard format."""
-        column_mapping = {
-            'date': 'timestamp',
-            'datetime': 'timestamp',
-            'time': 'timestamp',
-            'o': 'open',
-            'h': 'high',
-            'l': 'low',
-            'c': 'close',
-            'v': 'volume',
-            'vol': 'volume',
-            'volume': 'volume'
-        }
-
         df = df.copy()
         df.columns = df.columns.str.lower()
 
-        for old_col, new_col in column_mapping.items():
-            if old_col in df.columns and new_col not in df.columns:
+        for new_col, aliases in COLUMN_ALIASES.items():
+            old_col = next((alias for alias in aliases if alias in df.columns), None)
+            if old_col is not None and old_col != new_col:
                 df = df.rename(columns={old_col: new_col})
 
         return df
@@ -339,18 +496,28 @@ class DataIngestionPipeline:
         # or SYMBOL.csv
         name = Path(filename).stem
 
+        # Remove date patterns
+        name = re.sub(r'_\d{4}-\d{2}-\d{2}$', '', name)
+
         # Remove common suffixes
         for suffix in ['_minute', '_daily', '_hourly', '_weekly', '_monthly']:
             if name.endswith(suffix):
                 name = name[:-len(suffix)]
                 break
 
-        # Remove date patterns
-        import re
-        name = re.sub(r'_\d{4}-\d{2}-\d{2}$', '', name)
-
         return name.upper() if name else None
 
+    @staticmethod
+    def _extract_date_from_filename(filename: str) -> Optional[date]:
+        """Trading date embedded in a filename like SYMBOL_minute_YYYY-MM-DD.parquet."""
+        match = re.search(r'(\d{4}-\d{2}-\d{2})$', Path(filename).stem)
+        if not match:
+            return None
+        try:
+            return date.fromisoformat(match.group(1))
+        except ValueError:
+            return None
+
     def get_ingestion_stats(self) -> Dict[str, Any]:
         """Get ingestion statistics."""
         try:
@@ -5,8 +5,9 @@ Fetches today's 1-minute intraday data and inserts missing records into DuckDB.
 
 Features:
 - Gets today's intraday data only (no fallback to yesterday)
-- Checks for existing data in DuckDB to avoid duplicates
-- Inserts only missing 1-minute records
+- Fetches symbols concurrently under a shared broker rate limit
+- Stages each batch of symbols as one in-memory Arrow table
+- Inserts only missing 1-minute records with one anti-join INSERT per batch
 - Handles broker API limitations gracefully
 - Comprehensive logging and error handling
 """
@@ -14,16 +15,23 @@ Features:
 import os
 import sys
 import datetime
+import threading
+import time
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 import logging
 
 # Add project root to path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
-from broker import get_broker
+from src.infrastructure.core.ohlcv_rollups import day_ranges, refresh_rollups
 from src.infrastructure.core.singleton_database import DuckDBConnectionManager, create_db_manager
+from src.infrastructure.services.result_cache import bump_table_version
 
 # Configure logging
 logging.basicConfig(
@@ -32,27 +40,100 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+STAGING_SCHEMA = pa.schema([
+    ('symbol', pa.string()),
+    ('timestamp', pa.timestamp('us')),
+    ('open', pa.float64()),
+    ('high', pa.float64()),
+    ('low', pa.float64()),
+    ('close', pa.float64()),
+    ('volume', pa.int64()),
+    ('date_partition', pa.date32()),
+])
+
+# Existing rows per staged symbol for the day (for the sync statistics)
+_EXISTING_COUNTS_SQL = """
+    SELECT symbol, COUNT(*) AS existing_records
+    FROM {table}
+    WHERE symbol IN (SELECT DISTINCT symbol FROM staged_intraday)
+      AND timestamp >= ? AND timestamp < ?
+    GROUP BY symbol
+"""
+
+# Anti-join insert: staged rows whose (symbol, timestamp) is not stored yet.
+# The probe is bounded to the staged time span so DuckDB only scans those days.
+_INSERT_MISSING_SQL = """
+    INSERT INTO {table} (symbol, timestamp, open, high, low, close, volume, date_partition)
+    SELECT DISTINCT ON (s.symbol, s.timestamp)
+           s.symbol, s.timestamp, s.open, s.high, s.low, s.close, s.volume, s.date_partition
+    FROM staged_intraday s
+    WHERE NOT EXISTS (
+        SELECT 1 FROM {table} m
+        WHERE m.timestamp >= ? AND m.timestamp <= ?
+          AND m.date_partition = s.date_partition
+          AND m.symbol = s.symbol AND m.timestamp = s.timestamp
+    )
+    RETURNING symbol
+"""
+
+
+@dataclass
+class IntradaySyncConfig:
+    """Concurrency and batching settings for the intraday sync."""
+    max_workers: int = 5                # concurrent broker requests
+    requests_per_second: float = 5.0    # shared broker rate limit (0 disables it)
+    batch_size: int = 200               # symbols written per anti-join insert
+    table: str = "market_data"
+
+
+class RateLimiter:
+    """Spaces calls evenly at a fixed rate across threads."""
+
+    def __init__(self, requests_per_second: float):
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until the caller's request slot is due."""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
 
 class TodayIntradaySync:
     """Handles syncing today's intraday data to DuckDB."""
 
-    def __init__(self, db_path: str = "data/financial_data.duckdb"):
+    def __init__(self, db_path: str = "data/financial_data.duckdb",
+                 config: Optional[IntradaySyncConfig] = None, broker=None):
         """
         Initialize the intraday sync handler.
 
         Args:
             db_path: Path to DuckDB database file
+            config: Concurrency and batching settings (defaults if None)
+            broker: Connected broker client (connected on run_sync if None)
         """
-        self.db_manager = create_db_manager(db_path=db_path)
-        self.broker = None
+        self.db_manager = create_db_manager(db_path=db_path, read_only=False)
+        self.config = config or IntradaySyncConfig()
+        self.broker = broker
         self.today = datetime.date.today()
+        self.rate_limiter = RateLimiter(self.config.requests_per_second)
 
         logger.info(f"Initialized TodayIntradaySync for {self.today}")
 
     def connect_broker(self):
         """Connect to the broker."""
+        if self.broker is not None:
+            return True
         try:
             logger.info("🔗 Connecting to broker...")
+            from broker import get_broker
             self.broker = get_broker()
             logger.info("✅ Broker connected successfully")
             return True
@@ -126,110 +207,121 @@ class TodayIntradaySync:
                 logger.error(f"❌ Error getting intraday data for {symbol}: {e}")
                 return None
 
-    def get_existing_today_data(self, symbol: str) -> pd.DataFrame:
+    def stage_intraday_data(self, symbol: str, data: pd.DataFrame) -> pa.Table:
         """
-        Get existing today's data for a symbol from DuckDB.
+        Convert a symbol's intraday DataFrame into an Arrow table in the staging schema.
 
         Args:
             symbol: Trading symbol
+            data: DataFrame with intraday data
 
         Returns:
-            DataFrame with existing today's data
+            Arrow table with symbol, timestamp, OHLCV and date_partition columns
         """
-        try:
-            # Query existing data for today
-            existing_data = self.db_manager.query_market_data(
-                symbol=symbol,
-                start_date=self.today,
-                end_date=self.today
-            )
-
-            logger.debug(f"📊 Found {len(existing_data)} existing records for {symbol} today")
-            return existing_data
-
-        except Exception as e:
-            logger.error(f"❌ Error querying existing data for {symbol}: {e}")
-            return pd.DataFrame()
-
-    def get_missing_timestamps(self, symbol: str, new_data: pd.DataFrame) -> pd.DataFrame:
+        timestamps = pd.to_datetime(data['timestamp'])
+        if timestamps.dt.tz is not None:
+            # Keep exchange wall-clock time, as stored in market_data
+            timestamps = timestamps.dt.tz_localize(None)
+        frame = pd.DataFrame({
+            'symbol': symbol,
+            'timestamp': timestamps.to_numpy(),
+            'open': data['open'].to_numpy(),
+            'high': data['high'].to_numpy(),
+            'low': data['low'].to_numpy(),
+            'close': data['close'].to_numpy(),
+            'volume': data['volume'].to_numpy(),
+            'date_partition': timestamps.dt.date.to_numpy(),
+        })
+        return pa.Table.from_pandas(frame, schema=STAGING_SCHEMA, preserve_index=False)
+
+    def fetch_symbol(self, symbol: str) -> Tuple[str, Optional[pa.Table], str]:
         """
-        Identify which timestamps are missing from DuckDB.
+        Fetch stage: get today's data for one symbol under the shared rate limit.
 
         Args:
             symbol: Trading symbol
-            new_data: New intraday data from broker
 
         Returns:
-            DataFrame with only missing timestamps
+            Tuple of (symbol, staged Arrow table or None, status)
         """
-        if new_data.empty:
-            return pd.DataFrame()
-
+        self.rate_limiter.acquire()
+        data = self.get_today_intraday_data(symbol)
+        if data is None or data.empty:
+            return symbol, None, 'no_data'
         try:
-            # Get existing data
-            existing_data = self.get_existing_today_data(symbol)
-
-            if existing_data.empty:
-                # No existing data, all new data is missing
-                logger.info(f"ℹ️ No existing data for {symbol} today, all {len(new_data)} records are new")
-                return new_data
-
-            # Find missing timestamps
-            existing_timestamps = set(existing_data['timestamp'])
-            new_timestamps = set(new_data['timestamp'])
-
-            missing_timestamps = new_timestamps - existing_timestamps
-            missing_data = new_data[new_data['timestamp'].isin(missing_timestamps)]
-
-            if not missing_data.empty:
-                logger.info(f"📊 Found {len(missing_data)} missing records for {symbol} today")
-            else:
-                logger.info(f"✅ All {len(new_data)} records already exist for {symbol} today")
-
-            return missing_data
-
+            return symbol, self.stage_intraday_data(symbol, data), 'fetched'
         except Exception as e:
-            logger.error(f"❌ Error identifying missing timestamps for {symbol}: {e}")
-            return pd.DataFrame()
+            logger.error(f"❌ Error staging data for {symbol}: {e}")
+            return symbol, None, 'error'
 
-    def insert_intraday_data(self, symbol: str, data: pd.DataFrame) -> int:
+    def write_batch(self, fetched: List[Tuple[str, Optional[pa.Table], str]]) -> List[dict]:
         """
-        Insert intraday data into DuckDB.
+        Write stage: insert the missing rows of a batch of symbols in one statement.
+
+        The staged rows are anti-joined against the table on (symbol, timestamp),
+        so only records not already in DuckDB are inserted.
 
         Args:
-            symbol: Trading symbol
-            data: DataFrame with intraday data
+            fetched: Results of fetch_symbol for each symbol in the batch
 
         Returns:
-            Number of records inserted
+            List of per-symbol sync statistics
         """
-        if data.empty:
-            return 0
+        symbol_stats = {}
+        tables = []
+        for symbol, table, status in fetched:
+            symbol_stats[symbol] = {
+                'symbol': symbol,
+                'broker_records': 0 if table is None else table.num_rows,
+                'existing_records': 0,
+                'missing_records': 0,
+                'inserted_records': 0,
+                'status': status
+            }
+            if table is not None:
+                tables.append(table)
+
+        if not tables:
+            return list(symbol_stats.values())
+
+        staged = pa.concat_tables(tables)
+        table_name = self.config.table
+        day_start = datetime.datetime.combine(self.today, datetime.time.min)
+        day_end = day_start + datetime.timedelta(days=1)
+        staged_span = pc.min_max(staged['timestamp'])
+        staged_bounds = [staged_span['min'].as_py(), staged_span['max'].as_py()]
 
         try:
-            # Prepare data for insertion
-            df_insert = data.copy()
-
-            # Add symbol column if not present
-            if 'symbol' not in df_insert.columns:
-                df_insert['symbol'] = symbol
-
-            # Ensure timestamp is in proper format
-            df_insert['timestamp'] = pd.to_datetime(df_insert['timestamp'])
-
-            # Insert into database
-            records_inserted = self.db_manager.insert_market_data(df_insert)
-
-            if records_inserted > 0:
-                logger.info(f"💾 Successfully inserted {records_inserted} records for {symbol}")
-            else:
-                logger.info(f"ℹ️ No new records inserted for {symbol} (all duplicates)")
-
-            return records_inserted
-
+            conn = self.db_manager.get_connection()
+            conn.register('staged_intraday', staged)
+            try:
+                existing = conn.execute(_EXISTING_COUNTS_SQL.format(table=table_name), [day_start, day_end]).fetchall()
+                inserted = conn.execute(_INSERT_MISSING_SQL.format(table=table_name), staged_bounds).df()['symbol'].value_counts()
+            finally:
+                conn.unregister('staged_intraday')
+            if table_name == 'market_data' and len(inserted):
+                refresh_rollups(conn, [span for symbol in inserted.index
+                                       for span in day_ranges(symbol, self.today, self.today)])
         except Exception as e:
-            logger.error(f"❌ Error inserting data for {symbol}: {e}")
-            return 0
+            logger.error(f"❌ Error writing batch of {len(tables)} symbols: {e}")
+            for stats in symbol_stats.values():
+                if stats['status'] == 'fetched':
+                    stats['status'] = 'error'
+            return list(symbol_stats.values())
+
+        if len(inserted):
+            bump_table_version(table_name)
+
+        for symbol, count in existing:
+            symbol_stats[symbol]['existing_records'] = count
+        for stats in symbol_stats.values():
+            if stats['status'] != 'fetched':
+                continue
+            stats['missing_records'] = stats['inserted_records'] = int(inserted.get(stats['symbol'], 0))
+            stats['status'] = 'success' if stats['inserted_records'] > 0 else 'up_to_date'
+
+        logger.info(f"💾 Inserted {int(inserted.sum())} records for {len(tables)} symbols")
+        return list(symbol_stats.values())
 
     def sync_symbol_intraday(self, symbol: str) -> dict:
         """
@@ -241,60 +333,16 @@ class TodayIntradaySync:
         Returns:
             Dictionary with sync statistics for this symbol
         """
-        stats = {
-            'symbol': symbol,
-            'broker_records': 0,
-            'existing_records': 0,
-            'missing_records': 0,
-            'inserted_records': 0,
-            'status': 'failed'
-        }
-
-        try:
-            logger.info(f"🔄 Processing {symbol}")
-
-            # Get today's intraday data from broker
-            broker_data = self.get_today_intraday_data(symbol)
-            if broker_data is None or broker_data.empty:
-                stats['status'] = 'no_data'
-                return stats
-
-            stats['broker_records'] = len(broker_data)
-
-            # Get existing data count
-            existing_data = self.get_existing_today_data(symbol)
-            stats['existing_records'] = len(existing_data)
-
-            # Find missing data
-            missing_data = self.get_missing_timestamps(symbol, broker_data)
-            stats['missing_records'] = len(missing_data)
-
-            if missing_data.empty:
-                stats['status'] = 'up_to_date'
-                logger.info(f"✅ {symbol} is already up to date")
-                return stats
-
-            # Insert missing data
-            inserted = self.insert_intraday_data(symbol, missing_data)
-            stats['inserted_records'] = inserted
-
-            if inserted > 0:
-                stats['status'] = 'success'
-                logger.info(f"✅ Successfully synced {symbol}")
-            else:
-                stats['status'] = 'no_insert'
-
-            return stats
-
-        except Exception as e:
-            logger.error(f"❌ Error syncing {symbol}: {e}")
-            stats['status'] = 'error'
-            return stats
+        logger.info(f"🔄 Processing {symbol}")
+        return self.write_batch([self.fetch_symbol(symbol)])[0]
 
     def sync_today_intraday(self, symbols: Optional[List[str]] = None, max_symbols: Optional[int] = None) -> dict:
         """
         Sync today's intraday data for all symbols.
 
+        Broker requests run concurrently (bounded by max_workers and the rate
+        limit) while completed symbols are written to DuckDB in batches.
+
         Args:
             symbols: List of symbols to sync (optional, uses all if None)
             max_symbols: Maximum number of symbols to process (optional)
@@ -329,32 +377,18 @@ class TodayIntradaySync:
 
         overall_stats['total_symbols'] = len(symbols)
 
-        logger.info(f"🚀 Starting intraday sync for {len(symbols)} symbols on {self.today}")
-
-        # Process each symbol
-        for i, symbol in enumerate(symbols, 1):
-            logger.info(f"🔄 [{i}/{len(symbols)}] Processing {symbol}")
-
-            symbol_stats = self.sync_symbol_intraday(symbol)
-            overall_stats['symbol_stats'].append(symbol_stats)
-            overall_stats['processed_symbols'] += 1
-
-            # Update overall stats
-            overall_stats['total_broker_records'] += symbol_stats['broker_records']
-            overall_stats['total_inserted_records'] += symbol_stats['inserted_records']
+        logger.info(f"🚀 Starting intraday sync for {len(symbols)} symbols on {self.today} "
+                    f"({self.config.max_workers} workers, batches of {self.config.batch_size})")
 
-            if symbol_stats['status'] == 'success':
-                overall_stats['successful_syncs'] += 1
-            elif symbol_stats['status'] == 'up_to_date':
-                overall_stats['up_to_date'] += 1
-            elif symbol_stats['status'] == 'no_data':
-                overall_stats['no_data'] += 1
-            elif symbol_stats['status'] == 'error':
-                overall_stats['errors'] += 1
-
-            # Progress update
-            if i % 10 == 0:
-                logger.info(f"📊 Progress: {i}/{len(symbols)} symbols processed")
+        batch = []
+        with ThreadPoolExecutor(max_workers=self.config.max_workers) as executor:
+            futures = [executor.submit(self.fetch_symbol, symbol) for symbol in symbols]
+            for i, future in enumerate(as_completed(futures), 1):
+                batch.append(future.result())
+                if len(batch) >= self.config.batch_size or i == len(futures):
+                    self._record_batch(overall_stats, self.write_batch(batch))
+                    batch = []
+                    logger.info(f"📊 Progress: {i}/{len(symbols)} symbols processed")
 
         logger.info("📊 INTRADAY SYNC COMPLETED!")
         logger.info(f"   ✅ Total symbols: {overall_stats['total_symbols']}")
@@ -368,6 +402,19 @@ class TodayIntradaySync:
 
         return overall_stats
 
+    @staticmethod
+    def _record_batch(overall_stats: dict, batch_stats: List[dict]):
+        """Add a written batch's per-symbol statistics to the overall totals."""
+        status_keys = {'success': 'successful_syncs', 'up_to_date': 'up_to_date',
+                       'no_data': 'no_data', 'error': 'errors'}
+        for symbol_stats in batch_stats:
+            overall_stats['symbol_stats'].append(symbol_stats)
+            overall_stats['processed_symbols'] += 1
+            overall_stats['total_broker_records'] += symbol_stats['broker_records']
+            overall_stats['total_inserted_records'] += symbol_stats['inserted_records']
+            if symbol_stats['status'] in status_keys:
+                overall_stats[status_keys[symbol_stats['status']]] += 1
+
     def run_sync(self, symbols: Optional[List[str]] = None, max_symbols: Optional[int] = None) -> bool:
         """
         Run the complete intraday sync process.
@@ -419,6 +466,12 @@ def main():
     parser.add_argument('--symbols', nargs='+', help='Specific symbols to sync')
     parser.add_argument('--max-symbols', type=int, help='Maximum number of symbols to process')
     parser.add_argument('--db-path', default='data/financial_data.duckdb', help='Path to DuckDB database')
+    parser.add_argument('--workers', type=int, default=IntradaySyncConfig.max_workers,
+                       help='Concurrent broker requests')
+    parser.add_argument('--requests-per-second', type=float, default=IntradaySyncConfig.requests_per_second,
+                       help='Broker rate limit shared by all workers (0 disables it)')
+    parser.add_argument('--batch-size', type=int, default=IntradaySyncConfig.batch_size,
+                       help='Symbols written per batched insert')
     parser.add_argument('--log-level', default='INFO', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
                        help='Logging level')
 
@@ -428,7 +481,12 @@ def main():
     logging.getLogger().setLevel(getattr(logging, args.log_level))
 
     # Create sync handler
-    sync_handler = TodayIntradaySync(db_path=args.db_path)
+    config = IntradaySyncConfig(
+        max_workers=args.workers,
+        requests_per_second=args.requests_per_second,
+        batch_size=args.batch_size
+    )
+    sync_handler = TodayIntradaySync(db_path=args.db_path, config=config)
 
     # Run sync
     success = sync_handler.run_sync(symbols=args.symbols, max_symbols=args.max_symbols)
@@ -15,6 +15,7 @@ from ...domain.repositories.market_data_repo import MarketDataRepository
 from ...infrastructure.repositories.duckdb_market_repo import DuckDBMarketDataRepository
 from ...infrastructure.messaging.event_bus import publish_event
 from ...domain.events import DataIngestedEvent
+from ...domain.services.technical.streaming import IndicatorFactory, StreamingIndicators
 
 
 logger = logging.getLogger(__name__)
@@ -330,11 +331,21 @@ class RealtimeDataStreamer:
 class CandleAggregator:
     """Aggregates real-time tick data into candles."""
 
-    def __init__(self, timeframe_minutes: int = 1):
-        """Initialize candle aggregator."""
+    def __init__(self, timeframe_minutes: int = 1,
+                 indicator_factory: Optional[IndicatorFactory] = None):
+        """Initialize candle aggregator.
+
+        Args:
+            timeframe_minutes: Candle length in minutes
+            indicator_factory: Optional callable returning a fresh
+                ``StreamingIndicators`` set; when given, each symbol's set is
+                updated in O(1) as its candles complete.
+        """
         self.timeframe_minutes = timeframe_minutes
+        self.indicator_factory = indicator_factory
         self._candles: Dict[str, Dict[str, Any]] = {}
         self._last_update: Dict[str, datetime] = {}
+        self._indicators: Dict[str, StreamingIndicators] = {}
 
     def update_tick(self, symbol: str, price: Decimal, volume: int, timestamp: datetime):
         """Update candle with new tick data."""
@@ -407,10 +418,28 @@ class CandleAggregator:
         """Mark a candle as complete."""
         try:
             if symbol in self._candles and candle_key in self._candles[symbol]:
-                self._candles[symbol][candle_key]['complete'] = True
+                candle = self._candles[symbol][candle_key]
+                if not candle['complete'] and self.indicator_factory is not None:
+                    candle['indicators'] = self._update_indicators(symbol, candle)
+                candle['complete'] = True
         except Exception as e:
             logger.error(f"Error marking candle complete for {symbol}: {e}")
 
+    def _update_indicators(self, symbol: str, candle: Dict[str, Any]) -> Dict[str, float]:
+        """Feed a completed candle to the symbol's streaming indicators."""
+        indicators = self._indicators.get(symbol)
+        if indicators is None:
+            indicators = self._indicators[symbol] = self.indicator_factory()
+        return indicators.update_bar(
+            float(candle['high']), float(candle['low']),
+            float(candle['close']), float(candle['volume']),
+        )
+
+    def get_indicators(self, symbol: str) -> Dict[str, float]:
+        """Latest indicator values for symbol (as of its last completed candle)."""
+        indicators = self._indicators.get(symbol)
+        return dict(indicators.values) if indicators is not None else {}
+
 
 class AsyncRealtimeStreamer:
     """Async real-time data streamer using asyncio for non-blocking I/O."""
@@ -3,9 +3,12 @@
 import logging
 logger = logging.getLogger(__name__)
 
-from typing import Any, Dict, List, Callable, Optional
+from typing import Any, Deque, Dict, List, Callable, Optional, Tuple
+from collections import OrderedDict, deque
 from dataclasses import dataclass
 from datetime import datetime
+from enum import Enum
+import time
 
 try:
     from rx.subject import Subject
@@ -21,7 +24,6 @@ except ImportError:
     map = None
 
 import asyncio
-from typing import List, Optional, Awaitable
 
 from ...domain.events import DomainEvent
 
@@ -41,135 +43,344 @@ class EventEnvelope:
             object.__setattr__(self, 'metadata', {})
 
 
+class OverflowPolicy(str, Enum):
+    """What a full subscriber queue does with a new event."""
+
+    DROP_OLDEST = "drop_oldest"   # Evict the oldest queued event
+    BLOCK = "block"               # Make the publisher wait for room
+    COALESCE = "coalesce"         # Replace the queued event with the same key
+
+
+@dataclass
+class SubscriberMetrics:
+    """Delivery counters for one subscriber."""
+
+    delivered: int = 0
+    wakeups: int = 0
+    dropped: int = 0
+    coalesced: int = 0
+    errors: int = 0
+    queued: int = 0
+    last_lag_seconds: float = 0.0
+    max_lag_seconds: float = 0.0
+    events_per_second: float = 0.0
+
+
+def _symbol_key(event: DomainEvent) -> Any:
+    """Default coalescing key: the event's symbol, falling back to its type."""
+    return getattr(event, 'symbol', None) or event.event_type
+
+
+class Subscription:
+    """A subscriber's bounded queue, delivery options and metrics."""
+
+    def __init__(
+        self,
+        event_type: str,
+        handler: Callable,
+        shard: '_Shard',
+        max_queue_size: int = 1000,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        batch: bool = False,
+        max_batch_size: int = 100,
+        coalesce_key: Optional[Callable[[DomainEvent], Any]] = None,
+        run_in_executor: bool = False,
+    ):
+        if max_queue_size < 1:
+            raise ValueError("max_queue_size must be at least 1")
+
+        self.event_type = event_type
+        self.handler = handler
+        self.shard = shard
+        self.max_queue_size = max_queue_size
+        self.overflow = OverflowPolicy(overflow)
+        self.batch = batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.coalesce_key = coalesce_key or _symbol_key
+        self.run_in_executor = run_in_executor
+        self.is_async = asyncio.iscoroutinefunction(handler)
+        self.active = True
+
+        # (enqueued at, envelope); keyed by coalescing key under COALESCE
+        self._queue: Deque[Tuple[float, EventEnvelope]] = deque()
+        self._keyed: 'OrderedDict[Any, Tuple[float, EventEnvelope]]' = OrderedDict()
+        self._space = asyncio.Event()
+        self._space.set()
+        self._created = time.monotonic()
+        self.metrics = SubscriberMetrics()
+
+    def __len__(self) -> int:
+        return len(self._keyed) if self.overflow == OverflowPolicy.COALESCE else len(self._queue)
+
+    async def offer(self, envelope: EventEnvelope) -> None:
+        """Queue ``envelope`` under the overflow policy and wake the shard."""
+        if self.overflow == OverflowPolicy.BLOCK:
+            while self.active and len(self._queue) >= self.max_queue_size:
+                self._space.clear()
+                await self._space.wait()
+            if not self.active:
+                return
+        self.offer_nowait(envelope)
+
+    def offer_nowait(self, envelope: EventEnvelope) -> None:
+        """Queue without waiting; a BLOCK queue that is full drops its oldest event."""
+        item = (time.monotonic(), envelope)
+
+        if self.overflow == OverflowPolicy.COALESCE:
+            key = self.coalesce_key(envelope.event)
+            if key in self._keyed:
+                # Latest value wins but keeps its place in line, so lag stays honest
+                self._keyed[key] = (self._keyed[key][0], envelope)
+                self.metrics.coalesced += 1
+                return
+            if len(self._keyed) >= self.max_queue_size:
+                self._keyed.popitem(last=False)
+                self.metrics.dropped += 1
+            self._keyed[key] = item
+        else:
+            if len(self._queue) >= self.max_queue_size:
+                self._queue.popleft()
+                self.metrics.dropped += 1
+            self._queue.append(item)
+
+        self.shard.schedule(self)
+
+    def drain(self) -> List[Tuple[float, EventEnvelope]]:
+        """Pop up to one wakeup's worth of events."""
+        limit = self.max_batch_size if self.batch else 1
+        items = []
+        if self.overflow == OverflowPolicy.COALESCE:
+            while self._keyed and len(items) < limit:
+                items.append(self._keyed.popitem(last=False)[1])
+        else:
+            while self._queue and len(items) < limit:
+                items.append(self._queue.popleft())
+        self._space.set()
+        return items
+
+    async def deliver(self, items: List[Tuple[float, EventEnvelope]]) -> None:
+        """Invoke the handler with one event, or the list of events if batching."""
+        now = time.monotonic()
+        lag = now - items[0][0]
+        metrics = self.metrics
+        metrics.wakeups += 1
+        metrics.last_lag_seconds = lag
+        metrics.max_lag_seconds = max(metrics.max_lag_seconds, lag)
+
+        payload = [envelope.event for _, envelope in items] if self.batch else items[0][1].event
+        try:
+            if self.is_async:
+                await self.handler(payload)
+            elif self.run_in_executor:
+                await asyncio.get_running_loop().run_in_executor(None, self.handler, payload)
+            else:
+                self.handler(payload)
+            metrics.delivered += len(items)
+        except Exception as e:
+            metrics.errors += 1
+            logger.error(f"Error in subscriber for {self.event_type}: {e}")
+
+    def snapshot(self) -> SubscriberMetrics:
+        elapsed = time.monotonic() - self._created
+        metrics = SubscriberMetrics(**vars(self.metrics))
+        metrics.queued = len(self)
+        metrics.events_per_second = metrics.delivered / elapsed if elapsed > 0 else 0.0
+        return metrics
+
+    def close(self) -> None:
+        self.active = False
+        self._queue.clear()
+        self._keyed.clear()
+        self._space.set()
+
+
+class _Shard:
+    """One long-lived consumer task serving the subscriptions that have work."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self._ready: Deque[Subscription] = deque()
+        self._scheduled: set = set()
+        self._wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        # A fresh Event binds to the loop the bus is (re)started on
+        self._wakeup = asyncio.Event()
+        if self._ready:
+            self._wakeup.set()
+        self.task = asyncio.create_task(self.run())
+
+    def schedule(self, subscription: Subscription) -> None:
+        if subscription not in self._scheduled:
+            self._scheduled.add(subscription)
+            self._ready.append(subscription)
+            self._wakeup.set()
+
+    async def run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+            # Round-robin one wakeup per subscriber so a busy one cannot starve the rest
+            while self._ready:
+                subscription = self._ready.popleft()
+                self._scheduled.discard(subscription)
+                if not subscription.active:
+                    continue
+                items = subscription.drain()
+                if items:
+                    await subscription.deliver(items)
+                if len(subscription) and subscription.active:
+                    self.schedule(subscription)
+
+
 class AsyncEventBus:
-    """Async event bus using asyncio.Queue for non-blocking publish/subscribe."""
-    
-    def __init__(self):
+    """
+    Async publish/subscribe with one long-lived consumer task per shard.
+
+    Every subscriber owns a bounded queue with an ``OverflowPolicy`` and is
+    pinned to a shard. Publishing fans the event out to the subscribers'
+    queues and wakes their shards; each shard's consumer drains one
+    subscriber at a time, delivering either single envelopes or, for
+    ``batch=True`` subscribers, lists of up to ``max_batch_size`` events.
+    Sync handlers run inline on the consumer unless they opt into the
+    default executor. ``get_subscriber_metrics`` reports per-subscriber lag
+    and throughput.
+    """
+
+    def __init__(self, num_shards: int = 4):
         """Initialize the async event bus."""
-        self._queues: Dict[str, asyncio.Queue] = {}
-        self._subscribers: Dict[str, List[Callable]] = {}
+        self.num_shards = max(1, num_shards)
+        self._shards = [_Shard(i) for i in range(self.num_shards)]
+        self._subscribers: Dict[str, List[Subscription]] = {}
+        self._next_shard = 0
         self._is_running = False
-        self._main_task: Optional[asyncio.Task] = None
-        
+
         logger.info("Async event bus initialized")
-    
+
     async def start(self):
         """Start the async event bus."""
         if self._is_running:
             return
-        
+
         self._is_running = True
-        self._main_task = asyncio.create_task(self._event_loop())
-        logger.info("Async event bus started")
-    
+        for shard in self._shards:
+            shard.start()
+        logger.info(f"Async event bus started with {self.num_shards} shards")
+
     async def stop(self):
         """Stop the async event bus."""
         if not self._is_running:
             return
-        
+
         self._is_running = False
-        
-        # Cancel main task
-        if self._main_task and not self._main_task.done():
-            self._main_task.cancel()
-            try:
-                await self._main_task
-            except asyncio.CancelledError:
-                pass
-        
-        # Clear queues
-        for queue in self._queues.values():
-            queue.put_nowait(None)  # Sentinel to wake up consumers
-        
+
+        for shard in self._shards:
+            if shard.task and not shard.task.done():
+                shard.task.cancel()
+                try:
+                    await shard.task
+                except asyncio.CancelledError:
+                    pass
+            shard.task = None
+
         logger.info("Async event bus stopped")
-    
-    async def _event_loop(self):
-        """Main event loop for processing events."""
-        while self._is_running:
-            try:
-                # Wait for any event in any queue
-                done, pending = await asyncio.wait(
-                    [self._process_queue(event_type) for event_type in self._queues.keys()],
-                    return_when=asyncio.FIRST_COMPLETED
-                )
-                
-                # Cancel pending tasks
-                for task in pending:
-                    task.cancel()
-                    
-            except Exception as e:
-                logger.error(f"Error in async event loop: {e}")
-                await asyncio.sleep(1)
-    
-    async def _process_queue(self, event_type: str):
-        """Process events from a specific queue."""
-        queue = self._queues.get(event_type)
-        if not queue:
-            return
-        
-        while self._is_running:
-            try:
-                event = await asyncio.wait_for(queue.get(), timeout=1.0)
-                if event is None:  # Stop signal
-                    break
-                
-                # Notify subscribers
-                if event_type in self._subscribers:
-                    for subscriber in self._subscribers[event_type]:
-                        try:
-                            if asyncio.iscoroutinefunction(subscriber):
-                                await subscriber(event)
-                            else:
-                                # Run sync subscriber in executor
-                                loop = asyncio.get_event_loop()
-                                await loop.run_in_executor(None, subscriber, event)
-                        except Exception as e:
-                            logger.error(f"Error in subscriber for {event_type}: {e}")
-                
-                queue.task_done()
-                
-            except asyncio.TimeoutError:
-                continue
-            except Exception as e:
-                logger.error(f"Error processing queue {event_type}: {e}")
-    
+
     async def async_publish(self, event: DomainEvent, event_type: Optional[str] = None, correlation_id: Optional[str] = None) -> None:
-        """Async publish event to the bus."""
+        """Async publish event to the bus.
+
+        Waits only when a subscriber with ``OverflowPolicy.BLOCK`` is full.
+        """
         event_type = event_type or event.event_type
-        
+
         # Create envelope
         envelope = EventEnvelope(
             event=event,
             timestamp=datetime.now(),
             correlation_id=correlation_id,
         )
-        
-        # Ensure queue exists
-        if event_type not in self._queues:
-            self._queues[event_type] = asyncio.Queue()
-        
-        # Publish to queue
-        await self._queues[event_type].put(envelope)
+
+        for subscription in self._subscribers.get(event_type, ()):
+            await subscription.offer(envelope)
         logger.debug(f"Async published event: {event_type}")
-    
-    async def async_subscribe(self, event_type: str, handler: Callable) -> None:
-        """Async subscribe to events."""
-        if event_type not in self._subscribers:
-            self._subscribers[event_type] = []
-        
-        self._subscribers[event_type].append(handler)
+
+    def publish_nowait(self, event: DomainEvent, event_type: Optional[str] = None, correlation_id: Optional[str] = None) -> None:
+        """Publish without awaiting; full BLOCK queues drop their oldest event instead."""
+        event_type = event_type or event.event_type
+        envelope = EventEnvelope(event=event, timestamp=datetime.now(), correlation_id=correlation_id)
+        for subscription in self._subscribers.get(event_type, ()):
+            subscription.offer_nowait(envelope)
+
+    async def async_subscribe(
+        self,
+        event_type: str,
+        handler: Callable,
+        max_queue_size: int = 1000,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        batch: bool = False,
+        max_batch_size: int = 100,
+        coalesce_key: Optional[Callable[[DomainEvent], Any]] = None,
+        run_in_executor: bool = False,
+    ) -> Subscription:
+        """
+        Async subscribe to events.
+
+        Args:
+            event_type: Event type to receive
+            handler: Sync or async callable taking the domain event
+                (or a list of events when ``batch`` is set)
+            max_queue_size: Bound on this subscriber's pending events
+            overflow: Policy applied when the queue is full
+            batch: Deliver lists of up to ``max_batch_size`` events per wakeup
+            max_batch_size: Largest list delivered to a batch subscriber
+            coalesce_key: Key for ``OverflowPolicy.COALESCE`` (default: event symbol)
+            run_in_executor: Run a blocking sync handler in the default executor
+
+        Returns:
+            The subscription, for metrics or ``async_unsubscribe``
+        """
+        subscription = Subscription(
+            event_type, handler, self._shards[self._next_shard % self.num_shards],
+            max_queue_size=max_queue_size,
+            overflow=overflow,
+            batch=batch,
+            max_batch_size=max_batch_size,
+            coalesce_key=coalesce_key,
+            run_in_executor=run_in_executor,
+        )
+        self._next_shard += 1
+
+        self._subscribers.setdefault(event_type, []).append(subscription)
         logger.debug(f"Async subscribed to event type: {event_type}")
-    
+        return subscription
+
     async def async_unsubscribe(self, event_type: str, handler: Callable) -> None:
         """Async unsubscribe from events."""
-        if event_type in self._subscribers and handler in self._subscribers[event_type]:
-            self._subscribers[event_type].remove(handler)
+        subscriptions = self._subscribers.get(event_type, [])
+        for subscription in [s for s in subscriptions if s.handler == handler or s is handler]:
+            subscription.close()
+            subscriptions.remove(subscription)
             logger.debug(f"Async unsubscribed from event type: {event_type}")
-    
+
     def get_queue_size(self, event_type: str) -> int:
-        """Get queue size for event type."""
-        queue = self._queues.get(event_type)
-        return queue.qsize() if queue else 0
+        """Get the number of undelivered events queued for an event type."""
+        return sum(len(s) for s in self._subscribers.get(event_type, ()))
+
+    def get_subscriber_metrics(self) -> List[Dict[str, Any]]:
+        """Lag, throughput and overflow counters for every subscriber."""
+        return [
+            {
+                'event_type': event_type,
+                'handler': getattr(subscription.handler, '__qualname__', repr(subscription.handler)),
+                'shard': subscription.shard.index,
+                'overflow': subscription.overflow.value,
+                'batch': subscription.batch,
+                **vars(subscription.snapshot()),
+            }
+            for event_type, subscriptions in self._subscribers.items()
+            for subscription in subscriptions
+        ]
 
 
 class EventBus:
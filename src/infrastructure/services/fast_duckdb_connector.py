@@ -4,6 +4,10 @@ Fast DuckDB Connector with Connection Pooling
 
 High-performance DuckDB connector with connection pooling and caching
 for fast database operations in development and testing environments.
+
+In fast mode SELECT results are cached as Arrow tables in a byte-bounded
+LRU (see ``result_cache``); writes issued through the connector bump the
+target table's version, which invalidates dependent entries.
 """
 
 import time
@@ -14,9 +18,17 @@ from dataclasses import dataclass
 from queue import Queue, Empty
 import duckdb
 import logging
+import pyarrow as pa
 
 from src.infrastructure.config.settings import get_settings
 from src.domain.exceptions import DatabaseConnectionError
+from src.infrastructure.services.result_cache import (
+    DEFAULT_MAX_BYTES,
+    ArrowResultCache,
+    bump_table_version,
+    referenced_tables,
+    written_table,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -198,13 +210,15 @@ class FastDuckDBConnector:
     and implementing performance optimizations for development workflows.
     """
 
-    def __init__(self, db_path: Optional[str] = None, pool_size: int = 10):
+    def __init__(self, db_path: Optional[str] = None, pool_size: int = 10,
+                 cache_max_bytes: int = DEFAULT_MAX_BYTES):
         """
         Initialize the fast DuckDB connector.
 
         Args:
             db_path: Path to DuckDB database file
             pool_size: Size of connection pool
+            cache_max_bytes: Upper bound on cached Arrow result bytes
         """
         settings = get_settings()
 
@@ -220,8 +234,8 @@ class FastDuckDBConnector:
         )
 
         # Query cache for fast mode
-        self._query_cache: Dict[str, Dict[str, Any]] = {}
         self._cache_ttl = settings.performance.query_cache_ttl
+        self._query_cache = ArrowResultCache(max_bytes=cache_max_bytes, ttl=self._cache_ttl)
 
         logger.info(
             "FastDuckDBConnector initialized",
@@ -255,20 +269,10 @@ class FastDuckDBConnector:
         Returns:
             Query result
         """
-        start_time = time.time()
-
-        # Check cache in fast mode
         if self.fast_mode and self._should_cache_query(query):
-            cached_result = self._get_cached_result(query, params)
-            if cached_result is not None:
-                execution_time = time.time() - start_time
-                logger.debug(
-                    "Query served from cache",
-                    query=query[:100],
-                    execution_time=execution_time,
-                    cached=True
-                )
-                return cached_result
+            return self._rows(self.execute_query_arrow(query, params))
+
+        start_time = time.time()
 
         # Execute query using pooled connection
         with self.get_connection() as conn:
@@ -278,11 +282,11 @@ class FastDuckDBConnector:
                 else:
                     result = conn.execute(query).fetchall()
 
-                execution_time = time.time() - start_time
+                target = written_table(query)
+                if target:
+                    bump_table_version(target)
 
-                # Cache result in fast mode
-                if self.fast_mode and self._should_cache_query(query):
-                    self._cache_result(query, params, result, execution_time)
+                execution_time = time.time() - start_time
 
                 logger.debug(
                     "Query executed",
@@ -312,6 +316,64 @@ class FastDuckDBConnector:
                     }
                 )
 
+    def execute_query_arrow(self, query: str, params: Optional[List[Any]] = None) -> pa.Table:
+        """
+        Execute a query and return the result as an Arrow table.
+
+        In fast mode cacheable queries are served from the result cache;
+        a hit returns the cached table itself (no copy).
+
+        Args:
+            query: SQL query to execute
+            params: Query parameters
+
+        Returns:
+            pyarrow Table
+        """
+        start_time = time.time()
+        use_cache = self.fast_mode and self._should_cache_query(query)
+
+        if use_cache:
+            cached_result = self._query_cache.get_query(query, params)
+            if cached_result is not None:
+                logger.debug(
+                    "Query served from cache",
+                    query=query[:100],
+                    execution_time=time.time() - start_time,
+                    cached=True
+                )
+                return cached_result
+            # Versions are read before executing so a concurrent write
+            # invalidates this result rather than being masked by it
+            versions = self._query_cache.snapshot(referenced_tables(query))
+
+        with self.get_connection() as conn:
+            try:
+                cursor = conn.execute(query, params) if params else conn.execute(query)
+                to_arrow = getattr(cursor, 'to_arrow_table', None) or cursor.fetch_arrow_table
+                result = to_arrow()
+            except Exception as e:
+                raise DatabaseConnectionError(
+                    f"Query execution failed: {str(e)}",
+                    'execute_query_arrow',
+                    context={
+                        'query': query[:100],
+                        'execution_time': time.time() - start_time
+                    }
+                )
+
+        if use_cache:
+            self._query_cache.put_query(query, params, result, versions=versions)
+
+        logger.debug(
+            "Query executed",
+            query=query[:100],
+            execution_time=time.time() - start_time,
+            rows_returned=result.num_rows,
+            cached=False
+        )
+        return result
+
     def execute_query_df(self, query: str, params: Optional[List[Any]] = None):
         """
         Execute a query and return result as pandas DataFrame.
@@ -323,7 +385,8 @@ class FastDuckDBConnector:
         Returns:
             pandas DataFrame
         """
-        import pandas as pd
+        if self.fast_mode and self._should_cache_query(query):
+            return self.execute_query_arrow(query, params).to_pandas()
 
         with self.get_connection() as conn:
             if params:
@@ -333,46 +396,19 @@ class FastDuckDBConnector:
 
     def _should_cache_query(self, query: str) -> bool:
         """Determine if a query should be cached."""
-        # Only cache SELECT queries that are not too complex
+        # Only cache read queries whose result does not depend on the clock
         query_upper = query.strip().upper()
         return (
-            query_upper.startswith('SELECT') and
-            len(query) < 1000 and  # Not too long
+            query_upper.startswith(('SELECT', 'WITH')) and
             'NOW()' not in query_upper and  # Not time-dependent
-            'CURRENT_TIMESTAMP' not in query_upper
+            'CURRENT_TIMESTAMP' not in query_upper and
+            'RANDOM()' not in query_upper
         )
 
-    def _get_cached_result(self, query: str, params: Optional[List[Any]]) -> Optional[Any]:
-        """Get cached result if available and not expired."""
-        cache_key = f"{query}:{str(params) if params else ''}"
-
-        if cache_key in self._query_cache:
-            cached_item = self._query_cache[cache_key]
-            if time.time() - cached_item['timestamp'] < self._cache_ttl:
-                return cached_item['result']
-
-            # Remove expired cache entry
-            del self._query_cache[cache_key]
-
-        return None
-
-    def _cache_result(self, query: str, params: Optional[List[Any]], result: Any, execution_time: float):
-        """Cache query result."""
-        cache_key = f"{query}:{str(params) if params else ''}"
-
-        self._query_cache[cache_key] = {
-            'result': result,
-            'timestamp': time.time(),
-            'execution_time': execution_time
-        }
-
-        # Limit cache size (simple LRU eviction)
-        if len(self._query_cache) > 100:
-            oldest_key = min(
-                self._query_cache.keys(),
-                key=lambda k: self._query_cache[k]['timestamp']
-            )
-            del self._query_cache[oldest_key]
+    @staticmethod
+    def _rows(table: pa.Table) -> List[tuple]:
+        """Arrow table as the list of tuples ``fetchall()`` returns."""
+        return list(zip(*(column.to_pylist() for column in table.columns)))
 
     def get_pool_stats(self) -> ConnectionPoolStats:
         """Get connection pool statistics."""
@@ -394,6 +430,8 @@ class FastDuckDBConnector:
                 if (stats.pool_hits + stats.pool_misses) > 0 else 0
             ),
             'cache_size': len(self._query_cache),
+            'cache_bytes': self._query_cache.nbytes,
+            'cache_hit_rate': self._query_cache.get_stats().hit_rate,
             'fast_mode_enabled': self.fast_mode
         }
 
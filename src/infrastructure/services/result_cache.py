@@ -0,0 +1,278 @@
+"""
+Arrow Result Cache
+==================
+
+Byte-bounded LRU cache for query results, with invalidation tied to
+per-table write versions.
+
+- Results are held as ``pyarrow.Table`` so a hit hands back the cached
+  buffers without copying or re-materializing rows.
+- The cache is bounded by total Arrow bytes; eviction pops the least
+  recently used entry in O(1).
+- SQL keys are normalized (whitespace and case outside quoted text), so
+  the same scanner query formatted differently shares one entry.
+- Each entry remembers the write version of every table its query reads.
+  Ingest paths call ``bump_table_version`` after writing; entries reading
+  a bumped table are dropped on their next lookup. Views built over a
+  table (``DERIVED_TABLES``) are bumped along with it; the Parquet side of
+  ``market_data_unified`` is bumped by the lake write paths.
+"""
+
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import pyarrow as pa
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_QUOTED = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")")
+_READ_TABLES = re.compile(r"\b(?:from|join)\s+([a-z_][\w.]*)", re.IGNORECASE)
+_WRITE_TABLES = re.compile(
+    r"^\s*(?:insert\s+(?:or\s+\w+\s+)?into|update|delete\s+from|copy|truncate(?:\s+table)?"
+    r"|create\s+(?:or\s+replace\s+)?(?:temp\w*\s+)?table(?:\s+if\s+not\s+exists)?"
+    r"|drop\s+table(?:\s+if\s+exists)?|alter\s+table)\s+([a-z_][\w.]*)",
+    re.IGNORECASE,
+)
+
+
+def normalize_sql(query: str) -> str:
+    """Canonical form of a query: lower-cased, single-spaced, no trailing ';'.
+
+    Quoted literals and identifiers are kept verbatim.
+    """
+    parts = _QUOTED.split(query.strip().rstrip(";"))
+    for i in range(0, len(parts), 2):
+        parts[i] = " ".join(parts[i].split()).lower()
+    return "".join(parts).strip()
+
+
+def _table_name(name: str) -> str:
+    return name.rsplit(".", 1)[-1].lower()
+
+
+def referenced_tables(query: str) -> Tuple[str, ...]:
+    """Tables a query reads (FROM / JOIN targets), lower-cased, schema dropped."""
+    unquoted = " ".join(_QUOTED.sub("''", query).split())
+    return tuple(sorted({_table_name(name) for name in _READ_TABLES.findall(unquoted)}))
+
+
+def written_table(query: str) -> Optional[str]:
+    """Target table of a write statement (INSERT/UPDATE/DELETE/COPY/DDL), else None."""
+    match = _WRITE_TABLES.match(_QUOTED.sub("''", query))
+    return _table_name(match.group(1)) if match else None
+
+
+#: Views reading a base table; a write to the table also bumps these
+DERIVED_TABLES: Dict[str, Tuple[str, ...]] = {
+    "market_data": ("market_data_unified",),
+}
+
+
+class TableVersions:
+    """Thread-safe monotonically increasing write version per table."""
+
+    def __init__(self, derived: Optional[Dict[str, Tuple[str, ...]]] = None):
+        self._versions: Dict[str, int] = {}
+        self._derived = DERIVED_TABLES if derived is None else derived
+        self._lock = threading.Lock()
+
+    def bump(self, *tables: str):
+        keys = {table.lower() for table in tables}
+        keys.update(view for key in list(keys) for view in self._derived.get(key, ()))
+        with self._lock:
+            for key in keys:
+                self._versions[key] = self._versions.get(key, 0) + 1
+
+    def get(self, table: str) -> int:
+        return self._versions.get(table.lower(), 0)
+
+    def snapshot(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        return tuple(self.get(table) for table in tables)
+
+
+#: Process-wide registry shared by caches and ingest paths
+table_versions = TableVersions()
+
+
+def bump_table_version(*tables: str):
+    """Record a write to ``tables`` in the process-wide registry."""
+    table_versions.bump(*tables)
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate retained bytes of a cached value.
+
+    Exact for Arrow tables and pandas frames; containers of plain Python
+    objects are walked one level deep.
+    """
+    if isinstance(value, (pa.Table, pa.RecordBatch)):
+        return value.nbytes
+    if hasattr(value, "memory_usage"):
+        return int(value.memory_usage(deep=True).sum())
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        items = list(value.keys()) + list(value.values())
+    elif isinstance(value, (list, tuple, set)):
+        items = value
+    else:
+        return size
+    for item in items:
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            size += sum(sys.getsizeof(v) for v in item.values())
+        elif hasattr(item, "__dict__"):
+            size += sum(sys.getsizeof(v) for v in vars(item).values())
+    return size
+
+
+@dataclass
+class _Entry:
+    value: Any
+    nbytes: int
+    tables: Tuple[str, ...]
+    versions: Tuple[int, ...]
+    created: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class ResultCacheStats:
+    """Counters for cache monitoring."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    expirations: int = 0
+    entries: int = 0
+    bytes: int = 0
+    max_bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return (self.hits / total) * 100.0 if total else 0.0
+
+
+class ArrowResultCache:
+    """
+    Byte-bounded LRU cache keyed on normalized SQL (or caller-chosen keys).
+
+    ``get_query`` / ``put_query`` handle SQL results; ``get`` / ``put``
+    take an explicit key and table list for callers caching derived
+    results (e.g. scanner candidate lists).
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, ttl: Optional[float] = None,
+                 versions: Optional[TableVersions] = None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.versions = versions or table_versions
+        self._entries: "OrderedDict[Any, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = ResultCacheStats(max_bytes=max_bytes)
+
+    # ------------------------------------------------------------------
+    # Generic keys
+    # ------------------------------------------------------------------
+
+    def get(self, key: Any) -> Optional[Any]:
+        """Cached value for ``key``, or None if absent, expired or invalidated."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            if self.versions.snapshot(entry.tables) != entry.versions:
+                self._drop(key)
+                self._stats.invalidations += 1
+                self._stats.misses += 1
+                return None
+            if self.ttl is not None and time.monotonic() - entry.created >= self.ttl:
+                self._drop(key)
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return entry.value
+
+    def put(self, key: Any, value: Any, tables: Iterable[str] = (),
+            versions: Optional[Tuple[int, ...]] = None, nbytes: Optional[int] = None) -> bool:
+        """Store ``value``; returns False if it alone exceeds ``max_bytes``.
+
+        Pass ``versions`` captured (via ``snapshot``) before running the
+        query, so a write that lands mid-query invalidates the result.
+        """
+        tables = tuple(tables)
+        nbytes = estimate_size(value) if nbytes is None else nbytes
+        if nbytes > self.max_bytes:
+            return False
+        if versions is None:
+            versions = self.versions.snapshot(tables)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = _Entry(value, nbytes, tables, versions)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self._stats.evictions += 1
+        return True
+
+    def snapshot(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        return self.versions.snapshot(tables)
+
+    def _drop(self, key: Any):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.nbytes
+
+    # ------------------------------------------------------------------
+    # SQL keys
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def query_key(query: str, params: Optional[Iterable[Any]] = None) -> Tuple[str, Tuple]:
+        return normalize_sql(query), tuple(params) if params else ()
+
+    def get_query(self, query: str, params: Optional[Iterable[Any]] = None) -> Optional[pa.Table]:
+        return self.get(self.query_key(query, params))
+
+    def put_query(self, query: str, params: Optional[Iterable[Any]], table: pa.Table,
+                  versions: Optional[Tuple[int, ...]] = None) -> bool:
+        return self.put(self.query_key(query, params), table, referenced_tables(query),
+                        versions=versions, nbytes=table.nbytes)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def invalidate_table(self, table: str):
+        """Bump ``table``'s version; dependent entries drop on next lookup."""
+        self.versions.bump(table)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._entries
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def get_stats(self) -> ResultCacheStats:
+        with self._lock:
+            self._stats.entries = len(self._entries)
+            self._stats.bytes = self._bytes
+            return ResultCacheStats(**vars(self._stats))
@@ -146,6 +146,9 @@ def get_unified_manager() -> UnifiedDuckDBManager:
         read_only=True,  # API operations are typically read-only
         enable_httpfs=getattr(settings.database, 'enable_httpfs', True),
         parquet_root=getattr(settings.database, 'parquet_root', None),
+        compacted_parquet_root=getattr(settings.database, 'compacted_parquet_root', None),
+        compaction_granularity=getattr(settings.database, 'compaction_granularity', 'month'),
+        use_parquet_catalog=getattr(settings.database, 'use_parquet_catalog', False),
         use_parquet_in_unified_view=getattr(settings.database, 'use_parquet_in_unified_view', True)
     )
     return UnifiedDuckDBManager(config)
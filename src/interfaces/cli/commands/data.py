@@ -39,6 +39,28 @@ logger = get_logger(__name__)
 console = Console()
 
 
+def _lake_manager(**overrides):
+    """Writable UnifiedDuckDBManager over the configured database and Parquet lake."""
+    from src.infrastructure.config.settings import get_settings
+    from src.infrastructure.database.unified_duckdb import DuckDBConfig, UnifiedDuckDBManager
+
+    settings = get_settings()
+    options = dict(
+        database_path=settings.database.path,
+        memory_limit=getattr(settings.database, 'memory_limit', '2GB'),
+        threads=getattr(settings.database, 'threads', 4),
+        enable_httpfs=False,
+        parquet_root=getattr(settings.database, 'parquet_root', None) or 'data',
+        parquet_glob=getattr(settings.database, 'parquet_glob', None),
+        compacted_parquet_root=getattr(settings.database, 'compacted_parquet_root', None),
+        compaction_granularity=getattr(settings.database, 'compaction_granularity', 'month'),
+        use_parquet_catalog=getattr(settings.database, 'use_parquet_catalog', False),
+        use_parquet_in_unified_view=getattr(settings.database, 'use_parquet_in_unified_view', True),
+    )
+    options.update(overrides)
+    return UnifiedDuckDBManager(DuckDBConfig(**options))
+
+
 @click.group()
 @click.pass_context
 def data(ctx):
@@ -90,10 +112,11 @@ def latest(ctx, limit):
 @data.command()
 @click.argument('data_directory', type=click.Path(exists=True))
 @click.option('--symbol-pattern', default='*.parquet', help='File pattern for symbols')
-@click.option('--batch-size', default=1000, help='Batch size for processing')
+@click.option('--batch-size', default=1000, help='Files loaded per bulk INSERT')
+@click.option('--threads', type=int, help='DuckDB threads used for the load')
 @click.option('--dry-run', is_flag=True, help='Show what would be processed without executing')
 @click.pass_context
-def ingest(ctx, data_directory, symbol_pattern, batch_size, dry_run):
+def ingest(ctx, data_directory, symbol_pattern, batch_size, threads, dry_run):
     """Ingest market data from Parquet files."""
     verbose = ctx.obj.get('verbose', False)
 
@@ -141,7 +164,8 @@ def ingest(ctx, data_directory, symbol_pattern, batch_size, dry_run):
             result = pipeline.ingest_from_parquet_files(
                 data_directory=str(data_directory),
                 symbol_pattern=symbol_pattern,
-                batch_size=batch_size
+                batch_size=batch_size,
+                threads=threads
             )
 
             progress.update(task, completed=True)
@@ -151,10 +175,11 @@ def ingest(ctx, data_directory, symbol_pattern, batch_size, dry_run):
         table.add_column("Metric", style="cyan")
         table.add_column("Value", style="green")
 
-        table.add_row("Files Processed", str(result.get('files_processed', 0)))
-        table.add_row("Records Ingested", str(result.get('records_ingested', 0)))
-        table.add_row("Symbols Processed", str(result.get('symbols_processed', 0)))
-        table.add_row("Duration", ".2f")
+        table.add_row("Files Processed", str(result.get('total_files', 0)))
+        table.add_row("Records Ingested", str(result.get('total_records', 0)))
+        table.add_row("Symbols Processed", str(len(result.get('processed_symbols', []))))
+        table.add_row("Failed Files", str(len(result.get('failed_files', []))))
+        table.add_row("Duration", f"{result.get('duration_seconds', 0):.2f}s")
 
         console.print(table)
         console.print("[green]✅ Data ingestion completed successfully![/green]")
@@ -474,3 +499,114 @@ def create_parquet_view(ctx, view_name, parquet_glob):
         logger.error(f"Failed to create parquet view: {e}")
         console.print(f"[red]❌ Failed to create parquet view: {e}[/red]")
         raise click.Abort()
+
+
+@data.command()
+@click.option('--source-root', default='data', type=click.Path(exists=True),
+              help='Root of the daily YYYY/MM/DD Parquet tree')
+@click.option('--target-root', default='data/compacted', help='Directory for compacted period files')
+@click.option('--granularity', type=click.Choice(['day', 'month', 'year']), default='month',
+              help='Period covered by each compacted file')
+@click.option('--row-group-size', default=122880, help='Rows per Parquet row group')
+@click.option('--remove-sources', is_flag=True, help='Delete daily files once compacted')
+@click.option('--dry-run', is_flag=True, help='Show pending daily files without compacting')
+@click.pass_context
+def compact(ctx, source_root, target_root, granularity, row_group_size, remove_sources, dry_run):
+    """Compact daily Parquet files into symbol-sorted period files.
+
+    Only daily files added or changed since the last run are merged, so this
+    can run after every ingest. The parquet catalog and market_data_unified
+    view are updated for the written and removed files.
+    """
+    from src.infrastructure.database.parquet_compaction import CompactionConfig, ParquetCompactor
+
+    try:
+        config = CompactionConfig(
+            source_root=source_root,
+            target_root=target_root,
+            granularity=granularity,
+            row_group_size=row_group_size,
+            remove_sources=remove_sources,
+        )
+
+        if dry_run:
+            with ParquetCompactor(config) as compactor:
+                pending = compactor.pending_source_files()
+                per_partition = {}
+                for path in pending:
+                    key = compactor.partition_key(path)
+                    if key:
+                        per_partition[key] = per_partition.get(key, 0) + 1
+
+            table = Table(title="📋 Pending daily files by partition")
+            table.add_column("Partition", style="cyan")
+            table.add_column("Files", style="magenta")
+            for key, count in sorted(per_partition.items()):
+                table.add_row(key, str(count))
+            console.print(table)
+            console.print(f"[green]✅ Pending files: {len(pending)}[/green]")
+            return
+
+        with _lake_manager() as manager:
+            # Folds the compacted and removed files into the catalog and view
+            result = manager.compact_parquet(config)
+
+        table = Table(title="🗜️  Compaction Results")
+        table.add_column("Metric", style="cyan")
+        table.add_column("Value", style="green")
+        table.add_row("Partitions Written", str(len(result.partitions_written)))
+        table.add_row("Source Files Compacted", str(result.source_files_compacted))
+        table.add_row("Rows Written", str(result.rows_written))
+        table.add_row("Errors", str(len(result.errors)))
+        console.print(table)
+
+        for key, error in result.errors.items():
+            console.print(f"[red]❌ {key}: {error}[/red]")
+        if not result.success:
+            raise click.Abort()
+
+        console.print(f"[green]✅ Compacted store up to date: {target_root}[/green]")
+
+    except click.Abort:
+        raise
+    except Exception as e:
+        logger.error(f"Parquet compaction failed: {e}")
+        console.print(f"[red]❌ Parquet compaction failed: {e}[/red]")
+        raise click.Abort()
+
+
+@data.command("catalog")
+@click.option('--path', 'paths', multiple=True, type=click.Path(exists=True),
+              help='Only (re)catalog these files; omit to re-list the whole lake')
+@click.pass_context
+def catalog(ctx, paths):
+    """Update the parquet_catalog table used to prune Parquet scans.
+
+    Run with --path for files just written outside the ingest paths, or
+    without arguments to reconcile the catalog with the lake. The
+    market_data_unified view is rebuilt afterwards.
+    """
+    try:
+        with _lake_manager(use_parquet_catalog=True) as manager:
+            # Also rebuilds the persisted market_data_unified view
+            result = manager.refresh_parquet_catalog([*paths] if paths else None)
+
+        table = Table(title="📚 Parquet Catalog Refresh")
+        table.add_column("Metric", style="cyan")
+        table.add_column("Value", style="green")
+        table.add_row("Files Scanned", str(result.files_scanned))
+        table.add_row("Files Removed", str(result.files_removed))
+        table.add_row("Catalog Rows Written", str(result.rows_upserted))
+        table.add_row("Errors", str(len(result.errors)))
+        console.print(table)
+
+        if result.errors:
+            raise click.Abort()
+        console.print("[green]✅ Parquet catalog up to date[/green]")
+
+    except click.Abort:
+        raise
+    except Exception as e:
+        logger.error(f"Parquet catalog refresh failed: {e}")
+        console.print(f"[red]❌ Parquet catalog refresh failed: {e}[/red]")
+        raise click.Abort()
@@ -7,23 +7,81 @@ This module dynamically generates optimized SQL queries from rule conditions for
 - Technical indicator calculations
 - Volume analysis
 - Custom rule conditions
+
+Rules are compiled once into a ``CompiledQuery``: SQL text in which the scan
+date, time window, symbols and thresholds are all bind parameters. The text
+is identical for every scan date, so a connection prepares it once and the
+nightly run re-executes the same plan date after date.
 """
 
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import date, time
+import hashlib
+import json
 import logging
+import threading
 
 from ..schema.rule_types import RuleType
 
 logger = logging.getLogger(__name__)
 
 
+class _ScanDate:
+    """Placeholder for the scan date in compiled parameter lists."""
+
+    def __repr__(self):
+        return "SCAN_DATE"
+
+
+SCAN_DATE = _ScanDate()
+
+
+def rule_fingerprint(*parts: Any) -> str:
+    """Stable short hash of rule definition parts (dict key order ignored)."""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class CompiledQuery:
+    """A rule's SQL with the scan date left as a bind parameter."""
+    version: str
+    rule_type: RuleType
+    sql: str
+    params: Tuple[Any, ...]
+    rule_columns: Tuple[Tuple[str, str], ...] = ()
+
+    def bind(self, scan_date: date) -> List[Any]:
+        """Parameters for one scan date."""
+        value = scan_date.isoformat()
+        return [value if param is SCAN_DATE else param for param in self.params]
+
+
 class QueryBuilder:
     """Dynamically builds SQL queries from rule conditions."""
 
-    def __init__(self):
-        self.query_cache = {}
-        self.max_cache_size = 1000
+    # Rule types whose conditions are pure filters over a shared feature query,
+    # mapped to the query that computes those features
+    FUSION_BASES = {
+        RuleType.BREAKOUT: RuleType.BREAKOUT,
+        RuleType.VOLUME: RuleType.VOLUME,
+        RuleType.TECHNICAL: RuleType.TECHNICAL,
+        RuleType.MOMENTUM: RuleType.TECHNICAL,
+    }
+    FUSED_ORDER_BY = {
+        RuleType.BREAKOUT: "volume_multiplier DESC, price_change_pct DESC",
+        RuleType.VOLUME: "volume_ratio_10 DESC, volume DESC",
+        RuleType.TECHNICAL: "timestamp DESC",
+    }
+
+    def __init__(self, max_cache_size: int = 1000):
+        self.query_cache: "OrderedDict[str, CompiledQuery]" = OrderedDict()
+        self.max_cache_size = max_cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._lock = threading.Lock()
 
     def build_query(
         self,
@@ -33,7 +91,7 @@ class QueryBuilder:
         start_time: Optional[time] = None,
         end_time: Optional[time] = None,
         symbols: Optional[List[str]] = None
-    ) -> Tuple[str, Dict[str, Any]]:
+    ) -> Tuple[str, List[Any]]:
         """
         Build SQL query for rule execution.
 
@@ -46,35 +104,136 @@ class QueryBuilder:
             symbols: Symbol filter list
 
         Returns:
-            Tuple of (SQL query string, parameters dictionary)
+            Tuple of (SQL query string, positional parameters)
+        """
+        compiled = self.compile(rule_type, conditions, start_time, end_time, symbols)
+        return compiled.sql, compiled.bind(scan_date)
+
+    def compile(
+        self,
+        rule_type: RuleType,
+        conditions: Dict[str, Any],
+        start_time: Optional[time] = None,
+        end_time: Optional[time] = None,
+        symbols: Optional[List[str]] = None
+    ) -> CompiledQuery:
+        """
+        Compile a rule into date-independent SQL, once per rule version.
+
+        The version is a fingerprint of everything that shapes the SQL or
+        its parameters, so editing a rule's conditions yields a new plan
+        while re-running it for another date reuses the cached one.
         """
-        # Create cache key
-        cache_key = self._create_cache_key(rule_type, conditions, scan_date, start_time, end_time, symbols)
+        version = self._create_cache_key(rule_type, conditions, start_time, end_time, symbols)
 
-        # Check cache
-        if cache_key in self.query_cache:
-            logger.debug(f"Using cached query for {cache_key}")
-            return self.query_cache[cache_key]
+        with self._lock:
+            compiled = self.query_cache.get(version)
+            if compiled is not None:
+                self.query_cache.move_to_end(version)
+                self.cache_hits += 1
+                return compiled
+            self.cache_misses += 1
 
         # Build query based on rule type
         if rule_type == RuleType.BREAKOUT:
-            query, params = self._build_breakout_query(conditions, scan_date, start_time, end_time, symbols)
+            query, params = self._build_breakout_query(conditions, SCAN_DATE, start_time, end_time, symbols)
         elif rule_type == RuleType.CRP:
-            query, params = self._build_crp_query(conditions, scan_date, start_time, end_time, symbols)
+            query, params = self._build_crp_query(conditions, SCAN_DATE, start_time, end_time, symbols)
         elif rule_type == RuleType.TECHNICAL:
-            query, params = self._build_technical_query(conditions, scan_date, start_time, end_time, symbols)
+            query, params = self._build_technical_query(conditions, SCAN_DATE, start_time, end_time, symbols)
         elif rule_type == RuleType.VOLUME:
-            query, params = self._build_volume_query(conditions, scan_date, start_time, end_time, symbols)
+            query, params = self._build_volume_query(conditions, SCAN_DATE, start_time, end_time, symbols)
         elif rule_type == RuleType.MOMENTUM:
-            query, params = self._build_momentum_query(conditions, scan_date, start_time, end_time, symbols)
+            query, params = self._build_momentum_query(conditions, SCAN_DATE, start_time, end_time, symbols)
         else:
-            query, params = self._build_custom_query(conditions, scan_date, start_time, end_time, symbols)
+            query, params = self._build_custom_query(conditions, SCAN_DATE, start_time, end_time, symbols)
 
-        # Cache the query
-        self._cache_query(cache_key, (query, params))
+        compiled = CompiledQuery(version, rule_type, query, tuple(params))
+        self._cache_query(version, compiled)
 
-        logger.debug(f"Built query for rule type {rule_type.value}: {len(query)} chars")
-        return query, params
+        logger.debug(f"Compiled query for rule type {rule_type.value}: {len(query)} chars")
+        return compiled
+
+    def compile_fused(
+        self,
+        rules: Dict[str, Tuple[RuleType, Dict[str, Any]]],
+        start_time: Optional[time] = None,
+        end_time: Optional[time] = None,
+        symbols: Optional[List[str]] = None
+    ) -> CompiledQuery:
+        """
+        Compile several rules into one query over their shared features.
+
+        The base query (window functions, joins) is built once with no rule
+        filters; each rule's filters become a boolean ``rule_match_<n>``
+        column and rows matching no rule are dropped. ``rule_columns`` maps
+        each rule ID to its column.
+
+        Args:
+            rules: Rule ID -> (rule type, conditions); all types must share
+                a base in ``FUSION_BASES``
+
+        Raises:
+            ValueError: If the rules do not share a fusable base query
+        """
+        bases = {self.FUSION_BASES.get(rule_type) for rule_type, _ in rules.values()}
+        if len(bases) != 1 or None in bases:
+            raise ValueError(f"Rules cannot share one query: {sorted(rules)}")
+        base_type = bases.pop()
+
+        version = rule_fingerprint(
+            'fused',
+            sorted((rule_id, rule_type.value, conditions) for rule_id, (rule_type, conditions) in rules.items()),
+            start_time.strftime('%H:%M:%S') if start_time else None,
+            end_time.strftime('%H:%M:%S') if end_time else None,
+            list(symbols) if symbols else None
+        )
+
+        with self._lock:
+            compiled = self.query_cache.get(version)
+            if compiled is not None:
+                self.query_cache.move_to_end(version)
+                self.cache_hits += 1
+                return compiled
+            self.cache_misses += 1
+
+        base = self.compile(base_type, {}, start_time, end_time, symbols)
+        params = list(base.params)
+        flags = []
+        rule_columns = []
+        for i, (rule_id, (_, conditions)) in enumerate(sorted(rules.items())):
+            where_conditions, filter_params = self._rule_filters(base_type, conditions)
+            column = f"rule_match_{i}"
+            flags.append(f"({' AND '.join(where_conditions) or 'TRUE'}) AS {column}")
+            params.extend(filter_params)
+            rule_columns.append((rule_id, column))
+
+        query = f"""
+        WITH fused_features AS ({base.sql})
+        SELECT *
+        FROM (
+            SELECT
+                fused_features.*,
+                {',                '.join(flags)}
+            FROM fused_features
+        ) fused
+        WHERE {' OR '.join(column for _, column in rule_columns)}
+        ORDER BY {self.FUSED_ORDER_BY[base_type]}
+        """
+
+        compiled = CompiledQuery(version, base_type, query, tuple(params), tuple(rule_columns))
+        self._cache_query(version, compiled)
+
+        logger.debug(f"Compiled fused {base_type.value} query for {len(rules)} rules")
+        return compiled
+
+    def _rule_filters(self, rule_type: RuleType, conditions: Dict[str, Any]) -> Tuple[List[str], List[Any]]:
+        """Per-rule predicates over the output of the rule type's base query."""
+        if rule_type == RuleType.BREAKOUT:
+            return self._breakout_filters(conditions)
+        if rule_type == RuleType.VOLUME:
+            return self._volume_filters(conditions)
+        return self._technical_filters(conditions)
 
     def _build_breakout_query(
         self,
@@ -86,11 +245,6 @@ class QueryBuilder:
     ) -> Tuple[str, Dict[str, Any]]:
         """Build breakout pattern detection query."""
 
-        # Extract conditions
-        time_window = conditions.get('time_window', {})
-        breakout_conditions = conditions.get('breakout_conditions', {})
-        market_conditions = conditions.get('market_conditions', {})
-
         # Build filters for price_data_full and price_data first
         price_data_filters = []
         params = [scan_date]
@@ -177,28 +331,9 @@ class QueryBuilder:
             WHERE prev_price IS NOT NULL
         """
 
-        # Add breakout condition filters
-        where_conditions = []
-        if breakout_conditions.get('min_price_move_pct'):
-            where_conditions.append("price_change_pct >= ?")
-            params.append(breakout_conditions['min_price_move_pct'])
-        if breakout_conditions.get('max_price_move_pct'):
-            where_conditions.append("price_change_pct <= ?")
-            params.append(breakout_conditions['max_price_move_pct'])
-        if breakout_conditions.get('min_volume_multiplier'):
-            where_conditions.append("volume_multiplier >= ?")
-            params.append(breakout_conditions['min_volume_multiplier'])
-
-        # Add market condition filters to breakout_signals
-        if market_conditions.get('min_price'):
-            where_conditions.append("price >= ?")
-            params.append(market_conditions['min_price'])
-        if market_conditions.get('max_price'):
-            where_conditions.append("price <= ?")
-            params.append(market_conditions['max_price'])
-        if market_conditions.get('min_volume'):
-            where_conditions.append("volume >= ?")
-            params.append(market_conditions['min_volume'])
+        # Add breakout and market condition filters to breakout_signals
+        where_conditions, filter_params = self._breakout_filters(conditions)
+        params.extend(filter_params)
 
         if where_conditions:
             query += " AND " + " AND ".join(where_conditions)
@@ -255,18 +390,18 @@ class QueryBuilder:
 
         consolidation_period = crp_conditions.get('consolidation_period', 5)
 
-        query = f"""
+        query = """
         WITH daily_ranges AS (
             SELECT
                 symbol,
-                date,
+                date_partition as date,
                 MIN(low) as day_low,
                 MAX(high) as day_high,
                 (MAX(high) - MIN(low)) / NULLIF(MIN(low), 0) * 100 as daily_range_pct
             FROM market_data
-            WHERE date >= date '{scan_date.isoformat()}', '-{consolidation_period + 1} days')
-            AND date <= '{scan_date.isoformat()}'
-            GROUP BY symbol, date
+            WHERE date_partition >= CAST(? AS DATE) - CAST(? AS INTEGER)
+            AND date_partition <= CAST(? AS DATE)
+            GROUP BY symbol, date_partition
         ),
         consolidation_analysis AS (
             SELECT
@@ -300,9 +435,12 @@ class QueryBuilder:
         """
 
         params = [
+            scan_date,
+            consolidation_period + 1,
+            scan_date,
             crp_conditions.get('close_threshold_pct', 2.0) / 100,  # Convert to decimal
             crp_conditions.get('close_threshold_pct', 2.0) / 100,  # Convert to decimal
-            scan_date.isoformat()
+            scan_date
         ]
 
         # Add time filter
@@ -383,11 +521,6 @@ class QueryBuilder:
     ) -> Tuple[str, Dict[str, Any]]:
         """Build technical indicator analysis query."""
 
-        # Extract conditions
-        time_window = conditions.get('time_window', {})
-        technical_conditions = conditions.get('technical_conditions', {})
-        market_conditions = conditions.get('market_conditions', {})
-
         query = """
         WITH technical_indicators AS (
             SELECT
@@ -464,44 +597,13 @@ class QueryBuilder:
         WHERE 1=1
         """
 
-        # Add technical condition filters
-        where_conditions = []
-        rsi_conditions = technical_conditions.get('rsi', {})
-        if rsi_conditions.get('condition') == 'oversold':
-            where_conditions.append("rsi <= ?")
-            params.append(rsi_conditions.get('oversold', 30))
-        elif rsi_conditions.get('condition') == 'overbought':
-            where_conditions.append("rsi >= ?")
-            params.append(rsi_conditions.get('overbought', 70))
-
-        macd_conditions = technical_conditions.get('macd', {})
-        if macd_conditions.get('condition') == 'bullish':
-            where_conditions.append("macd_histogram > 0")
-        elif macd_conditions.get('condition') == 'bearish':
-            where_conditions.append("macd_histogram < 0")
-
-        bb_conditions = technical_conditions.get('bollinger_bands', {})
-        if bb_conditions.get('condition') == 'upper_breakout':
-            where_conditions.append("bb_position >= ?")
-            params.append(bb_conditions.get('deviations', 2.0))
-        elif bb_conditions.get('condition') == 'lower_breakout':
-            where_conditions.append("bb_position <= ?")
-            params.append(-bb_conditions.get('deviations', 2.0))
+        # Add technical and market condition filters
+        where_conditions, filter_params = self._technical_filters(conditions)
+        params.extend(filter_params)
 
         if where_conditions:
             query += " AND " + " AND ".join(where_conditions)
 
-        # Add market condition filters
-        if market_conditions.get('min_price'):
-            query += " AND price >= ?"
-            params.append(market_conditions['min_price'])
-        if market_conditions.get('max_price'):
-            query += " AND price <= ?"
-            params.append(market_conditions['max_price'])
-        if market_conditions.get('min_volume'):
-            query += " AND volume >= ?"
-            params.append(market_conditions['min_volume'])
-
         query += """
         ORDER BY timestamp DESC
         """
@@ -518,11 +620,6 @@ class QueryBuilder:
     ) -> Tuple[str, Dict[str, Any]]:
         """Build volume analysis query."""
 
-        # Extract conditions
-        time_window = conditions.get('time_window', {})
-        volume_conditions = conditions.get('volume_conditions', {})
-        market_conditions = conditions.get('market_conditions', {})
-
         query = """
         WITH volume_analysis AS (
             SELECT
@@ -599,33 +696,13 @@ class QueryBuilder:
         WHERE 1=1
         """
 
-        # Add volume condition filters
-        where_conditions = []
-        if volume_conditions.get('min_volume'):
-            where_conditions.append("volume >= ?")
-            params.append(volume_conditions['min_volume'])
-        if volume_conditions.get('max_volume'):
-            where_conditions.append("volume <= ?")
-            params.append(volume_conditions['max_volume'])
-        if volume_conditions.get('relative_volume'):
-            where_conditions.append("volume_ratio_10 >= ?")
-            params.append(volume_conditions['relative_volume'])
-        if volume_conditions.get('volume_trend') == 'increasing':
-            where_conditions.append("volume_change_pct > 0")
-        elif volume_conditions.get('volume_trend') == 'decreasing':
-            where_conditions.append("volume_change_pct < 0")
+        # Add volume and market condition filters
+        where_conditions, filter_params = self._volume_filters(conditions)
+        params.extend(filter_params)
 
         if where_conditions:
             query += " AND " + " AND ".join(where_conditions)
 
-        # Add market condition filters
-        if market_conditions.get('min_price'):
-            query += " AND price >= ?"
-            params.append(market_conditions['min_price'])
-        if market_conditions.get('max_price'):
-            query += " AND price <= ?"
-            params.append(market_conditions['max_price'])
-
         query += """
         ORDER BY volume_ratio_10 DESC, volume DESC
         """
@@ -691,46 +768,143 @@ class QueryBuilder:
 
         return query, params
 
+    def _breakout_filters(self, conditions: Dict[str, Any]) -> Tuple[List[str], List[Any]]:
+        """Per-rule predicates over breakout_signals columns."""
+        breakout_conditions = conditions.get('breakout_conditions', {})
+        market_conditions = conditions.get('market_conditions', {})
+
+        where_conditions = []
+        params = []
+        if breakout_conditions.get('min_price_move_pct'):
+            where_conditions.append("price_change_pct >= ?")
+            params.append(breakout_conditions['min_price_move_pct'])
+        if breakout_conditions.get('max_price_move_pct'):
+            where_conditions.append("price_change_pct <= ?")
+            params.append(breakout_conditions['max_price_move_pct'])
+        if breakout_conditions.get('min_volume_multiplier'):
+            where_conditions.append("volume_multiplier >= ?")
+            params.append(breakout_conditions['min_volume_multiplier'])
+
+        if market_conditions.get('min_price'):
+            where_conditions.append("price >= ?")
+            params.append(market_conditions['min_price'])
+        if market_conditions.get('max_price'):
+            where_conditions.append("price <= ?")
+            params.append(market_conditions['max_price'])
+        if market_conditions.get('min_volume'):
+            where_conditions.append("volume >= ?")
+            params.append(market_conditions['min_volume'])
+
+        return where_conditions, params
+
+    def _technical_filters(self, conditions: Dict[str, Any]) -> Tuple[List[str], List[Any]]:
+        """Per-rule predicates over technical_signals columns."""
+        technical_conditions = conditions.get('technical_conditions', {})
+        market_conditions = conditions.get('market_conditions', {})
+
+        where_conditions = []
+        params = []
+        rsi_conditions = technical_conditions.get('rsi', {})
+        if rsi_conditions.get('condition') == 'oversold':
+            where_conditions.append("rsi <= ?")
+            params.append(rsi_conditions.get('oversold', 30))
+        elif rsi_conditions.get('condition') == 'overbought':
+            where_conditions.append("rsi >= ?")
+            params.append(rsi_conditions.get('overbought', 70))
+
+        macd_conditions = technical_conditions.get('macd', {})
+        if macd_conditions.get('condition') == 'bullish':
+            where_conditions.append("macd_histogram > 0")
+        elif macd_conditions.get('condition') == 'bearish':
+            where_conditions.append("macd_histogram < 0")
+
+        bb_conditions = technical_conditions.get('bollinger_bands', {})
+        if bb_conditions.get('condition') == 'upper_breakout':
+            where_conditions.append("bb_position >= ?")
+            params.append(bb_conditions.get('deviations', 2.0))
+        elif bb_conditions.get('condition') == 'lower_breakout':
+            where_conditions.append("bb_position <= ?")
+            params.append(-bb_conditions.get('deviations', 2.0))
+
+        if market_conditions.get('min_price'):
+            where_conditions.append("price >= ?")
+            params.append(market_conditions['min_price'])
+        if market_conditions.get('max_price'):
+            where_conditions.append("price <= ?")
+            params.append(market_conditions['max_price'])
+        if market_conditions.get('min_volume'):
+            where_conditions.append("volume >= ?")
+            params.append(market_conditions['min_volume'])
+
+        return where_conditions, params
+
+    def _volume_filters(self, conditions: Dict[str, Any]) -> Tuple[List[str], List[Any]]:
+        """Per-rule predicates over volume_signals columns."""
+        volume_conditions = conditions.get('volume_conditions', {})
+        market_conditions = conditions.get('market_conditions', {})
+
+        where_conditions = []
+        params = []
+        if volume_conditions.get('min_volume'):
+            where_conditions.append("volume >= ?")
+            params.append(volume_conditions['min_volume'])
+        if volume_conditions.get('max_volume'):
+            where_conditions.append("volume <= ?")
+            params.append(volume_conditions['max_volume'])
+        if volume_conditions.get('relative_volume'):
+            where_conditions.append("volume_ratio_10 >= ?")
+            params.append(volume_conditions['relative_volume'])
+        if volume_conditions.get('volume_trend') == 'increasing':
+            where_conditions.append("volume_change_pct > 0")
+        elif volume_conditions.get('volume_trend') == 'decreasing':
+            where_conditions.append("volume_change_pct < 0")
+
+        if market_conditions.get('min_price'):
+            where_conditions.append("price >= ?")
+            params.append(market_conditions['min_price'])
+        if market_conditions.get('max_price'):
+            where_conditions.append("price <= ?")
+            params.append(market_conditions['max_price'])
+
+        return where_conditions, params
+
     def _create_cache_key(
         self,
         rule_type: RuleType,
         conditions: Dict[str, Any],
-        scan_date: date,
         start_time: Optional[time],
         end_time: Optional[time],
         symbols: Optional[List[str]]
     ) -> str:
-        """Create a cache key for query caching."""
-        # Create a deterministic key from query parameters
-        key_parts = [
+        """Create the rule version key: everything but the scan date."""
+        return rule_fingerprint(
             rule_type.value,
-            str(conditions),  # This will be the same for identical conditions
-            scan_date.isoformat(),
-            start_time.strftime('%H:%M:%S') if start_time else 'none',
-            end_time.strftime('%H:%M:%S') if end_time else 'none',
-            ','.join(sorted(symbols)) if symbols else 'all'
-        ]
-        return '|'.join(key_parts)
-
-    def _cache_query(self, key: str, query_data: Tuple[str, Dict[str, Any]]):
-        """Cache a query with size management."""
-        self.query_cache[key] = query_data
+            conditions,
+            start_time.strftime('%H:%M:%S') if start_time else None,
+            end_time.strftime('%H:%M:%S') if end_time else None,
+            list(symbols) if symbols else None
+        )
 
-        # Manage cache size
-        if len(self.query_cache) > self.max_cache_size:
-            # Remove oldest entry (simple FIFO)
-            oldest_key = next(iter(self.query_cache))
-            del self.query_cache[oldest_key]
+    def _cache_query(self, key: str, compiled: CompiledQuery):
+        """Cache a compiled query, evicting the least recently used."""
+        with self._lock:
+            self.query_cache[key] = compiled
+            while len(self.query_cache) > self.max_cache_size:
+                self.query_cache.popitem(last=False)
 
     def clear_cache(self):
         """Clear the query cache."""
-        self.query_cache.clear()
+        with self._lock:
+            self.query_cache.clear()
         logger.info("Query cache cleared")
 
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
+        lookups = self.cache_hits + self.cache_misses
         return {
             'cache_size': len(self.query_cache),
             'max_cache_size': self.max_cache_size,
-            'cache_hit_ratio': 0  # Would need hit/miss counters for this
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'cache_hit_ratio': self.cache_hits / lookups if lookups else 0
         }
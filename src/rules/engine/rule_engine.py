@@ -6,18 +6,34 @@ This module provides the main rule execution engine that:
 - Executes rules against the database
 - Generates trading signals
 - Manages execution context and performance
+
+Each rule is compiled once per version into parameterized SQL; DuckDB
+connections prepare that SQL once and re-execute it for every scan date.
+Query results are cached per (rule version, scan date) and dropped when
+``market_data`` is written (ingest paths bump its table version).
+
+Batches fuse rules that only differ in their filters over the same feature
+query (see ``QueryBuilder.FUSION_BASES``): one scan computes the shared
+window features and a match column per rule, which the signal generator
+fans back out into per-rule batches.
 """
 
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, Tuple
 from datetime import date, time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
 import json
+import threading
+
+from duckdb import DuckDBPyConnection
+
+from src.infrastructure.database.prepared_statements import PreparedStatementCache
+from src.infrastructure.services.result_cache import ArrowResultCache, referenced_tables
 
 from ..schema.rule_types import RuleType, SignalType
 from ..schema.validation_engine import RuleValidator
 from .context_manager import ContextManager, ExecutionContext
-from .query_builder import QueryBuilder
+from .query_builder import CompiledQuery, QueryBuilder
 from .signal_generator import SignalGenerator, TradingSignal, SignalBatch
 
 logger = logging.getLogger(__name__)
@@ -26,17 +42,24 @@ logger = logging.getLogger(__name__)
 class RuleEngine:
     """Main rule execution engine."""
 
-    def __init__(self, db_connection=None, max_workers: int = 4):
+    def __init__(self, db_connection=None, max_workers: int = 4,
+                 result_cache_bytes: int = 64 * 1024 * 1024):
         """
         Initialize the rule engine.
 
         Args:
             db_connection: Database connection object
             max_workers: Maximum number of worker threads for parallel execution
+            result_cache_bytes: Memory bound for cached rule results (0 disables)
         """
         self.db_connection = db_connection
         self.max_workers = max_workers
 
+        # Prepared statements per connection, cached results per (rule version, date)
+        self.result_cache = ArrowResultCache(max_bytes=result_cache_bytes)
+        self._statement_caches: Dict[int, PreparedStatementCache] = {}
+        self._query_lock = threading.Lock()
+
         # Core components
         self.validator = RuleValidator()
         self.query_builder = QueryBuilder()
@@ -194,12 +217,11 @@ class RuleEngine:
             # Record execution start
             execution_start = context.performance_metrics['start_time']
 
-            # Build query
+            # Compile once per rule version; only the date is bound per call
             rule_type = RuleType(rule['rule_type'])
-            query, params = self.query_builder.build_query(
+            compiled = self.query_builder.compile(
                 rule_type=rule_type,
                 conditions=rule.get('conditions', {}),
-                scan_date=scan_date,
                 start_time=start_time,
                 end_time=end_time,
                 symbols=symbols
@@ -209,63 +231,15 @@ class RuleEngine:
             if self.db_connection is None:
                 raise ValueError("Database connection not provided")
 
-            # Debug: Log the actual query being executed
-            logger.info(f"DEBUG RULE {rule_id}: Generated query:\n{query}")
-            logger.info(f"DEBUG RULE {rule_id}: Query params: {params}")
-
-            context.record_query_execution(f"{rule_type.value}_query", 0)  # Query time would be measured
-
-            # Execute the query (simplified - would use actual DB connection)
-            logger.debug(f"Executing rule {rule_id} with query params: {params}")
-            results = self._execute_query(query, params)
+            results = self._run_compiled(compiled, scan_date, context)
             logger.debug(f"Query returned {len(results)} results for rule {rule_id}")
-            if results:
-                logger.debug(f"First result sample: {results[0]}")
 
             # Generate signals
             signals = []
-            logger.debug(f"Processing {len(results)} results for signal generation")
-            for i, result in enumerate(results):
-                logger.debug(f"Processing result {i}: {result} (type: {type(result)})")
-
-                # Check if result is a dictionary
-                if not isinstance(result, dict):
-                    logger.error(f"Result {i} is not a dictionary: {result} (type: {type(result)})")
-                    continue
-
-                if 'symbol' not in result:
-                    logger.error(f"Result {i} missing 'symbol' key: {result}")
-                    continue
-
-                market_data = {
-                    'close': result.get('price'),
-                    'volume': result.get('volume'),
-                    'timestamp': result.get('timestamp'),
-                    'price_change_pct': result.get('price_change_pct', 0),
-                    'volume_multiplier': result.get('volume_multiplier', 1),
-                    'breakout_strength': result.get('breakout_strength', 0),
-                    'price_at_0950': result.get('price_at_0950'),
-                    'price_at_1515': result.get('price_at_1515'),
-                    'daily_performance_pct': result.get('daily_performance_pct')
-                }
-
-                # Debug logging for INTELLECT
-                if result.get('symbol') == 'INTELLECT':
-                    logger.info(f"DEBUG EXECUTE_RULE: result keys: {list(result.keys())}")
-                    logger.info(f"DEBUG EXECUTE_RULE: price_at_1515 from result: {result.get('price_at_1515')}")
-                    logger.info(f"DEBUG EXECUTE_RULE: daily_performance_pct from result: {result.get('daily_performance_pct')}")
-                    logger.info(f"DEBUG EXECUTE_RULE: market_data: {market_data}")
-
-                logger.debug(f"Creating signal for symbol: {result['symbol']}")
-                signal = self.signal_generator.generate_signal(
-                    rule_id=rule_id,
-                    symbol=result['symbol'],
-                    signal_type=SignalType(rule['actions']['signal_type']),
-                    confidence=self._calculate_confidence(result, rule),
-                    market_data=market_data,
-                    risk_management=rule['actions'].get('risk_management')
-                )
-                signals.append(signal)
+            for result in results:
+                signal = self._generate_rule_signal(rule_id, rule, result)
+                if signal is not None:
+                    signals.append(signal)
 
             # Update statistics
             self._update_rule_stats(rule_id, True, len(signals))
@@ -301,6 +275,7 @@ class RuleEngine:
         rule_ids: List[str],
         scan_date: date,
         parallel: bool = True,
+        fuse: bool = True,
         **kwargs
     ) -> Dict[str, Any]:
         """
@@ -310,15 +285,120 @@ class RuleEngine:
             rule_ids: List of rule IDs to execute
             scan_date: Date to scan
             parallel: Whether to execute in parallel
+            fuse: Whether to evaluate rules sharing a feature query in one scan
             **kwargs: Additional execution parameters
 
         Returns:
             Batch execution results
         """
-        if parallel and len(rule_ids) > 1:
-            return self._execute_parallel(rule_ids, scan_date, **kwargs)
+        groups, standalone = self.plan_fusion(rule_ids) if fuse else ([], list(rule_ids))
+
+        if parallel and len(standalone) > 1:
+            results = self._execute_parallel(standalone, scan_date, **kwargs)
         else:
-            return self._execute_sequential(rule_ids, scan_date, **kwargs)
+            results = self._execute_sequential(standalone, scan_date, **kwargs)
+
+        results['total_rules'] = len(rule_ids)
+        results['fused_groups'] = len(groups)
+        for group in groups:
+            for rule_id, result in self._execute_fused(group, scan_date, **kwargs).items():
+                self._record_batch_result(results, rule_id, result)
+
+        return results
+
+    def plan_fusion(self, rule_ids: List[str]) -> Tuple[List[List[str]], List[str]]:
+        """
+        Group rules that can be evaluated by one fused query.
+
+        Rules whose types share a base query in ``QueryBuilder.FUSION_BASES``
+        are grouped together; the time window and symbol filter are shared by
+        the whole batch. Groups of one and other rule types run on their own.
+
+        Returns:
+            Tuple of (fusable groups, standalone rule IDs)
+        """
+        by_base: Dict[RuleType, List[str]] = {}
+        standalone = []
+
+        for rule_id in rule_ids:
+            rule = self.rules.get(rule_id)
+            try:
+                base = QueryBuilder.FUSION_BASES.get(RuleType(rule['rule_type'])) if rule else None
+            except ValueError:
+                base = None
+            if base is None:
+                standalone.append(rule_id)
+            else:
+                by_base.setdefault(base, []).append(rule_id)
+
+        groups = []
+        for group in by_base.values():
+            if len(group) > 1:
+                groups.append(group)
+            else:
+                standalone.extend(group)
+
+        return groups, standalone
+
+    def _execute_fused(
+        self,
+        rule_ids: List[str],
+        scan_date: date,
+        **kwargs
+    ) -> Dict[str, Dict[str, Any]]:
+        """Execute a fusion group with one query; falls back to per-rule runs on failure."""
+        rules = {rule_id: self.rules[rule_id] for rule_id in rule_ids}
+        context = self.context_manager.create_context(
+            scan_date=scan_date,
+            start_time=kwargs.get('start_time'),
+            end_time=kwargs.get('end_time'),
+            symbols=kwargs.get('symbols')
+        )
+
+        try:
+            compiled = self.query_builder.compile_fused(
+                {rule_id: (RuleType(rule['rule_type']), rule.get('conditions', {}))
+                 for rule_id, rule in rules.items()},
+                start_time=kwargs.get('start_time'),
+                end_time=kwargs.get('end_time'),
+                symbols=kwargs.get('symbols')
+            )
+
+            if self.db_connection is None:
+                raise ValueError("Database connection not provided")
+
+            results = self._run_compiled(compiled, scan_date, context)
+        except Exception as e:
+            logger.warning(f"Fused execution of {len(rule_ids)} rules failed, running individually: {e}")
+            return {rule_id: self.execute_rule(rule_id, scan_date, **kwargs) for rule_id in rule_ids}
+
+        batches = self.signal_generator.fan_out_fused_results(
+            results,
+            dict(compiled.rule_columns),
+            lambda rule_id, result: self._generate_rule_signal(rule_id, rules[rule_id], result)
+        )
+
+        outcome = {}
+        for rule_id, batch in batches.items():
+            context.performance_metrics['rules_executed'] += 1
+            signals = batch.signals
+
+            self._update_rule_stats(rule_id, True, len(signals))
+            self._execute_signal_callbacks(signals)
+            self._execute_execution_callbacks(rule_id, True, len(signals))
+
+            outcome[rule_id] = {
+                'success': True,
+                'rule_id': rule_id,
+                'signals_generated': len(signals),
+                'query_results': batch.metadata['query_results'],
+                'fused_rules': len(rule_ids),
+                'signals': [s.to_dict() for s in signals]
+            }
+
+        logger.info(f"Fused {len(rule_ids)} {compiled.rule_type.value} rules into one query "
+                    f"({len(results)} rows)")
+        return outcome
 
     def _execute_parallel(
         self,
@@ -327,15 +407,9 @@ class RuleEngine:
         **kwargs
     ) -> Dict[str, Any]:
         """Execute rules in parallel."""
-        results = {
-            'total_rules': len(rule_ids),
-            'successful_executions': 0,
-            'failed_executions': 0,
-            'total_signals': 0,
-            'signals': [],  # Collect all signals here
-            'rule_results': {},
-            'execution_errors': []
-        }
+        results = self._empty_batch_results(rule_ids)
+        if not rule_ids:
+            return results
 
         with ThreadPoolExecutor(max_workers=min(self.max_workers, len(rule_ids))) as executor:
             # Submit all tasks
@@ -348,21 +422,7 @@ class RuleEngine:
             for future in as_completed(future_to_rule):
                 rule_id = future_to_rule[future]
                 try:
-                    result = future.result()
-                    results['rule_results'][rule_id] = result
-
-                    if result['success']:
-                        results['successful_executions'] += 1
-                        results['total_signals'] += result.get('signals_generated', 0)
-                        # Collect all signals from this rule
-                        results['signals'].extend(result.get('signals', []))
-                    else:
-                        results['failed_executions'] += 1
-                        results['execution_errors'].append({
-                            'rule_id': rule_id,
-                            'error': result.get('error', 'Unknown error')
-                        })
-
+                    self._record_batch_result(results, rule_id, future.result())
                 except Exception as e:
                     logger.error(f"Parallel execution failed for {rule_id}: {e}")
                     results['failed_executions'] += 1
@@ -380,7 +440,15 @@ class RuleEngine:
         **kwargs
     ) -> Dict[str, Any]:
         """Execute rules sequentially."""
-        results = {
+        results = self._empty_batch_results(rule_ids)
+
+        for rule_id in rule_ids:
+            self._record_batch_result(results, rule_id, self.execute_rule(rule_id, scan_date, **kwargs))
+
+        return results
+
+    def _empty_batch_results(self, rule_ids: List[str]) -> Dict[str, Any]:
+        return {
             'total_rules': len(rule_ids),
             'successful_executions': 0,
             'failed_executions': 0,
@@ -390,26 +458,84 @@ class RuleEngine:
             'execution_errors': []
         }
 
-        for rule_id in rule_ids:
-            result = self.execute_rule(rule_id, scan_date, **kwargs)
-            results['rule_results'][rule_id] = result
-
-            if result['success']:
-                results['successful_executions'] += 1
-                results['total_signals'] += result.get('signals_generated', 0)
-                # Collect all signals from this rule
-                results['signals'].extend(result.get('signals', []))
-            else:
-                results['failed_executions'] += 1
-                results['execution_errors'].append({
-                    'rule_id': rule_id,
-                    'error': result.get('error', 'Unknown error')
-                })
+    def _record_batch_result(self, results: Dict[str, Any], rule_id: str, result: Dict[str, Any]):
+        """Fold one rule's execution result into batch results."""
+        results['rule_results'][rule_id] = result
+
+        if result['success']:
+            results['successful_executions'] += 1
+            results['total_signals'] += result.get('signals_generated', 0)
+            # Collect all signals from this rule
+            results['signals'].extend(result.get('signals', []))
+        else:
+            results['failed_executions'] += 1
+            results['execution_errors'].append({
+                'rule_id': rule_id,
+                'error': result.get('error', 'Unknown error')
+            })
+
+    def _run_compiled(self, compiled: CompiledQuery, scan_date: date, context: ExecutionContext) -> List[Dict[str, Any]]:
+        """Run a compiled query for one date, through the result cache."""
+        query, params = compiled.sql, compiled.bind(scan_date)
+        cache_key = ('rule_results', compiled.version, scan_date.isoformat())
+        tables = referenced_tables(query)
+
+        results = self.result_cache.get(cache_key)
+        if results is None:
+            versions = self.result_cache.snapshot(tables)
+            logger.debug(f"Executing {compiled.rule_type.value} query with params: {params}")
+            results = self._execute_query(query, params)
+            self.result_cache.put(cache_key, results, tables, versions=versions)
+            context.record_query_execution(f"{compiled.rule_type.value}_query", 0)  # Query time would be measured
+        else:
+            logger.debug(f"Using cached {compiled.rule_type.value} results for {scan_date}")
 
         return results
 
+    def _generate_rule_signal(
+        self,
+        rule_id: str,
+        rule: Dict[str, Any],
+        result: Dict[str, Any]
+    ) -> Optional[TradingSignal]:
+        """Build a rule's signal from one query result row (None if the row is unusable)."""
+        # Check if result is a dictionary
+        if not isinstance(result, dict):
+            logger.error(f"Result is not a dictionary: {result} (type: {type(result)})")
+            return None
+
+        if 'symbol' not in result:
+            logger.error(f"Result missing 'symbol' key: {result}")
+            return None
+
+        market_data = {
+            'close': result.get('price'),
+            'volume': result.get('volume'),
+            'timestamp': result.get('timestamp'),
+            'price_change_pct': result.get('price_change_pct', 0),
+            'volume_multiplier': result.get('volume_multiplier', 1),
+            'breakout_strength': result.get('breakout_strength', 0),
+            'price_at_0950': result.get('price_at_0950'),
+            'price_at_1515': result.get('price_at_1515'),
+            'daily_performance_pct': result.get('daily_performance_pct')
+        }
+
+        logger.debug(f"Creating signal for symbol: {result['symbol']}")
+        return self.signal_generator.generate_signal(
+            rule_id=rule_id,
+            symbol=result['symbol'],
+            signal_type=SignalType(rule['actions']['signal_type']),
+            confidence=self._calculate_confidence(result, rule),
+            market_data=market_data,
+            risk_management=rule['actions'].get('risk_management')
+        )
+
     def _execute_query(self, query: str, params: List[Any]) -> List[Dict[str, Any]]:
-        """Execute SQL query against database."""
+        """Execute SQL query against database.
+
+        Raises on query errors so a failed execution is reported (and never
+        cached) rather than looking like a rule with no matches.
+        """
         try:
             if self.db_connection is None:
                 logger.error("No database connection available")
@@ -419,12 +545,20 @@ class RuleEngine:
             logger.debug(f"Executing query: {query}")
             logger.debug(f"With params: {params}")
 
-            # Use the database connection to execute query
-            result = self.db_connection.execute(query, params)
+            # The connection runs one statement at a time; parallel rules queue here
+            with self._query_lock:
+                statements = self._statements_for(self.db_connection)
+                if statements is not None:
+                    result = statements.execute(query, params)
+                else:
+                    result = self.db_connection.execute(query, params)
+                rows = result.fetchall() if hasattr(result, 'fetchall') else None
+                description = getattr(result, 'description', None)
+                described_columns = ([column[0] for column in description]
+                                     if isinstance(description, (list, tuple)) else None)
 
             # Convert result to list of dictionaries
-            if hasattr(result, 'fetchall'):
-                rows = result.fetchall()
+            if rows is not None:
                 logger.debug(f"Query returned {len(rows)} rows")
 
                 if len(rows) > 0:
@@ -433,8 +567,8 @@ class RuleEngine:
                     logger.debug(f"First row: {rows[0]}")
                     logger.debug(f"Processing {len(rows)} rows with {len(rows[0])} columns each")
 
-                # DuckDB doesn't provide column names via .keys(), so we need to map by position
-                # For breakout queries, we know the expected column order
+                # Rows are tuples; use the cursor's column names when it has them,
+                # otherwise map by position using the known query layouts
 
                 # Convert rows to dictionaries with proper column mapping
                 results_list = []
@@ -442,7 +576,9 @@ class RuleEngine:
                     row_dict = {}
 
                     # Map columns based on query type (determined by row length)
-                    if len(row) == 11:  # breakout query with daily prices (updated)
+                    if described_columns and len(described_columns) == len(row):
+                        column_names = described_columns
+                    elif len(row) == 11:  # breakout query with daily prices (updated)
                         column_names = ['symbol', 'timestamp', 'price', 'volume',
                                       'price_change_pct', 'volume_multiplier',
                                       'breakout_strength', 'price_at_0950',
@@ -482,7 +618,17 @@ class RuleEngine:
             logger.error(f"Failed to execute query: {e}")
             logger.error(f"Query: {query}")
             logger.error(f"Params: {params}")
-            return []
+            raise
+
+    def _statements_for(self, conn) -> Optional[PreparedStatementCache]:
+        """Prepared-statement cache for a DuckDB connection (None for other drivers)."""
+        if not isinstance(conn, DuckDBPyConnection):
+            return None
+        cache = self._statement_caches.get(id(conn))
+        if cache is None or cache.conn is not conn:
+            cache = PreparedStatementCache(conn)
+            self._statement_caches[id(conn)] = cache
+        return cache
 
     def _calculate_confidence(self, result: Dict[str, Any], rule: Dict[str, Any]) -> float:
         """Calculate signal confidence based on rule and result data."""
@@ -572,12 +718,18 @@ class RuleEngine:
             'total_signals_generated': total_signals,
             'overall_success_rate': success_rate,
             'active_rules': len([r for r in self.rules.values() if r.get('enabled', True)]),
-            'query_cache_stats': self.query_builder.get_cache_stats()
+            'query_cache_stats': self.query_builder.get_cache_stats(),
+            'result_cache_stats': vars(self.result_cache.get_stats()),
+            'prepared_statements': sum(len(cache) for cache in self._statement_caches.values())
         }
 
     def clear_cache(self):
         """Clear all caches."""
         self.query_builder.clear_cache()
+        self.result_cache.clear()
+        for cache in self._statement_caches.values():
+            cache.clear()
+        self._statement_caches.clear()
         logger.info("Rule engine caches cleared")
 
     def shutdown(self):
@@ -8,7 +8,7 @@ This module generates trading signals from rule execution results including:
 - Performance tracking
 """
 
-from typing import Dict, List, Any, Optional, Union
+from typing import Callable, Dict, List, Any, Optional, Union
 from dataclasses import dataclass, field
 from datetime import datetime, date, time
 from decimal import Decimal
@@ -307,6 +307,42 @@ class SignalGenerator:
         logger.info(f"Generated signal batch with {len(batch.signals)} signals")
         return batch
 
+    def fan_out_fused_results(
+        self,
+        results: List[Dict[str, Any]],
+        rule_columns: Dict[str, str],
+        make_signal: Callable[[str, Dict[str, Any]], Optional[TradingSignal]]
+    ) -> Dict[str, SignalBatch]:
+        """
+        Split the rows of a fused multi-rule query into one batch per rule.
+
+        Args:
+            results: Rows of the fused query, one boolean match column per rule
+            rule_columns: Rule ID -> name of its match column
+            make_signal: Builds a rule's signal from a matching row (None skips it)
+
+        Returns:
+            SignalBatch per rule ID; ``metadata['query_results']`` counts the
+            rows the rule matched
+        """
+        batches = {
+            rule_id: SignalBatch(metadata={'rule_id': rule_id, 'query_results': 0, 'fused_rules': len(rule_columns)})
+            for rule_id in rule_columns
+        }
+
+        for result in results:
+            for rule_id, column in rule_columns.items():
+                if not result.get(column):
+                    continue
+                batch = batches[rule_id]
+                batch.metadata['query_results'] += 1
+                signal = make_signal(rule_id, result)
+                if signal is not None:
+                    batch.add_signal(signal)
+
+        logger.info(f"Fanned {len(results)} fused rows out to {len(batches)} rule batches")
+        return batches
+
     def filter_signals(
         self,
         signals: List[TradingSignal],
@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""
+Metrics Store - Pre-aggregated Rollups for Performance Monitoring
+
+Rule executions and system samples used to be written to SQLite one row per
+event and every report re-scanned the raw rows. This module keeps the hot
+path to an append and stores only aggregates:
+
+- Recording appends a tuple to a ring buffer owned by the calling thread, so
+  producers never contend on a lock or touch the database.
+- ``flush()`` drains every buffer and folds the events into per-minute,
+  per-hour and per-day rollups in DuckDB with one ``INSERT ... ON CONFLICT``
+  per table. Execution times are kept as fixed-bucket histograms, so
+  percentiles survive aggregation.
+- ``apply_retention()`` downsamples by age: minute rows are dropped first,
+  then hour rows, leaving the coarser rollups for long-range trends.
+
+Rollups can be exported to Parquet for offline analysis.
+"""
+
+import bisect
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import duckdb
+import pandas as pd
+import pyarrow as pa
+
+#: Upper bounds (seconds) of the execution-time histogram buckets; the last bucket is open-ended
+HISTOGRAM_BOUNDS: Tuple[float, ...] = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+HISTOGRAM_COLUMNS: Tuple[str, ...] = tuple(f"h{i:02d}" for i in range(len(HISTOGRAM_BOUNDS) + 1))
+
+#: Rollup resolutions, finest first
+RESOLUTIONS: Tuple[str, ...] = ("minute", "hour", "day")
+
+_RULE_EVENT_SCHEMA = pa.schema([
+    ("ts", pa.timestamp("us")),
+    ("rule_id", pa.string()),
+    ("execution_time", pa.float64()),
+    ("success", pa.bool_()),
+    ("signals", pa.int64()),
+    ("bucket", pa.int8()),
+])
+
+_SYSTEM_EVENT_SCHEMA = pa.schema([
+    ("ts", pa.timestamp("us")),
+    ("cpu_percent", pa.float64()),
+    ("memory_percent", pa.float64()),
+    ("memory_used_mb", pa.float64()),
+    ("disk_usage_percent", pa.float64()),
+    ("network_connections", pa.int64()),
+    ("active_threads", pa.int64()),
+])
+
+
+def histogram_bucket(execution_time: float) -> int:
+    """Index of the histogram bucket an execution time falls into."""
+    return bisect.bisect_left(HISTOGRAM_BOUNDS, execution_time)
+
+
+def histogram_percentile(counts: List[int], q: float) -> float:
+    """
+    Approximate the ``q`` quantile (0-1) from histogram bucket counts.
+
+    Returns the upper bound of the bucket holding the quantile; values in the
+    open-ended last bucket report the largest finite bound.
+    """
+    total = sum(counts)
+    if total == 0:
+        return 0.0
+    rank = q * total
+    seen = 0
+    for i, count in enumerate(counts):
+        seen += count
+        if seen >= rank and count:
+            return HISTOGRAM_BOUNDS[min(i, len(HISTOGRAM_BOUNDS) - 1)]
+    return HISTOGRAM_BOUNDS[-1]
+
+
+@dataclass
+class RetentionPolicy:
+    """How long each rollup resolution is kept, in days (None keeps forever)."""
+    minute_days: Optional[int] = 2
+    hour_days: Optional[int] = 30
+    day_days: Optional[int] = 730
+
+    def days(self, resolution: str) -> Optional[int]:
+        return getattr(self, f"{resolution}_days")
+
+
+class _ThreadBuffer:
+    """Fixed-size ring of pending events, appended to by a single thread."""
+
+    __slots__ = ("thread", "events", "dropped")
+
+    def __init__(self, thread: threading.Thread, capacity: int):
+        self.thread = thread
+        # deque append/popleft are atomic, so the owner and the flusher never lock
+        self.events: Deque[Tuple] = deque(maxlen=capacity)
+        self.dropped = 0
+
+    def append(self, event: Tuple) -> None:
+        if len(self.events) == self.events.maxlen:
+            self.dropped += 1
+        self.events.append(event)
+
+    def drain(self) -> List[Tuple]:
+        drained = []
+        events = self.events
+        try:
+            for _ in range(len(events)):
+                drained.append(events.popleft())
+        except IndexError:
+            pass
+        return drained
+
+
+class MetricsStore:
+    """Per-thread event buffers flushed into DuckDB rollup tables."""
+
+    def __init__(self, path: str = "performance_metrics.duckdb",
+                 retention: Optional[RetentionPolicy] = None,
+                 buffer_capacity: int = 10000):
+        """
+        Open (or create) the rollup database.
+
+        Args:
+            path: DuckDB database file, or ``:memory:``
+            retention: Per-resolution retention; defaults to ``RetentionPolicy()``
+            buffer_capacity: Events each thread can buffer before the oldest are dropped
+        """
+        self.path = path
+        self.retention = retention or RetentionPolicy()
+        self.buffer_capacity = buffer_capacity
+        self.logger = logging.getLogger(__name__)
+
+        self._local = threading.local()
+        self._buffers: List[Tuple[str, _ThreadBuffer]] = []
+        self._buffers_lock = threading.Lock()
+        self._db_lock = threading.RLock()
+        self.flushed_events = 0
+
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = duckdb.connect(path)
+        self._setup_tables()
+
+    def _setup_tables(self):
+        histogram = ",\n".join(f"{column} UBIGINT NOT NULL DEFAULT 0" for column in HISTOGRAM_COLUMNS)
+        self.conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS rule_rollups (
+                resolution VARCHAR NOT NULL,
+                bucket_start TIMESTAMP NOT NULL,
+                rule_id VARCHAR NOT NULL,
+                executions UBIGINT NOT NULL,
+                successes UBIGINT NOT NULL,
+                signals UBIGINT NOT NULL,
+                total_time DOUBLE NOT NULL,
+                min_time DOUBLE,
+                max_time DOUBLE,
+                {histogram},
+                PRIMARY KEY (resolution, bucket_start, rule_id)
+            )
+        ''')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS system_rollups (
+                resolution VARCHAR NOT NULL,
+                bucket_start TIMESTAMP NOT NULL,
+                samples UBIGINT NOT NULL,
+                cpu_sum DOUBLE NOT NULL,
+                cpu_max DOUBLE,
+                memory_sum DOUBLE NOT NULL,
+                memory_max DOUBLE,
+                memory_used_max_mb DOUBLE,
+                disk_sum DOUBLE NOT NULL,
+                network_sum DOUBLE NOT NULL,
+                threads_sum DOUBLE NOT NULL,
+                PRIMARY KEY (resolution, bucket_start)
+            )
+        ''')
+
+    # ------------------------------------------------------------------
+    # Recording (hot path)
+    # ------------------------------------------------------------------
+
+    def _buffer(self, kind: str) -> _ThreadBuffer:
+        buffer = getattr(self._local, kind, None)
+        if buffer is None:
+            buffer = _ThreadBuffer(threading.current_thread(), self.buffer_capacity)
+            setattr(self._local, kind, buffer)
+            with self._buffers_lock:
+                self._buffers.append((kind, buffer))
+        return buffer
+
+    def record_rule(self, rule_id: str, execution_time: float, success: bool,
+                    signals_generated: int = 0, timestamp: Optional[datetime] = None) -> None:
+        """Buffer one rule execution."""
+        self._buffer("rule").append((
+            timestamp or datetime.now(), rule_id, float(execution_time), bool(success),
+            int(signals_generated or 0), histogram_bucket(execution_time),
+        ))
+
+    def record_system(self, cpu_percent: float, memory_percent: float, memory_used_mb: float,
+                      disk_usage_percent: float, network_connections: int, active_threads: int,
+                      timestamp: Optional[datetime] = None) -> None:
+        """Buffer one system health sample."""
+        self._buffer("system").append((
+            timestamp or datetime.now(), cpu_percent, memory_percent, memory_used_mb,
+            disk_usage_percent, network_connections, active_threads,
+        ))
+
+    @property
+    def pending_events(self) -> int:
+        with self._buffers_lock:
+            return sum(len(buffer.events) for _, buffer in self._buffers)
+
+    @property
+    def dropped_events(self) -> int:
+        with self._buffers_lock:
+            return sum(buffer.dropped for _, buffer in self._buffers)
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+
+    def _drain(self) -> Tuple[List[Tuple], List[Tuple]]:
+        rules: List[Tuple] = []
+        systems: List[Tuple] = []
+        with self._buffers_lock:
+            buffers = list(self._buffers)
+        for kind, buffer in buffers:
+            (rules if kind == "rule" else systems).extend(buffer.drain())
+        with self._buffers_lock:
+            # Forget buffers of threads that have exited once they are empty
+            self._buffers = [(kind, buffer) for kind, buffer in self._buffers
+                             if buffer.thread.is_alive() or buffer.events]
+        return rules, systems
+
+    def flush(self) -> int:
+        """
+        Fold all buffered events into the rollup tables.
+
+        Returns the number of events written.
+        """
+        rules, systems = self._drain()
+        if not rules and not systems:
+            return 0
+        with self._db_lock:
+            if rules:
+                self._merge_rules(pa.Table.from_pylist(
+                    [dict(zip(_RULE_EVENT_SCHEMA.names, event)) for event in rules], schema=_RULE_EVENT_SCHEMA))
+            if systems:
+                self._merge_systems(pa.Table.from_pylist(
+                    [dict(zip(_SYSTEM_EVENT_SCHEMA.names, event)) for event in systems],
+                    schema=_SYSTEM_EVENT_SCHEMA))
+        self.flushed_events += len(rules) + len(systems)
+        return len(rules) + len(systems)
+
+    @staticmethod
+    def _by_resolution(select: str) -> str:
+        return "\nUNION ALL\n".join(select.format(resolution=resolution) for resolution in RESOLUTIONS)
+
+    def _merge_rules(self, events: pa.Table):
+        histogram = ", ".join(f"count_if(bucket = {i}) AS {column}" for i, column in enumerate(HISTOGRAM_COLUMNS))
+        select = f'''
+            SELECT '{{resolution}}', date_trunc('{{resolution}}', ts), rule_id,
+                   count(*), count_if(success), sum(signals), sum(execution_time),
+                   min(execution_time), max(execution_time), {histogram}
+            FROM rule_events GROUP BY ALL
+        '''
+        updates = ", ".join(f"{column} = {column} + EXCLUDED.{column}" for column in HISTOGRAM_COLUMNS)
+        self.conn.register("rule_events", events)
+        try:
+            self.conn.execute(f'''
+                INSERT INTO rule_rollups {self._by_resolution(select)}
+                ON CONFLICT DO UPDATE SET
+                    executions = executions + EXCLUDED.executions,
+                    successes = successes + EXCLUDED.successes,
+                    signals = signals + EXCLUDED.signals,
+                    total_time = total_time + EXCLUDED.total_time,
+                    min_time = least(min_time, EXCLUDED.min_time),
+                    max_time = greatest(max_time, EXCLUDED.max_time),
+                    {updates}
+            ''')
+        finally:
+            self.conn.unregister("rule_events")
+
+    def _merge_systems(self, events: pa.Table):
+        select = '''
+            SELECT '{resolution}', date_trunc('{resolution}', ts), count(*),
+                   sum(cpu_percent), max(cpu_percent), sum(memory_percent), max(memory_percent),
+                   max(memory_used_mb), sum(disk_usage_percent), sum(network_connections), sum(active_threads)
+            FROM system_events GROUP BY ALL
+        '''
+        self.conn.register("system_events", events)
+        try:
+            self.conn.execute(f'''
+                INSERT INTO system_rollups {self._by_resolution(select)}
+                ON CONFLICT DO UPDATE SET
+                    samples = samples + EXCLUDED.samples,
+                    cpu_sum = cpu_sum + EXCLUDED.cpu_sum,
+                    cpu_max = greatest(cpu_max, EXCLUDED.cpu_max),
+                    memory_sum = memory_sum + EXCLUDED.memory_sum,
+                    memory_max = greatest(memory_max, EXCLUDED.memory_max),
+                    memory_used_max_mb = greatest(memory_used_max_mb, EXCLUDED.memory_used_max_mb),
+                    disk_sum = disk_sum + EXCLUDED.disk_sum,
+                    network_sum = network_sum + EXCLUDED.network_sum,
+                    threads_sum = threads_sum + EXCLUDED.threads_sum
+            ''')
+        finally:
+            self.conn.unregister("system_events")
+
+    # ------------------------------------------------------------------
+    # Retention
+    # ------------------------------------------------------------------
+
+    def apply_retention(self, now: Optional[datetime] = None) -> int:
+        """
+        Drop rollup rows older than their resolution's retention.
+
+        Coarser resolutions were written alongside the fine ones, so dropping
+        minute rows leaves the same totals available per hour and per day.
+        Returns the number of rows removed.
+        """
+        now = now or datetime.now()
+        removed = 0
+        with self._db_lock:
+            for resolution in RESOLUTIONS:
+                days = self.retention.days(resolution)
+                if days is None:
+                    continue
+                cutoff = now - timedelta(days=days)
+                for table in ("rule_rollups", "system_rollups"):
+                    removed += self.conn.execute(
+                        f"DELETE FROM {table} WHERE resolution = ? AND bucket_start < ?",
+                        [resolution, cutoff]).fetchone()[0]
+        return removed
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def resolution_for(self, since: datetime, now: Optional[datetime] = None) -> str:
+        """Finest resolution whose retention still covers ``since``."""
+        now = now or datetime.now()
+        for resolution in RESOLUTIONS:
+            days = self.retention.days(resolution)
+            if days is None or since >= now - timedelta(days=days):
+                return resolution
+        return RESOLUTIONS[-1]
+
+    def _query(self, sql: str, params: List[Any]) -> pd.DataFrame:
+        with self._db_lock:
+            return self.conn.execute(sql, params).df()
+
+    def rule_ids(self, since: datetime) -> List[str]:
+        """Rules with executions since ``since``."""
+        df = self._query('''
+            SELECT DISTINCT rule_id FROM rule_rollups
+            WHERE resolution = ? AND bucket_start >= date_trunc(?, CAST(? AS TIMESTAMP))
+            ORDER BY rule_id
+        ''', [self.resolution_for(since), self.resolution_for(since), since])
+        return df['rule_id'].tolist()
+
+    def rule_summary(self, rule_id: str, since: datetime) -> Dict[str, Any]:
+        """Totals and latency percentiles for one rule since ``since``."""
+        resolution = self.resolution_for(since)
+        histogram = ", ".join(f"sum({column})" for column in HISTOGRAM_COLUMNS)
+        with self._db_lock:
+            row = self.conn.execute(f'''
+                SELECT sum(executions), sum(successes), sum(signals), sum(total_time),
+                       min(min_time), max(max_time), {histogram}
+                FROM rule_rollups
+                WHERE resolution = ? AND rule_id = ? AND bucket_start >= date_trunc(?, CAST(? AS TIMESTAMP))
+            ''', [resolution, rule_id, resolution, since]).fetchone()
+        executions = int(row[0] or 0)
+        counts = [int(c or 0) for c in row[6:]]
+        min_time, max_time = float(row[4] or 0.0), float(row[5] or 0.0)
+
+        def percentile(q: float) -> float:
+            # Bucket bounds can lie outside the observed range; never report beyond it
+            return min(max(histogram_percentile(counts, q), min_time), max_time)
+
+        return {
+            'executions': executions,
+            'successes': int(row[1] or 0),
+            'signals': int(row[2] or 0),
+            'total_time': float(row[3] or 0.0),
+            'min_time': min_time,
+            'max_time': max_time,
+            'p50_time': percentile(0.5),
+            'p95_time': percentile(0.95),
+            'histogram': counts,
+            'resolution': resolution,
+        }
+
+    def rule_series(self, rule_id: str, since: datetime, resolution: Optional[str] = None) -> pd.DataFrame:
+        """Per-bucket executions, success rate and mean execution time of one rule."""
+        resolution = resolution or self.resolution_for(since)
+        return self._query('''
+            SELECT bucket_start, executions,
+                   successes / executions AS success_rate,
+                   total_time / executions AS avg_execution_time,
+                   max_time
+            FROM rule_rollups
+            WHERE resolution = ? AND rule_id = ? AND bucket_start >= date_trunc(?, CAST(? AS TIMESTAMP))
+            ORDER BY bucket_start
+        ''', [resolution, rule_id, resolution, since])
+
+    def rule_totals(self, since: datetime) -> Dict[str, Any]:
+        """Execution totals across all rules since ``since``."""
+        resolution = self.resolution_for(since)
+        with self._db_lock:
+            row = self.conn.execute('''
+                SELECT count(DISTINCT rule_id), sum(executions), sum(successes), sum(total_time)
+                FROM rule_rollups
+                WHERE resolution = ? AND bucket_start >= date_trunc(?, CAST(? AS TIMESTAMP))
+            ''', [resolution, resolution, since]).fetchone()
+        executions = int(row[1] or 0)
+        return {
+            'unique_rules': int(row[0] or 0),
+            'total_executions': executions,
+            'avg_execution_time': float(row[3]) / executions if executions else 0.0,
+            'overall_success_rate': float(row[2]) * 100.0 / executions if executions else 0.0,
+        }
+
+    def system_series(self, since: datetime, resolution: Optional[str] = None) -> pd.DataFrame:
+        """Per-bucket system averages and peaks."""
+        resolution = resolution or self.resolution_for(since)
+        return self._query('''
+            SELECT bucket_start, samples,
+                   cpu_sum / samples AS avg_cpu_percent, cpu_max,
+                   memory_sum / samples AS avg_memory_percent, memory_max, memory_used_max_mb
+            FROM system_rollups
+            WHERE resolution = ? AND bucket_start >= date_trunc(?, CAST(? AS TIMESTAMP))
+            ORDER BY bucket_start
+        ''', [resolution, resolution, since])
+
+    def system_summary(self, since: datetime) -> Dict[str, Any]:
+        """System averages and peaks since ``since``."""
+        resolution = self.resolution_for(since)
+        with self._db_lock:
+            row = self.conn.execute('''
+                SELECT sum(samples), sum(cpu_sum), max(cpu_max), sum(memory_sum), max(memory_max),
+                       max(memory_used_max_mb), sum(disk_sum), sum(network_sum), sum(threads_sum)
+                FROM system_rollups
+                WHERE resolution = ? AND bucket_start >= date_trunc(?, CAST(? AS TIMESTAMP))
+            ''', [resolution, resolution, since]).fetchone()
+        samples = int(row[0] or 0)
+
+        def avg(value):
+            return float(value) / samples if samples else 0.0
+
+        return {
+            'samples': samples,
+            'avg_cpu_percent': avg(row[1]),
+            'max_cpu_percent': float(row[2] or 0.0),
+            'avg_memory_percent': avg(row[3]),
+            'max_memory_percent': float(row[4] or 0.0),
+            'peak_memory_mb': float(row[5] or 0.0),
+            'avg_disk_usage': avg(row[6]),
+            'avg_network_connections': avg(row[7]),
+            'avg_active_threads': avg(row[8]),
+        }
+
+    # ------------------------------------------------------------------
+    # Export / lifecycle
+    # ------------------------------------------------------------------
+
+    def export_parquet(self, directory: str) -> List[str]:
+        """Write both rollup tables to Parquet files in ``directory``."""
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        paths = []
+        with self._db_lock:
+            for table in ("rule_rollups", "system_rollups"):
+                path = str(Path(directory) / f"{table}.parquet")
+                self.conn.execute(
+                    f"COPY (SELECT * FROM {table} ORDER BY resolution, bucket_start) TO '{path}' (FORMAT PARQUET)")
+                paths.append(path)
+        return paths
+
+    def close(self):
+        """Flush pending events and close the database."""
+        try:
+            self.flush()
+        finally:
+            with self._db_lock:
+                self.conn.close()
@@ -4,6 +4,9 @@ Performance Analytics - Advanced Performance Analysis and Reporting
 
 This module provides sophisticated analytics for performance data including
 trend analysis, predictive insights, comparative analysis, and automated reporting.
+
+Trends are computed from the minute/hour/day rollups kept by ``MetricsStore``
+rather than from raw events.
 """
 
 import json
@@ -15,7 +18,9 @@ from dataclasses import dataclass
 import statistics
 import logging
 from pathlib import Path
-import sqlite3
+
+from .metrics_store import MetricsStore
+from .performance_monitor import metrics_store_path
 
 
 @dataclass
@@ -43,8 +48,9 @@ class PerformanceInsight:
 class PerformanceAnalytics:
     """Advanced performance analytics engine."""
 
-    def __init__(self, db_path: str = "performance.db"):
+    def __init__(self, db_path: str = "performance.db", metrics_store: Optional[MetricsStore] = None):
         self.db_path = Path(db_path)
+        self.metrics_store = metrics_store or MetricsStore(str(metrics_store_path(db_path)))
         self.logger = logging.getLogger(__name__)
 
     def analyze_performance_trends(self, days: int = 30) -> Dict[str, List[PerformanceTrend]]:
@@ -52,12 +58,11 @@ class PerformanceAnalytics:
         try:
             cutoff_date = datetime.now() - timedelta(days=days)
 
-            with sqlite3.connect(self.db_path) as conn:
-                # Analyze system metrics trends
-                system_trends = self._analyze_system_trends(conn, cutoff_date)
+            # Analyze system metrics trends
+            system_trends = self._analyze_system_trends(cutoff_date)
 
-                # Analyze rule performance trends
-                rule_trends = self._analyze_rule_trends(conn, cutoff_date)
+            # Analyze rule performance trends
+            rule_trends = self._analyze_rule_trends(cutoff_date)
 
             return {
                 'system_trends': system_trends,
@@ -70,108 +75,55 @@ class PerformanceAnalytics:
             self.logger.error(f"Failed to analyze performance trends: {e}")
             return {}
 
-    def _analyze_system_trends(self, conn: sqlite3.Connection, cutoff_date: datetime) -> List[PerformanceTrend]:
+    def _analyze_system_trends(self, cutoff_date: datetime) -> List[PerformanceTrend]:
         """Analyze system metrics trends."""
         trends = []
 
         try:
-            # CPU usage trend
-            cpu_data = pd.read_sql_query('''
-                SELECT timestamp, cpu_percent
-                FROM system_metrics
-                WHERE timestamp > ?
-                ORDER BY timestamp ASC
-            ''', conn, params=(cutoff_date.isoformat(),))
-
-            if not cpu_data.empty and len(cpu_data) > 10:
-                cpu_trend = self._calculate_trend(cpu_data['cpu_percent'].values)
-                trends.append(PerformanceTrend(
-                    metric_name='CPU Usage',
-                    trend_direction=cpu_trend['direction'],
-                    trend_strength=cpu_trend['strength'],
-                    change_percentage=cpu_trend['change_percent'],
-                    time_period=f"{len(cpu_data)} data points",
-                    confidence_level=cpu_trend['confidence']
-                ))
+            resolution = self.metrics_store.resolution_for(cutoff_date)
+            system_data = self.metrics_store.system_series(cutoff_date, resolution)
 
-            # Memory usage trend
-            memory_data = pd.read_sql_query('''
-                SELECT timestamp, memory_percent
-                FROM system_metrics
-                WHERE timestamp > ?
-                ORDER BY timestamp ASC
-            ''', conn, params=(cutoff_date.isoformat(),))
-
-            if not memory_data.empty and len(memory_data) > 10:
-                memory_trend = self._calculate_trend(memory_data['memory_percent'].values)
-                trends.append(PerformanceTrend(
-                    metric_name='Memory Usage',
-                    trend_direction=memory_trend['direction'],
-                    trend_strength=memory_trend['strength'],
-                    change_percentage=memory_trend['change_percent'],
-                    time_period=f"{len(memory_data)} data points",
-                    confidence_level=memory_trend['confidence']
-                ))
+            if len(system_data) >= 5:
+                for metric_name, column in (('CPU Usage', 'avg_cpu_percent'),
+                                            ('Memory Usage', 'avg_memory_percent')):
+                    trend = self._calculate_trend(system_data[column].values)
+                    trends.append(PerformanceTrend(
+                        metric_name=metric_name,
+                        trend_direction=trend['direction'],
+                        trend_strength=trend['strength'],
+                        change_percentage=trend['change_percent'],
+                        time_period=f"{len(system_data)} {resolution} buckets",
+                        confidence_level=trend['confidence']
+                    ))
 
         except Exception as e:
             self.logger.error(f"Failed to analyze system trends: {e}")
 
         return trends
 
-    def _analyze_rule_trends(self, conn: sqlite3.Connection, cutoff_date: datetime) -> List[PerformanceTrend]:
+    def _analyze_rule_trends(self, cutoff_date: datetime) -> List[PerformanceTrend]:
         """Analyze rule performance trends."""
         trends = []
 
         try:
-            # Get all rule IDs
-            rule_ids = pd.read_sql_query('''
-                SELECT DISTINCT rule_id
-                FROM rule_metrics
-                WHERE timestamp > ?
-            ''', conn, params=(cutoff_date.isoformat(),))['rule_id'].tolist()
-
-            for rule_id in rule_ids:
-                # Success rate trend
-                success_data = pd.read_sql_query('''
-                    SELECT timestamp, success
-                    FROM rule_metrics
-                    WHERE rule_id = ? AND timestamp > ?
-                    ORDER BY timestamp ASC
-                ''', conn, params=(rule_id, cutoff_date.isoformat(),))
-
-                if not success_data.empty and len(success_data) > 10:
-                    # Calculate rolling success rate
-                    success_data['success_rate'] = success_data['success'].rolling(window=10).mean()
-                    success_rates = success_data['success_rate'].dropna().values
-
-                    if len(success_rates) > 5:
-                        success_trend = self._calculate_trend(success_rates)
-                        trends.append(PerformanceTrend(
-                            metric_name=f'{rule_id} Success Rate',
-                            trend_direction=success_trend['direction'],
-                            trend_strength=success_trend['strength'],
-                            change_percentage=success_trend['change_percent'],
-                            time_period=f"{len(success_data)} executions",
-                            confidence_level=success_trend['confidence']
-                        ))
+            resolution = self.metrics_store.resolution_for(cutoff_date)
 
-                # Execution time trend
-                time_data = pd.read_sql_query('''
-                    SELECT timestamp, execution_time
-                    FROM rule_metrics
-                    WHERE rule_id = ? AND timestamp > ?
-                    ORDER BY timestamp ASC
-                ''', conn, params=(rule_id, cutoff_date.isoformat(),))
+            for rule_id in self.metrics_store.rule_ids(cutoff_date):
+                rule_data = self.metrics_store.rule_series(rule_id, cutoff_date, resolution)
+                if len(rule_data) < 5:
+                    continue
 
-                if not time_data.empty and len(time_data) > 10:
-                    time_trend = self._calculate_trend(time_data['execution_time'].values)
+                executions = int(rule_data['executions'].sum())
+                for metric_name, column in (('Success Rate', 'success_rate'),
+                                            ('Execution Time', 'avg_execution_time')):
+                    trend = self._calculate_trend(rule_data[column].values)
                     trends.append(PerformanceTrend(
-                        metric_name=f'{rule_id} Execution Time',
-                        trend_direction=time_trend['direction'],
-                        trend_strength=time_trend['strength'],
-                        change_percentage=time_trend['change_percent'],
-                        time_period=f"{len(time_data)} executions",
-                        confidence_level=time_trend['confidence']
+                        metric_name=f'{rule_id} {metric_name}',
+                        trend_direction=trend['direction'],
+                        trend_strength=trend['strength'],
+                        change_percentage=trend['change_percent'],
+                        time_period=f"{executions} executions in {len(rule_data)} {resolution} buckets",
+                        confidence_level=trend['confidence']
                     ))
 
         except Exception as e:
@@ -425,35 +377,20 @@ class PerformanceAnalytics:
     def _calculate_summary_statistics(self, days: int) -> Dict[str, Any]:
         """Calculate summary statistics for the analysis period."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                # Overall system statistics
-                system_stats = pd.read_sql_query('''
-                    SELECT
-                        AVG(cpu_percent) as avg_cpu,
-                        MAX(cpu_percent) as max_cpu,
-                        AVG(memory_percent) as avg_memory,
-                        MAX(memory_percent) as max_memory,
-                        COUNT(*) as data_points
-                    FROM system_metrics
-                    WHERE timestamp > ?
-                ''', conn, params=((datetime.now() - timedelta(days=days)).isoformat(),))
-
-                # Rule performance statistics
-                rule_stats = pd.read_sql_query('''
-                    SELECT
-                        COUNT(DISTINCT rule_id) as unique_rules,
-                        COUNT(*) as total_executions,
-                        AVG(execution_time) as avg_execution_time,
-                        SUM(CASE WHEN success THEN 1 ELSE 0 END) * 100.0 / COUNT(*) as overall_success_rate
-                    FROM rule_metrics
-                    WHERE timestamp > ?
-                ''', conn, params=((datetime.now() - timedelta(days=days)).isoformat(),))
+            cutoff_date = datetime.now() - timedelta(days=days)
+            system = self.metrics_store.system_summary(cutoff_date)
 
-                return {
-                    'system_stats': system_stats.to_dict('records')[0] if not system_stats.empty else {},
-                    'rule_stats': rule_stats.to_dict('records')[0] if not rule_stats.empty else {},
-                    'analysis_period_days': days
-                }
+            return {
+                'system_stats': {
+                    'avg_cpu': system['avg_cpu_percent'],
+                    'max_cpu': system['max_cpu_percent'],
+                    'avg_memory': system['avg_memory_percent'],
+                    'max_memory': system['max_memory_percent'],
+                    'data_points': system['samples'],
+                },
+                'rule_stats': self.metrics_store.rule_totals(cutoff_date),
+                'analysis_period_days': days
+            }
 
         except Exception as e:
             self.logger.error(f"Failed to calculate summary statistics: {e}")
@@ -4,6 +4,9 @@ Performance Monitor - Comprehensive Performance Monitoring System
 
 This module provides enterprise-grade performance monitoring for the rule-based
 trading system, including real-time metrics, historical analysis, and alerting.
+
+Rule and system metrics are buffered per thread and stored as minute/hour/day
+rollups by ``MetricsStore``; only alerts are written to SQLite.
 """
 
 import time
@@ -18,6 +21,8 @@ from dataclasses import dataclass, field
 from pathlib import Path
 import sqlite3
 
+from .metrics_store import MetricsStore, RetentionPolicy
+
 
 @dataclass
 class PerformanceMetric:
@@ -54,18 +59,28 @@ class SystemHealthMetric:
     timestamp: datetime = field(default_factory=datetime.now)
 
 
+def metrics_store_path(db_path: str) -> Path:
+    """Rollup database kept next to the alerts database (``performance.db`` -> ``performance.duckdb``)."""
+    return Path(db_path).with_suffix('.duckdb')
+
+
 class PerformanceMonitor:
     """Main performance monitoring system."""
 
-    def __init__(self, db_path: str = "performance.db", retention_days: int = 30):
+    def __init__(self, db_path: str = "performance.db", retention_days: int = 30,
+                 metrics_store: Optional[MetricsStore] = None, flush_interval: float = 10.0):
         self.db_path = Path(db_path)
         self.retention_days = retention_days
+        self.flush_interval = flush_interval
         self._monitoring_active = False
         self._collection_thread = None
 
-        # In-memory metrics storage
-        self.metrics_buffer = deque(maxlen=10000)
-        self.rule_metrics = defaultdict(list)
+        # Rollup storage for rule and system metrics
+        self.metrics_store = metrics_store or MetricsStore(
+            str(metrics_store_path(db_path)), retention=RetentionPolicy(hour_days=retention_days))
+
+        # Recent in-memory metrics for alerting
+        self.rule_metrics = defaultdict(lambda: deque(maxlen=100))
         self.system_metrics = deque(maxlen=1000)
 
         # Alert thresholds
@@ -85,35 +100,8 @@ class PerformanceMonitor:
         self._setup_database()
 
     def _setup_database(self):
-        """Initialize the performance database."""
+        """Initialize the alerts database."""
         with sqlite3.connect(self.db_path) as conn:
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS rule_metrics (
-                    id INTEGER PRIMARY KEY,
-                    rule_id TEXT,
-                    execution_time REAL,
-                    success BOOLEAN,
-                    signals_generated INTEGER,
-                    error_message TEXT,
-                    timestamp TEXT,
-                    memory_usage REAL,
-                    cpu_usage REAL
-                )
-            ''')
-
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS system_metrics (
-                    id INTEGER PRIMARY KEY,
-                    cpu_percent REAL,
-                    memory_percent REAL,
-                    memory_used_mb REAL,
-                    disk_usage_percent REAL,
-                    network_connections INTEGER,
-                    active_threads INTEGER,
-                    timestamp TEXT
-                )
-            ''')
-
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS alerts (
                     id INTEGER PRIMARY KEY,
@@ -127,10 +115,7 @@ class PerformanceMonitor:
                 )
             ''')
 
-            # Create indexes for better query performance
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_rule_metrics_rule_id ON rule_metrics(rule_id)')
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_rule_metrics_timestamp ON rule_metrics(timestamp)')
-            conn.execute('CREATE INDEX IF NOT EXISTS idx_system_metrics_timestamp ON system_metrics(timestamp)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_alerts_timestamp ON alerts(timestamp)')
 
     def start_monitoring(self):
         """Start the performance monitoring system."""
@@ -155,18 +140,20 @@ class PerformanceMonitor:
 
     def _collection_loop(self):
         """Main monitoring collection loop."""
+        last_flush = time.monotonic()
         while self._monitoring_active:
             try:
                 # Collect system metrics
                 system_metric = self._collect_system_metrics()
-                self.system_metrics.append(system_metric)
+                self.record_system_metric(system_metric)
 
                 # Check for alerts
                 self._check_alerts()
 
-                # Flush metrics to database periodically
-                if len(self.metrics_buffer) >= 100:
+                # Flush metrics to the rollups periodically
+                if time.monotonic() - last_flush >= self.flush_interval:
                     self._flush_metrics_to_db()
+                    last_flush = time.monotonic()
 
                 time.sleep(1)  # Collect every second
 
@@ -195,71 +182,24 @@ class PerformanceMonitor:
         """Record a rule execution metric."""
         self.rule_metrics[metric.rule_id].append(metric)
 
-        # Keep only recent metrics (last 1000 per rule)
-        if len(self.rule_metrics[metric.rule_id]) > 1000:
-            self.rule_metrics[metric.rule_id] = self.rule_metrics[metric.rule_id][-1000:]
-
-        # Store in database
-        self._store_rule_metric(metric)
+        # Buffered in the calling thread; written to the rollups on flush
+        self.metrics_store.record_rule(metric.rule_id, metric.execution_time, metric.success,
+                                       metric.signals_generated, metric.timestamp)
 
         # Check for rule-specific alerts
         self._check_rule_alerts(metric)
 
-    def _store_rule_metric(self, metric: RuleExecutionMetric):
-        """Store rule metric in database."""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute('''
-                    INSERT INTO rule_metrics
-                    (rule_id, execution_time, success, signals_generated,
-                     error_message, timestamp, memory_usage, cpu_usage)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    metric.rule_id,
-                    metric.execution_time,
-                    metric.success,
-                    metric.signals_generated,
-                    metric.error_message,
-                    metric.timestamp.isoformat(),
-                    metric.memory_usage,
-                    metric.cpu_usage
-                ))
-        except Exception as e:
-            self.logger.error(f"Failed to store rule metric: {e}")
-
-    def _store_system_metric(self, metric: SystemHealthMetric):
-        """Store system metric in database."""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute('''
-                    INSERT INTO system_metrics
-                    (cpu_percent, memory_percent, memory_used_mb, disk_usage_percent,
-                     network_connections, active_threads, timestamp)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    metric.cpu_percent,
-                    metric.memory_percent,
-                    metric.memory_used_mb,
-                    metric.disk_usage_percent,
-                    metric.network_connections,
-                    metric.active_threads,
-                    metric.timestamp.isoformat()
-                ))
-        except Exception as e:
-            self.logger.error(f"Failed to store system metric: {e}")
+    def record_system_metric(self, metric: SystemHealthMetric):
+        """Record a system health sample."""
+        self.system_metrics.append(metric)
+        self.metrics_store.record_system(
+            metric.cpu_percent, metric.memory_percent, metric.memory_used_mb, metric.disk_usage_percent,
+            metric.network_connections, metric.active_threads, metric.timestamp)
 
     def _flush_metrics_to_db(self):
-        """Flush buffered metrics to database."""
+        """Fold buffered metrics into the rollup tables."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                # Store system metrics
-                for metric in self.system_metrics:
-                    self._store_system_metric(metric)
-
-                # Clear buffers
-                self.system_metrics.clear()
-                self.metrics_buffer.clear()
-
+            self.metrics_store.flush()
         except Exception as e:
             self.logger.error(f"Failed to flush metrics to database: {e}")
 
@@ -312,7 +252,7 @@ class PerformanceMonitor:
             })
 
         # Success rate alert
-        rule_metrics = self.rule_metrics[metric.rule_id][-100:]  # Last 100 executions
+        rule_metrics = self.rule_metrics[metric.rule_id]  # Last 100 executions
         if len(rule_metrics) >= 10:
             success_rate = sum(1 for m in rule_metrics if m.success) / len(rule_metrics)
             if success_rate < self.alert_thresholds['rule_success_rate']:
@@ -368,17 +308,11 @@ class PerformanceMonitor:
         try:
             cutoff_date = datetime.now() - timedelta(days=days)
 
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute('''
-                    SELECT execution_time, success, signals_generated
-                    FROM rule_metrics
-                    WHERE rule_id = ? AND timestamp > ?
-                    ORDER BY timestamp DESC
-                ''', (rule_id, cutoff_date.isoformat()))
-
-                metrics = cursor.fetchall()
+            self._flush_metrics_to_db()
+            rollup = self.metrics_store.rule_summary(rule_id, cutoff_date)
+            executions = rollup['executions']
 
-            if not metrics:
+            if not executions:
                 return {
                     'rule_id': rule_id,
                     'total_executions': 0,
@@ -388,17 +322,16 @@ class PerformanceMonitor:
                     'total_signals': 0
                 }
 
-            executions = len(metrics)
-            successful = sum(1 for m in metrics if m[1])  # success column
-            total_signals = sum(m[2] for m in metrics if m[2])  # signals_generated column
-            avg_execution_time = sum(m[0] for m in metrics) / executions
+            total_signals = rollup['signals']
 
             return {
                 'rule_id': rule_id,
                 'total_executions': executions,
-                'success_rate': successful / executions if executions > 0 else 0,
-                'avg_execution_time': avg_execution_time,
-                'avg_signals_per_execution': total_signals / executions if executions > 0 else 0,
+                'success_rate': rollup['successes'] / executions,
+                'avg_execution_time': rollup['total_time'] / executions,
+                'p95_execution_time': rollup['p95_time'],
+                'max_execution_time': rollup['max_time'],
+                'avg_signals_per_execution': total_signals / executions,
                 'total_signals': total_signals
             }
 
@@ -411,18 +344,10 @@ class PerformanceMonitor:
         try:
             cutoff_time = datetime.now() - timedelta(hours=hours)
 
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute('''
-                    SELECT cpu_percent, memory_percent, memory_used_mb,
-                           disk_usage_percent, network_connections, active_threads
-                    FROM system_metrics
-                    WHERE timestamp > ?
-                    ORDER BY timestamp DESC
-                ''', (cutoff_time.isoformat(),))
-
-                metrics = cursor.fetchall()
+            self._flush_metrics_to_db()
+            rollup = self.metrics_store.system_summary(cutoff_time)
 
-            if not metrics:
+            if not rollup['samples']:
                 return {
                     'avg_cpu_percent': 0.0,
                     'avg_memory_percent': 0.0,
@@ -433,21 +358,14 @@ class PerformanceMonitor:
                     'data_points': 0
                 }
 
-            cpu_avg = sum(m[0] for m in metrics) / len(metrics)
-            memory_avg = sum(m[1] for m in metrics) / len(metrics)
-            memory_peak = max(m[2] for m in metrics)
-            disk_avg = sum(m[3] for m in metrics) / len(metrics)
-            network_avg = sum(m[4] for m in metrics) / len(metrics)
-            threads_avg = sum(m[5] for m in metrics) / len(metrics)
-
             return {
-                'avg_cpu_percent': cpu_avg,
-                'avg_memory_percent': memory_avg,
-                'peak_memory_mb': memory_peak,
-                'avg_disk_usage': disk_avg,
-                'avg_network_connections': network_avg,
-                'avg_active_threads': threads_avg,
-                'data_points': len(metrics)
+                'avg_cpu_percent': rollup['avg_cpu_percent'],
+                'avg_memory_percent': rollup['avg_memory_percent'],
+                'peak_memory_mb': rollup['peak_memory_mb'],
+                'avg_disk_usage': rollup['avg_disk_usage'],
+                'avg_network_connections': rollup['avg_network_connections'],
+                'avg_active_threads': rollup['avg_active_threads'],
+                'data_points': rollup['samples']
             }
 
         except Exception as e:
@@ -486,23 +404,16 @@ class PerformanceMonitor:
     def cleanup_old_data(self):
         """Clean up old performance data based on retention policy."""
         try:
-            cutoff_date = datetime.now() - timedelta(days=self.retention_days)
+            # Downsample rollups: minute rows expire first, then hourly ones
+            deleted_count = self.metrics_store.apply_retention()
 
             with sqlite3.connect(self.db_path) as conn:
-                # Clean up old rule metrics
-                conn.execute('DELETE FROM rule_metrics WHERE timestamp < ?',
-                           (cutoff_date.isoformat(),))
-
-                # Clean up old system metrics
-                conn.execute('DELETE FROM system_metrics WHERE timestamp < ?',
-                           (cutoff_date.isoformat(),))
-
                 # Clean up old alerts (keep alerts for 90 days)
                 alert_cutoff = datetime.now() - timedelta(days=90)
                 conn.execute('DELETE FROM alerts WHERE timestamp < ?',
                            (alert_cutoff.isoformat(),))
 
-                deleted_count = conn.total_changes
+                deleted_count += conn.total_changes
                 conn.commit()
 
             self.logger.info(f"Cleaned up {deleted_count} old performance records")
@@ -523,14 +434,8 @@ class PerformanceMonitor:
             }
 
             # Get all unique rule IDs from recent metrics
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute('''
-                    SELECT DISTINCT rule_id
-                    FROM rule_metrics
-                    WHERE timestamp > ?
-                ''', ((datetime.now() - timedelta(days=days)).isoformat(),))
-
-                rule_ids = [row[0] for row in cursor.fetchall()]
+            self._flush_metrics_to_db()
+            rule_ids = self.metrics_store.rule_ids(datetime.now() - timedelta(days=days))
 
             # Get performance for each rule
             for rule_id in rule_ids:
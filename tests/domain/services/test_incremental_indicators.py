@@ -0,0 +1,139 @@
+"""Incremental indicator state and delta-file storage."""
+
+import json
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.domain.services.technical.calculator import TechnicalIndicatorsCalculator
+from src.domain.services.technical.incremental import (
+    DEFERRED_COLUMNS,
+    STATE_FORMAT_VERSION,
+    IncrementalIndicatorState,
+)
+from src.domain.services.technical.storage import TechnicalIndicatorsStorage
+from src.domain.services.technical.streaming import PivotPoints, RollingRank
+
+from .test_streaming_indicators import _bars
+
+SKIPPED = {"timestamp", "calculation_timestamp", "lookback_periods"}
+
+
+@pytest.fixture
+def bars():
+    return _bars(400)
+
+
+@pytest.fixture
+def full_day(bars):
+    calculator = TechnicalIndicatorsCalculator()
+    calculator.use_ta = calculator.use_talib = False
+    return calculator.calculate_all_indicators(bars, "TEST", "1T")
+
+
+def _assert_rows_match(actual, expected):
+    for column in actual.columns:
+        if column in SKIPPED:
+            continue
+        left, right = actual[column], expected[column].reset_index(drop=True)
+        if pd.api.types.is_float_dtype(left) or pd.api.types.is_float_dtype(right):
+            np.testing.assert_allclose(left.astype(float), right.astype(float),
+                                       rtol=1e-9, atol=1e-9, equal_nan=True, err_msg=column)
+        else:
+            assert left.tolist() == right.tolist(), column
+
+
+def _state(bars):
+    return IncrementalIndicatorState("TEST", "1T", bars["timestamp"].iloc[0].date())
+
+
+def test_chunked_updates_match_full_day(bars, full_day):
+    state = _state(bars)
+    chunks = [state.update(bars.iloc[a:b]) for a, b in [(0, 1), (1, 120), (120, 400)]]
+    streamed = pd.concat(chunks, ignore_index=True)
+
+    assert not set(full_day.columns) - set(streamed.columns) - set(DEFERRED_COLUMNS)
+    _assert_rows_match(streamed, full_day)
+    assert streamed["lookback_periods"].tolist() == list(range(1, 401))
+
+
+def test_state_round_trips_through_storage(bars, full_day, tmp_path):
+    storage = TechnicalIndicatorsStorage(tmp_path)
+    state = _state(bars)
+    state.update(bars.iloc[:200])
+    assert storage.save_state(state)
+
+    restored = storage.load_state("TEST", "1T")
+    tail = restored.update(restored.new_bars(bars))
+    assert len(tail) == 200
+    _assert_rows_match(tail, full_day.iloc[200:])
+
+    with pytest.raises(ValueError):
+        restored.update(bars.iloc[390:])
+    assert storage.load_state("OTHER", "1T") is None
+
+
+def test_rejected_state_is_logged_and_ignored(bars, tmp_path, caplog):
+    storage = TechnicalIndicatorsStorage(tmp_path)
+    state = _state(bars)
+    state.update(bars.iloc[:50])
+    assert storage.save_state(state)
+    path = storage.get_state_path("TEST", "1T")
+    data = json.loads(path.read_text())
+    assert data["format"] == STATE_FORMAT_VERSION
+
+    path.write_text(json.dumps({**data, "format": STATE_FORMAT_VERSION + 1}))
+    with caplog.at_level(logging.WARNING):
+        assert storage.load_state("TEST", "1T") is None
+    assert "Rejected stored indicator state" in caplog.text
+
+    del data["indicators"]["aroon"]
+    path.write_text(json.dumps(data))
+    assert storage.load_state("TEST", "1T") is None
+
+
+def test_append_load_and_compact(bars, tmp_path):
+    storage = TechnicalIndicatorsStorage(tmp_path)
+    day = bars["timestamp"].iloc[0].date()
+    state = _state(bars)
+    for a, b in [(0, 100), (100, 150), (150, 400)]:
+        assert storage.append_indicators(state.update(bars.iloc[a:b]), "TEST", "1T", day)
+
+    deltas = storage.get_delta_paths("TEST", "1T", day)
+    assert [p.name.split(".")[-2] for p in deltas] == ["delta-000001", "delta-000002"]
+    before = storage.load_indicators("TEST", "1T", day, day)
+    assert len(before) == 400 and before["timestamp"].is_monotonic_increasing
+
+    assert storage.compact_indicators("TEST", "1T", day)
+    assert storage.get_delta_paths("TEST", "1T", day) == []
+    after = storage.load_indicators("TEST", "1T", day, day)
+    pd.testing.assert_frame_equal(before, after)
+    assert storage.get_available_dates("TEST", "1T") == [day]
+
+
+def test_full_rewrite_supersedes_deltas(bars, full_day, tmp_path):
+    storage = TechnicalIndicatorsStorage(tmp_path)
+    day = bars["timestamp"].iloc[0].date()
+    state = _state(bars)
+    storage.append_indicators(state.update(bars.iloc[:10]), "TEST", "1T", day)
+    storage.append_indicators(state.update(bars.iloc[10:20]), "TEST", "1T", day)
+
+    assert storage.store_indicators(full_day, "TEST", "1T", day, overwrite=True)
+    assert storage.get_delta_paths("TEST", "1T", day) == []
+    assert len(storage.load_indicators("TEST", "1T", day, day)) == 400
+
+
+def test_daily_pivots_use_previous_bar(bars):
+    pivots = PivotPoints.for_timeframe("1D")
+    values = [pivots.update_bar(h, l, c) for h, l, c in zip(bars["high"], bars["low"], bars["close"])]
+    prev = bars.shift(1)
+    expected = (prev["high"] + prev["low"] + prev["close"]) / 3
+    np.testing.assert_allclose([v["pivot_point"] for v in values], expected, equal_nan=True)
+
+
+def test_rolling_rank_matches_pandas():
+    series = pd.Series([np.nan, 1, 2, 2, np.nan, 3, 1, 1, 5, 2, 2, 2, 0.5])
+    np.testing.assert_allclose(RollingRank(4, min_periods=1).update_batch(series),
+                               series.rolling(4, min_periods=1).rank(pct=True), equal_nan=True)
@@ -0,0 +1,215 @@
+"""Streaming indicator kernels must match the batch calculators bar for bar."""
+
+import json
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.domain.services.technical.calculator import TechnicalIndicatorsCalculator
+from src.domain.services.technical.streaming import (
+    ADX,
+    ATR,
+    EMA,
+    RSI,
+    Aroon,
+    RollingMax,
+    RollingMin,
+    RollingStd,
+    SMA,
+    SingleInputIndicator,
+    StreamingIndicator,
+    StreamingIndicators,
+)
+
+
+def _bars(n=260, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.5, n))
+    close[40:45] = close[39]  # flat stretch exercises zero-change bars
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2025-09-01 09:15", periods=n, freq="1min"),
+        "open": close + rng.normal(0, 0.1, n),
+        "high": close + np.abs(rng.normal(0.3, 0.1, n)),
+        "low": close - np.abs(rng.normal(0.3, 0.1, n)),
+        "close": close,
+        "volume": rng.integers(1000, 50000, n).astype(float),
+    })
+
+
+@pytest.fixture
+def bars():
+    return _bars()
+
+
+def _assert_column(actual, expected, name, atol=1e-9):
+    np.testing.assert_allclose(
+        np.asarray(actual, dtype=float), np.asarray(expected, dtype=float),
+        rtol=1e-9, atol=atol, equal_nan=True, err_msg=name,
+    )
+
+
+def test_matches_calculator_fallback(bars):
+    calculator = TechnicalIndicatorsCalculator()
+    calculator.use_ta = calculator.use_talib = False
+    expected = calculator.calculate_all_indicators(bars, "TEST", "1T")
+
+    streamed = StreamingIndicators.calculator_defaults().update_frame(bars)
+
+    for column in streamed.columns:
+        _assert_column(streamed[column], expected[column], column)
+
+
+def test_matches_two_phase_runner(bars):
+    from src.application.scanners.strategies.advanced_two_phase_runner import AdvancedTwoPhaseRunner
+
+    expected = AdvancedTwoPhaseRunner().calculate_advanced_indicators(bars.copy())
+    streamed = StreamingIndicators.two_phase_defaults().update_frame(bars)
+
+    for column in ["vwap", "obv", "atr", "adx", "di_plus", "di_minus", "volume_ma", "volume_ratio"]:
+        _assert_column(streamed[column], expected[column], column)
+
+
+def test_runner_live_indicators_track_session(bars):
+    from src.application.scanners.strategies.advanced_two_phase_runner import AdvancedTwoPhaseRunner
+
+    runner = AdvancedTwoPhaseRunner()
+    for row in bars.head(60).itertuples():
+        live = runner.update_live_indicators("TEST", row.high, row.low, row.close, row.volume)
+
+    expected = runner.calculate_advanced_indicators(bars.head(60).copy()).iloc[-1]
+    for column in ["vwap", "obv", "atr", "adx", "volume_ratio"]:
+        assert live[column] == pytest.approx(expected[column], rel=1e-9)
+
+
+@pytest.mark.parametrize("window", [1, 5, 20])
+def test_rolling_kernels_match_pandas(bars, window):
+    close = bars["close"].copy()
+    close.iloc[[10, 11, 70]] = np.nan
+
+    _assert_column(SMA(window).update_batch(close), close.rolling(window).mean(), "sma")
+    _assert_column(RollingMax(window).update_batch(close), close.rolling(window).max(), "max")
+    _assert_column(RollingMin(window).update_batch(close), close.rolling(window).min(), "min")
+    _assert_column(RollingMax(window, min_periods=1).update_batch(close),
+                   close.rolling(window, min_periods=1).max(), "max min_periods")
+    if window > 1:
+        # pandas' rolling variance leaves ~1e-7 residue on the flat stretch
+        _assert_column(RollingStd(window).update_batch(close), close.rolling(window).std(), "std", atol=1e-6)
+
+
+def test_ema_matches_pandas_ewm(bars):
+    for span in (3, 12, 50):
+        _assert_column(EMA(span).update_batch(bars["close"]), bars["close"].ewm(span=span).mean(), f"ema_{span}")
+
+
+def _wilder(values, period):
+    """Reference Wilder smoothing: SMA seed, then (prev * (n - 1) + x) / n."""
+    out = np.full(len(values), np.nan)
+    valid = np.flatnonzero(~np.isnan(values))
+    seed_end = valid[period - 1]
+    out[seed_end] = values[valid[:period]].mean()
+    for i in range(seed_end + 1, len(values)):
+        out[i] = (out[i - 1] * (period - 1) + values[i]) / period
+    return out
+
+
+def test_wilder_rsi_and_atr(bars):
+    close = bars["close"].to_numpy()
+    delta = np.diff(close)
+    gain = np.concatenate(([np.nan], np.where(delta > 0, delta, 0.0)))
+    loss = np.concatenate(([np.nan], np.where(delta < 0, -delta, 0.0)))
+    expected_rsi = 100 - 100 / (1 + _wilder(gain, 14) / _wilder(loss, 14))
+    _assert_column(RSI(14, smoothing="wilder").update_batch(close), expected_rsi, "wilder rsi")
+
+    prev_close = bars["close"].shift(1)
+    tr = np.maximum(bars["high"] - bars["low"],
+                    np.maximum((bars["high"] - prev_close).abs(), (bars["low"] - prev_close).abs()))
+    atr = ATR(14, smoothing="wilder")
+    streamed = [atr.update_bar(h, l, c) for h, l, c in zip(bars["high"], bars["low"], bars["close"])]
+    _assert_column(streamed, _wilder(tr.to_numpy(), 14), "wilder atr")
+
+
+def test_wilder_adx_is_bounded_and_warms_up(bars):
+    adx = ADX(14, smoothing="wilder")
+    values = [adx.update_bar(h, l, c) for h, l, c in zip(bars["high"], bars["low"], bars["close"])]
+    series = pd.Series([v["adx"] for v in values])
+    assert series.first_valid_index() == 2 * 14 - 1
+    assert series.dropna().between(0, 100).all()
+
+
+def test_base_kernels_are_abstract():
+    for base in (StreamingIndicator, SingleInputIndicator):
+        with pytest.raises(TypeError):
+            base()
+
+
+def test_aroon_ties_and_nans_match_window_argmax():
+    rng = np.random.default_rng(3)
+    high = np.round(rng.normal(0, 1, 400), 1)  # coarse values force ties
+    low = np.round(rng.normal(0, 1, 400), 1)
+    high[[50, 51, 200]] = np.nan
+    period = 14
+
+    def expected(values, pick):
+        windows = np.lib.stride_tricks.sliding_window_view(values, period)
+        scores = [np.nan if np.isnan(w).any() else (pick(w) + 1) / period * 100 for w in windows]
+        return np.concatenate([np.full(period - 1, np.nan), scores])
+
+    aroon = Aroon(period)
+    rows = [aroon.update_bar(h, l) for h, l in zip(high, low)]
+    np.testing.assert_array_equal([r["aroon_up"] for r in rows], expected(high, np.argmax))
+    np.testing.assert_array_equal([r["aroon_down"] for r in rows], expected(low, np.argmin))
+
+
+def test_reset_restarts_state(bars):
+    indicators = StreamingIndicators.calculator_defaults()
+    first = indicators.update_frame(bars.head(50))
+    indicators.reset()
+    again = indicators.update_frame(bars.head(50))
+    pd.testing.assert_frame_equal(first, again)
+
+
+@pytest.mark.parametrize("factory", [StreamingIndicators.calculator_defaults, StreamingIndicators.two_phase_defaults,
+                                     lambda: StreamingIndicators({"rsi": RSI(14, "wilder"), "adx": ADX(14, "wilder")})])
+def test_state_dict_round_trips_through_json(bars, factory):
+    indicators = factory()
+    indicators.update_frame(bars.head(150))
+    restored = factory()
+    restored.load_state_dict(json.loads(json.dumps(indicators.state_dict(), allow_nan=False)))
+
+    pd.testing.assert_frame_equal(restored.update_frame(bars.iloc[150:]), indicators.update_frame(bars.iloc[150:]))
+
+
+def test_load_state_dict_rejects_other_kernels(bars):
+    sma = SMA(20)
+    sma.update_batch(bars["close"].head(30))
+    state = sma.state_dict()
+
+    with pytest.raises(ValueError):
+        SMA(50).load_state_dict(state)
+    with pytest.raises(ValueError):
+        EMA(20).load_state_dict(state)
+    with pytest.raises(ValueError):
+        SMA(20).load_state_dict({**state, "fields": {"_values": {"deque": []}}})
+
+
+def test_candle_aggregator_feeds_indicators_on_completion():
+    from src.infrastructure.external.realtime_data_streamer import CandleAggregator
+
+    aggregator = CandleAggregator(indicator_factory=StreamingIndicators.two_phase_defaults)
+    start = datetime(2025, 9, 1, 9, 15)
+    for i, price in enumerate([100, 101, 102]):
+        aggregator.update_tick("TEST", Decimal(price), 10, start + timedelta(minutes=i))
+        aggregator.update_tick("TEST", Decimal(price + 1), 30, start + timedelta(minutes=i, seconds=30))
+        key = aggregator._get_candle_key(start + timedelta(minutes=i))
+        aggregator.mark_candle_complete("TEST", key)
+        aggregator.mark_candle_complete("TEST", key)  # idempotent
+
+    candles = aggregator.get_completed_candles("TEST")
+    assert len(candles) == 3
+    assert candles[-1]["indicators"]["obv"] == 80.0
+    closes = np.array([101.0, 102.0, 103.0])
+    assert aggregator.get_indicators("TEST")["vwap"] == pytest.approx(closes.mean())
+    assert CandleAggregator().get_indicators("TEST") == {}
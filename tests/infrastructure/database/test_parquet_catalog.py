@@ -0,0 +1,232 @@
+"""
+Tests for the Parquet partition catalog
+=======================================
+
+Covers incremental maintenance of the parquet_catalog table, exact file-list
+lookups and catalog-backed relations on the unified manager.
+"""
+
+import os
+import tempfile
+from datetime import date, datetime
+from pathlib import Path
+
+import duckdb
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.infrastructure.database.parquet_catalog import CATALOG_TABLE, ParquetCatalog
+from src.infrastructure.database.parquet_compaction import CompactionConfig, ParquetCompactor
+from src.infrastructure.database.unified_duckdb import DuckDBConfig, UnifiedDuckDBManager
+from src.infrastructure.services.result_cache import table_versions
+
+
+def _write_daily(root: Path, symbol: str, day: str, rows: int = 3, base: float = 10.0) -> Path:
+    y, m, d = day.split("-")
+    day_dir = root / y / m / d
+    day_dir.mkdir(parents=True, exist_ok=True)
+    ts_base = datetime.fromisoformat(f"{day}T09:15:00")
+    df = pd.DataFrame({
+        "timestamp": [ts_base + pd.Timedelta(minutes=i) for i in range(rows)],
+        "open": [base + i for i in range(rows)],
+        "high": [base + 1 + i for i in range(rows)],
+        "low": [base - 1 + i for i in range(rows)],
+        "close": [base + 0.5 + i for i in range(rows)],
+        "volume": [100 + i for i in range(rows)],
+    })
+    path = day_dir / f"{symbol}_minute_{day}.parquet"
+    pq.write_table(pa.Table.from_pandas(df), path)
+    return path
+
+
+@pytest.fixture
+def lake(tmp_path):
+    root = tmp_path / "data"
+    _write_daily(root, "TCS", "2025-09-04")
+    _write_daily(root, "INFY", "2025-09-04", base=20.0)
+    _write_daily(root, "INFY", "2025-09-05", base=20.0)
+    return root
+
+
+@pytest.fixture
+def conn():
+    connection = duckdb.connect(":memory:")
+    yield connection
+    connection.close()
+
+
+class TestParquetCatalog:
+    """Test catalog maintenance and lookups."""
+
+    def test_full_refresh_records_stats(self, lake, conn):
+        catalog = ParquetCatalog(str(lake))
+        result = catalog.refresh(conn)
+
+        assert result.files_scanned == 3
+        assert result.rows_upserted == 3
+
+        row = conn.execute(f"""
+            SELECT row_count, min_timestamp, max_timestamp, min_close, max_close, file_size
+            FROM {CATALOG_TABLE} WHERE symbol = 'INFY' AND date = DATE '2025-09-05'
+        """).fetchone()
+        assert row[0] == 3
+        assert row[1] == datetime(2025, 9, 5, 9, 15)
+        assert row[2] == datetime(2025, 9, 5, 9, 17)
+        assert (row[3], row[4]) == (20.5, 22.5)
+        assert row[5] > 0
+
+    def test_refresh_is_incremental(self, lake, conn):
+        catalog = ParquetCatalog(str(lake))
+        catalog.refresh(conn)
+
+        assert catalog.refresh(conn).files_scanned == 0
+
+        new_file = _write_daily(lake, "TCS", "2025-09-05")
+        result = catalog.refresh(conn, [str(new_file)])
+        assert result.files_scanned == 1
+        assert conn.execute(f"SELECT COUNT(*) FROM {CATALOG_TABLE}").fetchone()[0] == 4
+
+    def test_full_refresh_drops_removed_files(self, lake, conn):
+        catalog = ParquetCatalog(str(lake))
+        catalog.refresh(conn)
+
+        (lake / "2025" / "09" / "04" / "TCS_minute_2025-09-04.parquet").unlink()
+        result = catalog.refresh(conn)
+
+        assert result.files_removed == 1
+        assert conn.execute(f"SELECT COUNT(*) FROM {CATALOG_TABLE}").fetchone()[0] == 2
+
+    def test_explicit_refresh_drops_removed_and_missing_files(self, lake, conn):
+        catalog = ParquetCatalog(str(lake))
+        catalog.refresh(conn)
+
+        tcs = lake / "2025" / "09" / "04" / "TCS_minute_2025-09-04.parquet"
+        infy = lake / "2025" / "09" / "05" / "INFY_minute_2025-09-05.parquet"
+        tcs.unlink()
+        result = catalog.refresh(conn, [str(tcs)], removed_paths=[str(infy)])
+
+        assert result.files_removed == 2
+        assert [Path(f).name for f in catalog.files_for(conn)] == ["INFY_minute_2025-09-04.parquet"]
+
+    def test_files_for_predicate(self, lake, conn):
+        catalog = ParquetCatalog(str(lake))
+        catalog.refresh(conn)
+
+        files = catalog.files_for(conn, symbols=["INFY"], start_date=date(2025, 9, 5))
+        assert [Path(f).name for f in files] == ["INFY_minute_2025-09-05.parquet"]
+
+        day_files = catalog.files_for(conn, start_date=date(2025, 9, 4), end_date=date(2025, 9, 4))
+        assert len(day_files) == 2
+
+    def test_compacted_store_is_cataloged_once(self, lake, tmp_path, conn):
+        target = tmp_path / "compacted"
+        with ParquetCompactor(CompactionConfig(str(lake), str(target))) as compactor:
+            compactor.compact()
+
+        catalog = ParquetCatalog(str(lake), compacted_root=str(target))
+        catalog.refresh(conn)
+
+        files = catalog.files_for(conn)
+        assert [Path(f).name for f in files] == ["market_data_2025-09.parquet"]
+        assert conn.execute(f"SELECT SUM(row_count) FROM {CATALOG_TABLE}").fetchone()[0] == 9
+
+
+class TestCatalogBackedManager:
+    """Test the unified manager reading through the catalog."""
+
+    def setup_method(self):
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.temp_db.close()
+        os.unlink(self.temp_db.name)
+
+    def teardown_method(self):
+        if os.path.exists(self.temp_db.name):
+            os.unlink(self.temp_db.name)
+
+    def test_view_and_pruned_relation(self, lake):
+        config = DuckDBConfig(
+            database_path=self.temp_db.name,
+            enable_httpfs=False,
+            parquet_root=str(lake),
+            use_parquet_catalog=True,
+        )
+        with UnifiedDuckDBManager(config) as manager:
+            total = manager.persistence_query("SELECT COUNT(*) AS n FROM market_data_unified")
+            assert total["n"].iloc[0] == 9
+            view_sql = manager.persistence_query(
+                "SELECT sql FROM duckdb_views() WHERE view_name = 'market_data_unified'"
+            )["sql"].iloc[0]
+            assert "TCS_minute" not in view_sql
+
+            relation = manager.market_data_relation(
+                symbols=["INFY"], start_date=date(2025, 9, 5), end_date=date(2025, 9, 5)
+            )
+            assert "TCS_minute" not in relation
+            df = manager.persistence_query(f"SELECT symbol, COUNT(*) AS n FROM {relation} GROUP BY symbol")
+            assert df.to_dict("records") == [{"symbol": "INFY", "n": 3}]
+
+            new_file = _write_daily(lake, "WIPRO", "2025-09-05")
+            manager.refresh_parquet_catalog([str(new_file)])
+            total = manager.persistence_query("SELECT COUNT(*) AS n FROM market_data_unified")
+            assert total["n"].iloc[0] == 12
+
+    def test_empty_predicate_returns_empty_relation(self, lake):
+        config = DuckDBConfig(
+            database_path=self.temp_db.name,
+            enable_httpfs=False,
+            parquet_root=str(lake),
+            use_parquet_catalog=True,
+        )
+        with UnifiedDuckDBManager(config) as manager:
+            relation = manager.market_data_relation(start_date=date(2030, 1, 1))
+            df = manager.persistence_query(f"SELECT COUNT(*) AS n FROM {relation}")
+            assert df["n"].iloc[0] == 0
+
+    def test_ingested_file_is_readable_without_manual_refresh(self, lake):
+        config = DuckDBConfig(
+            database_path=self.temp_db.name,
+            enable_httpfs=False,
+            parquet_root=str(lake),
+            use_parquet_catalog=True,
+        )
+        bars = pd.DataFrame({
+            "timestamp": pd.date_range("2025-09-05 09:15", periods=4, freq="min"),
+            "open": [30.0, 31.0, 32.0, 33.0],
+            "high": [31.0, 32.0, 33.0, 34.0],
+            "low": [29.0, 30.0, 31.0, 32.0],
+            "close": [30.5, 31.5, 32.5, 33.5],
+            "volume": [10, 20, 30, 40],
+        })
+        with UnifiedDuckDBManager(config) as manager:
+            version = table_versions.get("market_data_unified")
+            path = manager.write_daily_parquet("WIPRO", date(2025, 9, 5), bars)
+            assert table_versions.get("market_data_unified") > version
+
+            assert path.endswith("2025/09/05/WIPRO_minute_2025-09-05.parquet")
+            df = manager.persistence_query(
+                "SELECT COUNT(*) AS n, SUM(volume) AS v FROM market_data_unified WHERE symbol = 'WIPRO'"
+            )
+            assert df.to_dict("records") == [{"n": 4, "v": 100}]
+
+    def test_compaction_updates_catalog_and_view(self, lake, tmp_path):
+        target = tmp_path / "compacted"
+        config = DuckDBConfig(
+            database_path=self.temp_db.name,
+            enable_httpfs=False,
+            parquet_root=str(lake),
+            compacted_parquet_root=str(target),
+            use_parquet_catalog=True,
+        )
+        with UnifiedDuckDBManager(config) as manager:
+            result = manager.compact_parquet(
+                CompactionConfig(str(lake), str(target), remove_sources=True)
+            )
+            assert result.success
+            assert not list(lake.glob("*/*/*/*.parquet"))
+
+            files = manager.persistence_query(f"SELECT DISTINCT file_path FROM {CATALOG_TABLE}")
+            assert [Path(f).name for f in files["file_path"]] == ["market_data_2025-09.parquet"]
+            total = manager.persistence_query("SELECT COUNT(*) AS n FROM market_data_unified")
+            assert total["n"].iloc[0] == 9
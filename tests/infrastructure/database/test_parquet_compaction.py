@@ -0,0 +1,175 @@
+"""
+Tests for Parquet lake compaction
+=================================
+
+Covers rewriting daily per-symbol files into sorted period files,
+incremental compaction and the unified view reading the compacted store.
+"""
+
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import duckdb
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.infrastructure.database.parquet_compaction import (
+    CompactionConfig,
+    ParquetCompactor,
+)
+from src.infrastructure.database.unified_duckdb import DuckDBConfig, UnifiedDuckDBManager
+
+
+def _write_daily(root: Path, symbol: str, day: str, rows: int = 3, base: float = 10.0) -> Path:
+    y, m, d = day.split("-")
+    day_dir = root / y / m / d
+    day_dir.mkdir(parents=True, exist_ok=True)
+    ts_base = datetime.fromisoformat(f"{day}T09:15:00")
+    df = pd.DataFrame({
+        "timestamp": [ts_base + pd.Timedelta(minutes=i) for i in range(rows)],
+        "open": [base + i for i in range(rows)],
+        "high": [base + 1 + i for i in range(rows)],
+        "low": [base - 1 + i for i in range(rows)],
+        "close": [base + 0.5 + i for i in range(rows)],
+        "volume": [100 + i for i in range(rows)],
+    })
+    path = day_dir / f"{symbol}_minute_{day}.parquet"
+    pq.write_table(pa.Table.from_pandas(df), path)
+    return path
+
+
+@pytest.fixture
+def lake(tmp_path):
+    source = tmp_path / "data"
+    _write_daily(source, "TCS", "2025-09-04")
+    _write_daily(source, "INFY", "2025-09-04")
+    _write_daily(source, "INFY", "2025-09-05")
+    _write_daily(source, "TCS", "2025-10-01")
+    return source, tmp_path / "compacted"
+
+
+class TestCompactionConfig:
+    """Test compaction configuration validation."""
+
+    def test_invalid_granularity(self):
+        with pytest.raises(ValueError, match="Invalid granularity"):
+            CompactionConfig(source_root="a", target_root="b", granularity="week")
+
+    def test_invalid_row_group_size(self):
+        with pytest.raises(ValueError):
+            CompactionConfig(source_root="a", target_root="b", row_group_size=0)
+
+
+class TestParquetCompactor:
+    """Test compaction of daily files into period files."""
+
+    def test_monthly_compaction_sorted(self, lake):
+        source, target = lake
+        with ParquetCompactor(CompactionConfig(str(source), str(target))) as compactor:
+            result = compactor.compact()
+
+            assert result.success
+            assert result.partitions_written == ["2025-09", "2025-10"]
+            assert result.source_files_compacted == 4
+            assert result.rows_written == 12
+
+            df = duckdb.sql(
+                f"SELECT * FROM read_parquet('{compactor.partition_path('2025-09')}')"
+            ).df()
+
+        assert list(df.columns) == [
+            "symbol", "timestamp", "open", "high", "low", "close", "volume", "timeframe", "date_partition"
+        ]
+        assert df["symbol"].tolist() == ["INFY"] * 6 + ["TCS"] * 3
+        assert df.groupby("symbol")["timestamp"].apply(lambda s: s.is_monotonic_increasing).all()
+        assert set(df["timeframe"]) == {"1m"}
+
+    def test_incremental_compaction_only_rewrites_new_partitions(self, lake):
+        source, target = lake
+        config = CompactionConfig(str(source), str(target))
+        with ParquetCompactor(config) as compactor:
+            compactor.compact()
+            october_mtime = os.stat(compactor.partition_path("2025-10")).st_mtime_ns
+
+            assert compactor.pending_source_files() == []
+            assert compactor.compact().partitions_written == []
+
+            _write_daily(source, "TCS", "2025-09-05")
+            assert len(compactor.pending_source_files()) == 1
+
+            result = compactor.compact()
+            assert result.partitions_written == ["2025-09"]
+            assert result.rows_written == 12
+            assert os.stat(compactor.partition_path("2025-10")).st_mtime_ns == october_mtime
+
+    def test_redelivered_daily_file_replaces_rows(self, lake):
+        source, target = lake
+        with ParquetCompactor(CompactionConfig(str(source), str(target))) as compactor:
+            compactor.compact()
+
+            path = _write_daily(source, "TCS", "2025-09-04", rows=2, base=50.0)
+            os.utime(path, ns=(1, 1))
+            compactor.compact()
+
+            df = duckdb.sql(
+                f"SELECT * FROM read_parquet('{compactor.partition_path('2025-09')}') WHERE symbol = 'TCS'"
+            ).df()
+
+        assert len(df) == 2
+        assert df["open"].tolist() == [50.0, 51.0]
+
+    def test_remove_sources(self, lake):
+        source, target = lake
+        config = CompactionConfig(str(source), str(target), remove_sources=True)
+        with ParquetCompactor(config) as compactor:
+            compactor.compact()
+            assert compactor.discover_source_files() == []
+            assert len(compactor.compacted_files()) == 2
+
+    def test_granularity_change_triggers_full_recompaction(self, lake):
+        source, target = lake
+        with ParquetCompactor(CompactionConfig(str(source), str(target))) as compactor:
+            compactor.compact()
+
+        yearly = CompactionConfig(str(source), str(target), granularity="year")
+        with ParquetCompactor(yearly) as compactor:
+            assert len(compactor.pending_source_files()) == 4
+            result = compactor.compact()
+            assert result.partitions_written == ["2025"]
+
+
+class TestUnifiedViewOverCompactedStore:
+    """Test that the unified view reads compacted files plus pending daily files."""
+
+    def setup_method(self):
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.temp_db.close()
+        os.unlink(self.temp_db.name)
+
+    def teardown_method(self):
+        if os.path.exists(self.temp_db.name):
+            os.unlink(self.temp_db.name)
+
+    def test_view_reads_compacted_and_pending(self, lake):
+        source, target = lake
+        with ParquetCompactor(CompactionConfig(str(source), str(target))) as compactor:
+            compactor.compact()
+        _write_daily(source, "WIPRO", "2025-10-02")
+
+        config = DuckDBConfig(
+            database_path=self.temp_db.name,
+            enable_httpfs=False,
+            parquet_root=str(source),
+            compacted_parquet_root=str(target),
+        )
+        with UnifiedDuckDBManager(config) as manager:
+            df = manager.persistence_query(
+                "SELECT symbol, COUNT(*) AS n FROM market_data_unified GROUP BY symbol ORDER BY symbol"
+            )
+
+        assert df["symbol"].tolist() == ["INFY", "TCS", "WIPRO"]
+        assert df["n"].tolist() == [6, 6, 3]
@@ -0,0 +1,81 @@
+"""
+Tests for the per-connection prepared statement cache
+=====================================================
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+
+import duckdb
+import pytest
+
+from src.infrastructure.database.prepared_statements import PreparedStatementCache
+
+
+@pytest.fixture
+def conn():
+    connection = duckdb.connect(":memory:")
+    connection.execute("""
+        CREATE TABLE bars AS
+        SELECT 'SYM' || (i % 3) AS symbol,
+               DATE '2025-09-01' + CAST(i % 5 AS INTEGER) AS day,
+               TIMESTAMP '2025-09-01 09:15:00' + INTERVAL (i) MINUTE AS ts,
+               i * 1.5 AS close
+        FROM range(30) t(i)
+    """)
+    yield connection
+    connection.close()
+
+
+class TestPreparedStatementCache:
+    """Test caching and fallbacks."""
+
+    def test_repeated_query_reuses_statement(self, conn):
+        cache = PreparedStatementCache(conn)
+        query = "SELECT COUNT(*) FROM bars WHERE symbol = ? AND day >= ?"
+
+        first = cache.execute(query, ["SYM1", date(2025, 9, 3)]).fetchone()[0]
+        second = cache.execute(query, ["SYM2", date(2025, 9, 1)]).fetchone()[0]
+
+        assert first == conn.execute(query, ["SYM1", date(2025, 9, 3)]).fetchone()[0]
+        assert second == 10
+        assert (cache.misses, cache.hits) == (1, 1)
+        assert len(cache) == 1
+
+    def test_typed_parameters(self, conn):
+        cache = PreparedStatementCache(conn)
+        rows = cache.execute(
+            "SELECT COUNT(*) FROM bars WHERE ts < ? AND close > ? AND symbol <> ?",
+            [datetime(2025, 9, 1, 9, 25), 3.0, "O'Brien"],
+        ).fetchone()
+        assert rows[0] == 7
+
+    def test_parameters_keep_their_types(self, conn):
+        cache = PreparedStatementCache(conn)
+        query = "SELECT ? IS NULL, typeof(?), ? + 1, COUNT(*) FROM bars WHERE list_contains(?, symbol)"
+        row = cache.execute(query, [None, date(2025, 9, 1), Decimal("1.25"), ["SYM0"]]).fetchone()
+        assert row == (True, "DATE", Decimal("2.25"), 10)
+        assert len(cache) == 1
+
+    def test_parameters_are_bound_not_inlined(self, conn):
+        cache = PreparedStatementCache(conn)
+        hostile = "x'); DROP TABLE bars; --"
+        assert cache.execute("SELECT COUNT(*) FROM bars WHERE symbol = ?", [hostile]).fetchone()[0] == 0
+        assert conn.execute("SELECT COUNT(*) FROM bars").fetchone()[0] == 30
+
+    def test_ddl_statement_executes(self, conn):
+        cache = PreparedStatementCache(conn)
+        cache.execute("CREATE TABLE t2 AS SELECT ? AS v", [1])
+        assert conn.execute("SELECT v FROM t2").fetchone()[0] == 1
+
+    def test_multi_statement_text_falls_back(self, conn):
+        cache = PreparedStatementCache(conn)
+        with pytest.raises(duckdb.Error):
+            cache.execute("SELECT ?; SELECT ?", [1, 2])
+        assert len(cache) == 0
+
+    def test_lru_eviction(self, conn):
+        cache = PreparedStatementCache(conn, max_statements=2)
+        for column in ("symbol", "day", "close"):
+            cache.execute(f"SELECT {column} FROM bars WHERE close > ?", [1.0]).fetchall()
+        assert len(cache) == 2
@@ -114,13 +114,13 @@ class TestConnectionPool:
 
     def test_pool_exhaustion(self):
         """Test behavior when pool is exhausted."""
-        config = DuckDBConfig(database_path=self.temp_db.name, max_connections=1)
+        config = DuckDBConfig(database_path=self.temp_db.name, max_connections=1, connection_timeout=0.1)
         pool = ConnectionPool(config)
 
         # Get the only connection
         conn1 = pool.get_connection()
 
-        # Try to get another (should fail)
+        # Try to get another (should fail once the wait times out)
         with pytest.raises(RuntimeError, match="Connection pool exhausted"):
             pool.get_connection()
 
@@ -144,6 +144,92 @@ class TestConnectionPool:
         with pytest.raises(RuntimeError, match="Connection pool is closed"):
             pool.get_connection()
 
+    def test_acquire_waits_for_release(self):
+        """Test that an exhausted pool blocks until a connection is returned."""
+        import threading
+
+        config = DuckDBConfig(database_path=self.temp_db.name, max_connections=1, connection_timeout=5.0)
+        pool = ConnectionPool(config)
+        conn1 = pool.get_connection()
+
+        timer = threading.Timer(0.1, pool.release_connection, args=(conn1,))
+        timer.start()
+        conn2 = pool.get_connection()
+        timer.join()
+
+        assert conn2 is conn1
+        pool.release_connection(conn2)
+        pool.close_all()
+
+    def test_waiters_served_in_order(self):
+        """Test fair FIFO hand-off between waiting callers."""
+        import threading
+        import time
+
+        config = DuckDBConfig(database_path=self.temp_db.name, max_connections=1, connection_timeout=5.0)
+        pool = ConnectionPool(config)
+        held = pool.get_connection()
+        order = []
+
+        def worker(worker_id):
+            conn = pool.get_connection()
+            order.append(worker_id)
+            pool.release_connection(conn)
+
+        threads = []
+        for i in range(3):
+            t = threading.Thread(target=worker, args=(i,))
+            t.start()
+            threads.append(t)
+            while pool.waiting_requests < i + 1:
+                time.sleep(0.01)
+
+        pool.release_connection(held)
+        for t in threads:
+            t.join()
+
+        assert order == [0, 1, 2]
+        pool.close_all()
+
+    def test_readers_share_one_database(self):
+        """Test that readers see writes made through the writer lane."""
+        pool = ConnectionPool(self.config)
+
+        with pool.writer() as writer:
+            writer.execute("CREATE TABLE t AS SELECT 42 AS v")
+
+        with pool.reader() as reader:
+            assert reader.execute("SELECT v FROM t").fetchone()[0] == 42
+
+        pool.close_all()
+
+    def test_release_skips_health_check(self):
+        """Test that returning a connection does not issue a query."""
+        pool = ConnectionPool(self.config)
+        conn = MagicMock()
+
+        pool.release_connection(conn)
+
+        conn.execute.assert_not_called()
+        assert pool.available_connections == 1
+
+    def test_stale_connection_replaced(self):
+        """Test that an idle connection failing its lazy check is replaced."""
+        config = DuckDBConfig(database_path=self.temp_db.name, max_connections=1, health_check_interval=0.0)
+        pool = ConnectionPool(config)
+
+        conn1 = pool.get_connection()
+        pool.release_connection(conn1)
+        conn1.close()
+
+        conn2 = pool.get_connection()
+        assert conn2 is not conn1
+        assert conn2.execute("SELECT 1").fetchone()[0] == 1
+        assert pool.active_connections == 1
+
+        pool.release_connection(conn2)
+        pool.close_all()
+
 
 class TestQueryExecutor:
     """Test query execution functionality."""
@@ -172,6 +258,7 @@ class TestQueryExecutor:
         mock_result.df.return_value = mock_df
         mock_conn.execute.return_value = mock_result
         mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_conn
 
         # Execute query
         result = self.executor.execute_query("SELECT * FROM test_table")
@@ -188,6 +275,7 @@ class TestQueryExecutor:
         mock_result.rows_changed = 5
         mock_conn.execute.return_value = mock_result
         mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_conn
 
         result = self.executor.execute_command("INSERT INTO test_table VALUES (1)")
 
@@ -209,6 +297,7 @@ class TestQueryExecutor:
 
         mock_conn.execute.side_effect = mock_execute
         mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_conn
 
         result = self.executor.execute_analytics_query(
             "SELECT * FROM table WHERE value > {threshold}",
@@ -254,6 +343,7 @@ class TestSchemaManager:
         """Test schema initialization."""
         mock_conn = MagicMock()
         mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_conn
 
         # Initialize schema
         self.schema_manager.initialize_schema()
@@ -310,6 +400,7 @@ class TestUnifiedDuckDBManager:
         mock_result.df.return_value = mock_df
         mock_conn.execute.return_value = mock_result
         mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_conn
 
         with UnifiedDuckDBManager(self.config) as manager:
             result = manager.analytics_query("SELECT * FROM {table}", table="test_table")
@@ -326,6 +417,7 @@ class TestUnifiedDuckDBManager:
         mock_result.rows_changed = 1
         mock_conn.execute.return_value = mock_result
         mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_conn
 
         with UnifiedDuckDBManager(self.config) as manager:
             # Test query
@@ -389,6 +481,7 @@ class TestIntegrationScenarios:
 
         mock_conn.execute.side_effect = mock_execute
         mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_conn
 
         results = []
         errors = []
@@ -421,6 +514,7 @@ class TestIntegrationScenarios:
         """Test error handling and connection recovery."""
         mock_conn = MagicMock()
         mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_conn
 
         # Mock successful execution
         mock_result_success = MagicMock()
@@ -475,6 +569,7 @@ class TestPerformanceScenarios:
         mock_result.df.return_value = pd.DataFrame({'result': [1]})
         mock_conn.execute.return_value = mock_result
         mock_connect.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_conn
 
         with UnifiedDuckDBManager(self.config) as manager:
             start_time = time.time()
@@ -0,0 +1,107 @@
+"""Bulk Parquet/CSV ingestion straight into DuckDB (no per-row pandas work)."""
+
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from src.infrastructure.adapters.duckdb_adapter import DuckDBAdapter
+from src.infrastructure.core.database import DuckDBManager
+from src.infrastructure.external.data_ingestion_pipeline import DataIngestionPipeline
+from src.infrastructure.repositories.duckdb_market_repo import DuckDBMarketDataRepository
+
+DAYS = ["2024-01-01", "2024-01-02"]
+
+
+def _write_day(root, symbol, day, **columns):
+    directory = root.joinpath(*day.split("-"))
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{symbol}_minute_{day}.parquet"
+    pd.DataFrame(columns).to_parquet(path)
+    return path
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    adapter = DuckDBAdapter(database_path=str(tmp_path / "ingest.duckdb"))
+    schema = adapter.db_manager.schema_manager._get_default_schema()
+    with adapter.db_manager.connection_pool.writer() as conn:
+        conn.execute(schema["market_data"]["create_sql"])
+    return DataIngestionPipeline(DuckDBMarketDataRepository(adapter))
+
+
+def _rows(pipeline):
+    return pipeline.repository.adapter.db_manager.persistence_query(
+        "SELECT * FROM market_data ORDER BY symbol, timestamp")
+
+
+def test_parquet_batches_normalize_in_sql(pipeline, tmp_path):
+    data = tmp_path / "data"
+    for symbol in ("AAA", "BBB"):
+        for day in DAYS:
+            stamps = pd.date_range(f"{day} 09:15", periods=30, freq="1min", tz="Asia/Kolkata")
+            _write_day(data, symbol, day, Date=stamps, O=1.0, H=2.0, L=0.5, C=1.5, Vol=[10.7] * 30)
+    # No timestamp column: minutes from the open, dated by the file name
+    _write_day(data, "CCC", "2024-01-03", open=[1.0, 2.0], high=[2.0, 3.0], low=[0.5, 1.0],
+               close=[1.5, 2.5], volume=[5, 6])
+    (data / "BAD_minute_2024-01-04.parquet").write_text("not parquet")
+
+    result = pipeline.ingest_from_parquet_files(str(data), batch_size=2, threads=2)
+
+    assert result["total_files"] == 5 and result["total_records"] == 122
+    assert result["processed_symbols"] == ["AAA", "BBB", "CCC"]
+    assert result["failed_files"] == [str(data / "BAD_minute_2024-01-04.parquet")]
+    assert [b["files"] for b in result["batches"]] == [2, 2, 1]  # BAD's batch falls back to per-file loads
+    assert all({"records", "bytes", "seconds", "records_per_second", "mb_per_second"} <= set(b)
+               for b in result["batches"])
+
+    rows = _rows(pipeline)
+    aaa = rows[rows.symbol == "AAA"]
+    assert len(aaa) == 60
+    assert str(aaa.timestamp.iloc[0]) == "2024-01-01 09:15:00"  # wall-clock IST, not UTC
+    assert {str(d.date()) for d in aaa.date_partition} == set(DAYS)
+    assert aaa.volume.iloc[0] == 10 and set(rows.timeframe) == {"1m"}
+    ccc = rows[rows.symbol == "CCC"]
+    assert [str(t) for t in ccc.timestamp] == ["2024-01-03 09:15:00", "2024-01-03 09:16:00"]
+
+    # Re-ingesting replaces rows rather than duplicating them
+    pipeline.ingest_from_parquet_files(str(data), batch_size=100)
+    assert len(_rows(pipeline)) == 122
+
+
+def test_csv_ingestion_drops_unparseable_rows(pipeline, tmp_path):
+    data = tmp_path / "csv"
+    data.mkdir()
+    pd.DataFrame({
+        "datetime": ["2024-01-05 09:15:00", "2024-01-05 09:16:00", "not a time"],
+        "open": ["1", "x", "3"], "high": [2, 2, 4], "low": [0, 0, 2], "close": [1, 1, 3], "v": [1, 2, 3],
+    }).to_csv(data / "INFY_daily.csv", index=False)
+
+    result = pipeline.ingest_from_csv_files(str(data))
+
+    assert result["total_records"] == 1 and result["processed_symbols"] == ["INFY"]
+    assert str(_rows(pipeline).timestamp.iloc[0]) == "2024-01-05 09:15:00"
+
+
+def test_symbol_and_date_from_filename(pipeline):
+    assert pipeline._extract_symbol_from_filename("RELIANCE_minute_2024-01-01.parquet") == "RELIANCE"
+    assert pipeline._extract_symbol_from_filename("tcs_daily.csv") == "TCS"
+    assert pipeline._extract_date_from_filename("RELIANCE_minute_2024-01-01.parquet") == date(2024, 1, 1)
+    assert pipeline._extract_date_from_filename("tcs.csv") is None
+
+
+def test_load_symbol_data_single_insert(tmp_path):
+    data = tmp_path / "data"
+    for day in DAYS:
+        _write_day(data, "AAA", day, open=[1.0, 2.0, 3.0], high=[2.0] * 3, low=[0.5] * 3, close=[1.5] * 3,
+                   volume=[1, 2, 3])
+    manager = DuckDBManager(db_path=str(tmp_path / "core.duckdb"), data_root=str(data))
+    manager.create_schema()
+
+    assert manager.load_symbol_data("AAA", date(2024, 1, 1), date(2024, 1, 3)) == 6
+
+    rows = manager.query_market_data(symbol="AAA")
+    assert [str(t) for t in rows.timestamp[:3]] == ["2024-01-01 09:15:00", "2024-01-01 09:16:00",
+                                                     "2024-01-01 09:17:00"]
+    assert rows.date_partition.iloc[-1].date() == date(2024, 1, 2)
+    manager.close()
@@ -0,0 +1,142 @@
+"""Single-query correlations agree with per-symbol pandas correlation."""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.infrastructure.core.database import DuckDBManager
+from src.infrastructure.core.query_api import QueryAPI
+from src.infrastructure.duckdb_framework import FinancialAnalytics, StreamingCorrelation
+from src.infrastructure.duckdb_framework.correlation import ReturnsMatrix, correlation_frame, top_k_neighbors
+
+SYMBOLS = ["AAA", "BBB", "CCC", "DDD"]
+
+
+def _minute_bars(rng, symbol, days):
+    frames = []
+    for day in days:
+        stamps = pd.date_range(f"{day} 09:15", periods=30, freq="1min")
+        close = 100 + rng.normal(0, 1, len(stamps)).cumsum()
+        frames.append(pd.DataFrame({
+            "symbol": symbol, "timestamp": stamps, "open": close, "high": close + 1, "low": close - 1,
+            "close": close, "volume": 10, "date_partition": stamps.date,
+        }))
+    return pd.concat(frames)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    rng = np.random.default_rng(7)
+    days = pd.bdate_range("2024-01-01", "2024-02-29").strftime("%Y-%m-%d")
+    # DDD misses some days and EEE has no bars at all
+    bars = pd.concat([_minute_bars(rng, symbol, days if symbol != "DDD" else days[::3]) for symbol in SYMBOLS])
+    manager = DuckDBManager(db_path=str(tmp_path / "corr.duckdb"), data_root=str(tmp_path))
+    conn = manager.connect()
+    conn.execute("CREATE TABLE market_data AS SELECT * FROM bars")
+    conn.execute("CREATE VIEW market_data_unified AS SELECT * FROM market_data")
+    yield manager
+    manager.close()
+
+
+def _per_symbol_correlation(api, symbols, timeframe, method, **filters):
+    """The per-symbol resample-and-merge the single query replaced."""
+    merged = None
+    for symbol in symbols:
+        df = api.resample_data(symbol, timeframe, **filters)
+        if df.empty:
+            continue
+        df[symbol] = df["close"].pct_change() if method == "returns" else df["close"]
+        df = df[["timestamp", symbol]]
+        merged = df if merged is None else merged.merge(df, on="timestamp", how="outer")
+    return merged.drop("timestamp", axis=1).corr()
+
+
+@pytest.mark.parametrize("timeframe,method", [("1D", "returns"), ("1H", "returns"), ("30T", "prices")])
+def test_query_api_matches_per_symbol_merge(manager, timeframe, method):
+    api = QueryAPI(manager)
+    symbols = SYMBOLS + ["EEE"]
+    filters = dict(start_date=date(2024, 1, 10), end_date=date(2024, 2, 20))
+
+    result = api.get_correlation_matrix(symbols, timeframe, method=method, **filters)
+    expected = _per_symbol_correlation(api, symbols, timeframe, method, **filters)
+    assert list(result.columns) == SYMBOLS
+    pd.testing.assert_frame_equal(result, expected, check_exact=False, rtol=1e-9, atol=1e-12)
+    assert api.get_correlation_matrix(["EEE"]).empty
+
+
+def test_financial_analytics_daily_returns(manager):
+    analytics = FinancialAnalytics(manager.connect())
+    returns = analytics.daily_returns(SYMBOLS, "2024-01-01", "2024-03-01")
+
+    daily = manager.connect().execute("""
+        SELECT symbol, date_trunc('day', timestamp) AS date, LAST(close ORDER BY timestamp) AS close
+        FROM market_data GROUP BY ALL""").df()
+    closes = daily.pivot(index="date", columns="symbol", values="close")[SYMBOLS]
+    expected = pd.concat([closes[s].dropna().pct_change() for s in SYMBOLS], axis=1)
+    np.testing.assert_allclose(returns.values, expected.values, rtol=1e-12)
+
+    corr = analytics.correlation_matrix(SYMBOLS, "2024-01-01", "2024-03-01")
+    pd.testing.assert_frame_equal(corr, expected.corr(), check_exact=False, rtol=1e-9, check_names=False)
+
+    neighbors = analytics.correlation_neighbors(SYMBOLS, "2024-01-01", "2024-03-01", k=2)
+    assert len(neighbors) == 2 * len(SYMBOLS)
+
+
+def test_empty_symbol_list_returns_empty_results(manager):
+    assert QueryAPI(manager).get_correlation_matrix([]).empty
+
+    analytics = FinancialAnalytics(manager.connect())
+    returns = analytics.daily_returns([], "2024-01-01", "2024-03-01")
+    assert returns.symbols == [] and returns.values.shape == (0, 0)
+    assert analytics.correlation_matrix([], "2024-01-01", "2024-03-01").empty
+    assert analytics.correlation_neighbors([], "2024-01-01", "2024-03-01").empty
+
+
+def test_top_k_blocks_match_full_matrix():
+    rng = np.random.default_rng(1)
+    factors = rng.normal(size=(250, 5))
+    values = factors @ rng.normal(size=(5, 60)) + rng.normal(size=(250, 60))
+    values[rng.random(values.shape) < 0.1] = np.nan
+    matrix = ReturnsMatrix(np.arange(250), [f"S{i:02d}" for i in range(60)], values)
+
+    full = correlation_frame(matrix)
+    pd.testing.assert_frame_equal(full, matrix.to_frame().corr(), check_exact=False, rtol=1e-9,
+                                  check_names=False)
+
+    for absolute in (False, True):
+        top = top_k_neighbors(matrix, k=5, block_size=7, absolute=absolute)
+        assert len(top) == 60 * 5
+        for symbol, group in top.groupby("symbol"):
+            row = full.loc[symbol].drop(symbol)
+            expected = (row.abs() if absolute else row).nlargest(5).index
+            assert list(group.sort_values("rank")["neighbor"]) == list(expected)
+            np.testing.assert_allclose(group["correlation"], row[group["neighbor"]])
+
+
+def test_streaming_rolling_and_ewm():
+    rng = np.random.default_rng(2)
+    values = rng.normal(size=(120, 6))
+    values[:, 1] += values[:, 0]
+    symbols = list("ABCDEF")
+
+    rolling = StreamingCorrelation(symbols, window=20)
+    for i, row in enumerate(values):
+        rolling.update(row if i % 2 else dict(zip(symbols, row)))
+        if i >= 1:
+            window = values[max(0, i - 19):i + 1]
+            np.testing.assert_allclose(rolling.correlation().values, np.corrcoef(window.T), atol=1e-10)
+    assert rolling.count == 20
+    assert rolling.neighbors("A", k=1).index.tolist() == ["B"]
+
+    ewm = StreamingCorrelation.from_returns(ReturnsMatrix(np.arange(120), symbols, values), halflife=10)
+    weights = (1 - ewm.alpha) ** np.arange(119, -1, -1)
+    cov = np.cov(values.T, aweights=weights, bias=True)
+    std = np.sqrt(np.diag(cov))
+    np.testing.assert_allclose(ewm.correlation().values, cov / np.outer(std, std), atol=1e-10)
+    np.testing.assert_allclose(ewm.neighbors("A", k=5).sort_index(),
+                               ewm.correlation()["A"].drop("A").sort_index(), atol=1e-12)
+
+    with pytest.raises(ValueError):
+        StreamingCorrelation(symbols, window=10, alpha=0.1)
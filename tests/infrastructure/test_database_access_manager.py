@@ -0,0 +1,118 @@
+"""DatabaseAccessManager: parallel reads, single writer with group commit."""
+
+import threading
+
+import pytest
+
+from src.infrastructure.core.database_access_manager import AccessIntent, DatabaseAccessManager
+from src.infrastructure.database.unified_duckdb import ConnectionPool, DuckDBConfig
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(DuckDBConfig(database_path=str(tmp_path / "access.duckdb"), max_connections=8))
+    with pool.writer() as conn:
+        conn.execute("CREATE TABLE prices (symbol VARCHAR PRIMARY KEY, close DOUBLE)")
+    yield pool
+    pool.close_all()
+
+
+@pytest.fixture
+def manager(pool):
+    manager = DatabaseAccessManager(max_readers=3, max_group_size=16, connection_pool=pool)
+    manager.start()
+    yield manager
+    manager.stop()
+
+
+def test_reads_run_in_parallel(manager):
+    # Three reads can only pass the barrier together if they run concurrently
+    barrier = threading.Barrier(3, timeout=5)
+
+    def read(conn):
+        barrier.wait()
+        return conn.execute("SELECT count(*) FROM prices").fetchone()[0]
+
+    ids = [manager.submit_request(read, intent=AccessIntent.READ) for _ in range(3)]
+    assert [manager.get_result(i, timeout=10) for i in ids] == [0, 0, 0]
+
+    stats = manager.get_stats()
+    assert stats["read"]["completed"] == 3 and stats["read"]["queue_depth"] == 0
+    assert stats["read"]["latency"]["max_ms"] >= stats["read"]["latency"]["avg_ms"] > 0
+
+
+def test_writes_are_group_committed_and_failures_isolated(manager):
+    release = threading.Event()
+    started = threading.Event()
+
+    def gate(conn):
+        started.set()
+        release.wait(5)
+        conn.execute("INSERT INTO prices VALUES ('GATE', 0)")
+
+    first = manager.submit_request(gate)
+    assert started.wait(5)
+
+    # These queue up behind the gate and are picked up as one group
+    ids = [manager.submit_request(lambda conn, i=i: conn.execute(
+        "INSERT INTO prices VALUES (?, ?)", [f"S{i}", float(i)])) for i in range(5)]
+    duplicate = manager.submit_request(lambda conn: conn.execute("INSERT INTO prices VALUES ('S0', 99)"))
+    release.set()
+
+    manager.get_result(first)
+    for request_id in ids:
+        manager.get_result(request_id)
+    with pytest.raises(Exception, match="(?i)constraint"):
+        manager.get_result(duplicate)
+
+    rows = manager.execute_read(lambda conn: conn.execute(
+        "SELECT symbol, close FROM prices ORDER BY symbol").fetchall())
+    assert rows == [("GATE", 0.0)] + [(f"S{i}", float(i)) for i in range(5)]
+
+    stats = manager.get_stats()
+    assert stats["write"]["completed"] == 6 and stats["write"]["failed"] == 1
+    assert stats["write"]["wait"]["max_ms"] > 0
+    # The group of six failed on the duplicate and was retried one by one
+    assert stats["write_groups"]["committed"] == 0
+
+
+def test_priority_and_errors_without_pool():
+    manager = DatabaseAccessManager(max_readers=1)
+    order = []
+    gate = threading.Event()
+    manager.start()
+    try:
+        blocker = manager.submit_request(lambda: gate.wait(5))
+        low = manager.submit_request(lambda: order.append("low"), priority=1)
+        high = manager.submit_request(lambda: order.append("high"), priority=5)
+        gate.set()
+        for request_id in (blocker, low, high):
+            manager.get_result(request_id)
+        assert order == ["high", "low"]
+
+        with pytest.raises(ZeroDivisionError):
+            manager.execute_read(lambda: 1 / 0)
+        assert manager.execute_read(lambda: "ok") == "ok"
+    finally:
+        manager.stop()
+
+    assert not manager.is_running
+    with pytest.raises(RuntimeError):
+        manager.submit_request(lambda: None)
+
+
+def test_successful_group_commits_once(manager):
+    release = threading.Event()
+    started = threading.Event()
+    gate = manager.submit_request(lambda conn: (started.set(), release.wait(5)))
+    assert started.wait(5)
+
+    ids = [manager.submit_request(lambda conn, i=i: conn.execute(
+        "INSERT INTO prices VALUES (?, ?)", [f"G{i}", 1.0])) for i in range(10)]
+    release.set()
+    for request_id in [gate] + ids:
+        manager.get_result(request_id)
+
+    # The gate ran alone; the ten writes queued behind it shared one transaction
+    assert manager.get_stats()["write_groups"] == {"committed": 1, "writes": 10, "avg_size": 10.0}
+    assert manager.execute_read(lambda conn: conn.execute("SELECT count(*) FROM prices").fetchone()[0]) == 10
@@ -0,0 +1,121 @@
+"""Sharded AsyncEventBus: bounded per-subscriber queues, overflow policies, batching."""
+
+import asyncio
+from datetime import date
+
+import pytest
+
+from src.domain.events import DataIngestedEvent
+from src.infrastructure.messaging.event_bus import AsyncEventBus, OverflowPolicy
+
+
+def _event(symbol: str, records: int = 1) -> DataIngestedEvent:
+    return DataIngestedEvent(symbol=symbol, timeframe="1m", records_count=records,
+                             start_date=date.today(), end_date=date.today())
+
+
+async def _settle():
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_batches_and_sync_handlers_run_inline():
+    bus = AsyncEventBus(num_shards=2)
+    single, batches = [], []
+    await bus.async_subscribe("data_ingested", lambda event: single.append(event.symbol))
+    await bus.async_subscribe("data_ingested", batches.append, batch=True, max_batch_size=4)
+
+    # Published before start: queued, then delivered once the shards run
+    for i in range(10):
+        await bus.async_publish(_event(f"S{i}"))
+    await bus.start()
+    await _settle()
+    await bus.stop()
+
+    assert single == [f"S{i}" for i in range(10)]
+    assert [len(b) for b in batches] == [4, 4, 2]
+    assert [e.symbol for b in batches for e in b] == single
+
+    metrics = {m["batch"]: m for m in bus.get_subscriber_metrics()}
+    assert metrics[False]["delivered"] == 10 and metrics[False]["wakeups"] == 10
+    assert metrics[True]["delivered"] == 10 and metrics[True]["wakeups"] == 3
+    assert metrics[True]["shard"] != metrics[False]["shard"]
+    assert metrics[True]["max_lag_seconds"] >= metrics[True]["last_lag_seconds"] >= 0
+    assert metrics[True]["events_per_second"] > 0
+
+
+@pytest.mark.asyncio
+async def test_overflow_policies():
+    bus = AsyncEventBus(num_shards=1)
+    oldest, coalesced = [], []
+    await bus.async_subscribe("data_ingested", lambda e: oldest.append(e.symbol),
+                              max_queue_size=3, overflow=OverflowPolicy.DROP_OLDEST)
+    await bus.async_subscribe("data_ingested", lambda e: coalesced.append((e.symbol, e.records_count)),
+                              max_queue_size=3, overflow=OverflowPolicy.COALESCE)
+
+    for records, symbol in enumerate(["A", "B", "A", "C", "B", "D"]):
+        await bus.async_publish(_event(symbol, records))
+    assert bus.get_queue_size("data_ingested") == 6
+
+    await bus.start()
+    await _settle()
+    await bus.stop()
+
+    assert oldest == ["C", "B", "D"]
+    # A and B kept their first slot but carry their latest value; D pushed A out
+    assert coalesced == [("B", 4), ("C", 3), ("D", 5)]
+    metrics = {m["overflow"]: m for m in bus.get_subscriber_metrics()}
+    assert metrics["drop_oldest"]["dropped"] == 3
+    assert metrics["coalesce"]["coalesced"] == 2 and metrics["coalesce"]["dropped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_block_policy_applies_backpressure():
+    bus = AsyncEventBus(num_shards=1)
+    received = []
+    release = asyncio.Event()
+
+    async def slow(event):
+        await release.wait()
+        received.append(event.symbol)
+
+    await bus.async_subscribe("data_ingested", slow, max_queue_size=2, overflow=OverflowPolicy.BLOCK)
+    await bus.start()
+
+    publisher = asyncio.gather(*(bus.async_publish(_event(f"S{i}")) for i in range(5)))
+    await _settle()
+    assert not publisher.done()  # one in the handler, two queued, the rest waiting
+
+    release.set()
+    await asyncio.wait_for(publisher, timeout=2)
+    await _settle()
+    await bus.stop()
+
+    assert sorted(received) == [f"S{i}" for i in range(5)]
+    assert bus.get_subscriber_metrics()[0]["dropped"] == 0
+
+
+@pytest.mark.asyncio
+async def test_handler_errors_and_unsubscribe():
+    bus = AsyncEventBus()
+    seen = []
+
+    def flaky(event):
+        if event.symbol == "BAD":
+            raise RuntimeError("boom")
+        seen.append(event.symbol)
+
+    await bus.async_subscribe("data_ingested", flaky)
+    await bus.start()
+    for symbol in ("A", "BAD", "B"):
+        await bus.async_publish(_event(symbol))
+    await _settle()
+
+    await bus.async_unsubscribe("data_ingested", flaky)
+    await bus.async_publish(_event("C"))
+    await _settle()
+    await bus.stop()
+
+    assert seen == ["A", "B"]
+    assert bus.get_subscriber_metrics() == []
@@ -0,0 +1,138 @@
+"""Indexed instrument-master lookups agree with the DataFrame filters they replace."""
+
+import os
+from datetime import date
+
+import pandas as pd
+import pytest
+
+BROKERS_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "src", "infrastructure", "external", "brokers")
+
+
+@pytest.fixture
+def instrument_index(monkeypatch):
+    # Tradehull imports its helpers top-level (the brokers package itself needs dhanhq)
+    monkeypatch.syspath_prepend(os.path.abspath(BROKERS_DIR))
+    import instrument_index
+    return instrument_index
+
+
+def _master() -> pd.DataFrame:
+    rows = [
+        ("NSE", 2885, "RELIANCE", "RELIANCE", "", "EQUITY", None, None, "RELIANCE"),
+        ("BSE", 500325, "RELIANCE", "Reliance", "", "EQUITY", None, None, "RELIANCE"),
+        ("NSE", 1594, "INFY", "INFY", "", "EQUITY", None, None, "INFY"),
+        ("NSE", 1595, "INFY-BE", "INFY BE", "", "EQUITY", None, None, "INFY"),
+        ("MCX", 400, "CRUDEOIL-19NOV2024-FUT", "CRUDEOIL NOV FUT", "", "FUTCOM", "2024-11-19 23:30:00", None, "CRUDEOIL"),
+        ("MCX", 401, "CRUDEOIL-18OCT2024-FUT", "CRUDEOIL OCT FUT", "", "FUTCOM", "2024-10-18 23:30:00", None, "CRUDEOIL"),
+        ("MCX", 402, "CRUDEOIL-16OCT2024-5700-CE", "CRUDEOIL 16 OCT 5700 CALL", "CE", "OPTFUT",
+         "2024-10-16 23:30:00", 5700.0, "CRUDEOIL"),
+    ]
+    for i, strike in enumerate(range(24000, 25050, 50)):
+        for option_type, offset in (("CE", 0), ("PE", 1000)):
+            rows.append(("NSE", 50000 + offset + i, f"NIFTY-Oct2024-{strike}-{option_type}",
+                         f"NIFTY 17 OCT {strike} {'CALL' if option_type == 'CE' else 'PUT'}", option_type,
+                         "OPTIDX", "2024-10-17 14:30:00", float(strike), "NIFTY"))
+    # A relisted contract: the later row wins, as with iloc[-1]
+    rows.append(("NSE", 59999, "NIFTY-Oct2024-24500-CE", "NIFTY 17 OCT 24500 CALL", "CE", "OPTIDX",
+                 "2024-10-17 14:30:00", 24500.0, "NIFTY"))
+    for strike in (1400, 1420, 1460):
+        rows.append(("NSE", 70000 + strike, f"INFY-Oct2024-{strike}-CE", f"INFY 31 OCT {strike} CALL", "CE",
+                     "OPTSTK", "2024-10-31 14:30:00", float(strike), "INFY"))
+    return pd.DataFrame(rows, columns=[
+        "SEM_EXM_EXCH_ID", "SEM_SMST_SECURITY_ID", "SEM_TRADING_SYMBOL", "SEM_CUSTOM_SYMBOL", "SEM_OPTION_TYPE",
+        "SEM_INSTRUMENT_NAME", "SEM_EXPIRY_DATE", "SEM_STRIKE_PRICE", "SM_SYMBOL_NAME",
+    ])
+
+
+def _scan(df, exchange, column_filter):
+    """The original DataFrame lookup: filter on both symbol columns and take the last row."""
+    matches = df[(df["SEM_EXM_EXCH_ID"] == exchange) &
+                 (column_filter(df["SEM_TRADING_SYMBOL"]) | column_filter(df["SEM_CUSTOM_SYMBOL"]))]
+    return None if matches.empty else matches.iloc[-1]["SEM_SMST_SECURITY_ID"]
+
+
+def test_symbol_lookups_match_dataframe_scan(instrument_index):
+    df = _master()
+    index = instrument_index.InstrumentIndex(df)
+
+    for symbol, exchange in [("RELIANCE", "NSE"), ("Reliance", "BSE"), ("INFY", "NSE"), ("TCS", "NSE")]:
+        assert index.security_id(symbol, exchange) == _scan(df, exchange, lambda s: s == symbol)
+    for symbol, exchange in [("RELIANCE", "BSE"), ("INFY BE", "NSE")]:
+        assert index.security_id_upper(symbol, exchange) == _scan(df, exchange, lambda s: s.str.upper() == symbol)
+    for prefix, exchange in [("INFY", "NSE"), ("NIFTY 17 OCT 245", "NSE"), ("CRUDE", "MCX"), ("ZZZ", "NSE")]:
+        assert index.security_id_by_prefix(prefix, exchange) == \
+            _scan(df, exchange, lambda s: s.str.upper().str.startswith(prefix))
+
+    assert index.security_id_any_exchange("RELIANCE") == 500325
+    assert index.mcx_custom_symbol("CRUDEOIL 16 OCT 5700 CALL") == 402
+    assert index.nearest_commodity_future("crudeoil") == 401
+
+
+def test_option_chain_nearest_strike(instrument_index):
+    index = instrument_index.InstrumentIndex(_master())
+
+    chain = index.option_chain("NIFTY", "NSE", "2024-10-17", instrument_index.OPTION_MATCH_INDEX)
+    assert len(chain.ce.strikes) == len(chain.pe.strikes) == 21
+    assert chain.ce.nearest(24500) == (24500, "NIFTY 17 OCT 24500 CALL")
+    assert chain.ce.security_ids[chain.ce.strikes.searchsorted(24500)] == 59999
+    assert chain.pe.nearest(24526)[0] == 24550
+    assert chain.pe.nearest(24525)[0] == 24500  # ties go to the lower strike
+    assert chain.ce.nearest(30000)[0] == 25000
+    assert chain.ce.nearest(100)[0] == 24000
+
+    stock = index.option_chain("INFY", "NSE", "2024-10-31", instrument_index.OPTION_MATCH_STOCK)
+    assert stock.ce.nearest(1445) == (1460, "INFY 31 OCT 1460 CALL")
+    assert stock.pe.empty
+    with pytest.raises(ValueError):
+        stock.pe.nearest(1445)
+
+    assert index.option_chain("NIFTY", "NSE", "2024-10-24", instrument_index.OPTION_MATCH_INDEX).ce.empty
+
+
+def test_option_chain_common_strike_across_mismatched_sides(instrument_index):
+    df = _master()
+    df = df[~((df["SEM_OPTION_TYPE"] == "PE") & (df["SEM_STRIKE_PRICE"] == 24500.0))]
+    chain = instrument_index.InstrumentIndex(df).option_chain(
+        "NIFTY", "NSE", "2024-10-17", instrument_index.OPTION_MATCH_INDEX)
+
+    assert chain.ce.nearest(24500)[0] == 24500
+    assert chain.nearest_common(24510) == (24550, "NIFTY 17 OCT 24550 CALL", "NIFTY 17 OCT 24550 PUT")
+    assert chain.nearest_common(24500) == (24450, "NIFTY 17 OCT 24450 CALL", "NIFTY 17 OCT 24450 PUT")
+    assert chain.nearest_common(24600)[0] == 24600
+
+    stock = instrument_index.InstrumentIndex(df).option_chain(
+        "INFY", "NSE", "2024-10-31", instrument_index.OPTION_MATCH_STOCK)
+    with pytest.raises(ValueError):
+        stock.nearest_common(1445)
+
+
+def test_snapshot_round_trip(instrument_index, tmp_path):
+    calls = []
+
+    def read_master():
+        calls.append(1)
+        df = _master()
+        df.insert(0, "Unnamed: 0", range(len(df)))
+        return df
+
+    day = date(2024, 10, 16)
+    first = instrument_index.InstrumentIndex.load(str(tmp_path), read_master, day)
+    second = instrument_index.InstrumentIndex.load(str(tmp_path), read_master, day)
+
+    assert calls == [1]
+    assert os.path.exists(instrument_index.snapshot_path(str(tmp_path), day))
+    assert "Unnamed: 0" not in second.instrument_df.columns
+    assert second.trading_date == day
+    assert second.security_id("RELIANCE", "NSE") == first.security_id("RELIANCE", "NSE") == 2885
+    assert second.option_chain("NIFTY", "NSE", "2024-10-17", instrument_index.OPTION_MATCH_INDEX).ce.nearest(24480) \
+        == (24500, "NIFTY 17 OCT 24500 CALL")
+
+
+def test_for_frame_builds_once_per_frame(instrument_index):
+    df = _master()
+    index = instrument_index.InstrumentIndex.for_frame(df)
+
+    assert instrument_index.InstrumentIndex.for_frame(df) is index
+    assert index.security_id("RELIANCE", "NSE") == 2885
+    assert instrument_index.InstrumentIndex.for_frame(df.copy()) is not index
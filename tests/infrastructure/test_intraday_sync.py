@@ -0,0 +1,120 @@
+"""Concurrent, batched TodayIntradaySync against a local fake broker."""
+
+import datetime
+import threading
+import time
+
+import duckdb
+import pandas as pd
+import pytest
+
+from src.infrastructure.external.data_sync.historical.sync_today_intraday_duckdb import (
+    IntradaySyncConfig,
+    RateLimiter,
+    TodayIntradaySync,
+)
+
+TODAY = datetime.date.today()
+SYMBOLS = [f"SYM{i:02d}" for i in range(12)]
+
+
+class FakeBroker:
+    """Serves 30 one-minute bars for today plus a few from yesterday."""
+
+    def __init__(self, delay: float = 0.02):
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def get_intraday_data(self, symbol, exchange, interval):
+        with self._lock:
+            self.calls.append((symbol, time.monotonic()))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            if symbol == "BROKEN":
+                raise RuntimeError("DH-905 no data present")
+            today = pd.date_range(f"{TODAY} 09:15", periods=30, freq="1min")
+            yesterday = pd.date_range(f"{TODAY - datetime.timedelta(days=1)} 15:25", periods=3, freq="1min")
+            stamps = today.append(yesterday)
+            n = len(stamps)
+            return pd.DataFrame({
+                "timestamp": stamps,
+                "open": [100.0] * n, "high": [101.0] * n, "low": [99.0] * n, "close": [100.5] * n,
+                "volume": list(range(n)),
+            })
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "sync.duckdb")
+    conn = duckdb.connect(path)
+    conn.execute("""
+        CREATE TABLE market_data (
+            symbol VARCHAR NOT NULL, timestamp TIMESTAMP NOT NULL,
+            open DOUBLE NOT NULL, high DOUBLE NOT NULL, low DOUBLE NOT NULL, close DOUBLE NOT NULL,
+            volume BIGINT NOT NULL, date_partition DATE NOT NULL,
+            PRIMARY KEY (symbol, timestamp)
+        )
+    """)
+    # SYM00 already has the first 10 minutes, SYM01 is fully synced
+    for symbol, minutes in (("SYM00", 10), ("SYM01", 30)):
+        conn.execute(f"""
+            INSERT INTO market_data
+            SELECT '{symbol}', TIMESTAMP '{TODAY} 09:15:00' + to_minutes(i::BIGINT),
+                   100, 101, 99, 100.5, i, DATE '{TODAY}'
+            FROM range({minutes}) t(i)
+        """)
+    conn.close()
+    return path
+
+
+def test_concurrent_batched_sync(db_path):
+    broker = FakeBroker()
+    config = IntradaySyncConfig(max_workers=4, requests_per_second=0, batch_size=5)
+    sync = TodayIntradaySync(db_path=db_path, config=config, broker=broker)
+
+    stats = sync.sync_today_intraday(SYMBOLS + ["BROKEN"])
+    per_symbol = {s["symbol"]: s for s in stats["symbol_stats"]}
+
+    assert broker.max_in_flight > 1
+    assert stats["processed_symbols"] == 13
+    assert stats["no_data"] == 1 and stats["up_to_date"] == 1 and stats["successful_syncs"] == 11
+    assert per_symbol["SYM00"]["existing_records"] == 10
+    assert per_symbol["SYM00"]["inserted_records"] == 20
+    assert per_symbol["SYM01"]["status"] == "up_to_date"
+    assert per_symbol["SYM05"]["broker_records"] == 30 and per_symbol["SYM05"]["inserted_records"] == 30
+    assert stats["total_inserted_records"] == 20 + 10 * 30
+
+    conn = sync.db_manager.get_connection()
+    counts = dict(conn.execute("SELECT symbol, COUNT(*) FROM market_data GROUP BY symbol").fetchall())
+    assert counts == {symbol: 30 for symbol in SYMBOLS}
+
+    # A second run finds nothing missing
+    again = sync.sync_today_intraday(SYMBOLS)
+    assert again["up_to_date"] == len(SYMBOLS) and again["total_inserted_records"] == 0
+
+
+def test_rate_limit_is_shared_across_workers(db_path):
+    broker = FakeBroker(delay=0)
+    config = IntradaySyncConfig(max_workers=4, requests_per_second=50, batch_size=100)
+    sync = TodayIntradaySync(db_path=db_path, config=config, broker=broker)
+
+    sync.sync_today_intraday(SYMBOLS)
+
+    starts = sorted(t for _, t in broker.calls)
+    assert starts[-1] - starts[0] >= (len(starts) - 1) / 50 * 0.9
+
+
+def test_rate_limiter_disabled():
+    limiter = RateLimiter(0)
+    started = time.monotonic()
+    for _ in range(1000):
+        limiter.acquire()
+    assert time.monotonic() - started < 0.5
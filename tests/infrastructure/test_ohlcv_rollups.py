@@ -0,0 +1,163 @@
+"""Materialized multi-timeframe rollups agree with resampling the raw minute bars."""
+
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.infrastructure.adapters.duckdb_adapter import DuckDBAdapter
+from src.infrastructure.core.database import DuckDBManager
+from src.infrastructure.core.ohlcv_rollups import build_rollups, rollup_for, rollups_enabled
+from src.infrastructure.core.query_api import QueryAPI
+from src.infrastructure.database.unified_duckdb import DuckDBConfig, UnifiedDuckDBManager
+from src.infrastructure.external.data_ingestion_pipeline import DataIngestionPipeline
+from src.infrastructure.repositories.duckdb_market_repo import DuckDBMarketDataRepository
+
+TIMEFRAMES = ["5T", "15T", "30T", "1H", "4H", "1D", "1W", "1M"]
+
+
+def _write_day(root, symbol, day, minutes=375, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.normal(0, 1, minutes).cumsum()
+    directory = root.joinpath(*day.split("-"))
+    directory.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame({
+        "open": close + rng.normal(0, 0.1, minutes), "high": close + 1, "low": close - 1, "close": close,
+        "volume": rng.integers(1, 1000, minutes),
+    }).to_parquet(directory / f"{symbol}_minute_{day}.parquet")
+
+
+@pytest.fixture
+def manager(tmp_path):
+    data = tmp_path / "data"
+    for seed, (symbol, day) in enumerate([("AAA", "2024-01-29"), ("AAA", "2024-01-30"), ("BBB", "2024-01-30"),
+                                          ("AAA", "2024-02-01"), ("BBB", "2024-02-01")]):
+        _write_day(data, symbol, day, seed=seed)
+    manager = DuckDBManager(db_path=str(tmp_path / "rollups.duckdb"), data_root=str(data))
+    manager.create_schema()
+    manager.connect().execute("CREATE VIEW market_data_unified AS SELECT * FROM market_data")
+    yield manager
+    manager.close()
+
+
+def _assert_matches_raw(manager, symbol, **filters):
+    routed, raw = QueryAPI(manager), QueryAPI(manager, use_rollups=False)
+    for timeframe in TIMEFRAMES:
+        expected = raw.resample_data(symbol, timeframe, **filters)
+        assert not expected.empty
+        pd.testing.assert_frame_equal(routed.resample_data(symbol, timeframe, **filters), expected,
+                                      check_exact=False, rtol=1e-12)
+
+
+def test_routing_picks_coarsest_nested_rollup():
+    assert rollup_for("5T").table == "market_data_5m"
+    assert rollup_for("4H").table == "market_data_1h"
+    assert rollup_for("1W").table == "market_data_1d"
+    assert rollup_for("1M").table == "market_data_1d"
+    assert rollup_for("1T") is None
+    assert rollup_for("1H", has_time_filter=True) is None
+
+
+def test_rollups_match_raw_and_refresh_incrementally(manager):
+    manager.load_symbol_data("AAA", date(2024, 1, 29), date(2024, 1, 30))
+    assert not rollups_enabled(manager.connect())
+
+    assert manager.create_rollups() == 2 * 75
+    _assert_matches_raw(manager, "AAA")
+
+    # Loads after the build refresh only their own days
+    conn = manager.connect()
+    untouched = conn.execute("SELECT * FROM market_data_1h WHERE date_partition = '2024-01-29' ORDER BY 2").df()
+    manager.load_symbol_data("AAA", date(2024, 2, 1), date(2024, 2, 1))
+    manager.load_symbol_data("BBB", date(2024, 1, 30), date(2024, 2, 1))
+    manager.insert_market_data(pd.DataFrame({
+        "symbol": ["AAA", "AAA"], "timestamp": [datetime(2024, 1, 30, 15, 30), datetime(2024, 1, 30, 15, 31)],
+        "open": [500.0, 1.0], "high": [900.0, 2.0], "low": [1.0, 0.5], "close": [2.0, 1.5], "volume": [7, 8],
+    }))
+
+    for symbol in ("AAA", "BBB"):
+        _assert_matches_raw(manager, symbol)
+    _assert_matches_raw(manager, "AAA", start_date=date(2024, 1, 30), end_date=date(2024, 2, 1))
+    pd.testing.assert_frame_equal(
+        conn.execute("SELECT * FROM market_data_1h WHERE date_partition = '2024-01-29' ORDER BY 2").df(), untouched)
+
+    daily = QueryAPI(manager).resample_data("AAA", "1D", start_date=date(2024, 1, 30), end_date=date(2024, 1, 30))
+    assert daily["high"].iloc[0] == 900.0 and daily["tick_count"].iloc[0] == 377
+
+    # Time-of-day filters still read the minute bars
+    morning = QueryAPI(manager).resample_data("AAA", "1H", start_time="09:15", end_time="10:14")
+    assert morning["tick_count"].tolist() == [45, 15, 45, 15, 45, 15]
+
+
+def test_rebuild_replaces_rows(manager):
+    manager.load_symbol_data("BBB", date(2024, 1, 30), date(2024, 1, 30))
+    conn = manager.connect()
+    build_rollups(conn)
+    build_rollups(conn)
+    assert conn.execute("SELECT count(*), sum(tick_count) FROM market_data_1d").fetchone() == (1, 375)
+
+
+def test_bulk_ingestion_refreshes_built_rollups(tmp_path):
+    adapter = DuckDBAdapter(database_path=str(tmp_path / "ingest.duckdb"))
+    schema = adapter.db_manager.schema_manager._get_default_schema()
+    with adapter.db_manager.connection_pool.writer() as conn:
+        conn.execute(schema["market_data"]["create_sql"])
+        build_rollups(conn)
+    pipeline = DataIngestionPipeline(DuckDBMarketDataRepository(adapter))
+
+    data = tmp_path / "data"
+    for day in ("2024-01-01", "2024-01-02"):
+        directory = data.joinpath(*day.split("-"))
+        directory.mkdir(parents=True)
+        stamps = pd.date_range(f"{day} 09:15", periods=60, freq="1min")
+        pd.DataFrame({"timestamp": stamps, "open": 1.0, "high": range(60), "low": 0.5, "close": 1.5,
+                      "volume": 10}).to_parquet(directory / f"AAA_minute_{day}.parquet")
+
+    assert pipeline.ingest_from_parquet_files(str(data), batch_size=1)["total_records"] == 120
+
+    with adapter.db_manager.connection_pool.writer() as conn:
+        assert conn.execute("SELECT count(*), sum(tick_count), sum(volume) FROM market_data_15m").fetchone() \
+            == (8, 120, 1200)
+        assert conn.execute("SELECT high FROM market_data_1d ORDER BY timestamp").fetchall() == [(59.0,), (59.0,)]
+
+
+def _bars(day, minutes=120, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 50 + rng.normal(0, 1, minutes).cumsum()
+    return pd.DataFrame({
+        "timestamp": pd.date_range(f"{day} 09:15", periods=minutes, freq="1min"),
+        "open": close, "high": close + 1, "low": close - 1, "close": close,
+        "volume": rng.integers(1, 1000, minutes),
+    })
+
+
+@pytest.mark.parametrize("use_parquet_catalog", [True, False])
+def test_parquet_lake_writes_refresh_built_rollups(tmp_path, use_parquet_catalog):
+    data = tmp_path / "data"
+    data.joinpath("2024", "01", "29").mkdir(parents=True)
+    _bars("2024-01-29", minutes=375).to_parquet(data / "2024" / "01" / "29" / "AAA_minute_2024-01-29.parquet")
+    config = DuckDBConfig(database_path=str(tmp_path / "lake.duckdb"), enable_httpfs=False,
+                          parquet_root=str(data), use_parquet_catalog=use_parquet_catalog)
+
+    def hourly(conn, source):
+        return conn.execute(f"""
+            SELECT symbol, time_bucket(INTERVAL '1 hour', timestamp) AS bucket, FIRST(open ORDER BY timestamp),
+                   MAX(high), MIN(low), LAST(close ORDER BY timestamp), SUM(volume)
+            FROM {source} GROUP BY ALL ORDER BY ALL
+        """).fetchall()
+
+    with UnifiedDuckDBManager(config) as lake:
+        with lake.connection_pool.writer() as conn:
+            build_rollups(conn)
+
+        # A new day and a re-delivered day, both through the lake writer
+        lake.write_daily_parquet("BBB", date(2024, 1, 30), _bars("2024-01-30", seed=1))
+        lake.write_daily_parquet("AAA", date(2024, 1, 29), _bars("2024-01-29", seed=2))
+
+        with lake.connection_pool.writer() as conn:
+            expected = hourly(conn, "market_data_unified")
+            assert {row[0] for row in expected} == {"AAA", "BBB"}
+            assert hourly(conn, "market_data_1h") == expected
+            assert conn.execute("SELECT symbol, tick_count FROM market_data_1d ORDER BY 1").fetchall() \
+                == [("AAA", 120), ("BBB", 120)]
@@ -0,0 +1,160 @@
+"""Tests for the Arrow result cache and its use in FastDuckDBConnector."""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import pyarrow as pa
+import pytest
+
+from src.infrastructure.services.result_cache import (
+    ArrowResultCache,
+    TableVersions,
+    normalize_sql,
+    referenced_tables,
+    written_table,
+)
+
+
+def _table(n):
+    return pa.table({"x": pa.array(range(n), type=pa.int64())})
+
+
+class TestSqlHelpers:
+
+    def test_normalize_sql_ignores_layout_but_keeps_literals(self):
+        a = "SELECT symbol\n  FROM market_data\n WHERE symbol = 'Reliance';"
+        b = "select   symbol from MARKET_DATA where SYMBOL = 'Reliance'"
+        assert normalize_sql(a) == normalize_sql(b)
+        assert normalize_sql(a) != normalize_sql(b.replace("'Reliance'", "'RELIANCE'"))
+
+    def test_referenced_and_written_tables(self):
+        query = """
+        WITH t AS (SELECT * FROM main.market_data WHERE note = 'from fake')
+        SELECT * FROM t JOIN symbols s ON s.symbol = t.symbol
+        """
+        assert referenced_tables(query) == ("market_data", "symbols", "t")
+        assert written_table("INSERT INTO market_data SELECT * FROM df") == "market_data"
+        assert written_table("insert or replace into Positions VALUES (1)") == "positions"
+        assert written_table("CREATE OR REPLACE TABLE main.daily AS SELECT 1") == "daily"
+        assert written_table("SELECT * FROM market_data") is None
+
+
+class TestArrowResultCache:
+
+    def test_lru_eviction_is_bounded_by_bytes(self):
+        size = _table(100).nbytes
+        cache = ArrowResultCache(max_bytes=3 * size, versions=TableVersions())
+        for i in range(3):
+            cache.put(i, _table(100))
+        assert cache.get(0) is not None  # 0 becomes most recently used
+
+        cache.put(3, _table(100))
+        assert 1 not in cache
+        assert [k for k in (0, 2, 3) if k in cache] == [0, 2, 3]
+        assert cache.nbytes == 3 * size
+        assert cache.get_stats().evictions == 1
+
+        assert cache.put("huge", _table(1000)) is False
+        assert "huge" not in cache
+
+    def test_hit_returns_cached_table_without_copy(self):
+        cache = ArrowResultCache(versions=TableVersions())
+        table = _table(10)
+        cache.put_query("SELECT x FROM t", None, table)
+        assert cache.get_query("select x\nfrom t") is table
+
+    def test_write_version_invalidates_dependent_entries(self):
+        versions = TableVersions()
+        cache = ArrowResultCache(versions=versions)
+        cache.put_query("SELECT * FROM market_data", None, _table(1))
+        cache.put_query("SELECT * FROM symbols", None, _table(1))
+
+        versions.bump("market_data")
+        assert cache.get_query("SELECT * FROM market_data") is None
+        assert cache.get_query("SELECT * FROM symbols") is not None
+        assert cache.get_stats().invalidations == 1
+
+    def test_base_table_write_invalidates_derived_view(self):
+        versions = TableVersions()
+        cache = ArrowResultCache(versions=versions)
+        cache.put_query("SELECT * FROM market_data_unified", None, _table(1))
+
+        versions.bump("market_data")
+        assert cache.get_query("SELECT * FROM market_data_unified") is None
+
+        cache.put_query("SELECT * FROM market_data", None, _table(1))
+        versions.bump("market_data_unified")
+        assert cache.get_query("SELECT * FROM market_data") is not None
+
+    def test_write_during_query_invalidates_result(self):
+        versions = TableVersions()
+        cache = ArrowResultCache(versions=versions)
+        before = cache.snapshot(referenced_tables("SELECT * FROM market_data"))
+        versions.bump("market_data")
+        cache.put_query("SELECT * FROM market_data", None, _table(1), versions=before)
+        assert cache.get_query("SELECT * FROM market_data") is None
+
+    def test_ttl_expiry_and_params_in_key(self):
+        cache = ArrowResultCache(ttl=0.05, versions=TableVersions())
+        cache.put_query("SELECT ? FROM t", [1], _table(1))
+        assert cache.get_query("SELECT ? FROM t", [2]) is None
+        assert cache.get_query("SELECT ? FROM t", [1]) is not None
+        time.sleep(0.1)
+        assert cache.get_query("SELECT ? FROM t", [1]) is None
+        assert cache.get_stats().expirations == 1
+
+    def test_generic_values_use_size_estimate(self):
+        cache = ArrowResultCache(versions=TableVersions())
+        rows = [{"symbol": "A", "score": 1.0}, {"symbol": "B", "score": 2.0}]
+        cache.put("crp|2025-09-01", rows, ["market_data"])
+        assert cache.get("crp|2025-09-01") is rows
+        assert cache.nbytes > 0
+
+
+@pytest.fixture
+def fast_connector(tmp_path):
+    import duckdb
+    from src.infrastructure.services.fast_duckdb_connector import ConnectionPool, FastDuckDBConnector
+
+    db_path = str(tmp_path / "cache.duckdb")
+    # Plain connections: the pool's httpfs install needs network access
+    with patch('src.infrastructure.services.fast_duckdb_connector.get_settings') as mock_settings, \
+            patch.object(ConnectionPool, '_create_connection', lambda self: duckdb.connect(db_path)):
+        perf = MagicMock()
+        perf.is_fast_mode = True
+        perf.connection_pool_size = 2
+        perf.connection_pool_timeout = 30.0
+        perf.query_cache_ttl = 300
+        mock_settings.return_value.performance = perf
+        mock_settings.return_value.database = MagicMock(path=None)
+
+        connector = FastDuckDBConnector(db_path=db_path, pool_size=2)
+        yield connector
+        connector.close()
+
+
+class TestFastDuckDBConnectorCache:
+
+    def test_long_queries_are_cached_and_writes_invalidate(self, fast_connector):
+        fast_connector.execute_query("CREATE TABLE prices (symbol VARCHAR, close DOUBLE)")
+        fast_connector.execute_query("INSERT INTO prices VALUES ('A', 1.0)")
+
+        padding = " ".join(f"AND close > {-i}" for i in range(200))
+        query = f"SELECT symbol, close FROM prices WHERE close > -1 {padding} ORDER BY symbol"
+        assert len(query) > 1000
+
+        assert fast_connector.execute_query(query) == [("A", 1.0)]
+        assert len(fast_connector._query_cache) == 1
+        assert fast_connector.execute_query(query) == [("A", 1.0)]
+        assert fast_connector._query_cache.get_stats().hits == 1
+
+        fast_connector.execute_query("INSERT INTO prices VALUES ('B', 2.0)")
+        assert fast_connector.execute_query(query) == [("A", 1.0), ("B", 2.0)]
+
+    def test_arrow_and_dataframe_results_share_cache(self, fast_connector):
+        first = fast_connector.execute_query_arrow("SELECT 42 AS answer")
+        assert fast_connector.execute_query_arrow("select 42 as answer") is first
+        assert fast_connector.execute_query_df("SELECT 42 AS answer")["answer"].tolist() == [42]
+        metrics = fast_connector.get_performance_metrics()
+        assert metrics['cache_size'] == 1
+        assert metrics['cache_bytes'] == first.nbytes
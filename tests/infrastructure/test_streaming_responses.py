@@ -0,0 +1,109 @@
+"""Content negotiation and streamed Arrow/Parquet/NDJSON responses in the REST API."""
+
+import io
+import json
+
+import duckdb
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from fastapi.testclient import TestClient
+
+from src.infrastructure.core import api_server
+from src.infrastructure.core.query_api import QueryAPI
+from src.infrastructure.core.response_formats import (
+    ARROW_STREAM,
+    JSON,
+    NDJSON,
+    PARQUET,
+    iter_encoded,
+    negotiate_format,
+)
+from src.infrastructure.core.singleton_database import SimpleDuckDBConnector
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    db_path = str(tmp_path / "api.duckdb")
+    conn = duckdb.connect(db_path)
+    for table in ("market_data", "market_data_unified"):
+        conn.execute(f"""
+            CREATE TABLE {table} AS
+            SELECT 'TEST' AS symbol,
+                   TIMESTAMP '2024-01-01 09:15:00' + to_minutes(i::BIGINT) AS timestamp,
+                   (100.0 + i)::DOUBLE AS open, (101.0 + i)::DOUBLE AS high,
+                   (99.0 + i)::DOUBLE AS low, (100.5 + i)::DOUBLE AS close,
+                   (1000 + i)::BIGINT AS volume, DATE '2024-01-01' AS date_partition
+            FROM range(600) t(i)
+        """)
+    conn.close()
+    return SimpleDuckDBConnector(db_path, read_only=True)
+
+
+@pytest.fixture
+def client(db_manager):
+    api_server.app.dependency_overrides[api_server.get_db_manager] = lambda: db_manager
+    api_server.app.dependency_overrides[api_server.get_query_api] = lambda: QueryAPI(db_manager)
+    yield TestClient(api_server.app)
+    api_server.app.dependency_overrides.clear()
+
+
+class TestNegotiation:
+
+    def test_accept_header_ranking(self):
+        assert negotiate_format(None) == JSON
+        assert negotiate_format("*/*") == JSON
+        assert negotiate_format(f"text/html, {PARQUET};q=0.5, {ARROW_STREAM}") == ARROW_STREAM
+        assert negotiate_format(f"{ARROW_STREAM};q=0, {NDJSON}") == NDJSON
+
+    def test_format_parameter_overrides_accept(self):
+        assert negotiate_format(ARROW_STREAM, "parquet") == PARQUET
+        with pytest.raises(ValueError):
+            negotiate_format(None, "xml")
+
+
+def test_encoders_emit_one_chunk_per_batch():
+    table = pa.table({"x": list(range(10))})
+    reader = pa.RecordBatchReader.from_batches(table.schema, table.to_batches(max_chunksize=3))
+    chunks = list(iter_encoded(reader, ARROW_STREAM))
+    assert len(chunks) >= 4
+    assert pa.ipc.open_stream(b"".join(chunks)).read_all().equals(table)
+
+
+class TestMarketDataEndpoint:
+
+    def test_arrow_stream(self, client):
+        response = client.post("/market-data", json={"symbol": "TEST"}, headers={"Accept": ARROW_STREAM})
+        assert response.status_code == 200
+        assert response.headers["content-type"] == ARROW_STREAM
+        table = pa.ipc.open_stream(response.content).read_all()
+        assert table.num_rows == 600
+        assert table.column_names == ["symbol", "timestamp", "open", "high", "low", "close", "volume",
+                                      "date_partition"]
+
+    def test_parquet_and_ndjson(self, client):
+        response = client.post("/market-data?format=parquet", json={"symbol": "TEST", "limit": 50})
+        assert response.headers["content-type"] == PARQUET
+        assert pq.read_table(io.BytesIO(response.content)).num_rows == 50
+
+        response = client.post("/market-data", json={"symbol": "TEST", "limit": 2},
+                               headers={"Accept": NDJSON})
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert rows[0]["timestamp"] == "2024-01-01 09:15:00"
+        assert rows[1]["date_partition"] == "2024-01-01"
+
+    def test_unknown_format_is_rejected(self, client):
+        response = client.post("/market-data?format=xml", json={"symbol": "TEST"})
+        assert response.status_code == 400
+
+
+def test_resample_streams_arrow_with_timeframe(client):
+    response = client.post("/resample?format=arrow", json={"symbol": "TEST", "timeframe": "1H"})
+    assert response.status_code == 200
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.num_rows == 11  # 09:15-19:14 in hourly buckets
+    assert set(table.column("timeframe").to_pylist()) == {"1H"}
+    assert sum(table.column("tick_count").to_pylist()) == 600
+
+    json_rows = client.post("/resample", json={"symbol": "TEST", "timeframe": "1H"}).json()
+    assert json_rows["count"] == table.num_rows
@@ -0,0 +1,158 @@
+"""Tests for micro-batched tick ingestion in the DuckDB realtime framework."""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import duckdb
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pytest
+
+from src.infrastructure.duckdb_framework.realtime import MarketData, RealtimeManager, TickIngestionBuffer
+
+START = datetime(2025, 9, 1, 9, 15)
+
+
+@pytest.fixture
+def connection():
+    conn = duckdb.connect()
+    conn.execute("""
+    CREATE TABLE market_data (
+        symbol VARCHAR, timestamp TIMESTAMP, timeframe VARCHAR,
+        open DOUBLE, high DOUBLE, low DOUBLE, close DOUBLE,
+        volume BIGINT, date_partition DATE,
+        PRIMARY KEY (symbol, timestamp, timeframe)
+    )
+    """)
+    yield conn
+    conn.close()
+
+
+def _tick(i):
+    return MarketData(symbol=f"SYM{i % 3}", timestamp=START + timedelta(seconds=i),
+                      price=100.0 + i, volume=10 * i)
+
+
+def _rows(connection):
+    return connection.execute(
+        "SELECT symbol, timestamp, close, volume, date_partition FROM market_data ORDER BY timestamp"
+    ).fetchall()
+
+
+@pytest.mark.asyncio
+async def test_flushes_by_size_and_on_stop(connection, tmp_path):
+    buffer = TickIngestionBuffer(connection, batch_size=4, flush_interval=60, spill_dir=str(tmp_path))
+    await buffer.start()
+    for i in range(10):
+        await buffer.append(_tick(i))
+    await buffer._queue.join()
+
+    assert len(_rows(connection)) == 8  # two full batches; two ticks still buffered
+    assert len(buffer) == 2
+
+    await buffer.stop()
+    rows = _rows(connection)
+    assert [r[0] for r in rows] == [f"SYM{i % 3}" for i in range(10)]
+    assert rows[-1][1:] == (START + timedelta(seconds=9), 109.0, 90, START.date())
+    assert list(tmp_path.glob("*.arrow")) == []
+
+
+@pytest.mark.asyncio
+async def test_flushes_partial_buffer_after_interval(connection):
+    buffer = TickIngestionBuffer(connection, batch_size=1000, flush_interval=0.05)
+    await buffer.start()
+    await buffer.append(_tick(0))
+    await asyncio.sleep(0.2)
+    assert len(_rows(connection)) == 1
+    await buffer.stop()
+
+
+@pytest.mark.asyncio
+async def test_bounded_queue_applies_backpressure(connection):
+    buffer = TickIngestionBuffer(connection, batch_size=2, flush_interval=60, max_pending_batches=1)
+    # No writer running: one sealed batch fills the queue, the next seal must wait
+    for i in range(2):
+        await buffer.append(_tick(i))
+    assert buffer.pending_batches == 1
+
+    await buffer.append(_tick(2))
+    blocked = asyncio.create_task(buffer.append(_tick(3)))
+    await asyncio.sleep(0.05)
+    assert not blocked.done()
+
+    await buffer.start()
+    await asyncio.wait_for(blocked, timeout=5)
+    await buffer.stop()
+    assert len(_rows(connection)) == 4
+
+
+def _spill_file(path, symbols, minutes, prices):
+    batch = pa.table({
+        "symbol": symbols,
+        "timestamp": pa.array([START + timedelta(minutes=m) for m in minutes], type=pa.timestamp("us")),
+        "price": prices,
+        "volume": pa.array([3 + i for i in range(len(symbols))], type=pa.int64()),
+    })
+    with ipc.new_file(str(path), batch.schema) as writer:
+        writer.write_table(batch)
+    return batch
+
+
+@pytest.mark.asyncio
+async def test_spilled_batches_are_replayed_on_start(connection, tmp_path):
+    _spill_file(tmp_path / "ticks-000000000001-1.arrow", ["A", "B"], [0, 1], [1.5, 2.5])
+
+    buffer = TickIngestionBuffer(connection, spill_dir=str(tmp_path))
+    await buffer.start()
+    await buffer.stop()
+
+    assert [(r[0], r[2], r[3]) for r in _rows(connection)] == [("A", 1.5, 3), ("B", 2.5, 4)]
+    assert list(tmp_path.glob("*.arrow")) == []
+
+
+@pytest.mark.asyncio
+async def test_replaying_a_committed_batch_skips_stored_ticks(connection, tmp_path):
+    buffer = TickIngestionBuffer(connection, spill_dir=str(tmp_path))
+    # Committed just before a crash, so its spill file was never deleted
+    batch = _spill_file(tmp_path / "ticks-000000000001-1.arrow", ["A", "B"], [0, 1], [1.5, 2.5])
+    assert buffer._write_batch(batch) == 2
+    # A later batch overlapping it (and repeating one tick) must still land its new rows
+    _spill_file(tmp_path / "ticks-000000000002-1.arrow", ["B", "C", "C"], [1, 2, 2], [9.0, 3.5, 3.5])
+
+    await buffer.start()
+    await buffer.stop()
+
+    assert [(r[0], r[2]) for r in _rows(connection)] == [("A", 1.5), ("B", 2.5), ("C", 3.5)]
+    assert list(tmp_path.glob("*.arrow")) == []
+
+
+def test_unreplayable_spill_files_are_quarantined(connection, tmp_path):
+    (tmp_path / "ticks-000000000001-1.arrow").write_bytes(b"not an arrow file")
+
+    buffer = TickIngestionBuffer(connection, spill_dir=str(tmp_path))
+    assert buffer.recover() == 0
+
+    assert list(tmp_path.glob("*.arrow")) == []
+    assert [p.name for p in (tmp_path / "quarantine").iterdir()] == ["ticks-000000000001-1.arrow"]
+    assert buffer.recover() == 0
+
+
+@pytest.mark.asyncio
+async def test_realtime_manager_buffers_processed_ticks(connection, tmp_path):
+    config = RealtimeManager(connection).get_default_config()
+    config.update(ingest_batch_size=2, ingest_spill_dir=str(tmp_path))
+    manager = RealtimeManager(connection, config)
+    received = []
+    manager.subscribe("SYM0", received.append)
+
+    await manager.ingestion.start()
+    for i in range(3):
+        tick = _tick(i)
+        await manager._process_market_data({
+            "symbol": tick.symbol, "timestamp": tick.timestamp.isoformat(),
+            "price": tick.price, "volume": tick.volume,
+        })
+    await manager.ingestion.stop()
+
+    assert len(_rows(connection)) == 3
+    assert [t.symbol for t in received] == ["SYM0"]
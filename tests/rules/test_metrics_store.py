@@ -0,0 +1,147 @@
+"""Rollup-backed performance metrics: per-thread buffers, histograms, retention."""
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.rules.monitoring.metrics_store import (
+    HISTOGRAM_BOUNDS,
+    MetricsStore,
+    RetentionPolicy,
+    histogram_bucket,
+    histogram_percentile,
+)
+from src.rules.monitoring.performance_analytics import PerformanceAnalytics
+from src.rules.monitoring.performance_monitor import (
+    PerformanceMonitor,
+    RuleExecutionMetric,
+    SystemHealthMetric,
+)
+
+NOW = datetime(2024, 3, 10, 12, 0)
+
+
+@pytest.fixture
+def store():
+    store = MetricsStore(":memory:", retention=RetentionPolicy(minute_days=1, hour_days=7, day_days=None))
+    yield store
+    store.close()
+
+
+def test_histogram_buckets_and_percentiles():
+    assert histogram_bucket(0.0005) == 0
+    assert histogram_bucket(0.001) == 0
+    assert histogram_bucket(0.3) == HISTOGRAM_BOUNDS.index(0.5)
+    assert histogram_bucket(60) == len(HISTOGRAM_BOUNDS)
+
+    counts = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+    counts[histogram_bucket(0.02)] = 90
+    counts[histogram_bucket(3.0)] = 10
+    assert histogram_percentile(counts, 0.5) == 0.05
+    assert histogram_percentile(counts, 0.95) == 5.0
+    assert histogram_percentile([0] * len(counts), 0.5) == 0.0
+
+
+def test_concurrent_recording_rolls_up_per_resolution(store):
+    def worker(n):
+        for i in range(250):
+            store.record_rule(f"rule-{n % 2}", 0.02 if i % 10 else 2.0, success=i % 5 != 0,
+                              signals_generated=1, timestamp=NOW + timedelta(seconds=i))
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert store.pending_events == 1000
+    assert store.flush() == 1000
+    assert store.pending_events == 0 and store.dropped_events == 0
+
+    # A second flush for the same buckets merges into the existing rows
+    store.record_rule("rule-0", 0.001, success=True, timestamp=NOW)
+    store.flush()
+
+    counts = store.conn.execute(
+        "SELECT resolution, count(*), sum(executions) FROM rule_rollups GROUP BY 1 ORDER BY 1").fetchall()
+    # 250 seconds span 5 minutes; both rules share each bucket
+    assert counts == [("day", 2, 1001), ("hour", 2, 1001), ("minute", 10, 1001)]
+
+    summary = store.rule_summary("rule-0", NOW - timedelta(hours=1))
+    assert summary["executions"] == 501 and summary["successes"] == 401
+    assert summary["signals"] == 500
+    assert summary["min_time"] == 0.001 and summary["max_time"] == 2.0
+    # The 2.5s bucket bound is clamped to the observed maximum
+    assert summary["p50_time"] == 0.05 and summary["p95_time"] == 2.0
+
+    series = store.rule_series("rule-1", NOW - timedelta(hours=1), resolution="minute")
+    assert series["executions"].tolist() == [120, 120, 120, 120, 20]
+    assert series["success_rate"].iloc[0] == pytest.approx(0.8)
+
+
+def test_percentiles_stay_within_observed_range(tmp_path):
+    monitor = PerformanceMonitor(db_path=str(tmp_path / "performance.db"))
+    start = datetime.now() - timedelta(minutes=30)
+    for i, execution_time in enumerate([0.30, 0.32, 0.35, 0.38]):
+        monitor.record_rule_execution(RuleExecutionMetric(
+            rule_id="gap-scan", execution_time=execution_time, success=True,
+            signals_generated=0, timestamp=start + timedelta(minutes=i)))
+
+    summary = monitor.get_rule_performance_summary("gap-scan", days=1)
+    assert summary["p95_execution_time"] == 0.38
+
+    rollup = monitor.metrics_store.rule_summary("gap-scan", start - timedelta(hours=1))
+    assert rollup["min_time"] <= rollup["p50_time"] <= rollup["p95_time"] <= rollup["max_time"]
+
+
+def test_retention_downsamples_and_queries_pick_coarser_rollups(store):
+    old = datetime.now() - timedelta(days=3)
+    for i in range(6):
+        store.record_rule("nightly-scan", 0.4, success=True, timestamp=old + timedelta(minutes=20 * i))
+        store.record_system(50.0 + i, 60.0, 1000.0 + i, 40.0, 10, 8, timestamp=old + timedelta(minutes=20 * i))
+    store.flush()
+
+    assert store.apply_retention() == 12  # 6 rule + 6 system minute rows
+    resolutions = store.conn.execute("SELECT DISTINCT resolution FROM rule_rollups ORDER BY 1").fetchall()
+    assert resolutions == [("day",), ("hour",)]
+
+    since = datetime.now() - timedelta(days=5)
+    assert store.resolution_for(since) == "hour"
+    assert store.rule_summary("nightly-scan", since)["executions"] == 6
+    system = store.system_summary(since)
+    assert system["samples"] == 6 and system["peak_memory_mb"] == 1005.0
+    assert system["avg_cpu_percent"] == pytest.approx(52.5)
+
+
+def test_monitor_and_analytics_read_rollups(tmp_path):
+    db_path = str(tmp_path / "performance.db")
+    monitor = PerformanceMonitor(db_path=db_path)
+    start = datetime.now() - timedelta(hours=6)
+    for hour in range(6):
+        for i in range(10):
+            monitor.record_rule_execution(RuleExecutionMetric(
+                rule_id="breakout-scan", execution_time=0.1 * (hour + 1), success=True,
+                signals_generated=2, timestamp=start + timedelta(hours=hour, minutes=i)))
+        monitor.record_system_metric(SystemHealthMetric(
+            cpu_percent=20.0 * (hour + 1), memory_percent=50.0, memory_used_mb=512.0,
+            disk_usage_percent=30.0, network_connections=5, active_threads=4,
+            timestamp=start + timedelta(hours=hour)))
+
+    summary = monitor.get_rule_performance_summary("breakout-scan", days=1)
+    assert summary["total_executions"] == 60 and summary["total_signals"] == 120
+    assert summary["avg_execution_time"] == pytest.approx(0.35)
+    assert monitor.get_system_performance_summary(hours=24)["data_points"] == 6
+    assert (tmp_path / "performance.duckdb").exists()
+
+    analytics = PerformanceAnalytics(db_path=db_path, metrics_store=monitor.metrics_store)
+    trends = analytics.analyze_performance_trends(days=1)
+    by_name = {t.metric_name: t for t in trends["rule_trends"] + trends["system_trends"]}
+    assert by_name["breakout-scan Execution Time"].trend_direction == "increasing"
+    assert by_name["breakout-scan Success Rate"].trend_direction == "stable"
+    assert by_name["CPU Usage"].trend_direction == "increasing"
+    assert analytics._calculate_summary_statistics(1)["rule_stats"]["total_executions"] == 60
+
+    paths = monitor.metrics_store.export_parquet(str(tmp_path / "export"))
+    assert [p.rsplit("/", 1)[-1] for p in paths] == ["rule_rollups.parquet", "system_rollups.parquet"]
+    monitor.metrics_store.close()
@@ -478,3 +478,132 @@ class TestExecutionPipeline:
         # Test CSV export
         csv_export = pipeline.export_results(result, 'csv')
         assert 'symbol,rule_id' in csv_export
+
+
+class TestCompiledRuleExecution:
+    """Compiled rule plans and cached results against a real DuckDB connection."""
+
+    @pytest.fixture
+    def duckdb_engine(self):
+        import duckdb
+
+        conn = duckdb.connect()
+        conn.execute("""
+            CREATE TABLE market_data AS
+            SELECT 'S' || (i % 3) AS symbol,
+                   TIMESTAMP '2025-09-08 09:15:00' + to_days(CAST(d AS INTEGER)) + to_minutes(CAST(i // 3 AS INTEGER)) AS timestamp,
+                   100.0 + (i // 3) * (1 + d) AS open, 101.0 + (i // 3) * (1 + d) AS high,
+                   99.0 + (i // 3) * (1 + d) AS low, 100.0 + (i // 3) * (1 + d) AS close,
+                   CAST(1000 + i * 10 AS BIGINT) AS volume,
+                   DATE '2025-09-08' + CAST(d AS INTEGER) AS date_partition
+            FROM range(0, 90) r(i), range(0, 2) t(d)
+        """)
+        engine = RuleEngine(db_connection=conn)
+        engine.load_rules([{
+            "rule_id": f"compiled-{rule_type}",
+            "name": f"Compiled {rule_type} rule",
+            "rule_type": rule_type,
+            "conditions": conditions,
+            "actions": {"signal_type": "BUY"},
+            "metadata": {"author": "test", "created_at": datetime.now().isoformat(), "version": "1.0.0"}
+        } for rule_type, conditions in [
+            ("breakout", {"breakout_conditions": {"min_price_move_pct": 0.5}}),
+            ("crp", {"crp_conditions": {"close_threshold_pct": 2.0, "range_threshold_pct": 50.0}}),
+        ]])
+        assert len(engine.rules) == 2
+        yield engine, conn
+        conn.close()
+
+    def test_plan_compiled_once_across_dates(self, duckdb_engine):
+        engine, _ = duckdb_engine
+        days = [date(2025, 9, 8), date(2025, 9, 9)]
+
+        results = {day: engine.execute_rule('compiled-breakout', day) for day in days}
+        crp = engine.execute_rule('compiled-crp', days[0])
+
+        assert all(r['success'] and r['signals_generated'] > 0 for r in results.values())
+        assert crp['success'] and crp['query_results'] > 0
+        assert max(s['price'] for s in results[days[0]]['signals']) == 129
+        assert max(s['price'] for s in results[days[1]]['signals']) == 158
+
+        stats = engine.get_engine_stats()
+        assert stats['query_cache_stats']['cache_size'] == 2
+        assert stats['query_cache_stats']['cache_hits'] == 1
+        assert stats['prepared_statements'] == 2
+
+        sql, params = engine.query_builder.build_query(RuleType.BREAKOUT, engine.rules['compiled-breakout']['conditions'],
+                                                       days[1])
+        assert '2025-09-09' not in sql and params[0] == '2025-09-09'
+
+    def test_results_cached_per_date_until_data_load(self, duckdb_engine):
+        from src.infrastructure.services.result_cache import bump_table_version
+
+        engine, conn = duckdb_engine
+        day = date(2025, 9, 8)
+
+        with patch.object(engine, '_execute_query', wraps=engine._execute_query) as spy:
+            first = engine.execute_rule('compiled-breakout', day)
+            second = engine.execute_rule('compiled-breakout', day)
+            assert spy.call_count == 1
+            assert second['signals_generated'] == first['signals_generated']
+
+            engine.execute_rule('compiled-breakout', date(2025, 9, 9))
+            assert spy.call_count == 2
+
+            conn.execute("DELETE FROM market_data WHERE symbol = 'S0'")
+            bump_table_version('market_data')
+            third = engine.execute_rule('compiled-breakout', day)
+            assert spy.call_count == 3
+            assert third['signals_generated'] < first['signals_generated']
+
+    def test_query_errors_are_reported(self, duckdb_engine):
+        engine, conn = duckdb_engine
+        conn.execute("DROP TABLE market_data")
+
+        result = engine.execute_rule('compiled-breakout', date(2025, 9, 8))
+
+        assert not result['success']
+        assert len(engine.result_cache) == 0
+
+    def test_fused_batch_matches_individual_execution(self, duckdb_engine):
+        engine, _ = duckdb_engine
+        day = date(2025, 9, 8)
+        engine.load_rules([{
+            "rule_id": rule_id,
+            "name": f"Fusion rule {rule_id}",
+            "rule_type": rule_type,
+            "conditions": conditions,
+            "actions": {"signal_type": "BUY"},
+            "metadata": {"author": "test", "created_at": datetime.now().isoformat(), "version": "1.0.0"}
+        } for rule_id, rule_type, conditions in [
+            ("fused-move", "breakout", {"breakout_conditions": {"min_price_move_pct": 0.9}}),
+            ("fused-volume-mult", "breakout", {"breakout_conditions": {"min_volume_multiplier": 1.01},
+                                               "market_conditions": {"min_price": 110}}),
+            ("fused-none", "breakout", {"breakout_conditions": {"min_price_move_pct": 50}}),
+            ("fused-rvol", "volume", {"volume_conditions": {"relative_volume": 1.01}}),
+        ]])
+        rule_ids = list(engine.rules)
+
+        groups, standalone = engine.plan_fusion(rule_ids)
+        assert groups == [["compiled-breakout", "fused-move", "fused-volume-mult", "fused-none"]]
+        assert standalone == ["compiled-crp", "fused-rvol"]
+
+        individual = RuleEngine(db_connection=engine.db_connection)
+        individual.load_rules([engine.rules[r] for r in rule_ids])
+        expected = individual.execute_rules_batch(rule_ids, day, fuse=False)
+
+        with patch.object(engine, '_execute_query', wraps=engine._execute_query) as spy:
+            fused = engine.execute_rules_batch(rule_ids, day)
+
+        assert spy.call_count == 3  # one fused breakout scan, plus crp and volume on their own
+        assert fused['fused_groups'] == 1
+        assert fused['successful_executions'] == len(rule_ids) and fused['failed_executions'] == 0
+        assert fused['total_signals'] == expected['total_signals']
+        for rule_id in rule_ids:
+            got, want = fused['rule_results'][rule_id], expected['rule_results'][rule_id]
+            assert got['query_results'] == want['query_results']
+            assert sorted((s['symbol'], s['price']) for s in got['signals']) == \
+                sorted((s['symbol'], s['price']) for s in want['signals'])
+        assert fused['rule_results']['fused-none']['signals_generated'] == 0
+        assert fused['rule_results']['fused-move']['fused_rules'] == 4
+        assert engine.get_rule_stats('fused-move')['execution_count'] == 1
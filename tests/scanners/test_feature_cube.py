@@ -0,0 +1,198 @@
+from datetime import date, datetime, time
+
+import duckdb
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.application.scanners.backtests.feature_cube import (
+    FeatureCube,
+    composite_scores,
+    evaluate_feature_arrays,
+    evaluate_parameter_grid,
+)
+from src.application.scanners.backtests.optimization_engine import MiniBacktester, OptimizationEngine
+from src.infrastructure.core.singleton_database import create_db_manager
+
+START, END = date(2025, 8, 1), date(2025, 9, 30)
+METRICS = ["total_return", "total_trades", "win_rate", "sharpe_ratio", "max_drawdown", "final_portfolio"]
+
+
+def _bars():
+    rng = np.random.default_rng(7)
+    frames = []
+    for day in pd.bdate_range(START, END):
+        times = pd.date_range(datetime.combine(day, time(9, 15)), datetime.combine(day, time(9, 50)), freq="1min")
+        for i in range(12):
+            n = len(times) if i != 3 else 15  # one thin symbol below MIN_BARS
+            close = 100 + 10 * i + np.cumsum(rng.normal(0, 0.4, n))
+            frames.append(pd.DataFrame({
+                "symbol": f"SYM{i:02d}",
+                "timestamp": times[:n],
+                "open": close,
+                "high": close + 0.1,
+                "low": close - 0.1,
+                "close": close,
+                "volume": rng.integers(50_000, 400_000, n).astype(float),
+            }))
+    return pd.concat(frames, ignore_index=True)
+
+
+@pytest.fixture(scope="module")
+def db_manager(tmp_path_factory):
+    db_path = str(tmp_path_factory.mktemp("cube") / "bars.duckdb")
+    with duckdb.connect(db_path) as conn:
+        conn.register("bars_df", _bars())
+        conn.execute(
+            "CREATE TABLE market_data_unified AS "
+            "SELECT *, CAST(timestamp AS DATE) AS date_partition FROM bars_df"
+        )
+    return create_db_manager(db_path=db_path)
+
+
+GRID = [
+    {"min_score_threshold": 0.2, "obv_slope_threshold": 0.1, "volume_ratio_threshold": 1.0,
+     "risk_per_trade": 0.01, "leverage": 3},
+    {"min_score_threshold": 0.4, "obv_slope_threshold": 0.2, "volume_ratio_threshold": 1.2,
+     "risk_per_trade": 0.02, "leverage": 5},
+    {"min_score_threshold": 0.5, "obv_slope_threshold": 0.3, "volume_ratio_threshold": 0.8,
+     "risk_per_trade": 0.03, "leverage": 4},
+    {"min_score_threshold": 0.9, "obv_slope_threshold": 0.1, "volume_ratio_threshold": 1.5,
+     "risk_per_trade": 0.02, "leverage": 5},
+]
+
+
+def test_grid_metrics_match_mini_backtester(db_manager):
+    cube = FeatureCube.build(db_manager, START, END)
+    metrics = evaluate_parameter_grid(cube, GRID)
+
+    assert len(cube.days) == 9  # every 5th of 43 trading days
+    for row, params in zip(metrics.to_dict("records"), GRID):
+        expected = MiniBacktester(db_manager, START, END, params).run_quick_backtest()
+        for name in METRICS:
+            assert row[name] == pytest.approx(expected[name], rel=1e-9, abs=1e-9), name
+    assert metrics["total_trades"].iloc[0] > 0
+    assert metrics["total_trades"].iloc[-1] == 0
+
+
+def test_composite_scores_match_evaluate_parameters(db_manager):
+    engine = OptimizationEngine.__new__(OptimizationEngine)
+    engine.db_manager = db_manager
+    window = {"training_start": START, "training_end": END}
+
+    scores = composite_scores(evaluate_parameter_grid(FeatureCube.build(db_manager, START, END), GRID))
+
+    np.testing.assert_allclose(scores, [engine.evaluate_parameters(window, p) for p in GRID], rtol=1e-9)
+
+
+def test_cube_round_trips_through_parquet(db_manager, tmp_path):
+    built = FeatureCube.load_or_build(db_manager, START, END, cache_dir=str(tmp_path))
+    assert FeatureCube.cube_path(str(tmp_path), START, END).exists()
+
+    loaded = FeatureCube.load_or_build(None, START, END, cache_dir=str(tmp_path))
+    pd.testing.assert_frame_equal(
+        evaluate_parameter_grid(loaded, GRID), evaluate_parameter_grid(built, GRID)
+    )
+
+
+def test_empty_window_scores_as_no_trades(db_manager):
+    cube = FeatureCube.build(db_manager, date(2020, 1, 1), date(2020, 1, 31))
+    assert list(composite_scores(evaluate_parameter_grid(cube, GRID))) == [-100.0] * len(GRID)
+
+
+def test_optimize_window_searches_full_grid(db_manager, tmp_path):
+    engine = OptimizationEngine.__new__(OptimizationEngine)
+    engine.db_manager = db_manager
+    engine.parameter_grid = GRID
+    engine.max_parameter_sets = None
+    engine.cube_dir = str(tmp_path)
+    engine.feature_cubes = {}
+    window = {"training_start": START, "training_end": END}
+
+    best = engine.optimize_window(window)
+
+    expected = [engine.evaluate_parameters(window, p) for p in GRID]
+    assert best == GRID[int(np.argmax(expected))]
+    assert (START, END) in engine.feature_cubes
+
+
+def test_parallel_optimizer_matches_serial_search(db_manager, tmp_path):
+    from src.application.scanners.backtests.parallel_optimizer import ParallelWalkForwardOptimizer
+
+    windows = [
+        {"training_start": START, "training_end": date(2025, 8, 31),
+         "validation_start": date(2025, 9, 1), "validation_end": END},
+        {"training_start": date(2025, 8, 15), "training_end": END,
+         "validation_start": date(2025, 9, 1), "validation_end": END},
+    ]
+    optimizer = ParallelWalkForwardOptimizer(
+        db_manager.db_path, GRID * 3, cube_dir=str(tmp_path), max_workers=2, chunk_size=2
+    )
+
+    results = sorted(optimizer.run(windows), key=lambda r: r["window_index"])
+
+    assert [r["window_index"] for r in results] == [0, 1]
+    for result, window in zip(results, windows):
+        cube = FeatureCube.build(db_manager, window["training_start"], window["training_end"])
+        scores = composite_scores(evaluate_parameter_grid(cube, GRID * 3))
+        assert result["best_parameters"] == (GRID * 3)[int(np.argmax(scores))]
+        assert result["best_score"] == pytest.approx(scores.max())
+        assert result["evaluated"] == len(GRID) * 3
+        expected = MiniBacktester(
+            db_manager, window["validation_start"], window["validation_end"], result["best_parameters"]
+        ).run_quick_backtest()
+        assert result["validation_result"]["total_return"] == pytest.approx(expected["total_return"])
+
+
+def test_parallel_optimizer_early_stop(db_manager, tmp_path):
+    from src.application.scanners.backtests.parallel_optimizer import ParallelWalkForwardOptimizer
+
+    window = {"training_start": START, "training_end": END,
+              "validation_start": START, "validation_end": END}
+    optimizer = ParallelWalkForwardOptimizer(
+        db_manager.db_path, GRID * 50, cube_dir=str(tmp_path), max_workers=1, chunk_size=4,
+        target_score=-1000.0,
+    )
+
+    (result,) = list(optimizer.run([window]))
+
+    assert result["stopped_early"]
+    assert result["evaluated"] < len(GRID) * 50
+
+
+def _evaluate_or_fail(arrays, n_days, parameter_chunk):
+    if any(p.get("fail") for p in parameter_chunk):
+        raise OSError("could not attach shared memory")
+    return evaluate_feature_arrays(arrays, n_days, parameter_chunk)
+
+
+def test_parallel_optimizer_records_failed_chunks(db_manager, tmp_path, monkeypatch):
+    from src.application.scanners.backtests import parallel_optimizer
+
+    # Workers are forked after the patch, so they score through it too
+    monkeypatch.setattr(parallel_optimizer, "evaluate_feature_arrays", _evaluate_or_fail)
+    windows = [
+        {"training_start": START, "training_end": END, "validation_start": START, "validation_end": END},
+        {"training_start": START, "training_end": END, "validation_start": START, "validation_end": END},
+    ]
+    grid = [{**GRID[0], "fail": True}, GRID[1]] + GRID
+    optimizer = parallel_optimizer.ParallelWalkForwardOptimizer(
+        db_manager.db_path, grid, cube_dir=str(tmp_path), max_workers=2, chunk_size=2
+    )
+
+    results = sorted(optimizer.run(windows), key=lambda r: r["window_index"])
+
+    assert [r["window_index"] for r in results] == [0, 1]
+    cube = FeatureCube.build(db_manager, START, END)
+    scores = composite_scores(evaluate_parameter_grid(cube, GRID))
+    for result in results:
+        assert result["evaluated"] == len(GRID)
+        assert result["errors"] == ["chunk 0: could not attach shared memory"]
+        assert result["best_parameters"] == GRID[int(np.argmax(scores))]
+        assert "total_return" in result["validation_result"]
+
+    (failed,) = list(parallel_optimizer.ParallelWalkForwardOptimizer(
+        db_manager.db_path, grid[:1], cube_dir=str(tmp_path), max_workers=1
+    ).run(windows[:1]))
+    assert failed["evaluated"] == 0 and len(failed["errors"]) == 1
+    assert failed["validation_result"] == {"error": "no parameter sets were scored"}
@@ -0,0 +1,101 @@
+"""Set-based date-range scans match the day-by-day candidate + EOD queries."""
+
+from datetime import date, time
+
+import duckdb
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.application.scanners.strategies.breakout_scanner import BreakoutScanner
+from src.application.scanners.strategies.crp_scanner import CRPScanner
+from src.infrastructure.adapters.scanner_read_adapter import DuckDBScannerReadAdapter
+
+DAYS = [date(2024, 1, 4), date(2024, 1, 5), date(2024, 1, 6), date(2024, 1, 8)]
+SYMBOLS = ["AAA", "BBB", "CCC", "DDD", "EEE"]
+CUTOFF, EOD = time(9, 50), time(15, 15)
+
+
+def _bars() -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    frames = []
+    for day in DAYS:
+        stamps = pd.date_range(f"{day} 09:15", f"{day} 15:29", freq="1min")
+        for symbol in SYMBOLS:
+            close = 100 + np.cumsum(rng.normal(0, 0.4, len(stamps)))
+            open_ = close + rng.normal(0, 0.3, len(stamps))
+            frames.append(pd.DataFrame({
+                "symbol": symbol,
+                "timestamp": stamps,
+                "open": open_,
+                "high": np.maximum(open_, close) + rng.uniform(0, 2.5, len(stamps)),
+                "low": np.minimum(open_, close) - rng.uniform(0, 1.5, len(stamps)),
+                "close": close,
+                "volume": rng.integers(5_000, 120_000, len(stamps)),
+                "date_partition": day,
+            }))
+    return pd.concat(frames, ignore_index=True)
+
+
+@pytest.fixture
+def adapter(tmp_path):
+    db_path = str(tmp_path / "scan.duckdb")
+    conn = duckdb.connect(db_path)
+    bars = _bars()
+    conn.execute("CREATE TABLE market_data AS SELECT * FROM bars")
+    conn.close()
+    return DuckDBScannerReadAdapter(db_path=db_path, legacy_mode=True, enable_cache=False)
+
+
+def _daily(adapter, method, config, max_results):
+    rows = []
+    for day in DAYS:
+        candidates = getattr(adapter, method)(day, CUTOFF, config, max_results)
+        eod = adapter.get_end_of_day_prices(sorted({c["symbol"] for c in candidates}), day, EOD)
+        for candidate in candidates:
+            rows.append({**candidate, "scan_date": day, **eod[candidate["symbol"]]})
+    return rows
+
+
+def _key(row):
+    return tuple(sorted((k, round(v, 9) if isinstance(v, float) else v) for k, v in row.items()))
+
+
+@pytest.mark.parametrize("scanner_cls,method,score", [
+    (BreakoutScanner, "get_breakout_candidates", "probability_score"),
+    (CRPScanner, "get_crp_candidates", "crp_probability_score"),
+])
+def test_range_query_matches_daily_queries(adapter, scanner_cls, method, score):
+    config = scanner_cls(scanner_read_port=adapter).config
+    ranged = getattr(adapter, f"{method}_range")(DAYS[0], DAYS[-1], CUTOFF, EOD, config, 10_000)
+    daily = _daily(adapter, method, config, 10_000)
+
+    assert ranged
+    assert sorted(map(_key, ranged)) == sorted(map(_key, daily))
+
+    top = getattr(adapter, f"{method}_range")(DAYS[0], DAYS[-1], CUTOFF, EOD, config, 2)
+    for day in DAYS:
+        day_rows = [r for r in top if r["scan_date"] == day]
+        expected = sorted((r[score] for r in daily if r["scan_date"] == day), reverse=True)[:2]
+        assert [r[score] for r in day_rows] == expected
+
+
+@pytest.mark.parametrize("scanner_cls", [BreakoutScanner, CRPScanner])
+def test_scan_date_range_uses_one_pass(adapter, scanner_cls, monkeypatch):
+    # Scores are coarse buckets, so compare every candidate rather than a tied top 3
+    scanner = scanner_cls(scanner_read_port=adapter)
+    daily_scanner = scanner_cls(scanner_read_port=adapter)
+    scanner.config["max_results_per_day"] = daily_scanner.config["max_results_per_day"] = 10_000
+    daily_scanner.config["use_range_query"] = False
+
+    calls = []
+    monkeypatch.setattr(adapter, "get_end_of_day_prices",
+                        lambda *args, _orig=adapter.get_end_of_day_prices: calls.append(args) or _orig(*args))
+
+    ranged = scanner.scan_date_range(DAYS[0], DAYS[-1])
+    assert calls == []
+    daily = daily_scanner.scan_date_range(DAYS[0], DAYS[-1])
+    assert len(calls) == 3  # weekdays only
+
+    assert ranged and {r["scan_date"] for r in ranged} <= {d for d in DAYS if d.weekday() < 5}
+    assert sorted(map(_key, ranged)) == sorted(map(_key, daily))
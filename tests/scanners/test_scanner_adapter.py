@@ -11,6 +11,7 @@ from unittest.mock import Mock, patch, MagicMock
 from typing import Dict, List, Any
 
 from src.infrastructure.adapters.scanner_read_adapter import DuckDBScannerReadAdapter
+from src.infrastructure.services.result_cache import ArrowResultCache
 from src.infrastructure.database.unified_duckdb import UnifiedDuckDBManager, DuckDBConfig
 
 
@@ -74,7 +75,7 @@ class TestDuckDBScannerReadAdapter:
         adapter = DuckDBScannerReadAdapter(unified_manager=mock_unified_manager, enable_cache=True)
         assert adapter.enable_cache is True
         assert adapter.cache_ttl == 300  # default
-        assert adapter._cache == {}
+        assert len(adapter._cache) == 0
 
         # Test with caching disabled
         adapter_no_cache = DuckDBScannerReadAdapter(unified_manager=mock_unified_manager, enable_cache=False)
@@ -158,9 +159,7 @@ class TestDuckDBScannerReadAdapter:
         cache_key = adapter._get_cache_key("crp_candidates", scan_date, cutoff_time, str(sample_crp_config), max_results)
 
         cached_results = [{'symbol': 'CACHED', 'crp_probability_score': 90.0}]
-        import time as time_module
-        future_timestamp = time_module.time() + 100  # 100 seconds in the future
-        adapter._cache[cache_key] = (future_timestamp, cached_results)
+        adapter._set_cached_result(cache_key, cached_results)
 
         results = adapter.get_crp_candidates(scan_date, cutoff_time, sample_crp_config, max_results)
 
@@ -232,9 +231,7 @@ class TestDuckDBScannerReadAdapter:
         cache_key = adapter._get_cache_key("eod_prices", str(symbols), scan_date, end_time)
 
         cached_results = {'TEST1': {'eod_price': 100.0}}
-        import time as time_module
-        future_timestamp = time_module.time() + 100  # 100 seconds in the future
-        adapter._cache[cache_key] = (future_timestamp, cached_results)
+        adapter._set_cached_result(cache_key, cached_results)
 
         results = adapter.get_end_of_day_prices(symbols, scan_date, end_time)
 
@@ -280,7 +277,7 @@ class TestDuckDBScannerReadAdapter:
         """Test cache management operations."""
         # Test initial state
         assert adapter.enable_cache is True
-        assert isinstance(adapter._cache, dict)
+        assert isinstance(adapter._cache, ArrowResultCache)
 
         # Test cache stats
         stats = adapter.get_cache_stats()
@@ -288,7 +285,7 @@ class TestDuckDBScannerReadAdapter:
         assert 'total_entries' in stats
 
         # Test cache clearing
-        adapter._cache['test_key'] = (0, 'test_value')
+        adapter._set_cached_result('test_key', 'test_value')
         adapter.clear_cache()
         assert len(adapter._cache) == 0
 
@@ -0,0 +1,160 @@
+from datetime import date, datetime, time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.application.scanners.strategies.advanced_two_phase_runner import AdvancedTwoPhaseRunner
+from src.application.scanners.strategies.vectorized_intraday_scan import (
+    VectorizedScanParams,
+    compute_indicators_batch,
+    prefilter_batch,
+    scan_batch,
+)
+
+DAYS = [date(2025, 9, 4), date(2025, 9, 5)]
+
+
+def _bars(symbol, day, seed, drift, volume_growth):
+    rng = np.random.default_rng(seed)
+    times = pd.date_range(datetime.combine(day, time(9, 15)), datetime.combine(day, time(9, 50)), freq="1min")
+    steps = drift + rng.normal(0, 0.15, len(times))
+    close = 100 + np.cumsum(steps)
+    return pd.DataFrame({
+        "symbol": symbol,
+        "timestamp": times,
+        "open": close - steps / 2,
+        "high": close + np.abs(rng.normal(0.2, 0.05, len(times))),
+        "low": close - np.abs(rng.normal(0.2, 0.05, len(times))),
+        "close": close,
+        "volume": (150000 * np.exp(volume_growth * np.arange(len(times)))).round(),
+    })
+
+
+class WindowMarketReadPort:
+    """In-memory port serving both per-symbol and batched reads."""
+
+    def __init__(self):
+        frames = []
+        for d, day in enumerate(DAYS):
+            for i in range(12):
+                drift = [0.25, -0.25, 0.0][i % 3]
+                frames.append(_bars(f"SYM{i:02d}", day, seed=100 * d + i, drift=drift, volume_growth=0.06 * (i % 2)))
+        self.bars = pd.concat(frames, ignore_index=True)
+
+    def get_symbols_for_date(self, trading_date):
+        day = self.bars[self.bars["timestamp"].dt.date == trading_date]
+        return sorted(day["symbol"].unique())
+
+    def get_minute_data(self, symbol, trading_date, start, end):
+        df = self.bars[(self.bars["symbol"] == symbol)
+                       & (self.bars["timestamp"] >= start) & (self.bars["timestamp"] <= end)]
+        return df.drop(columns=["symbol"]).reset_index(drop=True)
+
+    def get_minute_window(self, start_date, end_date, start_time, end_time, symbols=None):
+        ts = self.bars["timestamp"]
+        mask = (ts.dt.date >= start_date) & (ts.dt.date <= end_date)
+        mask &= (ts.dt.time >= start_time) & (ts.dt.time <= end_time)
+        if symbols:
+            mask &= self.bars["symbol"].isin(symbols)
+        return self.bars[mask].reset_index(drop=True)
+
+
+class PerSymbolPort(WindowMarketReadPort):
+    get_minute_window = None
+
+
+def _runner(port, day):
+    runner = AdvancedTwoPhaseRunner()
+    runner.initialize_database(port)
+    runner.today = day
+    return runner
+
+
+@pytest.fixture
+def port():
+    return WindowMarketReadPort()
+
+
+def test_batch_indicators_match_per_symbol(port):
+    runner = _runner(port, DAYS[0])
+    batch = compute_indicators_batch(port.bars)
+
+    for (symbol, day), group in batch.groupby(["symbol", "trading_date"]):
+        single = port.get_minute_data(
+            symbol, day, datetime.combine(day, time(9, 15)), datetime.combine(day, time(9, 50))
+        )
+        expected = runner.calculate_advanced_indicators(single)
+        for column in ["vwap", "obv", "obv_slope", "atr", "di_plus", "adx", "volume_ratio", "orb_high", "orb_low"]:
+            np.testing.assert_allclose(
+                group[column].to_numpy(), expected[column].to_numpy(), rtol=1e-9, equal_nan=True,
+                err_msg=f"{symbol} {day} {column}",
+            )
+
+
+@pytest.mark.parametrize("day", DAYS)
+def test_vectorized_scan_matches_per_symbol_scan(port, day):
+    batch_runner = _runner(port, day)
+    loop_runner = _runner(PerSymbolPort(), day)
+
+    symbols = batch_runner.get_available_symbols()
+    expected = []
+    for symbol in loop_runner.pre_market_filter(symbols):
+        result = loop_runner.scan_symbol_advanced(symbol)
+        if result:
+            expected.append(result)
+
+    actual = batch_runner.vectorized_scan(symbols)
+
+    assert expected, "fixture should produce at least one setup"
+    assert [r["symbol"] for r in actual] == [r["symbol"] for r in expected]
+    assert [r["direction"] for r in actual] == [r["direction"] for r in expected]
+    np.testing.assert_allclose([r["score"] for r in actual], [r["score"] for r in expected], rtol=1e-9)
+
+
+def test_scan_date_range_covers_every_day(port):
+    runner = _runner(port, DAYS[0])
+    result = runner.scan_date_range(DAYS[0], DAYS[-1], chunk_days=1)
+
+    per_day = [
+        sorted(r["symbol"] for r in _runner(port, day).vectorized_scan(port.get_symbols_for_date(day)))
+        for day in DAYS
+    ]
+    assert [sorted(result[result["trading_date"] == day]["symbol"]) for day in DAYS] == per_day
+    assert set(result["direction"]) <= {"LONG", "SHORT"}
+
+
+def test_short_groups_are_skipped():
+    params = VectorizedScanParams()
+    bars = _bars("THIN", DAYS[0], seed=1, drift=0.3, volume_growth=0.1).head(25)
+    assert prefilter_batch(bars, params).empty
+    assert scan_batch(bars, params).empty
+
+
+def test_fast_backtester_vectorized_matches_per_symbol(port, tmp_path):
+    import duckdb
+    from src.application.scanners.backtests.fast_backtester import FastBacktester
+
+    db_path = str(tmp_path / "bars.duckdb")
+    bars = port.bars
+    with duckdb.connect(db_path) as conn:
+        conn.register("bars_df", bars)
+        conn.execute(
+            "CREATE TABLE market_data_unified AS "
+            "SELECT *, CAST(timestamp AS DATE) AS date_partition FROM bars_df"
+        )
+
+    backtester = FastBacktester(db_path=db_path, start_date=str(DAYS[0]), end_date=str(DAYS[-1]))
+    trading_days = backtester.get_trading_days()
+    vectorized = backtester.scan_trading_days(trading_days)
+
+    for day in trading_days:
+        expected = []
+        for symbol in backtester.pre_market_filter(backtester.get_symbols_for_date(day), day):
+            result = backtester.scan_symbol_advanced(symbol, day)
+            if result:
+                expected.append(result)
+        expected.sort(key=lambda x: x['score'], reverse=True)
+
+        assert [(r["symbol"], r["direction"]) for r in vectorized[day]] == \
+            [(r["symbol"], r["direction"]) for r in expected]
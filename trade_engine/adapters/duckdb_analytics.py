@@ -7,14 +7,81 @@ and scoring computations.
 """
 
 import duckdb
+from bisect import bisect_left, bisect_right
 from typing import Dict, List, Optional
-from datetime import date, time
+from datetime import date, datetime, time
 from decimal import Decimal
 import os
 
-from ..domain.models import Score, LeaderScore
+import numpy as np
+import pandas as pd
+
+from ..domain.models import Bar, Score, LeaderScore
 from ..ports.analytics import AnalyticsPort
 
+SCORE_COMPONENTS = (
+    'ret_0915_0950', 'vspike_10m', 'obv_delta_35m', 'sector_strength',
+    'range_compression', 'spread_penalty', 'illiq_penalty',
+)
+DEFAULT_LEADER_WEIGHTS = {'ret_since_entry': 0.5, 'vspike_5m': 0.25, 'obv_delta_10m': 0.25}
+RECENT_BARS = 10
+CRORE = 1e7
+
+
+class _SymbolTape:
+    """One symbol's bars for the current day, appended per bar"""
+
+    def __init__(self, trading_date: date):
+        self.trading_date = trading_date
+        self.times: List[time] = []
+        self.closes: List[float] = []
+        self.volumes: List[int] = []
+        self.obv: List[float] = []
+        self.volume_total = 0
+
+    def append(self, bar_time: time, close: float, volume: int):
+        if self.times and bar_time <= self.times[-1]:
+            return  # replayed or out-of-order bar
+        step = 0
+        if self.closes:
+            step = volume if close > self.closes[-1] else -volume if close < self.closes[-1] else 0
+        self.times.append(bar_time)
+        self.closes.append(close)
+        self.volumes.append(volume)
+        self.obv.append((self.obv[-1] if self.obv else 0) + step)
+        self.volume_total += volume
+
+    def leader_score(self, symbol: str, timestamp: datetime, entry_time: time,
+                     current_time: time, weights: Dict[str, float]) -> LeaderScore:
+        first = bisect_left(self.times, entry_time)
+        last = bisect_right(self.times, current_time) - 1
+
+        ret_since_entry = 0.0
+        if 0 <= first <= last and self.closes[first]:
+            ret_since_entry = (self.closes[last] - self.closes[first]) / self.closes[first] * 100
+
+        vspike_5m = obv_delta_10m = 0.0
+        if last >= 0:
+            recent = self.volumes[max(0, last - 4):last + 1]
+            day_mean = sum(self.volumes[:last + 1]) / (last + 1)
+            if day_mean:
+                vspike_5m = (sum(recent) / len(recent)) / day_mean
+            start = max(0, last - RECENT_BARS)
+            window_volume = sum(self.volumes[start + 1:last + 1])
+            if window_volume:
+                obv_delta_10m = (self.obv[last] - self.obv[start]) / window_volume
+
+        return LeaderScore(
+            symbol=symbol,
+            timestamp=timestamp,
+            ret_since_entry=ret_since_entry,
+            vspike_5m=vspike_5m,
+            obv_delta_10m=obv_delta_10m,
+            total_score=(ret_since_entry * weights['ret_since_entry']
+                         + vspike_5m * weights['vspike_5m']
+                         + obv_delta_10m * weights['obv_delta_10m']),
+        )
+
 
 class DuckDBAnalytics(AnalyticsPort):
     """DuckDB-based analytics implementation"""
@@ -23,6 +90,8 @@ class DuckDBAnalytics(AnalyticsPort):
         self.db_path = db_path
         self.config = config
         self._conn = None
+        self._table_exists: Dict[str, bool] = {}
+        self._tapes: Dict[str, _SymbolTape] = {}
         self._ensure_connection()
 
     def _ensure_connection(self):
@@ -39,123 +108,226 @@ class DuckDBAnalytics(AnalyticsPort):
         """
         Compute 09:15-09:50 warmup features and scores
 
-        This implements the scoring logic from your specification
+        The whole universe is scored with one grouped query; the window is
+        a timestamp range on the day's partition so scans can be pruned.
         """
         self._ensure_connection()
 
-        # If no symbols provided, get from available universe
-        if not symbols:
-            symbols = self._get_available_symbols()
+        try:
+            features = self._warmup_feature_frame(trading_date, symbols, start_time, end_time)
+        except Exception as e:
+            print(f"Error computing warmup features for {trading_date}: {e}")
+            return {}
 
-        scores = {}
+        if features.empty:
+            return {}
 
-        for symbol in symbols:
-            try:
-                score = self._compute_symbol_score(symbol, trading_date, start_time, end_time)
-                if score:
-                    scores[symbol] = score
-            except Exception as e:
-                print(f"Error computing score for {symbol}: {e}")
+        components = self._score_components(features)
+        weights = self.config['selection']['score_weights']
+        total = sum(components[name] * weights.get(name, 0.0) for name in SCORE_COMPONENTS)
 
+        scores = {}
+        for i, symbol in enumerate(features['symbol']):
+            scores[symbol] = Score(
+                symbol=symbol,
+                date=trading_date,
+                total_score=float(total[i]),
+                components_json={
+                    'window_return_pct': float(features['window_return_pct'].iat[i]),
+                    'turnover_crore': float(features['turnover'].iat[i] / CRORE),
+                    'avg_range_bps': float(features['avg_range_bps'].iat[i]),
+                    'sector': features['sector'].iat[i],
+                },
+                **{name: float(components[name][i]) for name in SCORE_COMPONENTS},
+            )
+
+        if symbols:
+            return {symbol: scores[symbol] for symbol in symbols if symbol in scores}
         return scores
 
-    def _compute_symbol_score(self, symbol: str, trading_date: date,
-                            start_time: time, end_time: time) -> Optional[Score]:
-        """Compute comprehensive score for a symbol"""
-        # Simplified scoring - in production you'd implement the full SQL logic
-        query = """
-        SELECT
-            AVG(close) as avg_price,
-            COUNT(*) as bar_count,
-            STDDEV(close) as volatility,
-            SUM(volume) as total_volume
-        FROM market_data_unified
-        WHERE symbol = ?
-          AND date_partition = ?
-          AND CAST(timestamp AS TIME) BETWEEN ? AND ?
-        """
+    def _warmup_feature_frame(self, trading_date: date, symbols: List[str],
+                              start_time: time, end_time: time) -> pd.DataFrame:
+        """Per-symbol warmup aggregates for the window, one row per symbol"""
+        symbol_filter = "AND list_contains(?, symbol)" if symbols else ""
+        sector_join = (
+            "LEFT JOIN symbols s ON s.symbol = a.symbol" if self._has_table('symbols') else
+            "LEFT JOIN (SELECT NULL::VARCHAR AS symbol, NULL::VARCHAR AS sector) s ON FALSE"
+        )
 
-        params = [symbol, trading_date.isoformat(), start_time.isoformat(), end_time.isoformat()]
+        query = f"""
+        WITH bars AS (
+            SELECT
+                symbol, timestamp, high, low, close, volume,
+                close - LAG(close) OVER (PARTITION BY symbol ORDER BY timestamp) AS change,
+                ROW_NUMBER() OVER (PARTITION BY symbol ORDER BY timestamp DESC) AS rn_desc
+            FROM market_data_unified
+            WHERE date_partition = ?
+              AND timestamp BETWEEN ? AND ?
+              {symbol_filter}
+        ),
+        agg AS (
+            SELECT
+                symbol,
+                AVG(close) as avg_price,
+                COUNT(*) as bar_count,
+                STDDEV(close) as volatility,
+                SUM(volume) as total_volume,
+                arg_min(close, timestamp) as first_close,
+                arg_max(close, timestamp) as last_close,
+                SUM(CASE WHEN change > 0 THEN volume WHEN change < 0 THEN -volume ELSE 0 END) as obv_delta,
+                MAX(high) - MIN(low) as window_range,
+                MAX(high) FILTER (WHERE rn_desc <= {RECENT_BARS}) - MIN(low) FILTER (WHERE rn_desc <= {RECENT_BARS}) as recent_range,
+                AVG((high - low) / NULLIF(close, 0)) * 10000 as avg_range_bps,
+                SUM(close * volume) as turnover
+            FROM bars
+            GROUP BY symbol
+        )
+        SELECT a.*, s.sector
+        FROM agg a
+        {sector_join}
+        ORDER BY a.symbol
+        """
 
-        try:
-            result = self._conn.execute(query, params).fetchone()
+        params = [
+            trading_date.isoformat(),
+            datetime.combine(trading_date, start_time),
+            datetime.combine(trading_date, end_time),
+        ]
+        if symbols:
+            params.append(list(symbols))
+
+        features = self._conn.execute(query, params).fetchdf()
+        features = features[features['bar_count'] > 0].reset_index(drop=True)
+        features['window_return_pct'] = (
+            (features['last_close'] - features['first_close']) / features['first_close'] * 100
+        )
+        return features
+
+    def _score_components(self, features: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Vectorized score components, one array per component"""
+        selection = self.config.get('selection', {})
+        avg_price = features['avg_price'].to_numpy(dtype=float)
+        volatility = features['volatility'].fillna(0).to_numpy(dtype=float)
+        total_volume = features['total_volume'].fillna(0).to_numpy(dtype=float)
+        window_range = features['window_range'].to_numpy(dtype=float)
+        recent_range = features['recent_range'].to_numpy(dtype=float)
+        window_return = features['window_return_pct'].fillna(0).to_numpy(dtype=float)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ret_score = np.where(avg_price > 0, np.minimum(volatility / avg_price * 100, 5.0), 0.0)
+            vol_score = np.minimum(total_volume / 1000000, 5.0)
+
+            # Net signed volume as a fraction of traded volume, in [-1, 1]
+            obv_delta = np.where(
+                total_volume > 0, features['obv_delta'].to_numpy(dtype=float) / total_volume, 0.0
+            )
 
-            if not result or result[1] == 0:  # No bars
-                return None
+            # 1 when the last bars trade in a much tighter range than the window
+            range_compression = np.where(window_range > 0, 1.0 - recent_range / window_range, 0.0)
 
-            avg_price = result[0]
-            bar_count = result[1]
-            volatility = result[2] or 0
-            total_volume = result[3] or 0
+        # Sector return relative to the scored universe (percentage points)
+        sector = features['sector']
+        sector_return = features.groupby(sector)['window_return_pct'].transform('mean')
+        sector_strength = np.where(
+            sector.notna(), (sector_return - window_return.mean()).fillna(0).to_numpy(dtype=float), 0.0
+        )
 
-            # Simplified scoring logic (you'd implement the full formula)
-            ret_score = min(volatility / avg_price * 100, 5.0) if avg_price > 0 else 0
-            vol_score = min(total_volume / 1000000, 5.0)  # Volume score
+        # No quotes in minute bars: bar range in bps stands in for the spread
+        spread_max = float(selection.get('spread_bps_max', 15))
+        avg_range_bps = features['avg_range_bps'].fillna(0).to_numpy(dtype=float)
+        spread_penalty = np.clip((avg_range_bps - spread_max) / spread_max, 0.0, 5.0)
 
-            total_score = (ret_score * self.config['selection']['score_weights']['ret_0915_0950'] +
-                          vol_score * self.config['selection']['score_weights']['vspike_10m'])
+        # Shortfall against the minimum warmup turnover
+        turnover_min = float(selection.get('turnover_min_crore', 5.0)) * CRORE
+        turnover = features['turnover'].fillna(0).to_numpy(dtype=float)
+        illiq_penalty = np.clip((turnover_min - turnover) / turnover_min, 0.0, 1.0) if turnover_min > 0 \
+            else np.zeros(len(features))
 
-            return Score(
-                symbol=symbol,
-                date=trading_date,
-                ret_0915_0950=ret_score,
-                vspike_10m=vol_score,
-                obv_delta_35m=0.0,  # Placeholder
-                sector_strength=0.0,  # Placeholder
-                range_compression=0.0,  # Placeholder
-                spread_penalty=0.0,    # Placeholder
-                illiq_penalty=0.0,     # Placeholder
-                total_score=total_score
-            )
+        return {
+            'ret_0915_0950': ret_score,
+            'vspike_10m': vol_score,
+            'obv_delta_35m': np.nan_to_num(obv_delta),
+            'sector_strength': sector_strength,
+            'range_compression': np.nan_to_num(range_compression),
+            'spread_penalty': spread_penalty,
+            'illiq_penalty': illiq_penalty,
+        }
 
-        except Exception as e:
-            print(f"Error in score computation for {symbol}: {e}")
-            return None
+    def _has_table(self, name: str) -> bool:
+        if name not in self._table_exists:
+            result = self._conn.execute(
+                "SELECT COUNT(*) FROM information_schema.tables WHERE table_name = ?", [name]
+            ).fetchone()
+            self._table_exists[name] = bool(result and result[0])
+        return self._table_exists[name]
+
+    def on_bar(self, bar: Bar) -> None:
+        """Update the in-memory per-symbol tape used for leader scoring"""
+        tape = self._tapes.get(bar.symbol)
+        if tape is None or tape.trading_date != bar.timestamp.date():
+            tape = self._tapes[bar.symbol] = _SymbolTape(bar.timestamp.date())
+        tape.append(bar.timestamp.time(), float(bar.close), int(bar.volume))
 
     def compute_leader_scores(self, symbols: List[str], trading_date: date,
                              current_time: time, entry_timestamps: Dict[str, time]) -> Dict[str, LeaderScore]:
-        """Compute real-time leader scores"""
+        """Compute real-time leader scores
+
+        Uses the per-bar tapes fed through ``on_bar``; symbols without a tape
+        for the day are read with one grouped query.
+        """
         scores = {}
+        timestamp = datetime.combine(trading_date, current_time)
+        leader_weights = {**DEFAULT_LEADER_WEIGHTS, **self.config.get('leader', {}).get('score_weights', {})}
 
+        missing = []
         for symbol in symbols:
-            # Simplified leader scoring
             entry_time = entry_timestamps.get(symbol)
             if not entry_time:
                 continue
-
-            # Calculate returns since entry
-            ret_since_entry = self._calculate_return_since_entry(symbol, trading_date, entry_time, current_time)
-
-            scores[symbol] = LeaderScore(
-                symbol=symbol,
-                timestamp=current_time,  # Should be datetime
-                ret_since_entry=ret_since_entry,
-                vspike_5m=0.0,  # Placeholder
-                obv_delta_10m=0.0,  # Placeholder
-                total_score=ret_since_entry * 0.5  # Simplified
-            )
-
-        return scores
-
-    def _calculate_return_since_entry(self, symbol: str, trading_date: date,
-                                    entry_time: time, current_time: time) -> float:
-        """Calculate return since entry time"""
+            tape = self._tapes.get(symbol)
+            if tape is not None and tape.trading_date == trading_date:
+                scores[symbol] = tape.leader_score(symbol, timestamp, entry_time, current_time, leader_weights)
+            else:
+                missing.append(symbol)
+
+        if missing:
+            scores.update(self._leader_scores_from_db(
+                missing, trading_date, current_time, entry_timestamps, timestamp, leader_weights
+            ))
+
+        return {symbol: scores[symbol] for symbol in symbols if symbol in scores}
+
+    def _leader_scores_from_db(self, symbols: List[str], trading_date: date, current_time: time,
+                               entry_timestamps: Dict[str, time], timestamp: datetime,
+                               leader_weights: Dict[str, float]) -> Dict[str, LeaderScore]:
+        """Build tapes for symbols not seen through ``on_bar`` with a single query"""
         query = """
-        SELECT
-            (LAST(close) - FIRST(close)) / FIRST(close) * 100 as return_pct
+        SELECT symbol, timestamp, close, volume
         FROM market_data_unified
-        WHERE symbol = ?
+        WHERE list_contains(?, symbol)
           AND date_partition = ?
-          AND CAST(timestamp AS TIME) BETWEEN ? AND ?
+          AND timestamp BETWEEN ? AND ?
+        ORDER BY symbol, timestamp
         """
-
-        params = [symbol, trading_date.isoformat(), entry_time.isoformat(), current_time.isoformat()]
+        earliest = min(entry_timestamps[s] for s in symbols)
+        params = [list(symbols), trading_date.isoformat(),
+                  datetime.combine(trading_date, earliest), timestamp]
 
         try:
-            result = self._conn.execute(query, params).fetchone()
-            return float(result[0]) if result and result[0] else 0.0
-        except:
-            return 0.0
+            rows = self._conn.execute(query, params).fetchall()
+        except Exception as e:
+            print(f"Error computing leader scores: {e}")
+            return {s: _SymbolTape(trading_date).leader_score(s, timestamp, entry_timestamps[s], current_time, leader_weights)
+                    for s in symbols}
+
+        tapes = {symbol: _SymbolTape(trading_date) for symbol in symbols}
+        for symbol, ts, close, volume in rows:
+            tapes[symbol].append(ts.time(), float(close), int(volume or 0))
+
+        return {
+            symbol: tape.leader_score(symbol, timestamp, entry_timestamps[symbol], current_time, leader_weights)
+            for symbol, tape in tapes.items()
+        }
 
     def calculate_atr(self, symbol: str, trading_date: date,
                      window: int = 14, timeframe: str = "5m") -> Optional[Decimal]:
@@ -7,13 +7,16 @@ Supports both backtest (deterministic replay) and live extensions.
 """
 
 import duckdb
-from typing import AsyncIterable, List
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import AsyncIterable, List, Optional, Union
 from datetime import date, time
-from decimal import Decimal
 import asyncio
 import os
 
+import numpy as np
+
 from ..domain.models import Bar
+from ..domain.bar_batch import BarBatch
 from ..ports.data_feed import DataFeedPort
 
 
@@ -38,69 +41,163 @@ class DuckDBDataFeed(DataFeedPort):
         """
         Subscribe to historical bars (for backtesting).
         In live mode, this would connect to real-time feeds.
+
+        Bars are replayed in global timestamp order (ties broken by symbol),
+        so strategies see every symbol's bar for a minute before the next.
         """
-        # For backtesting, we return historical data as async stream
-        for symbol in symbols:
-            bars = self.get_historical_bars(symbol, date.min, date.max, timeframe)
-            for bar in bars:
+        async for cross_section in self.replay(symbols, timeframe):
+            for bar in cross_section:
                 yield bar
+            await asyncio.sleep(0)  # Allow other coroutines, once per minute
+
+    async def replay(self, symbols: List[str], timeframe: str,
+                     start_date: date = date.min, end_date: date = date.max,
+                     days_per_chunk: int = 1) -> AsyncIterable[BarBatch]:
+        """
+        Replay bars as per-timestamp cross-sections.
+
+        Data is read ``days_per_chunk`` trading days at a time with one
+        ordered query per chunk; the next chunk is fetched on a background
+        thread while the current one is replayed, so memory stays bounded
+        by two chunks.
+
+        Yields:
+            BarBatch: all subscribed symbols' bars for one timestamp,
+            ordered by symbol (views into the chunk)
+        """
+        days = self.get_trading_days(symbols, start_date, end_date)
+        if not days:
+            return
+
+        chunks = [days[i:i + days_per_chunk] for i in range(0, len(days), days_per_chunk)]
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="replay-prefetch") as prefetcher:
+            pending: Optional[Future] = prefetcher.submit(self._fetch_chunk, symbols, chunks[0], timeframe)
+            for i in range(len(chunks)):
+                batch = await asyncio.wrap_future(pending)
+                pending = (
+                    prefetcher.submit(self._fetch_chunk, symbols, chunks[i + 1], timeframe)
+                    if i + 1 < len(chunks) else None
+                )
+                for cross_section in self._cross_sections(batch):
+                    yield cross_section
+
+    def get_trading_days(self, symbols: List[str], start_date: date = date.min,
+                         end_date: date = date.max) -> List[date]:
+        """Trading days with data for any of ``symbols``"""
+        self._ensure_connection()
+
+        try:
+            result = self._conn.execute("""
+                SELECT DISTINCT date_partition
+                FROM market_data
+                WHERE list_contains(?, symbol)
+                  AND date_partition BETWEEN ? AND ?
+                ORDER BY date_partition
+            """, [list(symbols), start_date.isoformat(), end_date.isoformat()]).fetchall()
+
+            return [row[0] for row in result]
+
+        except Exception as e:
+            print(f"Error fetching trading days: {e}")
+            return []
+
+    def _fetch_chunk(self, symbols: List[str], days: List[date], timeframe: str) -> BarBatch:
+        """Read one chunk of days in (timestamp, symbol) order; runs on the prefetch thread"""
+        cursor = self._conn.cursor()  # own cursor: connections are not shared across threads
+        try:
+            columns = cursor.execute("""
+                SELECT symbol, timestamp, open, high, low, close, volume
+                FROM market_data
+                WHERE list_contains(?, symbol)
+                  AND date_partition BETWEEN ? AND ?
+                ORDER BY timestamp, symbol
+            """, [list(symbols), str(days[0]), str(days[-1])]).fetchnumpy()
+            return BarBatch.from_numpy(columns, timeframe)
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _cross_sections(batch: BarBatch):
+        """Split a time-ordered batch into per-timestamp views"""
+        n = len(batch)
+        if n == 0:
+            return
+        ts = batch.timestamp
+        boundaries = (np.flatnonzero(ts[1:] != ts[:-1]) + 1).tolist()
+        for start, stop in zip([0] + boundaries, boundaries + [n]):
+            yield batch.slice(start, stop)
+
+    async def subscribe_batches(self, symbols: List[str], timeframe: str,
+                                start_date: date = date.min,
+                                end_date: date = date.max) -> AsyncIterable[BarBatch]:
+        """
+        Subscribe to historical bars as columnar batches.
+
+        All symbols are read with one query; each yielded batch is a
+        zero-copy view of one symbol's rows.
+        """
+        batch = self.get_historical_batch(symbols, start_date, end_date, timeframe)
+        for symbol in symbols:
+            symbol_batch = batch.for_symbol(symbol)
+            if len(symbol_batch):
+                yield symbol_batch
                 await asyncio.sleep(0)  # Allow other coroutines
 
-    def get_historical_bars(self, symbol: str, start_date: date,
-                           end_date: date, timeframe: str,
-                           start_time: time = None, end_time: time = None) -> List[Bar]:
+    def get_historical_batch(self, symbols: Union[str, List[str]], start_date: date,
+                             end_date: date, timeframe: str,
+                             start_time: time = None, end_time: time = None) -> BarBatch:
         """
-        Get historical bars from DuckDB
+        Get historical bars from DuckDB as a columnar batch
 
-        Note: This assumes your existing market_data table structure
+        Rows are ordered by symbol, then timestamp, so per-symbol slices
+        of the batch are views.
         """
         self._ensure_connection()
 
+        if isinstance(symbols, str):
+            symbols = [symbols]
+
         query = """
         SELECT
-            timestamp,
             symbol,
+            timestamp,
             open,
             high,
             low,
             close,
-            volume,
-            date_partition
+            volume
         FROM market_data
-        WHERE symbol = ?
+        WHERE list_contains(?, symbol)
           AND date_partition BETWEEN ? AND ?
-        ORDER BY timestamp
         """
 
-        params = [symbol, start_date.isoformat(), end_date.isoformat()]
+        params = [list(symbols), start_date.isoformat(), end_date.isoformat()]
 
         # Add time filters if specified
         if start_time and end_time:
             query += " AND CAST(timestamp AS TIME) BETWEEN ? AND ?"
             params.extend([start_time.isoformat(), end_time.isoformat()])
 
-        try:
-            result = self._conn.execute(query, params).fetchall()
-
-            bars = []
-            for row in result:
-                bar = Bar(
-                    timestamp=row[0],  # Assuming timestamp is datetime
-                    symbol=row[1],
-                    open=Decimal(str(row[2])),
-                    high=Decimal(str(row[3])),
-                    low=Decimal(str(row[4])),
-                    close=Decimal(str(row[5])),
-                    volume=int(row[6]),
-                    timeframe=timeframe
-                )
-                bars.append(bar)
+        query += " ORDER BY symbol, timestamp"
 
-            return bars
+        try:
+            return BarBatch.from_numpy(self._conn.execute(query, params).fetchnumpy(), timeframe)
 
         except Exception as e:
-            print(f"Error fetching bars for {symbol}: {e}")
-            return []
+            print(f"Error fetching bars for {', '.join(symbols)}: {e}")
+            return BarBatch.empty(timeframe)
+
+    def get_historical_bars(self, symbol: str, start_date: date,
+                           end_date: date, timeframe: str,
+                           start_time: time = None, end_time: time = None) -> List[Bar]:
+        """
+        Get historical bars from DuckDB
+
+        Note: This assumes your existing market_data table structure
+        """
+        return self.get_historical_batch(
+            symbol, start_date, end_date, timeframe, start_time, end_time
+        ).to_bars()
 
     def get_available_symbols(self) -> List[str]:
         """Get list of available symbols"""
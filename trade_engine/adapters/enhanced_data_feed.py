@@ -9,10 +9,10 @@ performance and data access patterns optimized for backtesting.
 import asyncio
 from typing import AsyncIterable, List, Optional, Dict, Tuple
 from datetime import date, time
-from decimal import Decimal
 import pandas as pd
 
 from trade_engine.domain.models import Bar
+from trade_engine.domain.bar_batch import BarBatch
 from trade_engine.ports.data_feed import DataFeedPort
 from trade_engine.adapters.duckdb_data_adapter import DuckDBDataAdapter
 
@@ -211,10 +211,10 @@ class EnhancedDataFeed(DataFeedPort):
         """
         return self.data_adapter.get_connection_stats()
 
-    async def get_optimized_bars_batch(self, symbols: List[str], start_date: str, end_date: str,
-                                     timeframe: str = "1m") -> Dict[str, List[Bar]]:
+    async def get_optimized_bar_batch(self, symbols: List[str], start_date: str, end_date: str,
+                                      timeframe: str = "1m") -> BarBatch:
         """
-        Get historical bars for multiple symbols in an optimized batch query.
+        Get historical bars for multiple symbols as one columnar batch.
 
         Args:
             symbols: List of stock symbols
@@ -223,56 +223,90 @@ class EnhancedDataFeed(DataFeedPort):
             timeframe: Bar timeframe
 
         Returns:
-            Dictionary mapping symbols to their bar data
+            BarBatch ordered by symbol, then timestamp
         """
         if not self._initialized:
             await self.initialize()
 
+        # Use a single optimized query for all symbols
+        symbols_str = "', '".join(symbols)
+        query = f"""
+        SELECT
+            symbol,
+            timestamp,
+            open,
+            high,
+            low,
+            close,
+            volume
+        FROM market_data
+        WHERE symbol IN ('{symbols_str}')
+          AND date_partition BETWEEN '{start_date}' AND '{end_date}'
+        ORDER BY symbol, timestamp
+        """
+
+        # Execute the query using the existing data adapter's connection
+        result = await self.data_adapter._execute_async_query(query)
+
+        # Rows without a volume cannot form a bar
+        valid = result['volume'].notna()
+        if not valid.all():
+            logger.warning(f"Skipping {int((~valid).sum())} bars with missing volume")
+            result = result[valid]
+
+        return BarBatch.from_frame(result, timeframe)
+
+    async def subscribe_batches(self, symbols: List[str], timeframe: str,
+                                start_date: date = date.min,
+                                end_date: date = date.max) -> AsyncIterable[BarBatch]:
+        """
+        Subscribe to historical bars as columnar batches, one per symbol.
+
+        Args:
+            symbols: List of symbols to subscribe to
+            timeframe: Bar timeframe (e.g., '1m', '5m')
+            start_date: Start date for data
+            end_date: End date for data
+
+        Yields:
+            BarBatch views over a single batched query
+        """
         try:
-            # Use a single optimized query for all symbols
-            symbols_str = "', '".join(symbols)
-            query = f"""
-            SELECT
-                symbol,
-                timestamp,
-                open,
-                high,
-                low,
-                close,
-                volume,
-                '{timeframe}' as timeframe
-            FROM market_data
-            WHERE symbol IN ('{symbols_str}')
-              AND date_partition BETWEEN '{start_date}' AND '{end_date}'
-            ORDER BY symbol, timestamp
-            """
+            batch = await self.get_optimized_bar_batch(
+                symbols, start_date.isoformat(), end_date.isoformat(), timeframe
+            )
+        except Exception as e:
+            logger.error(f"Error in batch subscription: {e}")
+            return
 
-            # Execute the query using the existing data adapter's connection
-            result = await self.data_adapter._execute_async_query(query)
+        by_symbol = batch.by_symbol()
+        for symbol in symbols:
+            symbol_batch = by_symbol.get(symbol)
+            if symbol_batch is not None:
+                yield symbol_batch
+                await asyncio.sleep(0)  # Allow other tasks to run
 
-            # Process results into symbol groups
-            symbol_data = {}
-            for symbol in symbols:
-                symbol_data[symbol] = []
-
-            for _, row in result.iterrows():
-                symbol = row['symbol']
-                if symbol in symbol_data:
-                    try:
-                        bar = Bar(
-                            timestamp=row['timestamp'],
-                            symbol=symbol,
-                            open=Decimal(str(row['open'])),
-                            high=Decimal(str(row['high'])),
-                            low=Decimal(str(row['low'])),
-                            close=Decimal(str(row['close'])),
-                            volume=int(row['volume']),
-                            timeframe=row['timeframe']
-                        )
-                        symbol_data[symbol].append(bar)
-                    except (ValueError, TypeError) as e:
-                        logger.warning(f"Skipping invalid bar data for {symbol}: {e}")
-                        continue
+    async def get_optimized_bars_batch(self, symbols: List[str], start_date: str, end_date: str,
+                                     timeframe: str = "1m") -> Dict[str, List[Bar]]:
+        """
+        Get historical bars for multiple symbols in an optimized batch query.
+
+        Args:
+            symbols: List of stock symbols
+            start_date: Start date string (YYYY-MM-DD)
+            end_date: End date string (YYYY-MM-DD)
+            timeframe: Bar timeframe
+
+        Returns:
+            Dictionary mapping symbols to their bar data
+        """
+        try:
+            by_symbol = (await self.get_optimized_bar_batch(symbols, start_date, end_date, timeframe)).by_symbol()
+
+            symbol_data = {
+                symbol: by_symbol[symbol].to_bars() if symbol in by_symbol else []
+                for symbol in symbols
+            }
 
             logger.info(f"Batch query completed for {len(symbols)} symbols, total bars: {sum(len(bars) for bars in symbol_data.values())}")
             return symbol_data
@@ -0,0 +1,226 @@
+"""
+Columnar Bar Batches
+====================
+
+``BarBatch`` holds many bars as NumPy columns instead of one frozen ``Bar``
+(six ``Decimal`` fields) per row. Prices are float64, volumes int64 and
+timestamps datetime64[ns]. Per-symbol and time-range slices are views into
+the same buffers, so a backtest can load a year of minute data once and
+walk it without per-row allocation.
+
+``Bar`` objects are only materialized on access (indexing or iteration),
+using the same ``Decimal(str(value))`` conversion the row-based feeds used.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .models import Bar
+
+PRICE_COLUMNS = ("open", "high", "low", "close")
+
+
+@dataclass(frozen=True, eq=False)
+class BarBatch:
+    """Immutable columnar block of bars sharing one timeframe."""
+    timeframe: str
+    symbol: np.ndarray
+    timestamp: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    _symbol_slices: Dict[str, slice] = field(default=None, repr=False, compare=False)
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_columns(cls, timeframe: str, symbol, timestamp, open, high, low, close, volume) -> "BarBatch":
+        """Build from array-likes; float64/int64/datetime64 inputs are not copied."""
+        return cls(
+            timeframe=timeframe,
+            symbol=np.asarray(symbol, dtype=object),
+            timestamp=np.asarray(timestamp, dtype="datetime64[ns]"),
+            open=np.asarray(open, dtype=np.float64),
+            high=np.asarray(high, dtype=np.float64),
+            low=np.asarray(low, dtype=np.float64),
+            close=np.asarray(close, dtype=np.float64),
+            volume=np.asarray(volume, dtype=np.int64),
+        )
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, timeframe: str) -> "BarBatch":
+        """Build from a DataFrame with symbol/timestamp/OHLC/volume columns."""
+        return cls.from_columns(
+            timeframe,
+            df["symbol"].to_numpy(),
+            pd.to_datetime(df["timestamp"]).to_numpy(),
+            *(df[column].to_numpy() for column in PRICE_COLUMNS),
+            df["volume"].to_numpy(),
+        )
+
+    @classmethod
+    def from_numpy(cls, columns: Dict[str, np.ndarray], timeframe: str) -> "BarBatch":
+        """Build from a column dict such as DuckDB's ``fetchnumpy()`` result."""
+        return cls.from_columns(
+            timeframe,
+            columns["symbol"],
+            columns["timestamp"],
+            *(columns[column] for column in PRICE_COLUMNS),
+            columns["volume"],
+        )
+
+    @classmethod
+    def from_bars(cls, bars: Iterable[Bar], timeframe: Optional[str] = None) -> "BarBatch":
+        """Pack existing ``Bar`` objects (e.g. from a row-based feed)."""
+        bars = list(bars)
+        if timeframe is None:
+            timeframe = bars[0].timeframe if bars else ""
+        return cls.from_columns(
+            timeframe,
+            [b.symbol for b in bars],
+            [b.timestamp for b in bars],
+            *([float(getattr(b, column)) for b in bars] for column in PRICE_COLUMNS),
+            [b.volume for b in bars],
+        )
+
+    @classmethod
+    def empty(cls, timeframe: str) -> "BarBatch":
+        return cls.from_columns(timeframe, [], [], [], [], [], [], [])
+
+    # ------------------------------------------------------------------
+    # Slicing (views, no copies)
+    # ------------------------------------------------------------------
+
+    def _take(self, index) -> "BarBatch":
+        return BarBatch(
+            timeframe=self.timeframe,
+            symbol=self.symbol[index],
+            timestamp=self.timestamp[index],
+            open=self.open[index],
+            high=self.high[index],
+            low=self.low[index],
+            close=self.close[index],
+            volume=self.volume[index],
+        )
+
+    def slice(self, start: int, stop: int) -> "BarBatch":
+        """Rows ``[start, stop)`` as a view."""
+        return self._take(slice(start, stop))
+
+    def symbol_slices(self) -> Dict[str, slice]:
+        """Row range of each symbol, in order of first appearance.
+
+        Requires each symbol's rows to be contiguous (e.g. ORDER BY symbol,
+        timestamp); use ``by_symbol`` otherwise.
+        """
+        if self._symbol_slices is None:
+            slices: Dict[str, slice] = {}
+            n = len(self.symbol)
+            if n:
+                boundaries = np.flatnonzero(self.symbol[1:] != self.symbol[:-1]) + 1
+                starts = np.concatenate(([0], boundaries))
+                stops = np.concatenate((boundaries, [n]))
+                for start, stop in zip(starts.tolist(), stops.tolist()):
+                    name = self.symbol[start]
+                    if name in slices:
+                        raise ValueError(f"Rows for {name} are not contiguous; use by_symbol()")
+                    slices[name] = slice(start, stop)
+            object.__setattr__(self, "_symbol_slices", slices)
+        return self._symbol_slices
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self.symbol_slices())
+
+    def for_symbol(self, symbol: str) -> "BarBatch":
+        """One symbol's bars as a view (empty batch if absent)."""
+        rows = self.symbol_slices().get(symbol)
+        if rows is None:
+            return BarBatch.empty(self.timeframe)
+        return self._take(rows)
+
+    def iter_symbols(self) -> Iterator[Tuple[str, "BarBatch"]]:
+        for symbol, rows in self.symbol_slices().items():
+            yield symbol, self._take(rows)
+
+    def by_symbol(self) -> Dict[str, "BarBatch"]:
+        """Group rows by symbol; copies only when rows are interleaved."""
+        try:
+            return dict(self.iter_symbols())
+        except ValueError:
+            order = np.argsort(self.symbol, kind="stable")
+            return dict(self._take(order).iter_symbols())
+
+    def between(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> "BarBatch":
+        """Bars with ``start <= timestamp <= end``.
+
+        A view when timestamps are sorted (a single symbol's bars, or a
+        time-ordered replay); a filtered copy otherwise.
+        """
+        lo = np.datetime64(start, "ns") if start is not None else None
+        hi = np.datetime64(end, "ns") if end is not None else None
+        ts = self.timestamp
+        if len(ts) < 2 or bool(np.all(ts[1:] >= ts[:-1])):
+            first = 0 if lo is None else int(np.searchsorted(ts, lo, side="left"))
+            last = len(ts) if hi is None else int(np.searchsorted(ts, hi, side="right"))
+            return self.slice(first, max(first, last))
+        mask = np.ones(len(ts), dtype=bool)
+        if lo is not None:
+            mask &= ts >= lo
+        if hi is not None:
+            mask &= ts <= hi
+        return self._take(mask)
+
+    # ------------------------------------------------------------------
+    # Lazy Bar view
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def bar(self, i: int) -> Bar:
+        """Materialize row ``i`` as a ``Bar``."""
+        return Bar(
+            timestamp=pd.Timestamp(self.timestamp[i]).to_pydatetime(),
+            symbol=self.symbol[i],
+            open=Decimal(str(self.open[i].item())),
+            high=Decimal(str(self.high[i].item())),
+            low=Decimal(str(self.low[i].item())),
+            close=Decimal(str(self.close[i].item())),
+            volume=int(self.volume[i]),
+            timeframe=self.timeframe,
+        )
+
+    def __getitem__(self, i: int) -> Bar:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("BarBatch index out of range")
+        return self.bar(i)
+
+    def __iter__(self) -> Iterator[Bar]:
+        for i in range(len(self)):
+            yield self.bar(i)
+
+    def to_bars(self) -> List[Bar]:
+        return list(self)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            "symbol": self.symbol,
+            "timestamp": self.timestamp,
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "volume": self.volume,
+        })
@@ -106,6 +106,9 @@ class StrategyRunner:
                 if not self.is_running:
                     break
 
+                # Keep incremental analytics state current before the strategy reads it
+                self.analytics_port.on_bar(bar)
+
                 # Process bar through strategy
                 signals = self.strategy.on_bar(bar, {'current_time': bar.timestamp})
 
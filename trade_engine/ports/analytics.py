@@ -51,6 +51,15 @@ class AnalyticsPort(ABC):
         """
         pass
 
+    def on_bar(self, bar: Bar) -> None:
+        """
+        Feed a new bar to adapters that keep incremental per-symbol state
+
+        Args:
+            bar: Latest market bar
+        """
+        pass
+
     @abstractmethod
     def calculate_atr(self, symbol: str, trading_date: date,
                      window: int = 14, timeframe: str = "5m") -> Optional[Decimal]:
@@ -11,6 +11,7 @@ from typing import AsyncIterable, List
 from datetime import date, time
 
 from ..domain.models import Bar
+from ..domain.bar_batch import BarBatch
 
 
 class DataFeedPort(ABC):
@@ -50,6 +51,29 @@ class DataFeedPort(ABC):
         """
         pass
 
+    async def subscribe_batches(self, symbols: List[str], timeframe: str,
+                                start_date: date = date.min,
+                                end_date: date = date.max) -> AsyncIterable[BarBatch]:
+        """
+        Subscribe to bar data as columnar batches
+
+        The default packs ``get_historical_bars`` per symbol; adapters that
+        can read columns directly should override it.
+
+        Args:
+            symbols: List of symbols to subscribe to
+            timeframe: Bar timeframe ("1m", "5m", etc.)
+            start_date: Start date for data
+            end_date: End date for data
+
+        Yields:
+            BarBatch: One batch per symbol, in subscription order
+        """
+        for symbol in symbols:
+            bars = self.get_historical_bars(symbol, start_date, end_date, timeframe)
+            if bars:
+                yield BarBatch.from_bars(bars, timeframe)
+
     @abstractmethod
     def get_available_symbols(self) -> List[str]:
         """Get list of available symbols"""
@@ -0,0 +1,184 @@
+"""
+Test Columnar Bar Batches
+=========================
+
+Tests for BarBatch slicing, the lazy Bar view and batch subscriptions.
+"""
+
+import asyncio
+from datetime import date, datetime
+from decimal import Decimal
+
+import duckdb
+import numpy as np
+import pandas as pd
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from trade_engine.adapters.duckdb_data_feed import DuckDBDataFeed
+from trade_engine.domain.bar_batch import BarBatch
+from trade_engine.domain.models import Bar
+
+
+@pytest.fixture
+def market_frame():
+    times = pd.date_range('2024-01-01 09:15:00', periods=5, freq='1min')
+    rows = []
+    for symbol, base in [('INFY', 1500.0), ('RELIANCE', 2500.0), ('TCS', 3200.0)]:
+        for i, ts in enumerate(times):
+            rows.append({
+                'symbol': symbol, 'timestamp': ts,
+                'open': base + i, 'high': base + i + 2.5, 'low': base + i - 1.25,
+                'close': base + i + 0.1, 'volume': 1000 * (i + 1),
+            })
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def feed(tmp_path, market_frame):
+    db_path = str(tmp_path / 'bars.duckdb')
+    with duckdb.connect(db_path) as conn:
+        conn.register('bars_df', market_frame)
+        conn.execute("""
+            CREATE TABLE market_data AS
+            SELECT *, CAST(timestamp AS DATE) AS date_partition FROM bars_df
+        """)
+    return DuckDBDataFeed(db_path)
+
+
+class TestBarBatch:
+    """Test slicing and the lazy Bar accessor."""
+
+    def test_symbol_slices_are_views(self, market_frame):
+        batch = BarBatch.from_frame(market_frame, '1m')
+
+        tcs = batch.for_symbol('TCS')
+
+        assert batch.symbols == ['INFY', 'RELIANCE', 'TCS']
+        assert len(tcs) == 5
+        assert np.shares_memory(tcs.close, batch.close)
+        assert len(batch.for_symbol('MISSING')) == 0
+
+    def test_between_slices_sorted_timestamps(self, market_frame):
+        infy = BarBatch.from_frame(market_frame, '1m').for_symbol('INFY')
+
+        window = infy.between(datetime(2024, 1, 1, 9, 16), datetime(2024, 1, 1, 9, 18))
+
+        assert [b.timestamp.minute for b in window] == [16, 17, 18]
+        assert np.shares_memory(window.open, infy.open)
+
+    def test_interleaved_rows_group_by_symbol(self, market_frame):
+        shuffled = market_frame.sort_values(['timestamp', 'symbol']).reset_index(drop=True)
+        batch = BarBatch.from_frame(shuffled, '1m')
+
+        with pytest.raises(ValueError):
+            batch.symbol_slices()
+        groups = batch.by_symbol()
+        assert list(groups) == ['INFY', 'RELIANCE', 'TCS']
+        assert groups['TCS'].volume.tolist() == [1000, 2000, 3000, 4000, 5000]
+
+    def test_lazy_bar_matches_row_conversion(self, market_frame):
+        batch = BarBatch.from_frame(market_frame, '1m')
+        row = market_frame.iloc[7]
+
+        bar = batch[7]
+
+        assert bar == Bar(
+            timestamp=row['timestamp'].to_pydatetime(), symbol=row['symbol'],
+            open=Decimal(str(row['open'])), high=Decimal(str(row['high'])),
+            low=Decimal(str(row['low'])), close=Decimal(str(row['close'])),
+            volume=int(row['volume']), timeframe='1m',
+        )
+        assert batch[-1].symbol == 'TCS'
+
+    def test_round_trip_from_bars(self, market_frame):
+        batch = BarBatch.from_frame(market_frame, '1m')
+        assert BarBatch.from_bars(batch.to_bars()).to_bars() == batch.to_bars()
+
+
+class TestDuckDBDataFeedBatches:
+    """Test the columnar read path of DuckDBDataFeed."""
+
+    def test_historical_bars_built_from_batch(self, feed, market_frame):
+        bars = feed.get_historical_bars('RELIANCE', date(2024, 1, 1), date(2024, 1, 1), '1m')
+
+        expected = BarBatch.from_frame(market_frame, '1m').for_symbol('RELIANCE').to_bars()
+        assert bars == expected
+        assert isinstance(bars[0].close, Decimal)
+        assert isinstance(bars[0].timestamp, datetime)
+
+    def test_time_filter(self, feed):
+        from datetime import time
+
+        bars = feed.get_historical_bars(
+            'TCS', date(2024, 1, 1), date(2024, 1, 1), '1m', time(9, 16), time(9, 17)
+        )
+        assert [b.timestamp.minute for b in bars] == [16, 17]
+
+    def test_subscribe_batches_single_query(self, feed):
+        async def collect():
+            return [b async for b in feed.subscribe_batches(['TCS', 'INFY', 'MISSING'], '1m')]
+
+        batches = asyncio.run(collect())
+
+        assert [b.symbols for b in batches] == [['TCS'], ['INFY']]
+        assert all(len(b) == 5 for b in batches)
+        assert batches[0].close[0] == pytest.approx(3200.1)
+
+
+class TestDuckDBDataFeedReplay:
+    """Test time-merged replay across symbols and days."""
+
+    @pytest.fixture
+    def two_day_feed(self, tmp_path, market_frame):
+        second_day = market_frame.assign(timestamp=market_frame['timestamp'] + pd.Timedelta(days=1))
+        frame = pd.concat([market_frame, second_day], ignore_index=True)
+        db_path = str(tmp_path / 'replay.duckdb')
+        with duckdb.connect(db_path) as conn:
+            conn.register('bars_df', frame)
+            conn.execute("""
+                CREATE TABLE market_data AS
+                SELECT *, CAST(timestamp AS DATE) AS date_partition FROM bars_df
+            """)
+        return DuckDBDataFeed(db_path), frame
+
+    def test_subscribe_emits_global_timestamp_order(self, two_day_feed):
+        feed, frame = two_day_feed
+
+        async def collect():
+            return [bar async for bar in feed.subscribe(['TCS', 'INFY'], '1m')]
+
+        bars = asyncio.run(collect())
+
+        expected = frame[frame['symbol'].isin(['TCS', 'INFY'])].sort_values(['timestamp', 'symbol'])
+        assert [(b.timestamp, b.symbol) for b in bars] == \
+            [(ts.to_pydatetime(), sym) for ts, sym in zip(expected['timestamp'], expected['symbol'])]
+
+    def test_replay_yields_cross_sections_per_minute(self, two_day_feed):
+        feed, _ = two_day_feed
+
+        async def collect():
+            return [section async for section in feed.replay(['RELIANCE', 'TCS', 'INFY'], '1m')]
+
+        sections = asyncio.run(collect())
+
+        assert len(sections) == 10  # 5 minutes on each of 2 days
+        assert all(s.symbol.tolist() == ['INFY', 'RELIANCE', 'TCS'] for s in sections)
+        assert all(len(set(s.timestamp.tolist())) == 1 for s in sections)
+        assert sections[5].timestamp[0] == np.datetime64('2024-01-02T09:15:00')
+
+    def test_replay_stops_early(self, two_day_feed):
+        feed, _ = two_day_feed
+
+        async def first_two():
+            sections = []
+            async for section in feed.replay(['TCS'], '1m'):
+                sections.append(section)
+                if len(sections) == 2:
+                    break
+            return sections
+
+        assert len(asyncio.run(first_two())) == 2
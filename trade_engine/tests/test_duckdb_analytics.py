@@ -0,0 +1,164 @@
+"""
+Test DuckDB Analytics
+=====================
+
+Tests for set-based warmup scoring and incremental leader scores.
+"""
+
+from datetime import date, datetime, time
+
+import duckdb
+import numpy as np
+import pandas as pd
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from trade_engine.adapters.duckdb_analytics import DuckDBAnalytics
+from trade_engine.domain.bar_batch import BarBatch
+
+DAY = date(2025, 8, 20)
+CONFIG = {
+    'selection': {
+        'turnover_min_crore': 5.0,
+        'spread_bps_max': 15,
+        'score_weights': {
+            'ret_0915_0950': 0.35, 'vspike_10m': 0.25, 'obv_delta_35m': 0.20,
+            'sector_strength': 0.10, 'range_compression': 0.10,
+            'spread_penalty': -0.20, 'illiq_penalty': -0.20,
+        },
+    },
+}
+SECTORS = {'AAA': 'IT', 'BBB': 'IT', 'CCC': 'BANK', 'DDD': None}
+
+
+@pytest.fixture
+def bars():
+    rng = np.random.default_rng(3)
+    times = pd.date_range(datetime.combine(DAY, time(9, 15)), datetime.combine(DAY, time(10, 30)), freq='1min')
+    frames = []
+    for i, symbol in enumerate(SECTORS):
+        close = 100 * (i + 1) + np.cumsum(rng.normal(0.05 * (i - 1), 0.5, len(times)))
+        frames.append(pd.DataFrame({
+            'symbol': symbol, 'timestamp': times,
+            'open': close, 'high': close + rng.uniform(0.05, 0.4, len(times)),
+            'low': close - rng.uniform(0.05, 0.4, len(times)), 'close': close,
+            'volume': rng.integers(1_000, 50_000 * (i + 1), len(times)),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def _analytics(tmp_path, bars, with_sectors=True):
+    db_path = str(tmp_path / 'analytics.duckdb')
+    with duckdb.connect(db_path) as conn:
+        conn.register('bars_df', bars)
+        conn.execute("""
+            CREATE TABLE market_data_unified AS
+            SELECT *, CAST(timestamp AS DATE) AS date_partition FROM bars_df
+        """)
+        if with_sectors:
+            conn.execute("CREATE TABLE symbols (symbol VARCHAR, sector VARCHAR)")
+            conn.executemany("INSERT INTO symbols VALUES (?, ?)", list(SECTORS.items()))
+    return DuckDBAnalytics(db_path, CONFIG)
+
+
+def _window(bars, symbol):
+    ts = bars['timestamp']
+    mask = (bars['symbol'] == symbol) & (ts.dt.time >= time(9, 15)) & (ts.dt.time <= time(9, 50))
+    return bars[mask]
+
+
+class TestWarmupFeatures:
+    """Test the grouped warmup scoring pass."""
+
+    def test_scores_whole_universe(self, tmp_path, bars):
+        scores = _analytics(tmp_path, bars).compute_warmup_features(DAY, [], time(9, 15), time(9, 50))
+
+        assert sorted(scores) == sorted(SECTORS)
+        for symbol, score in scores.items():
+            window = _window(bars, symbol)
+            expected_ret = min(window['close'].std() / window['close'].mean() * 100, 5.0)
+            assert score.ret_0915_0950 == pytest.approx(expected_ret)
+            assert score.vspike_10m == pytest.approx(min(window['volume'].sum() / 1e6, 5.0))
+            assert -1.0 <= score.obv_delta_35m <= 1.0
+            assert 0.0 <= score.range_compression <= 1.0
+            assert score.spread_penalty >= 0.0 and 0.0 <= score.illiq_penalty <= 1.0
+
+    def test_components_and_total(self, tmp_path, bars):
+        scores = _analytics(tmp_path, bars).compute_warmup_features(
+            DAY, ['CCC', 'AAA'], time(9, 15), time(9, 50)
+        )
+
+        assert list(scores) == ['CCC', 'AAA']
+        window = _window(bars, 'AAA')
+        signed = np.sign(window['close'].diff().fillna(0)) * window['volume']
+        aaa = scores['AAA']
+        assert aaa.obv_delta_35m == pytest.approx(signed.sum() / window['volume'].sum())
+        recent = window.tail(10)
+        assert aaa.range_compression == pytest.approx(
+            1 - (recent['high'].max() - recent['low'].min()) / (window['high'].max() - window['low'].min())
+        )
+        weights = CONFIG['selection']['score_weights']
+        assert aaa.total_score == pytest.approx(sum(getattr(aaa, k) * w for k, w in weights.items()))
+
+    def test_sector_strength(self, tmp_path, bars):
+        analytics = _analytics(tmp_path, bars)
+        scores = analytics.compute_warmup_features(DAY, [], time(9, 15), time(9, 50))
+
+        returns = {s: scores[s].components_json['window_return_pct'] for s in SECTORS}
+        universe = np.mean(list(returns.values()))
+        assert scores['AAA'].sector_strength == pytest.approx((returns['AAA'] + returns['BBB']) / 2 - universe)
+        assert scores['CCC'].sector_strength == pytest.approx(returns['CCC'] - universe)
+        assert scores['DDD'].sector_strength == 0.0
+
+    def test_without_symbols_table(self, tmp_path, bars):
+        scores = _analytics(tmp_path, bars, with_sectors=False).compute_warmup_features(
+            DAY, [], time(9, 15), time(9, 50)
+        )
+        assert len(scores) == 4
+        assert all(score.sector_strength == 0.0 for score in scores.values())
+
+    def test_no_bars(self, tmp_path, bars):
+        analytics = _analytics(tmp_path, bars)
+        assert analytics.compute_warmup_features(date(2025, 8, 21), [], time(9, 15), time(9, 50)) == {}
+
+
+class TestLeaderScores:
+    """Test incremental leader scores against the database path."""
+
+    def test_tape_matches_database(self, tmp_path, bars):
+        streamed = _analytics(tmp_path, bars)
+        entries = {'AAA': time(9, 55), 'CCC': time(10, 5)}
+        now = time(10, 20)
+
+        feed = BarBatch.from_frame(bars.sort_values(['timestamp', 'symbol']), '1m')
+        for bar in feed.between(None, datetime.combine(DAY, now)):
+            streamed.on_bar(bar)
+
+        from_tape = streamed.compute_leader_scores(['AAA', 'CCC', 'BBB'], DAY, now, entries)
+        streamed._tapes.clear()
+        from_db = streamed.compute_leader_scores(['AAA', 'CCC', 'BBB'], DAY, now, entries)
+
+        assert list(from_tape) == ['AAA', 'CCC']
+        for symbol in from_tape:
+            assert from_tape[symbol].ret_since_entry == pytest.approx(from_db[symbol].ret_since_entry)
+            assert from_tape[symbol].timestamp == datetime.combine(DAY, now)
+
+        aaa = bars[(bars['symbol'] == 'AAA') & (bars['timestamp'].dt.time >= entries['AAA'])
+                   & (bars['timestamp'].dt.time <= now)]
+        expected = (aaa['close'].iloc[-1] - aaa['close'].iloc[0]) / aaa['close'].iloc[0] * 100
+        assert from_tape['AAA'].ret_since_entry == pytest.approx(expected)
+
+    def test_tape_obv_and_volume_spike(self, tmp_path, bars):
+        analytics = _analytics(tmp_path, bars)
+        for bar in BarBatch.from_frame(bars, '1m').for_symbol('BBB'):
+            analytics.on_bar(bar)
+
+        score = analytics.compute_leader_scores(['BBB'], DAY, time(10, 30), {'BBB': time(9, 15)})['BBB']
+
+        day = bars[bars['symbol'] == 'BBB']
+        assert score.vspike_5m == pytest.approx(day['volume'].tail(5).mean() / day['volume'].mean())
+        signed = (np.sign(day['close'].diff().fillna(0)) * day['volume']).tail(10)
+        assert score.obv_delta_10m == pytest.approx(signed.sum() / day['volume'].tail(10).sum())